@@ -6,6 +6,7 @@ Provides REST endpoints for generating NBA and NFL parlay recommendations
 with ML prediction layer, APScheduler support, and health monitoring.
 """
 
+import asyncio
 import logging
 import os
 import sys
@@ -22,6 +23,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 try:
     from tools.unified_parlay_strategist_agent import UnifiedParlayStrategistAgent, create_unified_agent
     from tools.knowledge_base_rag import SportsKnowledgeRAG
+    from tools.model_watcher import get_model_watcher
     HAS_AGENTS = True
 except ImportError as e:
     logging.warning(f"Could not import unified agents: {e}")
@@ -76,9 +78,10 @@ async def startup_event():
     
     try:
         # Initialize knowledge base
+        # The embedding model loads in the background; keyword search until then
         logger.info("📚 Loading knowledge base...")
-        knowledge_base = SportsKnowledgeRAG()
-        logger.info("✅ Knowledge base loaded")
+        knowledge_base = SportsKnowledgeRAG(background_load=True)
+        logger.info("✅ Knowledge base loaded (embedding model loading in background)")
         
         # Initialize NFL unified agent
         if os.getenv("ENABLE_NFL", "true").lower() == "true":
@@ -92,12 +95,27 @@ async def startup_event():
             nba_agent = create_unified_agent("NBA", knowledge_base)
             logger.info("✅ Unified NBA agent ready")
         
+        # Hot-reload retrained models into the agents instead of restarting; the
+        # builders that use them are created per request, so watch what they serve
+        model_watcher = get_model_watcher()
+        if model_watcher.poll_interval > 0:
+            watched = await asyncio.to_thread(model_watcher.watch_served)
+            model_watcher.start()
+            logger.info(f"✅ Model watcher reloading {watched} models on retrain")
+        
         logger.info("🎯 All FastAPI services initialized")
         
     except Exception as e:
         logger.error(f"❌ Startup failed: {e}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background model reloading."""
+    if HAS_AGENTS:
+        get_model_watcher().stop()
+
+
 @app.get("/")
 async def root():
     """System status and basic information."""
@@ -142,8 +160,11 @@ async def health_check():
             },
             "knowledge_base": {
                 "status": "ready" if knowledge_base else "unavailable",
-                "chunks": len(knowledge_base.sports_betting_chunks) if knowledge_base else 0
+                "chunks": len(knowledge_base.sports_betting_chunks) if knowledge_base else 0,
+                "embedding_model": knowledge_base.model_status if knowledge_base else "unavailable",
+                "query_cache": knowledge_base.query_cache.stats() if knowledge_base else {}
             },
+            "model_watcher": get_model_watcher().stats() if HAS_AGENTS else {},
             "external_services": {
                 "qdrant": "connected" if os.getenv("QDRANT_URL") else "not_configured",
                 "redis": "connected" if os.getenv("REDIS_URL") else "not_configured"
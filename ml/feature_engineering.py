@@ -9,7 +9,7 @@ Implements shared feature engineering logic with sport-specific adaptations.
 import logging
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Union
 from sklearn.preprocessing import StandardScaler, LabelEncoder, OneHotEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
@@ -18,6 +18,13 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Value maps shared by create_derived_features and CompiledFeaturePipeline
+WEATHER_IMPACT = {'clear': 0, 'rain': -0.1, 'wind': -0.05, 'snow': -0.15, 'indoor': 0}
+INJURY_IMPACT = {'healthy': 0, 'questionable': -0.15, 'doubtful': -0.35}
+MOVEMENT_IMPACT = {'up': 0.05, 'stable': 0, 'down': -0.05}
+LINE_DIFFICULTY_EDGES = np.array([-10.0, -2.0, 2.0, 10.0])
+LINE_DIFFICULTY_LABELS = np.array(['very_easy', 'easy', 'fair', 'hard', 'very_hard'], dtype=object)
+
 
 class SportFeatureEngineer:
     """Feature engineering pipeline for sports betting data."""
@@ -77,9 +84,9 @@ class SportFeatureEngineer:
         
         # Line difficulty categories
         df['line_difficulty'] = pd.cut(
-            df['line_delta'], 
-            bins=[-float('inf'), -10, -2, 2, 10, float('inf')],
-            labels=['very_easy', 'easy', 'fair', 'hard', 'very_hard']
+            df['line_delta'],
+            bins=[-float('inf'), *LINE_DIFFICULTY_EDGES, float('inf')],
+            labels=list(LINE_DIFFICULTY_LABELS)
         )
         
         if self.sport == "nba":
@@ -93,8 +100,7 @@ class SportFeatureEngineer:
             
         elif self.sport == "nfl":
             # NFL-specific features
-            weather_impact_map = {'clear': 0, 'rain': -0.1, 'wind': -0.05, 'snow': -0.15, 'indoor': 0}
-            df['weather_impact'] = df['weather_conditions'].map(weather_impact_map).fillna(0)
+            df['weather_impact'] = df['weather_conditions'].map(WEATHER_IMPACT).fillna(0)
             
             df['divisional_factor'] = df['is_divisional'].astype(float) * 0.1  # Divisional games are tighter
             df['cold_weather'] = ((df['temperature'].fillna(70) < 40) & (df['weather_conditions'] != 'indoor')).astype(int)
@@ -111,12 +117,10 @@ class SportFeatureEngineer:
             )
         
         # Injury impact scoring
-        injury_impact_map = {'healthy': 0, 'questionable': -0.15, 'doubtful': -0.35}
-        df['injury_impact'] = df['injury_status'].map(injury_impact_map)
+        df['injury_impact'] = df['injury_status'].map(INJURY_IMPACT)
         
         # Market movement impact
-        movement_impact_map = {'up': 0.05, 'stable': 0, 'down': -0.05}
-        df['movement_impact'] = df['market_movement'].map(movement_impact_map)
+        df['movement_impact'] = df['market_movement'].map(MOVEMENT_IMPACT)
         
         # Odds value assessment
         df['implied_probability'] = 1.0 / df['prop_odds']
@@ -220,7 +224,10 @@ class SportFeatureEngineer:
         
         with open(filepath, 'wb') as f:
             pickle.dump(pipeline_data, f)
-        
+
+        # Array-only copy for request-time scoring (see CompiledFeaturePipeline)
+        CompiledFeaturePipeline.from_engineer(self).save(compiled_pipeline_path(filepath))
+
         logger.info(f"Saved {self.sport} feature pipeline to {filepath}")
     
     @classmethod
@@ -240,11 +247,208 @@ class SportFeatureEngineer:
         return engineer
 
 
+def compiled_pipeline_path(filepath: str) -> Path:
+    """Where save_pipeline writes the compiled copy of a pipeline pickle."""
+    path = Path(filepath)
+    return path.with_name(f"{path.stem}_compiled{path.suffix}")
+
+
+class CompiledFeaturePipeline:
+    """
+    Array-only replay of a fitted SportFeatureEngineer.
+
+    engineer_features(fit=False) copies DataFrames, runs pandas map/cut/str
+    operations and the sklearn encoder and scaler - fine for training, slow
+    for scoring a handful of legs per request. This class keeps only what the
+    fitted pipeline resolved to (output column order, one-hot categories,
+    scaler means and scales) as plain NumPy arrays and rebuilds the same
+    feature matrix with NumPy. It loads without pandas or sklearn objects.
+
+    As with engineer_features, a raw column missing from every row raises
+    KeyError; a key missing from only some dict rows is NaN for those rows.
+    """
+
+    def __init__(self, sport: str, feature_columns: List[str], onehot: Dict[str, Tuple[str, Any]],
+                 scale_columns: List[str], scale_mean: np.ndarray, scale_std: np.ndarray):
+        self.sport = sport
+        self.feature_columns = list(feature_columns)
+        self.onehot = dict(onehot)
+        self.scale_mean = dict(zip(scale_columns, np.asarray(scale_mean, dtype=float)))
+        self.scale_std = dict(zip(scale_columns, np.asarray(scale_std, dtype=float)))
+
+    @classmethod
+    def from_engineer(cls, engineer: SportFeatureEngineer) -> 'CompiledFeaturePipeline':
+        """Compile a fitted engineer (the output of engineer_features(fit=True) or load_pipeline)."""
+        if not engineer.is_fitted:
+            raise ValueError("Pipeline must be fitted before compiling")
+
+        encoder = engineer.categorical_encoder
+        onehot = {}
+        drop_idx = encoder.drop_idx_ if encoder.drop_idx_ is not None else [None] * len(encoder.categories_)
+        for column, categories, dropped in zip(encoder.feature_names_in_, encoder.categories_, drop_idx):
+            for i, category in enumerate(categories):
+                if dropped is None or i != dropped:
+                    onehot[f"{column}_{category}"] = (str(column), category.item() if hasattr(category, 'item') else category)
+
+        scaler = engineer.scaler
+        columns = [str(column) for column in scaler.feature_names_in_]
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(len(columns))
+        std = scaler.scale_ if scaler.with_std else np.ones(len(columns))
+        return cls(engineer.sport, engineer.feature_columns, onehot, columns, mean, std)
+
+    def save(self, filepath: Union[str, Path]):
+        """Pickle the compiled pipeline (plain lists, dicts and arrays only)."""
+        compiled_data = {
+            'sport': self.sport,
+            'feature_columns': self.feature_columns,
+            'onehot': self.onehot,
+            'scale_columns': list(self.scale_mean),
+            'scale_mean': np.array(list(self.scale_mean.values())),
+            'scale_std': np.array(list(self.scale_std.values())),
+        }
+        with open(filepath, 'wb') as f:
+            pickle.dump(compiled_data, f)
+
+        logger.info(f"Saved compiled {self.sport} feature pipeline to {filepath}")
+
+    @classmethod
+    def load(cls, filepath: Union[str, Path]) -> 'CompiledFeaturePipeline':
+        """Load a pipeline written by save()."""
+        with open(filepath, 'rb') as f:
+            compiled_data = pickle.load(f)
+        return cls(**compiled_data)
+
+    @staticmethod
+    def _columns(rows: Union[Dict[str, Any], List[Dict[str, Any]], np.ndarray]) -> Tuple[int, Any]:
+        """(row count, column getter) for dict rows or a structured array."""
+        if isinstance(rows, np.ndarray):
+            if rows.dtype.names is None:
+                raise ValueError("Array input must be a structured array with named fields")
+            rows = np.atleast_1d(rows)
+
+            def field(name):
+                if name not in rows.dtype.names:
+                    raise KeyError(name)
+                return rows[name]
+
+            return len(rows), field
+        if isinstance(rows, dict):
+            rows = [rows]
+
+        def column(name):
+            if not any(name in row for row in rows):
+                raise KeyError(name)
+            values = [row.get(name) for row in rows]
+            return np.array(values, dtype=object)
+
+        return len(rows), column
+
+    def transform(self, rows: Union[Dict[str, Any], List[Dict[str, Any]], np.ndarray]) -> np.ndarray:
+        """
+        Feature matrix for raw leg rows, columns in feature_columns order.
+
+        Args:
+            rows: One dict, a list of dicts, or a structured NumPy array with
+                the raw columns engineer_features expects
+
+        Returns:
+            float64 matrix, or an object matrix when the fitted pipeline
+            passes non-numeric columns through (as df[feature_columns].values does)
+        """
+        n, column = self._columns(rows)
+        if n == 0:
+            return np.zeros((0, len(self.feature_columns)))
+        numbers: Dict[str, np.ndarray] = {}
+        texts: Dict[str, np.ndarray] = {}
+
+        def number(name):
+            if name not in numbers:
+                values = column(name)
+                numbers[name] = np.array([np.nan if value is None else value for value in values], dtype=float) \
+                    if values.dtype == object else values.astype(float)
+            return numbers[name]
+
+        def text(name):
+            if name not in texts:
+                texts[name] = column(name).astype(object)
+            return texts[name]
+
+        def lookup(values, mapping, default=np.nan):
+            return np.array([mapping.get(value, default) if isinstance(value, str) else default
+                             for value in values], dtype=float)
+
+        def contains(values, needles):
+            return np.array([isinstance(value, str) and any(needle in value for needle in needles)
+                             for value in values], dtype=float)
+
+        features: Dict[str, np.ndarray] = {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            last_3, last_5, season = number('player_avg_last_3'), number('player_avg_last_5'), number('player_avg_season')
+            features['form_trend'] = (last_3 - last_5) / season
+            features['line_value_ratio'] = number('prop_line') / season
+            features['recent_vs_season'] = (last_5 - season) / season
+            features['consistency_score'] = 1.0 / (1.0 + np.abs(last_3 - last_5))
+
+            # pd.cut with right-closed bins; NaN stays uncategorised
+            line_delta = number('line_delta')
+            line_difficulty = LINE_DIFFICULTY_LABELS[np.searchsorted(LINE_DIFFICULTY_EDGES, line_delta, side='left')]
+            line_difficulty[np.isnan(line_delta)] = None
+            features['line_difficulty'] = line_difficulty
+
+            location = text('location')
+            if self.sport == "nba":
+                features['fatigue_factor'] = number('is_back_to_back') * 0.8 + (1 - number('rest_days') / 2.0)
+                features['matchup_difficulty'] = number('defensive_rank_against') / 30.0
+                features['primetime_home'] = text('is_primetime').astype(bool) & (location == 'home')
+                features['overperforming'] = (last_5 > season).astype(float)
+
+            elif self.sport == "nfl":
+                weather, temperature = text('weather_conditions'), number('temperature')
+                prop_type = text('prop_type')
+                features['weather_impact'] = np.nan_to_num(lookup(weather, WEATHER_IMPACT), nan=0.0)
+                features['divisional_factor'] = number('is_divisional') * 0.1
+                features['cold_weather'] = ((np.where(np.isnan(temperature), 70, temperature) < 40)
+                                            & (weather != 'indoor')).astype(float)
+                features['is_qb_prop'] = contains(prop_type, ['passing'])
+                features['is_skill_position'] = contains(prop_type, ['receiving', 'rushing'])
+                features['temperature_factor'] = np.where(
+                    ~np.isnan(temperature), np.clip((temperature - 40) / 40, -0.2, 0.1), 0)
+
+            features['injury_impact'] = lookup(text('injury_status'), INJURY_IMPACT)
+            features['movement_impact'] = lookup(text('market_movement'), MOVEMENT_IMPACT)
+            features['implied_probability'] = 1.0 / number('prop_odds')
+            features['odds_value'] = np.where(features['implied_probability'] < 0.5,
+                                              'good_value', 'poor_value').astype(object)
+
+        output = []
+        for name in self.feature_columns:
+            if name in self.onehot:
+                source, category = self.onehot[name]
+                values = features[source] if source in features else text(source)
+                values = (values == category).astype(float)
+            elif name in features:
+                values = features[name]
+            else:
+                values = number(name) if name in self.scale_mean else text(name)
+
+            if name in self.scale_mean:
+                values = (values.astype(float) - self.scale_mean[name]) / self.scale_std[name]
+            output.append(values)
+
+        if all(values.dtype.kind == 'f' for values in output):
+            return np.column_stack(output) if output else np.zeros((n, 0))
+        matrix = np.empty((n, len(output)), dtype=object)
+        for i, values in enumerate(output):
+            matrix[:, i] = values
+        return matrix
+
+
 class MultiSportFeatureEngineer:
     """Manages feature engineering for multiple sports."""
     
     def __init__(self):
         self.engineers = {}
+        self.compiled = {}
         self.output_dir = Path("models/feature_pipelines")
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
@@ -271,6 +475,7 @@ class MultiSportFeatureEngineer:
         
         # Store engineer
         self.engineers[sport] = engineer
+        self.compiled.pop(sport, None)
         
         logger.info(f"Prepared {sport} data: {X.shape[0]} examples, {X.shape[1]} features")
         return X, y, feature_cols
@@ -289,7 +494,30 @@ class MultiSportFeatureEngineer:
         df_engineered, _ = engineer.engineer_features(df, fit=False)
         
         return df_engineered[engineer.feature_columns].values
-    
+
+    def transform_records(self, sport: str,
+                          records: Union[Dict[str, Any], List[Dict[str, Any]], np.ndarray]) -> np.ndarray:
+        """
+        Request-time transform_new_data: same feature matrix, no pandas.
+
+        Uses the compiled pipeline saved next to the fitted one (compiling the
+        fitted pipeline in memory if only the pandas version is on disk).
+        """
+        if sport not in self.compiled:
+            compiled_path = compiled_pipeline_path(self.output_dir / f"{sport}_feature_pipeline.pkl")
+            if sport in self.engineers:
+                self.compiled[sport] = CompiledFeaturePipeline.from_engineer(self.engineers[sport])
+            elif compiled_path.exists():
+                self.compiled[sport] = CompiledFeaturePipeline.load(compiled_path)
+            else:
+                pipeline_path = self.output_dir / f"{sport}_feature_pipeline.pkl"
+                if not pipeline_path.exists():
+                    raise ValueError(f"No fitted pipeline found for {sport}")
+                self.engineers[sport] = SportFeatureEngineer.load_pipeline(str(pipeline_path))
+                self.compiled[sport] = CompiledFeaturePipeline.from_engineer(self.engineers[sport])
+
+        return self.compiled[sport].transform(records)
+
     def get_feature_importance_names(self, sport: str) -> List[str]:
         """Get feature names for importance analysis."""
         if sport not in self.engineers:
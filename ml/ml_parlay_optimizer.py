@@ -2,11 +2,16 @@
 """
 ParlayOptimizer - ML-OPTIMIZER-001
 
-Linear programming optimization for parlay construction using PuLP.
-Maximizes Expected Value while respecting correlation constraints and leg limits.
-Includes correlation computation from historical data and backtesting evaluation.
+Parlay construction that maximizes Expected Value while respecting
+correlation constraints and leg limits. The default solver is a native
+branch-and-bound search over NumPy EV and correlation arrays that returns
+the top-K diverse parlays in one search; the PuLP/CBC linear program is
+kept as solver="pulp". Includes correlation computation from historical
+data and backtesting evaluation.
 
 Key Features:
+- Exact search with pairwise correlation caps and pairwise penalties
+  (the LP linearizes the penalty per leg and shells out to CBC per parlay)
 - Linear programming formulation for EV maximization
 - Correlation matrix constraints to avoid highly correlated legs
 - Sport-agnostic design for NBA/NFL
@@ -15,6 +20,9 @@ Key Features:
 - Integration with existing ParlayBuilder
 """
 
+from __future__ import annotations
+
+import heapq
 import logging
 import numpy as np
 import pandas as pd
@@ -32,6 +40,9 @@ except ImportError:
     HAS_PULP = False
     pulp = None
 
+from tools.correlation_cache import CorrelationCache, get_correlation_cache, leg_fingerprint
+from tools.parlay_rules_engine import ParlayRulesEngine
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -100,15 +111,17 @@ class OptimizedParlay:
 class CorrelationComputer:
     """Computes correlation matrices from historical betting data."""
     
-    def __init__(self, historical_data_path: str = "data/historical_bet_outcomes.csv"):
+    def __init__(self, historical_data_path: str = "data/historical_bet_outcomes.csv",
+                 correlation_cache: Optional[CorrelationCache] = None):
         """
         Initialize correlation computer.
         
         Args:
             historical_data_path: Path to historical betting outcomes CSV
+            correlation_cache: Pair score cache (defaults to the process-wide cache)
         """
         self.historical_data_path = Path(historical_data_path)
-        self.correlation_cache = {}
+        self.correlation_cache = correlation_cache or get_correlation_cache()
         
     def compute_correlation_matrix(self, legs: List[ParlayLeg], 
                                  lookback_days: int = 90) -> pd.DataFrame:
@@ -135,28 +148,35 @@ class CorrelationComputer:
                 cutoff_date = datetime.now() - timedelta(days=lookback_days)
                 df = df[pd.to_datetime(df['date']) >= cutoff_date]
             
-            # Compute correlations for each pair of legs
+            # Compute correlations for each pair of legs; pairs scored against the
+            # same data file and window are reused across calls
             leg_ids = [leg.leg_id for leg in legs]
-            correlation_matrix = pd.DataFrame(
-                np.eye(len(legs)), 
-                index=leg_ids, 
-                columns=leg_ids
-            )
+            matrix = np.eye(len(legs))
+            namespace = (f"optimizer:{self.historical_data_path}:"
+                         f"{self.historical_data_path.stat().st_mtime_ns}:{lookback_days}")
+            fingerprints = [self._leg_fingerprint(leg) for leg in legs]
             
             for i, leg1 in enumerate(legs):
-                for j, leg2 in enumerate(legs):
-                    if i != j:
-                        corr = self._compute_pairwise_correlation(leg1, leg2, df)
-                        correlation_matrix.iloc[i, j] = corr
-                        correlation_matrix.iloc[j, i] = corr
+                for j in range(i + 1, len(legs)):
+                    corr = self.correlation_cache.get_or_compute(
+                        namespace, fingerprints[i], fingerprints[j],
+                        lambda: self._compute_pairwise_correlation(leg1, legs[j], df)
+                    )
+                    matrix[i, j] = corr
+                    matrix[j, i] = corr
             
             logger.info(f"Computed correlation matrix for {len(legs)} legs")
-            return correlation_matrix
+            return pd.DataFrame(matrix, index=leg_ids, columns=leg_ids)
             
         except Exception as e:
             logger.warning(f"Error computing correlations: {e}")
             return self._generate_synthetic_correlations(legs)
     
+    @staticmethod
+    def _leg_fingerprint(leg: ParlayLeg) -> str:
+        """Fingerprint of the leg attributes the pairwise correlation rules read."""
+        return leg_fingerprint([leg.sport, leg.market_type, leg.player_name], leg.game_id)
+    
     def _compute_pairwise_correlation(self, leg1: ParlayLeg, leg2: ParlayLeg, 
                                     df: pd.DataFrame) -> float:
         """Compute correlation between two specific legs."""
@@ -293,31 +313,150 @@ class CorrelationComputer:
         return pd.DataFrame(corr_matrix, index=leg_ids, columns=leg_ids)
 
 
+def search_parlays(ev: np.ndarray, correlation: np.ndarray, num_solutions: int,
+                   max_legs: int, min_legs: int = 2,
+                   max_pair_correlation: Optional[float] = None,
+                   conflicts: Optional[List[Tuple[int, int]]] = None,
+                   penalty_threshold: float = 0.3,
+                   penalty_weight: float = 0.1) -> List[Tuple[float, Tuple[int, ...]]]:
+    """
+    Top-K diverse parlays by branch-and-bound over leg EV and correlation arrays.
+
+    Objective: sum(EV_i) - penalty_weight * sum(corr_ij) over selected pairs
+    with corr_ij > penalty_threshold. Pairs above max_pair_correlation and
+    rule-conflicting pairs are never combined. Picks are made in objective
+    order and a parlay that contains an earlier pick is skipped, so the
+    result matches re-solving with a diversity cut per pick.
+
+    Args:
+        ev: Expected value per leg, shape (n,)
+        correlation: Symmetric leg correlation matrix, shape (n, n)
+        num_solutions: Number of parlays to return
+        max_legs: Maximum legs per parlay
+        min_legs: Minimum legs per parlay
+        max_pair_correlation: Cap on the correlation of any two selected legs
+        conflicts: Index pairs that may not appear in the same parlay
+        penalty_threshold: Correlation above which a pair is penalized
+        penalty_weight: Penalty per unit of correlation of such a pair
+
+    Returns:
+        (objective, sorted leg indices) per parlay, best first
+    """
+    ev = np.asarray(ev, dtype=float)
+    correlation = np.asarray(correlation, dtype=float)
+    n = len(ev)
+    if num_solutions <= 0 or n < min_legs or max_legs < min_legs:
+        return []
+    
+    # Search legs in descending EV order so the bound can stop a whole branch
+    order = np.argsort(-ev, kind="stable")
+    values = ev[order]
+    corr = correlation[np.ix_(order, order)]
+    penalty = np.where(corr > penalty_threshold, penalty_weight * corr, 0.0)
+    allowed = np.ones((n, n), dtype=bool)
+    if max_pair_correlation is not None:
+        allowed &= corr <= max_pair_correlation
+    position = np.empty(n, dtype=int)
+    position[order] = np.arange(n)
+    for i, j in conflicts or []:
+        allowed[position[i], position[j]] = allowed[position[j], position[i]] = False
+    np.fill_diagonal(allowed, False)
+    gains = np.maximum(values, 0.0)
+    
+    def run(pool_size: int) -> Tuple[List[Tuple[float, Tuple[int, ...]]], bool]:
+        pool: List[Tuple[float, Tuple[int, ...]]] = []  # min-heap of the best pool_size parlays
+        truncated = False  # some feasible parlay was dropped or pruned for a full pool
+        
+        def visit(chosen: List[int], score: float, feasible: np.ndarray) -> None:
+            nonlocal truncated
+            if len(chosen) >= min_legs:
+                entry = (score, tuple(chosen))
+                if len(pool) < pool_size:
+                    heapq.heappush(pool, entry)
+                else:
+                    truncated = True
+                    if entry > pool[0]:
+                        heapq.heapreplace(pool, entry)
+            remaining = max_legs - len(chosen)
+            if remaining == 0:
+                return
+            candidates = np.flatnonzero(feasible)
+            bounds = np.concatenate(([0.0], np.cumsum(gains[candidates])))
+            for idx, k in enumerate(candidates):
+                # Best case: the next `remaining` feasible legs with no penalty
+                bound = score + bounds[min(idx + remaining, len(candidates))] - bounds[idx]
+                if len(pool) == pool_size and bound <= pool[0][0]:
+                    truncated = True
+                    break  # later candidates have lower EV, so lower bounds
+                child = feasible & allowed[k]
+                child[:k + 1] = False
+                visit(chosen + [k], score + values[k] - penalty[k, chosen].sum(), child)
+        
+        visit([], 0.0, np.ones(n, dtype=bool))
+        
+        picks: List[Tuple[float, Tuple[int, ...]]] = []
+        picked_sets: List[frozenset] = []
+        for score, chosen in sorted(pool, reverse=True):
+            legs = frozenset(chosen)
+            if any(earlier <= legs for earlier in picked_sets):
+                continue
+            picks.append((score, tuple(sorted(int(order[k]) for k in chosen))))
+            picked_sets.append(legs)
+            if len(picks) == num_solutions:
+                break
+        return picks, truncated
+    
+    # Picks skip parlays containing earlier picks, so the pool may run short;
+    # it only holds every feasible parlay if the search was never cut short
+    pool_size = 2 * num_solutions
+    while True:
+        picks, truncated = run(pool_size)
+        if len(picks) == num_solutions or not truncated:
+            return picks
+        pool_size *= 4
+
+
 class ParlayOptimizer:
     """
-    Linear programming optimizer for parlay construction.
+    Optimizer for parlay construction.
     
-    Uses PuLP to formulate and solve optimization problems that maximize
-    Expected Value while respecting correlation and leg count constraints.
+    Maximizes Expected Value while respecting correlation and leg count
+    constraints, either with the native branch-and-bound search (default)
+    or by solving one PuLP linear program per solution.
     """
     
+    SOLVERS = ("native", "pulp")
+    
     def __init__(self, max_legs: int = 5, max_correlation_threshold: float = 0.3,
-                 min_ev_threshold: float = 0.05, correlation_data_path: str = None):
+                 min_ev_threshold: float = 0.05, correlation_data_path: str = None,
+                 rules_engine: Optional[ParlayRulesEngine] = None, sportsbook: str = "DRAFTKINGS",
+                 solver: str = "native"):
         """
         Initialize the parlay optimizer.
         
         Args:
             max_legs: Maximum number of legs per parlay
-            max_correlation_threshold: Maximum allowed correlation sum
+            max_correlation_threshold: Maximum allowed correlation between any
+                two legs of a parlay (native solver; the LP only penalizes it)
             min_ev_threshold: Minimum EV threshold for legs
             correlation_data_path: Path to historical correlation data
+            rules_engine: Parlay rules to enforce; hard-blocked leg pairs are
+                excluded from the search and solutions are validated in one batch
+            sportsbook: Sportsbook whose limits the solutions must satisfy
+            solver: "native" (branch-and-bound over NumPy arrays, all solutions
+                in one search) or "pulp" (one CBC solve per solution)
         """
-        if not HAS_PULP:
+        if solver not in self.SOLVERS:
+            raise ValueError(f"Unknown solver '{solver}', expected one of {self.SOLVERS}")
+        if solver == "pulp" and not HAS_PULP:
             raise ImportError("PuLP is required for optimization. Install with: pip install pulp")
         
+        self.solver = solver
         self.max_legs = max_legs
         self.max_correlation_threshold = max_correlation_threshold
         self.min_ev_threshold = min_ev_threshold
+        self.rules_engine = rules_engine
+        self.sportsbook = sportsbook
         
         # Initialize correlation computer
         self.correlation_computer = CorrelationComputer(
@@ -328,12 +467,12 @@ class ParlayOptimizer:
         self.optimization_cache = {}
         
         logger.info(f"ParlayOptimizer initialized: max_legs={max_legs}, "
-                   f"max_correlation={max_correlation_threshold:.2f}")
+                   f"max_correlation={max_correlation_threshold:.2f}, solver={solver}")
     
     def optimize_parlays(self, candidate_legs: List[Dict[str, Any]], 
                         num_solutions: int = 3) -> List[OptimizedParlay]:
         """
-        Optimize parlay construction using linear programming.
+        Optimize parlay construction with the configured solver.
         
         Args:
             candidate_legs: List of leg dictionaries with required fields
@@ -361,24 +500,41 @@ class ParlayOptimizer:
         # Compute correlation matrix
         correlation_matrix = self.correlation_computer.compute_correlation_matrix(viable_legs)
         
-        # Generate multiple optimal solutions
-        optimized_parlays = []
-        used_combinations = set()
+        # Leg pairs the sport's rules never allow together
+        rule_legs = {}
+        conflicting_pairs = []
+        if self.rules_engine is not None:
+            rule_legs = self._build_rule_legs(viable_legs, candidate_legs)
+            conflicting_pairs = self._find_rule_conflicts(viable_legs, rule_legs)
         
-        for solution_idx in range(num_solutions):
-            try:
-                parlay = self._solve_optimization_problem(
-                    viable_legs, correlation_matrix, solution_idx, used_combinations
-                )
-                
-                if parlay:
-                    optimized_parlays.append(parlay)
-                    # Add this combination to used set
-                    leg_combination = tuple(sorted([leg.leg_id for leg in parlay.legs]))
-                    used_combinations.add(leg_combination)
-                
-            except Exception as e:
-                logger.warning(f"Optimization solution {solution_idx + 1} failed: {e}")
+        if self.solver == "native":
+            # All solutions from one branch-and-bound search
+            optimized_parlays = self._search_parlays(
+                viable_legs, correlation_matrix, num_solutions, conflicting_pairs
+            )
+        else:
+            # Generate multiple optimal solutions, one LP per solution
+            optimized_parlays = []
+            used_combinations = set()
+            
+            for solution_idx in range(num_solutions):
+                try:
+                    parlay = self._solve_optimization_problem(
+                        viable_legs, correlation_matrix, solution_idx, used_combinations,
+                        conflicting_pairs
+                    )
+                    
+                    if parlay:
+                        optimized_parlays.append(parlay)
+                        # Add this combination to used set
+                        leg_combination = tuple(sorted([leg.leg_id for leg in parlay.legs]))
+                        used_combinations.add(leg_combination)
+                    
+                except Exception as e:
+                    logger.warning(f"Optimization solution {solution_idx + 1} failed: {e}")
+        
+        if self.rules_engine is not None and optimized_parlays:
+            optimized_parlays = self._filter_rule_violations(optimized_parlays, rule_legs)
         
         # Sort by optimization score
         optimized_parlays.sort(key=lambda p: p.optimization_score, reverse=True)
@@ -411,10 +567,96 @@ class ParlayOptimizer:
         
         return legs
     
+    @staticmethod
+    def _build_rule_legs(legs: List[ParlayLeg],
+                         candidate_legs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Rules-engine leg dicts keyed by leg_id (selection falls back to the player name)."""
+        sources = {leg_dict.get('leg_id', f"leg_{i}"): leg_dict for i, leg_dict in enumerate(candidate_legs)}
+        return {
+            leg.leg_id: {
+                'game_id': leg.game_id,
+                'market_type': leg.market_type,
+                'selection_name': sources.get(leg.leg_id, {}).get('selection_name', leg.player_name),
+                'odds_decimal': leg.odds
+            }
+            for leg in legs
+        }
+    
+    def _find_rule_conflicts(self, legs: List[ParlayLeg],
+                             rule_legs: Dict[str, Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """Leg id pairs a HARD_BLOCK rule of their sport forbids combining."""
+        conflicts = []
+        for sport in sorted({leg.sport for leg in legs}):
+            sport_legs = [leg for leg in legs if leg.sport == sport]
+            try:
+                compatible = self.rules_engine.compatibility_matrix(
+                    [rule_legs[leg.leg_id] for leg in sport_legs], sport
+                )
+            except (FileNotFoundError, ValueError) as e:
+                logger.warning(f"No {sport.upper()} parlay rules applied: {e}")
+                continue
+            for i, j in zip(*np.nonzero(np.triu(~compatible, 1))):
+                conflicts.append((sport_legs[i].leg_id, sport_legs[j].leg_id))
+        
+        if conflicts:
+            logger.info(f"Excluding {len(conflicts)} rule-conflicting leg pairs from optimization")
+        return conflicts
+    
+    def _filter_rule_violations(self, parlays: List[OptimizedParlay],
+                                rule_legs: Dict[str, Dict[str, Any]]) -> List[OptimizedParlay]:
+        """Drop solutions the rules engine hard-blocks (e.g. sportsbook limits), validated per sport in one batch."""
+        by_sport: Dict[str, List[OptimizedParlay]] = {}
+        for parlay in parlays:
+            by_sport.setdefault(parlay.legs[0].sport, []).append(parlay)
+        
+        kept = []
+        for sport, sport_parlays in by_sport.items():
+            results = self.rules_engine.validate_many(
+                [[rule_legs[leg.leg_id] for leg in parlay.legs] for parlay in sport_parlays],
+                sport, self.sportsbook
+            )
+            for parlay, result in zip(sport_parlays, results):
+                if result.has_hard_blocks():
+                    logger.warning(f"Dropping {parlay.parlay_id}: {result.get_rejection_reason()}")
+                else:
+                    kept.append(parlay)
+        return kept
+    
+    def _search_parlays(self, legs: List[ParlayLeg],
+                        correlation_matrix: pd.DataFrame,
+                        num_solutions: int,
+                        conflicting_pairs: Optional[List[Tuple[str, str]]] = None
+                        ) -> List[OptimizedParlay]:
+        """
+        Find the top num_solutions parlays in one branch-and-bound search.
+        
+        Same objective as the LP, but the correlation penalty is charged per
+        selected pair and max_correlation_threshold caps every pair.
+        """
+        leg_ids = [leg.leg_id for leg in legs]
+        index = {leg_id: i for i, leg_id in enumerate(leg_ids)}
+        ev = np.array([leg.expected_value() for leg in legs])
+        correlation = correlation_matrix.loc[leg_ids, leg_ids].to_numpy(dtype=float)
+        conflicts = [(index[leg1_id], index[leg2_id]) for leg1_id, leg2_id in conflicting_pairs or []]
+        
+        solutions = search_parlays(
+            ev, correlation, num_solutions, self.max_legs,
+            max_pair_correlation=self.max_correlation_threshold, conflicts=conflicts
+        )
+        if len(solutions) < num_solutions:
+            logger.warning(f"Only {len(solutions)} of {num_solutions} parlays satisfy the constraints")
+        
+        return [
+            self._build_parlay([legs[i] for i in selected], correlation_matrix, solution_idx)
+            for solution_idx, (_, selected) in enumerate(solutions)
+        ]
+    
     def _solve_optimization_problem(self, legs: List[ParlayLeg], 
                                   correlation_matrix: pd.DataFrame,
                                   solution_idx: int,
-                                  used_combinations: set) -> Optional[OptimizedParlay]:
+                                  used_combinations: set,
+                                  conflicting_pairs: Optional[List[Tuple[str, str]]] = None
+                                  ) -> Optional[OptimizedParlay]:
         """
         Solve the linear programming optimization problem.
         
@@ -422,6 +664,7 @@ class ParlayOptimizer:
         - Maximize: sum(EV_i * x_i) for all legs i
         - Subject to: sum(x_i) <= max_legs
         - Subject to: sum(correlation_ij * x_i * x_j) <= max_correlation_threshold
+        - Subject to: x_i + x_j <= 1 for rule-conflicting legs i, j
         - Subject to: x_i in {0, 1}
         """
         try:
@@ -467,6 +710,10 @@ class ParlayOptimizer:
             if correlation_penalty_terms:
                 prob.objective -= pulp.lpSum(correlation_penalty_terms)
             
+            # Constraint 4: Never combine legs the parlay rules hard-block
+            for pair_idx, (leg1_id, leg2_id) in enumerate(conflicting_pairs or []):
+                prob += leg_vars[leg1_id] + leg_vars[leg2_id] <= 1, f"RuleConflict_{pair_idx}"
+            
             # Add diversity constraint to avoid similar solutions
             if used_combinations and solution_idx > 0:
                 for combo_idx, used_combo in enumerate(list(used_combinations)[-3:]):  # Avoid last 3 solutions
@@ -499,6 +746,12 @@ class ParlayOptimizer:
             if leg_vars[leg.leg_id].varValue == 1:
                 selected_legs.append(leg)
         
+        return self._build_parlay(selected_legs, correlation_matrix, solution_idx)
+    
+    def _build_parlay(self, selected_legs: List[ParlayLeg],
+                      correlation_matrix: pd.DataFrame,
+                      solution_idx: int) -> OptimizedParlay:
+        """Score the selected legs as an OptimizedParlay."""
         # Calculate metrics
         total_ev = sum(leg.expected_value() for leg in selected_legs)
         total_odds = np.prod([leg.odds for leg in selected_legs])
@@ -740,10 +993,6 @@ if __name__ == "__main__":
     print("📈 ParlayOptimizer Demo")
     print("=" * 50)
     
-    if not HAS_PULP:
-        print("❌ PuLP not installed. Install with: pip install pulp")
-        exit(1)
-    
     # Create sample data
     print("🎲 Creating sample optimization data...")
     sample_legs = create_sample_optimization_data()
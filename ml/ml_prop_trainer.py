@@ -167,7 +167,7 @@ class HistoricalPropTrainer:
         
         # Handle missing values separately for numeric and categorical columns
         for col in X.columns:
-            if X[col].dtype in ['object', 'category']:
+            if not pd.api.types.is_numeric_dtype(X[col]):
                 # Fill categorical columns with mode
                 mode_value = X[col].mode().iloc[0] if not X[col].mode().empty else 'Unknown'
                 X[col] = X[col].fillna(mode_value)
@@ -322,28 +322,37 @@ class HistoricalPropTrainer:
         Returns:
             Probability of prop hitting (0.0 to 1.0)
         """
+        return float(self.predict_batch([features])[0])
+
+    def predict_batch(self, features: Union[List[Dict[str, Any]], pd.DataFrame]) -> np.ndarray:
+        """
+        Predict hit probabilities for many props in one pass.
+
+        Missing features are filled with the sport-specific defaults used by
+        predict() (a key absent from some rows counts as missing for those
+        rows), then the whole frame goes through one preprocessor.transform
+        and one predict_proba.
+
+        Args:
+            features: List of feature dictionaries or a DataFrame, one row per prop
+
+        Returns:
+            Array of hit probabilities (0.0 to 1.0), in input order
+        """
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
-        
-        # Convert to DataFrame for preprocessing
-        df = pd.DataFrame([features])
-        
-        # Ensure all expected features are present
-        for feature in self.numerical_features + self.categorical_features:
-            if feature not in df.columns:
-                # Use sport-specific defaults
-                if feature in self.categorical_features:
-                    df[feature] = 'Unknown' if self.sport == 'nba' else 'Other'
-                else:
-                    df[feature] = 0.0
-        
-        # Preprocess
-        X_processed = self.preprocessor.transform(df[self.numerical_features + self.categorical_features])
-        
-        # Predict
-        probability = self.model.predict_proba(X_processed)[0, 1]
-        
-        return float(probability)
+
+        df = features if isinstance(features, pd.DataFrame) else pd.DataFrame(list(features))
+        if len(df) == 0:
+            return np.zeros(0)
+
+        # Missing columns and missing values both become the defaults
+        X = df.reindex(columns=self.numerical_features + self.categorical_features)
+        X[self.numerical_features] = X[self.numerical_features].fillna(0.0)
+        X[self.categorical_features] = X[self.categorical_features].fillna('Unknown' if self.sport == 'nba' else 'Other')
+
+        X_processed = self.preprocessor.transform(X)
+        return self.model.predict_proba(X_processed)[:, 1]
     
     def evaluate(self, csv_path: str) -> Dict[str, Any]:
         """
@@ -25,6 +25,7 @@ import torch.optim as optim
 import torch.nn.functional as F
 import random
 import pickle
+import threading
 from collections import deque, namedtuple
 from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, field
@@ -41,6 +42,8 @@ except ImportError:
     HAS_GYMNASIUM = False
     gym = spaces = None
 
+from tools.parlay_rules_engine import ParlayRulesEngine
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -501,9 +504,17 @@ class ReplayBuffer:
 class QLearningParlayAgent:
     """Q-Learning agent for optimal parlay construction."""
     
-    def __init__(self, config: QLearningConfig = None):
-        """Initialize Q-Learning agent."""
+    def __init__(self, config: QLearningConfig = None, rules_engine: Optional[ParlayRulesEngine] = None):
+        """
+        Initialize Q-Learning agent.
+        
+        Args:
+            config: Agent configuration
+            rules_engine: Parlay rules enforced at inference (legs a HARD_BLOCK
+                rule forbids alongside already selected legs are skipped)
+        """
         self.config = config or QLearningConfig()
+        self.rules_engine = rules_engine
         
         # Initialize environment
         self.env = ParlayEnvironment(self.config)
@@ -527,6 +538,10 @@ class QLearningParlayAgent:
         self.epsilon = self.config.epsilon_start
         self.episode_count = 0
         self.training_history = []
+        self.is_loaded = False
+        
+        # Inference drives self.env, so concurrent callers of a shared agent take turns
+        self._inference_lock = threading.Lock()
         
         logger.info(f"QLearningParlayAgent initialized: {state_dim} state dims, {action_dim} actions")
     
@@ -706,6 +721,10 @@ class QLearningParlayAgent:
         if not candidate_legs:
             return []
         
+        with self._inference_lock:
+            return self._infer_parlay(candidate_legs, max_legs)
+    
+    def _infer_parlay(self, candidate_legs: List[Dict[str, Any]], max_legs: int) -> List[Dict[str, Any]]:
         # Convert to ParlayLeg objects
         parlay_legs = []
         for i, leg_data in enumerate(candidate_legs[:self.config.max_candidate_legs]):
@@ -719,6 +738,9 @@ class QLearningParlayAgent:
             )
             parlay_legs.append(leg)
         
+        # Pairwise rule compatibility, computed once for the candidate pool
+        compatible = self._rule_compatibility(candidate_legs[:self.config.max_candidate_legs])
+        
         # Set up environment with these specific legs
         self.env.candidate_legs = parlay_legs
         self.env.current_parlay = []
@@ -728,6 +750,7 @@ class QLearningParlayAgent:
         # Run inference
         state = self.env._get_state()
         selected_legs = []
+        selected_indices = []
         done = False
         step_count = 0
         
@@ -741,9 +764,13 @@ class QLearningParlayAgent:
             # Track selected legs
             if info.get('action_type') == 'add_leg':
                 leg_id = info.get('leg_added')
-                for leg_data in candidate_legs:
+                for i, leg_data in enumerate(candidate_legs):
                     if leg_data.get('leg_id') == leg_id:
-                        selected_legs.append(leg_data)
+                        if compatible is not None and not compatible[i, selected_indices].all():
+                            logger.debug(f"Skipping {leg_id}: parlay rules block it with a selected leg")
+                        else:
+                            selected_legs.append(leg_data)
+                            selected_indices.append(i)
                         break
             
             # Stop if we have enough legs or agent chooses done
@@ -755,6 +782,23 @@ class QLearningParlayAgent:
         logger.info(f"Inferred parlay with {len(selected_legs)} legs")
         return selected_legs[:max_legs]
     
+    def _rule_compatibility(self, legs: List[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Pairwise HARD_BLOCK compatibility of candidate legs, per sport (None without a rules engine)."""
+        if self.rules_engine is None:
+            return None
+        
+        compatible = np.ones((len(legs), len(legs)), dtype=bool)
+        sports = [leg.get('sport', 'nba') for leg in legs]
+        for sport in sorted(set(sports)):
+            indices = [i for i, leg_sport in enumerate(sports) if leg_sport == sport]
+            try:
+                compatible[np.ix_(indices, indices)] = self.rules_engine.compatibility_matrix(
+                    [legs[i] for i in indices], sport
+                )
+            except (FileNotFoundError, ValueError) as e:
+                logger.warning(f"No {sport.upper()} parlay rules applied: {e}")
+        return compatible
+    
     def save_model(self, path: str = None):
         """Save trained model."""
         if path is None:
@@ -792,6 +836,7 @@ class QLearningParlayAgent:
         self.episode_count = checkpoint.get('episode_count', 0)
         self.epsilon = checkpoint.get('epsilon', self.config.epsilon_end)
         self.training_history = checkpoint.get('training_history', [])
+        self.is_loaded = True
         
         logger.info(f"Model loaded from {model_path}")
         return True
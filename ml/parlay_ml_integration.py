@@ -62,8 +62,12 @@ class MLEnhancedParlayBuilder:
     def prepare_leg_features(self, leg_data: Dict[str, Any]) -> pd.DataFrame:
         """Convert leg data to ML features."""
         # Convert single leg to DataFrame format expected by feature engineer
-        df = pd.DataFrame([leg_data])
-        
+        return pd.DataFrame([self.prepare_leg_record(leg_data)])
+
+    def prepare_leg_record(self, leg_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Leg data with defaults for the raw columns the feature pipeline needs."""
+        record = dict(leg_data)
+
         # Ensure required columns exist with defaults
         required_columns = {
             'prop_type': 'points_over',
@@ -95,10 +99,9 @@ class MLEnhancedParlayBuilder:
         
         # Fill missing values
         for col, default_val in required_columns.items():
-            if col not in df.columns:
-                df[col] = default_val
-        
-        return df
+            record.setdefault(col, default_val)
+
+        return record
     
     def predict_leg_success(self, leg_data: Dict[str, Any]) -> MLPrediction:
         """Predict success probability for a single leg."""
@@ -114,11 +117,11 @@ class MLEnhancedParlayBuilder:
             )
         
         # Prepare features
-        df = self.prepare_leg_features(leg_data)
-        
-        # Transform to ML features
+        record = self.prepare_leg_record(leg_data)
+
+        # Transform to ML features (compiled pipeline, no pandas on this path)
         try:
-            X = self.feature_engineer.transform_new_data(self.sport, df)
+            X = self.feature_engineer.transform_records(self.sport, [record])
         except Exception as e:
             logger.warning(f"Feature transformation failed: {e}")
             return MLPrediction(
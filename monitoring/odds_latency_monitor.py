@@ -19,6 +19,7 @@ from typing import Dict, List, Optional, Tuple, Any
 sys.path.append(str(Path(__file__).parent.parent))
 
 from tools.odds_fetcher_tool import OddsFetcherTool, OddsFetcherError, GameOdds
+from tools.odds_delta_engine import OddsDeltaEngine, OddsDelta
 
 
 def parse_args() -> argparse.Namespace:
@@ -172,80 +173,53 @@ def log_odds_to_csv(filepath: Path, game: GameOdds, timestamp: str) -> None:
                 ])
 
 
-def diff_changes(current_game: GameOdds, last_snapshot: Dict[Tuple, Dict], 
-                print_diffs: bool = False) -> Dict[Tuple, Dict]:
+def diff_changes(current_game: GameOdds, delta_engine: OddsDeltaEngine, 
+                print_diffs: bool = False) -> List[OddsDelta]:
     """
-    Compare current odds with previous snapshot and detect changes.
+    Feed the current odds to the delta engine and report what moved.
+    
+    The engine keeps the previous snapshot, so an unchanged poll costs one
+    tuple comparison instead of rebuilding and re-walking a full dict.
     
     Args:
         current_game: Current game odds
-        last_snapshot: Previous snapshot of odds
+        delta_engine: Engine holding the previous snapshot
         print_diffs: Whether to print detected changes
         
     Returns:
-        Updated snapshot
+        Deltas since the previous poll (empty on the first poll of a game)
     """
-    current_snapshot = {}
-    changes = []
-    
-    # Build current snapshot
-    for book in current_game.books:
-        for selection in book.selections:
-            key = (book.bookmaker, book.market, selection.name, selection.line)
-            current_snapshot[key] = {
-                'price_decimal': selection.price_decimal,
-                'line': selection.line
-            }
-    
-    # Compare with last snapshot
-    for key, current_data in current_snapshot.items():
-        if key in last_snapshot:
-            last_data = last_snapshot[key]
-            
-            # Check for price or line changes
-            price_changed = current_data['price_decimal'] != last_data['price_decimal']
-            line_changed = current_data['line'] != last_data['line']
-            
-            if price_changed or line_changed:
-                bookmaker, market, selection_name, line = key
-                
-                # Format change message
-                line_info = f"line {last_data['line']} -> {current_data['line']}" if line_changed else ""
-                price_info = f"price {last_data['price_decimal']} -> {current_data['price_decimal']}" if price_changed else ""
-                
-                change_parts = [part for part in [line_info, price_info] if part]
-                change_msg = f" {' '.join(change_parts)}"
-                
-                changes.append({
-                    'timestamp': datetime.now(timezone.utc).isoformat(),
-                    'game_id': current_game.game_id,
-                    'bookmaker': bookmaker,
-                    'market': market,
-                    'selection': selection_name,
-                    'change': change_msg
-                })
+    batch = delta_engine.ingest([current_game])
+    if current_game.game_id in batch.new_game_ids:
+        return []
     
     # Print changes if requested
-    if print_diffs and changes:
-        for change in changes:
-            print(f"{change['timestamp']} game={change['game_id']} book={change['bookmaker']} "
-                  f"market={change['market']} sel={change['selection']}{change['change']}")
+    if print_diffs:
+        for delta in batch.deltas:
+            if delta.kind == 'changed':
+                change = f"price {delta.previous_price} -> {delta.price_decimal}"
+            elif delta.kind == 'added':
+                change = f"added line {delta.line} price {delta.price_decimal}"
+            else:
+                change = f"removed line {delta.line}"
+            print(f"{batch.timestamp} game={delta.game_id} book={delta.bookmaker} "
+                  f"market={delta.market} sel={delta.selection_name} {change}")
     
-    return current_snapshot
+    return batch.deltas
 
 
 def fetch_and_log_once(odds_fetcher: OddsFetcherTool, args: argparse.Namespace, 
-                      last_snapshot: Dict[Tuple, Dict]) -> Dict[Tuple, Dict]:
+                      delta_engine: OddsDeltaEngine) -> List[OddsDelta]:
     """
     Fetch odds once and log to CSV.
     
     Args:
         odds_fetcher: OddsFetcherTool instance
         args: Command line arguments
-        last_snapshot: Previous snapshot for diffing
+        delta_engine: Engine holding the previous snapshot for diffing
         
     Returns:
-        Updated snapshot
+        Deltas detected on this poll
     """
     try:
         # Fetch odds
@@ -254,7 +228,7 @@ def fetch_and_log_once(odds_fetcher: OddsFetcherTool, args: argparse.Namespace,
         
         if not games:
             print("No games found")
-            return last_snapshot
+            return []
         
         # Resolve target game
         target_game = resolve_target_game(games, args.game_id, args.home, args.away)
@@ -267,7 +241,7 @@ def fetch_and_log_once(odds_fetcher: OddsFetcherTool, args: argparse.Namespace,
                 away_filter = f"away={args.away}" if args.away else ""
                 filters = " and ".join(filter(None, [home_filter, away_filter]))
                 print(f"No games found matching filters: {filters}")
-            return last_snapshot
+            return []
         
         # Log timestamp
         timestamp = datetime.now(timezone.utc).isoformat()
@@ -289,16 +263,14 @@ def fetch_and_log_once(odds_fetcher: OddsFetcherTool, args: argparse.Namespace,
         log_odds_to_csv(filepath, target_game, timestamp)
         
         # Detect and report changes
-        new_snapshot = diff_changes(target_game, last_snapshot, args.print_diffs)
-        
-        return new_snapshot
+        return diff_changes(target_game, delta_engine, args.print_diffs)
         
     except OddsFetcherError as e:
         print(f"OddsFetcherError: {e}")
-        return last_snapshot
+        return []
     except Exception as e:
         print(f"Unexpected error: {e}")
-        return last_snapshot
+        return []
 
 
 def main() -> None:
@@ -308,8 +280,8 @@ def main() -> None:
     # Initialize odds fetcher
     odds_fetcher = OddsFetcherTool()
     
-    # Initialize snapshot for diffing
-    last_snapshot: Dict[Tuple, Dict] = {}
+    # Keeps the previous snapshot for diffing
+    delta_engine = OddsDeltaEngine()
     
     # Handle graceful shutdown
     def signal_handler(signum, frame):
@@ -320,7 +292,7 @@ def main() -> None:
     
     # Single fetch mode
     if args.once:
-        fetch_and_log_once(odds_fetcher, args, last_snapshot)
+        fetch_and_log_once(odds_fetcher, args, delta_engine)
         return
     
     # Continuous monitoring mode
@@ -332,7 +304,7 @@ def main() -> None:
             break
         
         # Fetch and log
-        last_snapshot = fetch_and_log_once(odds_fetcher, args, last_snapshot)
+        fetch_and_log_once(odds_fetcher, args, delta_engine)
         
         # Increment iteration counter
         iteration += 1
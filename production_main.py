@@ -31,6 +31,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from agents.multi_sport_scheduler_integration import MultiSportSchedulerIntegration
 from tools.unified_parlay_strategist_agent import create_unified_agent, UnifiedParlayStrategistAgent
 from tools.knowledge_base_rag import SportsKnowledgeRAG
+from tools.model_watcher import ModelWatcher, get_model_watcher
 
 # Configure logging
 logging.basicConfig(
@@ -58,6 +59,7 @@ class ProductionParlaySystem:
         self.nba_agent: Optional[UnifiedParlayStrategistAgent] = None
         self.knowledge_base: Optional[SportsKnowledgeRAG] = None
         self.scheduler_integration: Optional[MultiSportSchedulerIntegration] = None
+        self.model_watcher: Optional[ModelWatcher] = None
         self.app: Optional[FastAPI] = None
         self.system_start_time = datetime.now(timezone.utc)
         
@@ -106,6 +108,13 @@ class ProductionParlaySystem:
                 logger.warning("⚠️ APScheduler not available - manual generation only")
                 self.scheduler_integration = None
             
+            # 3. Hot-reload retrained models into the running agents
+            self.model_watcher = get_model_watcher()
+            if self.model_watcher.poll_interval > 0:
+                watched = await asyncio.to_thread(self.model_watcher.watch_served)
+                self.model_watcher.start()
+                logger.info(f"✅ Model watcher reloading {watched} models on retrain")
+            
             # 4. Initialize FastAPI
             logger.info("🌐 Setting up FastAPI web application...")
             self._setup_fastapi()
@@ -316,7 +325,8 @@ class ProductionParlaySystem:
                     "nfl_agent": self.nfl_agent is not None,
                     "knowledge_base": self.knowledge_base is not None,
                     "scheduler": self.scheduler_integration is not None
-                }
+                },
+                "model_watcher": self.model_watcher.stats() if self.model_watcher else {}
             }
     
     async def start_all_services(self):
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+ANN index benchmark - recall@k and latency of IVF-flat vs exact search.
+
+Builds a synthetic clustered corpus of unit vectors (default 200,000 x 384,
+the MiniLM embedding size) and queries drawn near corpus points, then
+reports for exact search and IVFFlatBackend at several nprobe values:
+
+- recall@k against exact search
+- median and p95 query latency
+- the same with a sport-style row filter (half the rows allowed) applied
+  inside the index
+
+Index build (k-means training + list assignment) time is reported once.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from tools.ann_index import ExactSearchBackend, IVFFlatBackend
+from tools.embedding_index import normalize_rows
+
+
+def build_corpus(n: int, dim: int, n_clusters: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, dim)).astype(np.float32)
+    corpus = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 50_000):
+        size = min(50_000, n - start)
+        corpus[start:start + size] = (centers[rng.integers(n_clusters, size=size)]
+                                      + 0.35 * rng.normal(size=(size, dim)).astype(np.float32))
+    return normalize_rows(corpus)
+
+
+def run(backend, vectors, queries, k, allowed=None):
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        rows, _ = backend.search(vectors, query, k, allowed)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(set(rows.tolist()))
+    return results, latencies
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark ANN recall@k vs latency")
+    parser.add_argument("--vectors", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=500, help="Topics in the synthetic corpus")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    vectors = build_corpus(args.vectors, args.dim, args.clusters, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    queries = normalize_rows(vectors[rng.choice(len(vectors), args.queries)]
+                             + 0.1 * rng.normal(size=(args.queries, args.dim)).astype(np.float32))
+    allowed = rng.random(len(vectors)) < 0.5
+
+    start = time.perf_counter()
+    ivf = IVFFlatBackend()
+    ivf.fit(vectors)
+    build_s = time.perf_counter() - start
+    print(f"corpus {args.vectors} x {args.dim}; IVF build {build_s:.1f} s, {len(ivf.centroids)} lists")
+
+    exact = ExactSearchBackend()
+    truth, exact_ms = run(exact, vectors, queries, args.k)
+    truth_filtered, exact_filtered_ms = run(exact, vectors, queries, args.k, allowed)
+
+    def row(name, results, latencies, reference):
+        recall = statistics.mean(len(r & t) / len(t) for r, t in zip(results, reference))
+        p95 = np.percentile(latencies, 95)
+        print(f"{name:<16}{recall:>10.3f}{statistics.median(latencies):>10.2f}{p95:>10.2f}")
+
+    for label, mask, reference, exact_latencies in [("unfiltered", None, truth, exact_ms),
+                                                   ("50% filter", allowed, truth_filtered, exact_filtered_ms)]:
+        print(f"\n{label}: {'backend':<16}{f'recall@{args.k}':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        row("exact", reference, exact_latencies, reference)
+        for nprobe in args.nprobe:
+            ivf.nprobe = nprobe
+            results, latencies = run(ivf, vectors, queries, args.k, mask)
+            row(f"ivf nprobe={nprobe}", results, latencies, reference)
+
+
+if __name__ == "__main__":
+    main()
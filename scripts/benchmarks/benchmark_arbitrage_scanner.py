@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Arbitrage scan benchmark - pairwise detect_arbitrage_two_way vs VectorizedArbitrageScanner.
+
+Builds a synthetic moneyline slate (default 1,000 games x 20 books) where each
+book shades a shared fair price by its own noise, so a small share of games
+carry a genuine cross-book arbitrage. Compares:
+
+- pairwise: the AdvancedArbitrageIntegration loop, every ordered pair of
+  distinct books through detect_arbitrage_two_way
+- vectorized: one (outcomes x books) matrix per game, whole slate scanned
+  with VectorizedArbitrageScanner.scan
+
+SQLite logging is disabled on both paths so only detection is timed.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from tools.arbitrage_detector_tool import ArbitrageDetectorTool
+from tools.vectorized_arbitrage_scanner import MarketMatrix, VectorizedArbitrageScanner, decimal_to_american
+
+BOOK_NAMES = ["draftkings", "fanduel", "betmgm", "caesars", "pointsbet", "barstool", "wynnbet", "betrivers"]
+
+
+def build_matrices(n_games: int, n_books: int, noise: float, seed: int) -> List[MarketMatrix]:
+    rng = np.random.default_rng(seed)
+    books = (BOOK_NAMES + [f"book_{i}" for i in range(n_books)])[:n_books]
+    matrices = []
+    for i in range(n_games):
+        p_home = rng.uniform(0.3, 0.7)
+        fair = np.array([p_home, 1 - p_home])[:, None]
+        # ~4.5% vig, per-book noise on each side's implied probability
+        implied = fair * 1.045 * (1 + rng.normal(0, noise, size=(2, n_books)))
+        odds = np.vectorize(decimal_to_american)(1 / implied)
+        matrices.append(MarketMatrix(f"game_{i}", "h2h", ["home", "away"], books, odds,
+                                     sport="nfl" if i % 2 else "nba"))
+    return matrices
+
+
+def scan_pairwise(detector: ArbitrageDetectorTool, matrices: List[MarketMatrix]) -> int:
+    found = 0
+    for matrix in matrices:
+        for a, home_book in enumerate(matrix.books):
+            for b, away_book in enumerate(matrix.books):
+                if a != b and detector.detect_arbitrage_two_way(
+                        matrix.odds[0, a], home_book, matrix.odds[1, b], away_book, sport=matrix.sport):
+                    found += 1
+    return found
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark slate-wide arbitrage scanning")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--books", type=int, default=20)
+    parser.add_argument("--noise", type=float, default=0.03, help="Per-book price noise (relative)")
+    parser.add_argument("--seed", type=int, default=5)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    matrices = build_matrices(args.games, args.books, args.noise, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        detector = ArbitrageDetectorTool(min_profit_threshold=0.005, db_path=str(Path(tmp) / "arb.sqlite"))
+        detector.log_arbitrage_opportunity = lambda opportunity, sport="nba": None
+
+        start = time.perf_counter()
+        pairs_found = scan_pairwise(detector, matrices)
+        pairwise_s = time.perf_counter() - start
+
+        scanner = VectorizedArbitrageScanner(detector)
+        start = time.perf_counter()
+        opportunities = scanner.scan(matrices)
+        vectorized_s = time.perf_counter() - start
+
+    n_pairs = args.games * args.books * (args.books - 1)
+    print(f"Slate: {args.games} games x {args.books} books ({n_pairs} ordered book pairs)")
+    print(f"{'path':<12}{'seconds':>10}{'games/s':>12}{'found':>8}")
+    print(f"{'pairwise':<12}{pairwise_s:>10.3f}{args.games / pairwise_s:>12.0f}{pairs_found:>8}  (book pairs)")
+    print(f"{'vectorized':<12}{vectorized_s:>10.3f}{args.games / vectorized_s:>12.0f}{len(opportunities):>8}  (games)")
+    print(f"speedup: {pairwise_s / vectorized_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Keyword search benchmark - per-query chunk scan vs the BM25 inverted index.
+
+Runs the strategist's templated queries against data/chunks/chunks.json with:
+
+- scan: the previous _search_with_keywords, which lowercased and split every
+  sports-betting chunk on every query (chunk text held in memory)
+- bm25: SportsKnowledgeRAG(retrieval_mode="keyword"), postings of the query
+  terms only
+- vector / hybrid: embedding search alone and fused with BM25 by reciprocal
+  rank (query cache disabled)
+
+Needs the SentenceTransformer model for the vector columns; --encoder hashing
+swaps in a bag-of-words encoder (encode cost is then negligible).
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import tools.knowledge_base_rag as knowledge_base_rag
+from scripts.benchmarks.benchmark_knowledge_search import QUERIES, HashingEncoder, time_ms
+from tools.knowledge_base_rag import SportsKnowledgeRAG
+from tools.rag_query_cache import RAGQueryCache
+
+
+def scan_search(contents, query: str, top_k: int):
+    """The previous keyword fallback: word overlap with every chunk."""
+    query_words = set(query.lower().split())
+    scored = []
+    for row, content in enumerate(contents):
+        overlap = len(query_words.intersection(content.lower().split()))
+        if overlap > 0:
+            scored.append((row, overlap / len(query_words)))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[:top_k]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark BM25 keyword and hybrid search")
+    parser.add_argument("--chunks", default="data/chunks/chunks.json")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--encoder", choices=["sentence-transformers", "hashing"], default="sentence-transformers")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    if args.encoder == "hashing":
+        knowledge_base_rag.SentenceTransformer = HashingEncoder
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        def knowledge_base(mode):
+            return SportsKnowledgeRAG(chunks_path=args.chunks, embeddings_model=args.model, index_dir=index_dir,
+                                      retrieval_mode=mode, query_cache=RAGQueryCache(max_embeddings=0, max_results=0))
+
+        start = time.perf_counter()
+        keyword = knowledge_base("keyword")
+        build_s = time.perf_counter() - start
+        vector, hybrid = knowledge_base("vector"), knowledge_base("hybrid")
+        start = time.perf_counter()
+        knowledge_base("keyword")
+        load_s = time.perf_counter() - start
+        contents = list(keyword.sports_betting_chunks.contents())
+
+    print(f"{len(contents)} chunks, {len(keyword.bm25_index.vocabulary)} terms; "
+          f"startup {build_s:.2f} s building indexes, {load_s:.2f} s loading them")
+    print(f"{'query':<48}{'scan ms':>9}{'bm25 ms':>9}{'vector ms':>11}{'hybrid ms':>11}{'overlap':>9}")
+    for query in QUERIES:
+        scan_ms = time_ms(lambda: scan_search(contents, query, 5), args.repeats)
+        bm25_ms = time_ms(lambda: keyword.search_knowledge(query, top_k=5), args.repeats)
+        vector_ms = time_ms(lambda: vector.search_knowledge(query, top_k=5, min_relevance=0.0), args.repeats)
+        hybrid_ms = time_ms(lambda: hybrid.search_knowledge(query, top_k=5, min_relevance=0.0), args.repeats)
+        # Hybrid top-5 shared with the vector top-5
+        vector_ids = {chunk.chunk_id for chunk in vector.search_knowledge(query, top_k=5, min_relevance=0.0).chunks}
+        hybrid_ids = {chunk.chunk_id for chunk in hybrid.search_knowledge(query, top_k=5, min_relevance=0.0).chunks}
+        print(f"{query[:46]:<48}{scan_ms:>9.2f}{bm25_ms:>9.3f}{vector_ms:>11.2f}{hybrid_ms:>11.2f}"
+              f"{len(vector_ids & hybrid_ids):>7}/5")
+
+
+if __name__ == "__main__":
+    main()
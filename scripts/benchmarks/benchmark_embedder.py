@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Document embedding benchmark - per-chunk encoding vs the batched pipeline.
+
+Embeds the markdown/text sources under data/ into an in-memory Qdrant with:
+
+- per-chunk: the previous tools/embedder.process_file loop, one encode call
+  per chunk and one upsert per file
+- pipeline: EmbeddingPipeline, process-pool chunking, windowed batched
+  encoding and bulk upserts
+- re-run: the pipeline again over the unchanged tree (content-hash dedup)
+
+Needs the SentenceTransformer model; --encoder random-minilm builds a
+randomly initialised model with the all-MiniLM-L6-v2 shape (6 layers, 384
+dims) and a vocabulary from data/, so the encode cost is realistic offline.
+"""
+
+import argparse
+import logging
+import re
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from tools.embedder import (
+    CHUNK_OVERLAP, CHUNK_SIZE, EMBED_MODEL_NAME, QDRANT_COLLECTION_NAME, EmbeddingPipeline,
+    RecursiveCharacterTextSplitter, determine_source_name, discover_files, relevance_for_source
+)
+
+
+def random_minilm(data_dir: Path, model_dir: Path):
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    words = Counter()
+    for path in discover_files(data_dir):
+        words.update(re.findall(r"[a-z]+", path.read_text(encoding="utf-8", errors="ignore").lower()))
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + [word for word, _ in words.most_common(8000)]
+    (model_dir / "vocab.txt").write_text("\n".join(vocab))
+    BertTokenizerFast(vocab_file=str(model_dir / "vocab.txt")).save_pretrained(model_dir)
+    config = BertConfig(vocab_size=len(vocab), hidden_size=384, num_hidden_layers=6,
+                        num_attention_heads=12, intermediate_size=1536)
+    BertModel(config).save_pretrained(model_dir)
+    return SentenceTransformer(modules=[models.Transformer(str(model_dir), max_seq_length=256),
+                                        models.Pooling(384)])
+
+
+def per_chunk_embed(model, qdrant, files) -> int:
+    """The previous process_file loop over every file."""
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    qdrant.create_collection(QDRANT_COLLECTION_NAME, vectors_config=VectorParams(
+        size=model.get_sentence_embedding_dimension(), distance=Distance.COSINE))
+    total = 0
+    for file_path in files:
+        source_name = determine_source_name(file_path)
+        relevance = relevance_for_source(source_name)
+        points = []
+        for i, text in enumerate(splitter.split_text(file_path.read_text(encoding="utf-8"))):
+            text = text.strip()
+            if not text:
+                continue
+            vector = model.encode(text).tolist()
+            points.append(PointStruct(id=str(uuid.uuid4()), vector=vector, payload={
+                "source": source_name, "source_relevance": relevance, "filename": file_path.name,
+                "chunk_index": i, "page": None, "text": text}))
+        if points:
+            qdrant.upsert(collection_name=QDRANT_COLLECTION_NAME, points=points)
+            total += len(points)
+    return total
+
+
+def vectors_by_text(qdrant) -> dict:
+    points, _ = qdrant.scroll(QDRANT_COLLECTION_NAME, limit=100_000, with_payload=True, with_vectors=True)
+    return {(p.payload["filename"], p.payload["chunk_index"]): np.asarray(p.vector) for p in points}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark document embedding")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--encoder", choices=["sentence-transformers", "random-minilm"],
+                        default="sentence-transformers")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--encode-window", type=int, default=512)
+    parser.add_argument("--workers", type=int, default=None)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.disable(logging.WARNING)
+    data_dir = Path(args.data_dir)
+    files = list(discover_files(data_dir))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.encoder == "random-minilm":
+            model = random_minilm(data_dir, Path(tmp))
+        else:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(EMBED_MODEL_NAME)
+
+        legacy_qdrant = QdrantClient(":memory:")
+        start = time.perf_counter()
+        legacy_chunks = per_chunk_embed(model, legacy_qdrant, files)
+        legacy_s = time.perf_counter() - start
+
+        qdrant = QdrantClient(":memory:")
+        options = dict(model=model, qdrant=qdrant, batch_size=args.batch_size, encode_window=args.encode_window,
+                       workers=args.workers, manifest_path=str(Path(tmp) / "manifest.json"))
+        pipeline = EmbeddingPipeline(**options)
+        stats = pipeline.run(str(data_dir))
+        rerun = EmbeddingPipeline(**options).run(str(data_dir))
+
+        # Parity: same chunks, same vectors (up to batch padding round-off)
+        legacy_vectors, pipeline_vectors = vectors_by_text(legacy_qdrant), vectors_by_text(qdrant)
+        assert legacy_vectors.keys() == pipeline_vectors.keys(), "chunk sets differ"
+        max_diff = max(float(np.abs(legacy_vectors[k] - pipeline_vectors[k]).max()) for k in legacy_vectors)
+        assert max_diff < 1e-3, f"vectors differ by {max_diff}"
+
+    print(f"{len(files)} files, {legacy_chunks} chunks, encoder {args.encoder}, "
+          f"batch size {args.batch_size}, window {args.encode_window}, {pipeline.workers} chunking workers")
+    print(f"{'path':<14}{'seconds':>10}{'chunks/s':>11}")
+    print(f"{'per-chunk':<14}{legacy_s:>10.2f}{legacy_chunks / legacy_s:>11.0f}")
+    print(f"{'pipeline':<14}{stats.elapsed_s:>10.2f}{stats.chunks_per_second:>11.0f}")
+    print(f"{'re-run':<14}{rerun.elapsed_s:>10.2f}{'':>11}  ({rerun.files_skipped} unchanged files skipped)")
+    print(f"speedup {legacy_s / stats.elapsed_s:.1f}x, max vector difference {max_diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Per-call feature pipeline latency - pandas engineer_features(fit=False) vs
+the compiled array pipeline, using the fitted pipelines in
+models/feature_pipelines and rows from data/ml_training.
+
+For each call size (legs scored per request) it times:
+
+- pandas: DataFrame(rows) -> engineer_features(fit=False) -> [feature_columns].values,
+  the MultiSportFeatureEngineer.transform_new_data path
+- compiled dicts: CompiledFeaturePipeline.transform(list of dicts)
+- compiled array: CompiledFeaturePipeline.transform(structured array)
+
+Every call size is checked for an identical feature matrix first.
+"""
+
+import argparse
+import logging
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from ml.feature_engineering import CompiledFeaturePipeline, SportFeatureEngineer, compiled_pipeline_path
+
+
+def per_call_ms(fn, calls: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return 1000.0 * (time.perf_counter() - start) / calls
+
+
+def same_matrix(expected: np.ndarray, actual: np.ndarray) -> bool:
+    if expected.shape != actual.shape:
+        return False
+    for j in range(expected.shape[1]):
+        try:
+            if not np.array_equal(expected[:, j].astype(float), actual[:, j].astype(float), equal_nan=True):
+                return False
+        except ValueError:
+            if list(expected[:, j]) != list(actual[:, j]):
+                return False
+    return True
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the compiled feature pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--calls", type=int, default=200, help="Timed calls per size (fewer for large sizes)")
+    parser.add_argument("--sports", nargs="+", default=["nba", "nfl"])
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.disable(logging.WARNING)  # engineer_features logs at INFO on every call
+    warnings.filterwarnings("ignore")  # sklearn version warnings when unpickling
+
+    print(f"{'sport':<6}{'legs':>6}{'pandas ms':>11}{'dicts ms':>10}{'array ms':>10}{'speedup':>9}")
+    for sport in args.sports:
+        pipeline_path = f"models/feature_pipelines/{sport}_feature_pipeline.pkl"
+        engineer = SportFeatureEngineer.load_pipeline(pipeline_path)
+        compiled_path = compiled_pipeline_path(pipeline_path)
+        compiled = (CompiledFeaturePipeline.load(compiled_path) if compiled_path.exists()
+                    else CompiledFeaturePipeline.from_engineer(engineer))
+        df = pd.read_csv(f"data/ml_training/{sport}_parlay_training_data.csv")
+
+        for size in args.sizes:
+            rows = df.sample(size, random_state=size).to_dict("records")
+            records = pd.DataFrame(rows).to_records(index=False)
+            records = records.astype([(name, "U32" if records.dtype[name].kind == "O" else records.dtype[name])
+                                      for name in records.dtype.names])
+
+            def pandas_path():
+                engineered, _ = engineer.engineer_features(pd.DataFrame(rows), fit=False)
+                return engineered[engineer.feature_columns].values
+
+            expected = pandas_path()
+            assert same_matrix(expected, compiled.transform(rows)), f"{sport} x{size}: dict rows differ"
+            assert same_matrix(expected, compiled.transform(records)), f"{sport} x{size}: array rows differ"
+
+            calls = max(5, args.calls * 10 // max(size, 10))
+            pandas_ms = per_call_ms(pandas_path, calls)
+            dicts_ms = per_call_ms(lambda: compiled.transform(rows), calls)
+            array_ms = per_call_ms(lambda: compiled.transform(records), calls)
+            print(f"{sport:<6}{size:>6}{pandas_ms:>11.2f}{dicts_ms:>10.3f}{array_ms:>10.3f}"
+                  f"{pandas_ms / min(dicts_ms, array_ms):>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Incremental ingestion benchmark - legacy chunks.json vs the JSONL chunk store.
+
+Copies data/chunks/chunks.json into a temp directory, migrates it to the
+JSONL store and compares, for one newly added document:
+
+- ingest: legacy read-modify-write of the whole JSON array vs a manifest
+  check plus a JSONL append
+- RAG refresh: SportsKnowledgeRAG startup after the change - the legacy
+  index is re-encoded in full (content hash changed), the JSONL index
+  encodes only the new chunks
+
+Uses a bag-of-words encoder (--encoder hashing) or the SentenceTransformer
+model; chunk counts encoded are reported either way.
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import tools.knowledge_base_rag as knowledge_base_rag
+from tools.knowledge_base_rag import SportsKnowledgeRAG
+from tools.knowledge_ingestor import IncrementalIngestor, chunk_documents, ingest_files
+
+
+class CountingHashingEncoder:
+    """Bag-of-words encoder that counts the texts it encodes."""
+
+    encoded = 0
+
+    def __init__(self, name: str = "", dim: int = 384):
+        self.dim = dim
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        CountingHashingEncoder.encoded += len(texts)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % self.dim] += 1.0
+        return vectors
+
+
+def legacy_append(chunks_path: Path, new_doc: Path) -> None:
+    """The previous `knowledge_ingestor` append: parse, extend and rewrite the whole array."""
+    with open(chunks_path, "r", encoding="utf-8") as f:
+        existing = json.load(f)
+    chunks = chunk_documents(ingest_files([new_doc]))
+    merged = existing + [{"content": c.page_content, "metadata": c.metadata} for c in chunks]
+    with open(chunks_path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=2)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def rag_refresh(chunks_path: Path, model: str):
+    CountingHashingEncoder.encoded = 0
+    rag, seconds = timed(lambda: SportsKnowledgeRAG(chunks_path=str(chunks_path), embeddings_model=model))
+    return rag, seconds, CountingHashingEncoder.encoded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark incremental knowledge ingestion")
+    parser.add_argument("--chunks", default="data/chunks/chunks.json")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--encoder", choices=["sentence-transformers", "hashing"], default="sentence-transformers")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    if args.encoder == "hashing":
+        knowledge_base_rag.SentenceTransformer = CountingHashingEncoder
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        legacy = tmp / "chunks.json"
+        shutil.copy(args.chunks, legacy)
+        store = tmp / "chunks.jsonl"
+        ingestor = IncrementalIngestor(str(store))
+        ingestor.migrate(str(legacy))
+
+        # Warm indexes for both layouts
+        rag_refresh(legacy, args.model)
+        rag_refresh(store, args.model)
+
+        new_doc = tmp / "Ed_Miller_appendix.md"
+        new_doc.write_text("\n\n".join(f"Appendix note {i}: kelly staking and closing line value. " * 12
+                                       for i in range(20)))
+
+        _, legacy_ingest_s = timed(lambda: legacy_append(legacy, new_doc))
+        stats, store_ingest_s = timed(lambda: ingestor.ingest([new_doc]))
+        _, rerun_s = timed(lambda: ingestor.ingest([new_doc]))
+
+        legacy_rag, legacy_refresh_s, legacy_encoded = rag_refresh(legacy, args.model)
+        store_rag, store_refresh_s, store_encoded = rag_refresh(store, args.model)
+        assert len(legacy_rag.sports_betting_chunks) == len(store_rag.sports_betting_chunks), "corpora differ"
+
+    print(f"corpus: {len(store_rag.sports_betting_chunks)} sports chunks, new document: {stats.chunks_added} chunks")
+    print(f"{'step':<28}{'legacy json':>14}{'jsonl store':>14}")
+    print(f"{'ingest new document (s)':<28}{legacy_ingest_s:>14.3f}{store_ingest_s:>14.3f}")
+    print(f"{'re-run, unchanged (s)':<28}{'-':>14}{rerun_s:>14.4f}")
+    print(f"{'RAG refresh (s)':<28}{legacy_refresh_s:>14.3f}{store_refresh_s:>14.3f}")
+    print(f"{'chunks re-encoded':<28}{legacy_encoded:>14}{store_encoded:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tweet classification throughput - one tweet per forward pass vs the batched
+inference service, on CPU.
+
+- per-tweet: the previous MultiSportTweetClassifier.classify_tweet path, one
+  tokenize + no_grad forward per tweet
+- service, N callers: N threads calling InferenceService.predict concurrently
+  (micro-batched by the worker)
+- service, predict_many: one caller queueing every tweet at once
+
+The tweets are the labeled NBA/NFL training CSVs, repeated to --tweets. The
+classifier is a randomly initialised RoBERTa with the roberta-base shape
+(--layers to shrink it) and a word-level vocabulary built from the tweets, so
+no model download is needed and the per-token cost is realistic.
+"""
+
+import argparse
+import csv
+import logging
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import torch
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from tools.inference_service import InferenceService, configure_cpu_threads
+from tools.multi_sport_tweet_classifier import LABELS
+
+TWEET_FILES = ["data/nba_tweets_labeled_training.csv", "data/nfl_tweets_labeled_training.csv"]
+
+
+def load_tweets(count: int) -> list:
+    tweets = []
+    for path in TWEET_FILES:
+        with open(path, newline="", encoding="utf-8") as f:
+            tweets.extend(f"[{row['sport'].upper()}] {row['text']}" for row in csv.DictReader(f))
+    return [tweets[i % len(tweets)] for i in range(count)]
+
+
+def random_roberta(tweets: list, model_dir: Path, layers: int):
+    from transformers import BertTokenizerFast, RobertaConfig, RobertaForSequenceClassification
+
+    words = Counter(re.findall(r"[a-z0-9]+", " ".join(tweets).lower()))
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + sorted(words)
+    (model_dir / "vocab.txt").write_text("\n".join(vocab))
+    tokenizer = BertTokenizerFast(vocab_file=str(model_dir / "vocab.txt"))
+    config = RobertaConfig(vocab_size=len(vocab), num_hidden_layers=layers, num_labels=len(LABELS),
+                           pad_token_id=0, max_position_embeddings=514)
+    return RobertaForSequenceClassification(config).eval(), tokenizer
+
+
+def per_tweet(model, tokenizer, tweets: list) -> np.ndarray:
+    """The previous classify_tweet loop: batch of one, no_grad."""
+    rows = []
+    for text in tweets:
+        encoding = tokenizer(text, truncation=True, padding=True, max_length=128, return_tensors="pt")
+        with torch.no_grad():
+            rows.append(torch.softmax(model(**encoding).logits, dim=-1)[0].numpy())
+    return np.stack(rows)
+
+
+def concurrent_callers(service: InferenceService, tweets: list, callers: int) -> np.ndarray:
+    rows = [None] * len(tweets)
+
+    def work(offset):
+        for i in range(offset, len(tweets), callers):
+            rows[i] = service.predict(tweets[i])
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.stack(rows)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark batched tweet classification")
+    parser.add_argument("--tweets", type=int, default=512)
+    parser.add_argument("--layers", type=int, default=12)
+    parser.add_argument("--callers", type=int, default=16)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--threads", type=int, default=None)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.disable(logging.WARNING)
+    threads = configure_cpu_threads(args.threads)
+    tweets = load_tweets(args.tweets)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model, tokenizer = random_roberta(tweets, Path(tmp), args.layers)
+
+    service = InferenceService(model, tokenizer, max_length=128, max_batch_size=args.max_batch_size,
+                               max_wait_ms=args.max_wait_ms, name="benchmark")
+    service.predict(tweets[0])  # start the worker
+
+    timings = {}
+    start = time.perf_counter()
+    baseline = per_tweet(model, tokenizer, tweets)
+    timings["per-tweet"] = time.perf_counter() - start
+
+    batches_before = service.batches
+    start = time.perf_counter()
+    threaded = concurrent_callers(service, tweets, args.callers)
+    timings[f"service, {args.callers} callers"] = time.perf_counter() - start
+    threaded_batch = len(tweets) / (service.batches - batches_before)
+
+    start = time.perf_counter()
+    bulk = service.predict_many(tweets)
+    timings["service, predict_many"] = time.perf_counter() - start
+    service.close()
+
+    max_diff = max(float(np.abs(baseline - threaded).max()), float(np.abs(baseline - bulk).max()))
+    assert max_diff < 1e-4, f"probabilities differ by {max_diff}"
+
+    print(f"{len(tweets)} tweets, RoBERTa {args.layers} layers (random init), {threads} CPU threads, "
+          f"max batch {args.max_batch_size}, max wait {args.max_wait_ms} ms")
+    print(f"{'path':<26}{'seconds':>10}{'tweets/s':>11}")
+    for name, seconds in timings.items():
+        print(f"{name:<26}{seconds:>10.2f}{len(tweets) / seconds:>11.1f}")
+    print(f"mean batch with {args.callers} callers {threaded_batch:.1f}, "
+          f"speedup {timings['per-tweet'] / min(timings.values()):.1f}x, max probability difference {max_diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Knowledge-base search benchmark - per-query chunk encoding vs EmbeddingIndex.
+
+Runs the strategist's templated queries against data/chunks/chunks.json with:
+
+- per-query: the previous _search_with_similarity, which re-encoded the
+  first 200 sports-betting chunks for every query (and never searched the rest)
+- indexed: SportsKnowledgeRAG with the memory-mapped EmbeddingIndex, one
+  query encode plus a matrix-vector product over every chunk (query cache
+  disabled)
+- cached: the same search served from the shared RAGQueryCache, as for the
+  strategist's repeated templated queries
+
+Index build and cold/warm startup are reported separately. Needs the
+SentenceTransformer model; --encoder hashing swaps in a bag-of-words encoder
+to exercise the index offline (encode cost is then negligible, so only the
+search overhead is measured).
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import tools.knowledge_base_rag as knowledge_base_rag
+from tools.knowledge_base_rag import SportsKnowledgeRAG
+from tools.rag_query_cache import RAGQueryCache
+
+QUERIES = [
+    "value betting in NFL parlays",
+    "correlation risk in basketball betting",
+    "bankroll management kelly criterion bet sizing money management",
+    "nba statistics probability analysis mathematical models regression",
+    "value betting expected value positive edge mathematical advantage",
+]
+
+
+class HashingEncoder:
+    """Offline bag-of-words stand-in with the SentenceTransformer encode() signature."""
+
+    def __init__(self, *args, dim: int = 384, **kwargs):
+        self.dim = dim
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % self.dim] += 1.0
+        return vectors
+
+
+def per_query_search(rag: SportsKnowledgeRAG, query: str, top_k: int = 5) -> list:
+    """The pre-index search: encode the query and the first 200 chunks, cosine, top-k."""
+    query_embedding = rag.embedding_model.encode([query])
+    chunk_embeddings = rag.embedding_model.encode([c.content for c in rag.sports_betting_chunks[:200]])
+    similarities = (chunk_embeddings @ query_embedding[0]) / (
+        np.linalg.norm(chunk_embeddings, axis=1) * np.linalg.norm(query_embedding[0]) + 1e-12)
+    return list(np.argsort(similarities)[::-1][:top_k])
+
+
+def time_ms(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark knowledge-base vector search")
+    parser.add_argument("--chunks", default="data/chunks/chunks.json")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--encoder", choices=["sentence-transformers", "hashing"], default="sentence-transformers")
+    parser.add_argument("--repeats", type=int, default=5)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.disable(logging.WARNING)
+    if args.encoder == "hashing":
+        knowledge_base_rag.SentenceTransformer = HashingEncoder
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        start = time.perf_counter()
+        rag = SportsKnowledgeRAG(chunks_path=args.chunks, embeddings_model=args.model, index_dir=index_dir,
+                                 query_cache=RAGQueryCache(max_embeddings=0, max_results=0))
+        cold_s = time.perf_counter() - start
+        assert rag.embedding_index is not None, "embedding model unavailable (try --encoder hashing)"
+
+        start = time.perf_counter()
+        cached_rag = SportsKnowledgeRAG(chunks_path=args.chunks, embeddings_model=args.model, index_dir=index_dir)
+        warm_s = time.perf_counter() - start
+
+        print(f"chunks indexed: {len(rag.embedding_index)} x {rag.embedding_index.dim} "
+              f"(per-query path searched {min(200, len(rag.sports_betting_chunks))})")
+        print(f"startup: {cold_s:.2f} s building the index, {warm_s:.2f} s memory-mapping it")
+        print(f"{'query':<48}{'per-query ms':>14}{'indexed ms':>12}{'cached ms':>11}{'speedup':>9}")
+        for query in QUERIES:
+            old_ms = time_ms(lambda: per_query_search(rag, query), args.repeats)
+            new_ms = time_ms(lambda: rag.search_knowledge(query, top_k=5, min_relevance=0.0), args.repeats)
+            cached_rag.search_knowledge(query, top_k=5, min_relevance=0.0)
+            cached_ms = time_ms(lambda: cached_rag.search_knowledge(query, top_k=5, min_relevance=0.0), args.repeats)
+            print(f"{query[:46]:<48}{old_ms:>14.2f}{new_ms:>12.2f}{cached_ms:>11.3f}{old_ms / new_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Classifier CPU latency and memory - fp32 PyTorch vs the fast-inference
+exports from tools.model_export (int8 dynamic quantization, ONNX Runtime,
+ONNX Runtime int8).
+
+The classifier is a randomly initialised RoBERTa with the roberta-base shape
+(--layers to shrink it) and a word-level vocabulary built from the labeled
+NBA/NFL tweets, saved and exported the way the training scripts do it, so no
+model download is needed. Each backend is loaded and timed in its own
+process so the peak RSS column is that backend's alone.
+
+Random weights make argmax agreement a harsher test than a trained model
+(many near-ties); max probability difference is the number to watch.
+"""
+
+import argparse
+import csv
+import logging
+import multiprocessing
+import re
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from tools.model_export import BACKEND_FILES, export_fast_inference, load_fast_sequence_classifier, predict_probabilities
+from tools.multi_sport_tweet_classifier import LABELS
+
+TWEET_FILES = ["data/nba_tweets_labeled_training.csv", "data/nfl_tweets_labeled_training.csv"]
+
+
+def load_tweets(count: int) -> list:
+    tweets = []
+    for path in TWEET_FILES:
+        with open(path, newline="", encoding="utf-8") as f:
+            tweets.extend(f"[{row['sport'].upper()}] {row['text']}" for row in csv.DictReader(f))
+    return [tweets[i % len(tweets)] for i in range(count)]
+
+
+def save_random_roberta(tweets: list, model_dir: Path, layers: int) -> None:
+    import torch
+    from transformers import BertTokenizerFast, RobertaConfig, RobertaForSequenceClassification
+
+    words = Counter(re.findall(r"[a-z0-9]+", " ".join(tweets).lower()))
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + sorted(words)
+    (model_dir / "vocab.txt").write_text("\n".join(vocab))
+    BertTokenizerFast(vocab_file=str(model_dir / "vocab.txt")).save_pretrained(model_dir)
+    torch.manual_seed(0)
+    config = RobertaConfig(vocab_size=len(vocab), num_hidden_layers=layers, num_labels=len(LABELS),
+                           pad_token_id=0, max_position_embeddings=514)
+    RobertaForSequenceClassification(config).save_pretrained(model_dir)
+
+
+def peak_rss_mb() -> float:
+    """VmHWM of this process (ru_maxrss would include the parent's RSS at fork)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_backend(model_dir: str, backend: str, tweets: list, batch_size: int, threads: int) -> dict:
+    """Load one backend and time it (runs in a child process)."""
+    import os
+    import torch
+
+    logging.disable(logging.WARNING)
+    os.environ["INFERENCE_NUM_THREADS"] = str(threads)
+    torch.set_num_threads(threads)
+    model, tokenizer = load_fast_sequence_classifier(model_dir, backend)
+    predict_probabilities(model, tokenizer, tweets[:batch_size], 128, batch_size)  # warm up
+    single = [predict_probabilities(model, tokenizer, [text], 128, 1)[1] for text in tweets[:64]]
+    start = time.perf_counter()
+    probabilities, _ = predict_probabilities(model, tokenizer, tweets, 128, batch_size)
+    return {
+        "probabilities": probabilities,
+        "single_ms": float(np.median(single)),
+        "tweets_per_s": len(tweets) / (time.perf_counter() - start),
+        "rss_mb": peak_rss_mb(),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark fast-inference classifier exports")
+    parser.add_argument("--tweets", type=int, default=512)
+    parser.add_argument("--layers", type=int, default=12)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=1)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.disable(logging.WARNING)
+    tweets = load_tweets(args.tweets)
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        save_random_roberta(tweets, Path(tmp), args.layers)
+        manifest = export_fast_inference(tmp, list(BACKEND_FILES), parity_texts=tweets[:256], max_length=128,
+                                         min_agreement=0.0)  # time every backend, whatever its parity
+        sizes = {"fp32": manifest["fp32"]["size_mb"]}
+        sizes.update({backend: entry["size_mb"] for backend, entry in manifest["backends"].items()})
+
+        results = {}
+        for backend in sizes:
+            with context.Pool(1) as pool:
+                results[backend] = pool.apply(run_backend, (tmp, backend, tweets, args.batch_size, args.threads))
+
+    reference = results["fp32"]["probabilities"]
+    print(f"{len(tweets)} tweets, RoBERTa {args.layers} layers (random init), {args.threads} CPU threads, "
+          f"batch {args.batch_size}")
+    print(f"{'backend':<11}{'size MB':>9}{'peak RSS MB':>13}{'1-tweet ms':>12}{'tweets/s':>10}"
+          f"{'agreement':>11}{'max diff':>10}")
+    for backend, result in results.items():
+        probabilities = result["probabilities"]
+        agreement = float((probabilities.argmax(axis=1) == reference.argmax(axis=1)).mean())
+        max_diff = float(np.abs(probabilities - reference).max())
+        print(f"{backend:<11}{sizes[backend]:>9.1f}{result['rss_mb']:>13.0f}{result['single_ms']:>12.1f}"
+              f"{result['tweets_per_s']:>10.1f}{agreement:>11.3f}{max_diff:>10.1e}")
+    assert float(np.abs(results["onnx"]["probabilities"] - reference).max()) < 1e-4, "onnx export drifted from fp32"
+
+
+if __name__ == "__main__":
+    main()
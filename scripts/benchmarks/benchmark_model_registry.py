@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+ParlayBuilder construction benchmark - per-builder model loading vs the
+shared model registry (tools/model_registry.py).
+
+Each mode runs in a fresh spawned process that imports the builder, then
+constructs --builders ParlayBuilders and keeps them alive:
+
+- per-builder: a new ModelRegistry per builder, i.e. every builder loads
+  every checkpoint itself (the previous ParlayBuilder.__init__ behaviour)
+- shared: the process-wide registry, models loaded by the first builder
+- shared lazy: the process-wide registry with lazy_models=True (models
+  load when the first builder's are checked at the end)
+
+RSS is reported for the first builder (imports, torch warm-up, first
+loads) and for the remaining builders together.
+
+Models are the trained prop predictors in models/, plus a Q-Learning
+checkpoint written to a scratch copy of the models directory (none is
+checked in) so its load is measured as well.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+MODES = ["per-builder", "shared", "shared lazy"]
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def prepare_workdir(workdir: Path) -> None:
+    """Scratch tree: links to the checked-in models and data, plus a Q-Learning checkpoint."""
+    (workdir / "models").mkdir()
+    for entry in (PROJECT_ROOT / "models").iterdir():
+        (workdir / "models" / entry.name).symlink_to(entry.resolve())
+    (workdir / "data").symlink_to((PROJECT_ROOT / "data").resolve())
+
+    from ml.ml_qlearning_agent import QLearningConfig, QLearningParlayAgent
+    QLearningParlayAgent(QLearningConfig()).save_model(str(workdir / "models" / "qlearning_parlay_agent"))
+
+
+def run_mode(mode: str, builders: int, workdir: str) -> dict:
+    """Construct builders in one mode (runs in a child process)."""
+    os.chdir(workdir)
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")  # sklearn version warnings when unpickling
+    from tools.model_registry import ModelRegistry
+    from tools.parlay_builder import ParlayBuilder
+
+    baseline = rss_mb()
+    kept, times = [], []
+    for _ in range(builders):
+        start = time.perf_counter()
+        if mode == "per-builder":
+            kept.append(ParlayBuilder("all_sports", model_registry=ModelRegistry()))
+        else:
+            kept.append(ParlayBuilder("all_sports", lazy_models=(mode == "shared lazy")))
+        times.append(time.perf_counter() - start)
+        if len(kept) == 1:
+            after_first = rss_mb()
+    after_all = rss_mb()
+
+    first = kept[0]
+    assert first.qlearning_enabled and all(trainer.is_trained for trainer in first.prop_trainers.values())
+    return {
+        "first_ms": 1000 * times[0],
+        "next_ms": 1000 * sum(times[1:]) / max(1, len(times) - 1),
+        "first_rss_mb": after_first - baseline,
+        "next_rss_mb": after_all - after_first,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark ParlayBuilder construction with the model registry")
+    parser.add_argument("--builders", type=int, default=50)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.disable(logging.WARNING)
+    context = multiprocessing.get_context("spawn")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        prepare_workdir(Path(tmp))
+        for mode in MODES:
+            with context.Pool(1) as pool:
+                results[mode] = pool.apply(run_mode, (mode, args.builders, tmp))
+
+    print(f"{args.builders} ParlayBuilder('all_sports') instances per process")
+    print(f"{'mode':<13}{'first ms':>10}{'next ms':>10}{'first RSS MB':>14}{'next RSS MB':>13}")
+    for mode, result in results.items():
+        print(f"{mode:<13}{result['first_ms']:>10.1f}{result['next_ms']:>10.2f}{result['first_rss_mb']:>14.1f}"
+              f"{result['next_rss_mb']:>13.1f}")
+    baseline, shared = results["per-builder"], results["shared"]
+    print(f"construction {baseline['next_ms'] / shared['next_ms']:.0f}x faster after the first builder, "
+          f"{baseline['next_rss_mb'] - shared['next_rss_mb']:.1f} MB saved across the other "
+          f"{args.builders - 1} builders")
+
+
+if __name__ == "__main__":
+    main()
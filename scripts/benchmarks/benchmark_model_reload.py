@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Hot model reload benchmark - ModelWatcher swapping a re-saved prop model
+into a ParlayBuilder that is serving requests, vs restarting the process.
+
+In a scratch copy of models/ (the NBA prop predictor copied, the rest
+linked) a request thread calls rank_legs_by_prop_ev on --legs legs in a
+loop. Mid-run the NBA prop model is saved again (new artifact version), and
+the watcher loads it on its own thread, smoke-tests it and swaps it in.
+
+Reported:
+- load / validate / swap timings of the reload and time from the save to
+  the new model serving
+- request latency before and after the save, failed requests, and requests
+  that straddled the swap (they finish on the model they started with)
+- the restart alternative: a fresh process importing the builder and
+  constructing it (a lower bound - the API also reloads RAG and embeddings)
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+
+def prepare_workdir(workdir: Path) -> None:
+    """Scratch tree: a writable copy of the NBA prop predictor, links to everything else."""
+    (workdir / "models").mkdir()
+    for entry in (PROJECT_ROOT / "models").iterdir():
+        if entry.name == "prop_predictor_nba":
+            shutil.copytree(entry, workdir / "models" / entry.name)
+        else:
+            (workdir / "models" / entry.name).symlink_to(entry.resolve())
+    (workdir / "data").symlink_to((PROJECT_ROOT / "data").resolve())
+
+
+def cold_start_ms(workdir: str) -> float:
+    """Import and construct a ParlayBuilder in a fresh process (runs in a child process)."""
+    start = time.perf_counter()
+    os.chdir(workdir)
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")
+    from tools.parlay_builder import ParlayBuilder
+    ParlayBuilder("basketball_nba")
+    return 1000 * (time.perf_counter() - start)
+
+
+def make_legs(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [{"selection": f"leg_{i}", "sport_key": "basketball_nba", "odds": round(rng.uniform(1.4, 3.5), 2),
+             "projected_points": rng.uniform(5, 40), "projected_minutes": rng.uniform(15, 40),
+             "usage_rate": rng.uniform(12, 35)} for i in range(count)]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark hot model reloads")
+    parser.add_argument("--legs", type=int, default=200, help="Legs ranked per request")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Serving time before and after the save")
+    parser.add_argument("--poll", type=float, default=0.05, help="Watcher poll interval")
+    parser.add_argument("--settle", type=float, default=0.2, help="Watcher settle time")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")  # sklearn version warnings when unpickling
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prepare_workdir(Path(tmp))
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            restart_ms = pool.apply(cold_start_ms, (tmp,))
+
+        os.chdir(tmp)
+        from tools.model_watcher import ModelWatcher
+        from tools.parlay_builder import ParlayBuilder
+
+        builder = ParlayBuilder("basketball_nba")
+        watcher = ModelWatcher(poll_interval=args.poll, settle_seconds=args.settle)
+        watcher.watch_active()
+        watcher.start()
+
+        legs = make_legs(args.legs, seed=3)
+        requests, errors, straddled = [], [], 0
+        stop = threading.Event()
+
+        def serve() -> None:
+            nonlocal straddled
+            while not stop.is_set():
+                trainer = builder.prop_trainers["nba"]
+                start = time.perf_counter()
+                try:
+                    builder.rank_legs_by_prop_ev(legs, top_k=10)
+                except Exception as e:
+                    errors.append(e)
+                end = time.perf_counter()
+                straddled += builder.prop_trainers["nba"] is not trainer
+                requests.append((start, end))
+
+        server = threading.Thread(target=serve)
+        server.start()
+        time.sleep(args.seconds)
+
+        saved_at = time.perf_counter()
+        builder.prop_trainers["nba"]._save_model()
+        deadline = saved_at + 30.0
+        while not watcher.history and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        serving_at = time.perf_counter()
+        time.sleep(args.seconds)
+        stop.set()
+        server.join()
+        watcher.stop()
+        os.chdir(PROJECT_ROOT)
+
+    assert watcher.history and watcher.history[-1].success, "reload did not succeed"
+    result = watcher.history[-1]
+    before = [1000 * (end - start) for start, end in requests if end < saved_at]
+    after = [1000 * (end - start) for start, end in requests if start >= saved_at]
+
+    print(f"NBA prop model re-saved while serving rank_legs_by_prop_ev({args.legs} legs); "
+          f"poll {args.poll:g}s, settle {args.settle:g}s")
+    print(f"load {result.load_seconds * 1000:.1f} ms, validate {result.validate_seconds * 1000:.1f} ms, "
+          f"swap {result.swap_ms:.3f} ms, save -> serving {1000 * (serving_at - saved_at):.0f} ms")
+    print(f"{'requests':<16}{'count':>7}{'p50 ms':>9}{'p99 ms':>9}")
+    for name, latencies in (("before save", before), ("after save", after)):
+        print(f"{name:<16}{len(latencies):>7}{np.percentile(latencies, 50):>9.2f}"
+              f"{np.percentile(latencies, 99):>9.2f}")
+    print(f"failed requests {len(errors)}, requests straddling the swap {straddled}")
+    print(f"restart alternative: fresh process import + ParlayBuilder {restart_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
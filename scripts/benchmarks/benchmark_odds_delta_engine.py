@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Odds delta engine benchmark - full dict re-diff vs OddsDeltaEngine.
+
+Replays a sequence of polls over a synthetic slate and compares the CPU time
+per poll of:
+
+- full re-diff: the previous diff_changes approach, rebuilding a dict of every
+  (book, market, selection, line) -> price and comparing it key by key
+- delta engine: OddsDeltaEngine.ingest()
+
+for three kinds of poll:
+
+- cache hit: the same GameOdds objects come back (within the snapshot TTL)
+- quiet refetch: new objects, identical prices
+- active: a fraction of the games have one moved price
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from scripts.benchmarks.benchmark_odds_snapshot_store import build_games
+from tools.odds_fetcher_tool import GameOdds
+from tools.odds_delta_engine import OddsDeltaEngine
+
+
+def full_rediff(games: List[GameOdds], last: Dict[str, Dict[Tuple, float]]) -> int:
+    changes = 0
+    for game in games:
+        current = {}
+        for book in game.books:
+            for selection in book.selections:
+                current[(book.bookmaker, book.market, selection.name, selection.line)] = selection.price_decimal
+        previous = last.get(game.game_id, {})
+        for key, price in current.items():
+            if key in previous and previous[key] != price:
+                changes += 1
+        last[game.game_id] = current
+    return changes
+
+
+def build_polls(games: List[GameOdds], kind: str, n_polls: int, moved_fraction: float,
+                seed: int) -> List[List[GameOdds]]:
+    rng = random.Random(seed)
+    if kind == "cache hit":
+        return [games] * n_polls
+    polls = []
+    for _ in range(n_polls):
+        poll = copy.deepcopy(games)
+        if kind == "active":
+            for game in rng.sample(poll, max(1, int(len(poll) * moved_fraction))):
+                selection = rng.choice(rng.choice(game.books).selections)
+                selection.price_decimal = round(selection.price_decimal + 0.01, 2)
+        polls.append(poll)
+    return polls
+
+
+def time_polls(fn, polls: List[List[GameOdds]]) -> float:
+    start = time.perf_counter()
+    for poll in polls:
+        fn(poll)
+    return (time.perf_counter() - start) / len(polls) * 1000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark incremental odds diffing")
+    parser.add_argument("--games", type=int, default=15)
+    parser.add_argument("--books", type=int, default=10)
+    parser.add_argument("--alt-lines", type=int, default=4, help="Alternate lines per spread/total market")
+    parser.add_argument("--polls", type=int, default=50)
+    parser.add_argument("--moved-fraction", type=float, default=0.2, help="Games moving per active poll")
+    parser.add_argument("--seed", type=int, default=11)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    games = build_games(args.games, args.books, args.alt_lines)
+    n_quotes = sum(len(book.selections) for game in games for book in game.books)
+    print(f"Slate: {args.games} games x {args.books} books, {n_quotes} quotes, {args.polls} polls per scenario")
+    print(f"{'poll kind':<16}{'re-diff ms':>12}{'engine ms':>12}{'speedup':>10}")
+
+    for kind in ("cache hit", "quiet refetch", "active"):
+        polls = build_polls(games, kind, args.polls, args.moved_fraction, args.seed)
+
+        last: Dict[str, Dict[Tuple, float]] = {}
+        full_rediff(games, last)
+        rediff_ms = time_polls(lambda poll: full_rediff(poll, last), polls)
+
+        engine = OddsDeltaEngine()
+        engine.ingest(games)
+        engine_ms = time_polls(engine.ingest, polls)
+
+        print(f"{kind:<16}{rediff_ms:>12.3f}{engine_ms:>12.3f}{rediff_ms / engine_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Odds fetcher benchmark - sync ApiFetcher path vs pooled async path.
+
+Starts a local stub of The Odds API (keep-alive HTTP/1.1 with configurable
+per-request latency), then fetches the same set of (sport, market group)
+requests through:
+
+- the existing sync path: one OddsFetcherTool.get_game_odds call per request
+- the async path: OddsFetcherTool.get_multi_sport_odds over AsyncApiFetcher
+
+and reports wall time, per-request latency and requests per second.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from statistics import mean, median
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from tools.odds_fetcher_tool import OddsFetcherTool
+
+
+BOOKMAKERS = ["DraftKings", "FanDuel", "BetMGM", "Caesars", "PointsBet",
+              "BetRivers", "WynnBET", "Unibet", "Barstool", "FOX Bet"]
+
+
+def build_slate(sport_key: str, markets: List[str], n_games: int, n_books: int) -> List[Dict[str, Any]]:
+    """Build a synthetic Odds API response for one sport and market group."""
+    rng = random.Random(f"{sport_key}:{','.join(markets)}")
+    games = []
+    for g in range(n_games):
+        home, away = f"Home Team {g}", f"Away Team {g}"
+        bookmakers = []
+        for book in BOOKMAKERS[:n_books]:
+            book_markets = []
+            for market in markets:
+                if market == "totals":
+                    total = round(rng.uniform(200, 240), 1)
+                    outcomes = [{"name": "Over", "price": round(rng.uniform(1.8, 2.0), 2), "point": total},
+                                {"name": "Under", "price": round(rng.uniform(1.8, 2.0), 2), "point": total}]
+                elif market == "spreads":
+                    spread = round(rng.uniform(-9, 9) * 2) / 2
+                    outcomes = [{"name": home, "price": round(rng.uniform(1.8, 2.0), 2), "point": spread},
+                                {"name": away, "price": round(rng.uniform(1.8, 2.0), 2), "point": -spread}]
+                else:
+                    outcomes = [{"name": home, "price": round(rng.uniform(1.4, 2.8), 2)},
+                                {"name": away, "price": round(rng.uniform(1.4, 2.8), 2)}]
+                book_markets.append({"key": market, "outcomes": outcomes})
+            bookmakers.append({"title": book, "markets": book_markets})
+        games.append({
+            "id": f"{sport_key}_{g}",
+            "commence_time": "2030-01-01T00:00:00Z",
+            "bookmakers": bookmakers
+        })
+    return games
+
+
+def start_stub_server(latency_ms: float, n_games: int, n_books: int) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub Odds API in a daemon thread and return (server, base_url)."""
+    cache: Dict[Tuple[str, str], bytes] = {}
+
+    class StubOddsHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            sport_key = parsed.path.strip("/").split("/")[-2]
+            markets = parse_qs(parsed.query).get("markets", ["h2h"])[0]
+            key = (sport_key, markets)
+            if key not in cache:
+                cache[key] = json.dumps(build_slate(sport_key, markets.split(","), n_games, n_books)).encode()
+            body = cache[key]
+
+            time.sleep(latency_ms / 1000.0)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOddsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_fetcher(base_url: str) -> OddsFetcherTool:
+    """OddsFetcherTool whose primary endpoint points at the stub server."""
+    fetcher = OddsFetcherTool()
+    fetcher.api_fetcher.api_key = fetcher.async_api_fetcher.api_key = "benchmark"
+
+    def build_stub_request(sport_key, regions, markets_str, api_key):
+        return f"{base_url}/v4/sports/{sport_key}/odds", {
+            "regions": regions, "markets": markets_str, "apiKey": api_key,
+            "oddsFormat": "decimal", "dateFormat": "iso"
+        }
+
+    fetcher._build_odds_request = build_stub_request
+    return fetcher
+
+
+def run_sync(fetcher: OddsFetcherTool, jobs: List[Tuple[str, List[str]]], rounds: int) -> Dict[str, float]:
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for sport_key, markets in jobs:
+            t0 = time.perf_counter()
+            fetcher.get_game_odds(sport_key, "us", markets)
+            latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def run_async(fetcher: OddsFetcherTool, sport_keys: List[str], market_groups: List[List[str]],
+              rounds: int) -> Dict[str, float]:
+    async def timed(sport_key, markets, latencies):
+        t0 = time.perf_counter()
+        await fetcher.get_game_odds_async(sport_key, "us", markets)
+        latencies.append(time.perf_counter() - t0)
+
+    async def main():
+        latencies: List[float] = []
+        # Warm the pool so both paths are compared at steady state
+        await fetcher.get_multi_sport_odds(sport_keys[:1], market_groups=market_groups[:1])
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(timed(s, m, latencies) for s in sport_keys for m in market_groups))
+        elapsed = time.perf_counter() - start
+        await fetcher.aclose()
+        return summarize(latencies, elapsed)
+
+    return asyncio.run(main())
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "wall_s": elapsed,
+        "mean_ms": mean(latencies) * 1000,
+        "p50_ms": median(latencies) * 1000,
+        "p95_ms": ordered[int(0.95 * (len(ordered) - 1))] * 1000,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async odds fetching against a local stub")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Stub server latency per request")
+    parser.add_argument("--rounds", type=int, default=5, help="Times to repeat the full request set")
+    parser.add_argument("--games", type=int, default=15, help="Games per slate")
+    parser.add_argument("--books", type=int, default=10, help="Bookmakers per game")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    sport_keys = ["basketball_nba", "americanfootball_nfl"]
+    market_groups = [["h2h"], ["spreads"], ["totals"]]
+    jobs = [(s, m) for s in sport_keys for m in market_groups]
+
+    server, base_url = start_stub_server(args.latency_ms, args.games, args.books)
+    try:
+        sync_stats = run_sync(make_fetcher(base_url), jobs, args.rounds)
+        async_stats = run_async(make_fetcher(base_url), sport_keys, market_groups, args.rounds)
+    finally:
+        server.shutdown()
+
+    print(f"Stub latency {args.latency_ms:.0f}ms, {len(jobs)} requests/round x {args.rounds} rounds, "
+          f"{args.games} games x {args.books} books")
+    print(f"{'path':<8}{'wall s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>10}")
+    for name, stats in (("sync", sync_stats), ("async", async_stats)):
+        print(f"{name:<8}{stats['wall_s']:>10.3f}{stats['mean_ms']:>10.1f}{stats['p50_ms']:>10.1f}"
+              f"{stats['p95_ms']:>10.1f}{stats['rps']:>10.1f}")
+    print(f"speedup: {sync_stats['wall_s'] / async_stats['wall_s']:.1f}x wall time")
+
+
+if __name__ == "__main__":
+    main()
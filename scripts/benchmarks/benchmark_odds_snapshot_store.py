@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Columnar odds snapshot benchmark - memory and lookup cost vs GameOdds trees.
+
+Builds a synthetic slate (default 15 games x 10 books x h2h/spreads/totals
+plus alternate lines), then compares:
+
+- retained memory of the GameOdds/BookOdds/Selection tree vs ColumnarOddsSnapshot
+- best price per outcome: nested Python loops vs best_price_per_outcome()
+- all books for a selection: nested loops vs books_for_selection()
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from scripts.benchmarks.benchmark_odds_fetcher import build_slate
+from tools.odds_fetcher_tool import OddsFetcherTool, GameOdds
+from tools.odds_snapshot_store import ColumnarOddsSnapshot
+
+
+def build_games(n_games: int, n_books: int, alt_lines: int) -> List[GameOdds]:
+    fetcher = OddsFetcherTool()
+    raw = build_slate("basketball_nba", ["h2h", "spreads", "totals"], n_games, n_books)
+    # Books hang the same lines (only prices differ), and alternate spread/total
+    # lines multiply the selections per book like a real props-heavy feed
+    for game in raw:
+        consensus = {m["key"]: m["outcomes"] for m in game["bookmakers"][0]["markets"]}
+        for book in game["bookmakers"]:
+            for market in book["markets"]:
+                for outcome, ref in zip(market["outcomes"], consensus[market["key"]]):
+                    if "point" in ref:
+                        outcome["point"] = ref["point"]
+            extra = []
+            for market in book["markets"]:
+                if market["key"] == "h2h":
+                    continue
+                for k in range(1, alt_lines + 1):
+                    extra.append({"key": market["key"], "outcomes": [
+                        dict(o, point=o["point"] + 0.5 * k) for o in market["outcomes"]
+                    ]})
+            book["markets"].extend(extra)
+    return fetcher._normalize_response(raw, "basketball_nba")
+
+
+def measure(fn):
+    tracemalloc.start()
+    result = fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def best_price_loops(games: List[GameOdds]) -> Dict[Tuple, Tuple[float, str]]:
+    best: Dict[Tuple, Tuple[float, str]] = {}
+    for game in games:
+        for book in game.books:
+            for sel in book.selections:
+                key = (game.game_id, book.market, sel.name, sel.line)
+                if key not in best or sel.price_decimal > best[key][0]:
+                    best[key] = (sel.price_decimal, book.bookmaker)
+    return best
+
+
+def books_for_selection_loops(games: List[GameOdds], game_id: str, market: str, name: str) -> List[str]:
+    books = []
+    for game in games:
+        if game.game_id != game_id:
+            continue
+        for book in game.books:
+            if book.market != market:
+                continue
+            for sel in book.selections:
+                if sel.name.lower() == name.lower():
+                    books.append(book.bookmaker)
+                    break
+    return books
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the columnar odds snapshot store")
+    parser.add_argument("--games", type=int, default=15)
+    parser.add_argument("--books", type=int, default=10)
+    parser.add_argument("--alt-lines", type=int, default=4, help="Alternate lines per spread/total market")
+    parser.add_argument("--repeat", type=int, default=50)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    games, tree_bytes = measure(lambda: build_games(args.games, args.books, args.alt_lines))
+    snapshot, columnar_bytes = measure(lambda: ColumnarOddsSnapshot.from_game_odds(games))
+
+    print(f"Slate: {args.games} games x {args.books} books, {len(snapshot)} quoted selections")
+    print(f"GameOdds tree retained:       {tree_bytes / 1024:10.1f} KiB")
+    print(f"Columnar snapshot retained:   {columnar_bytes / 1024:10.1f} KiB "
+          f"(numeric columns {snapshot.nbytes / 1024:.1f} KiB)")
+    print(f"Memory ratio:                 {tree_bytes / columnar_bytes:10.1f}x")
+
+    target = games[len(games) // 2]
+    name = next(s.name for b in target.books if b.market == "spreads" for s in b.selections)
+
+    loops_best = timed(lambda: best_price_loops(games), args.repeat)
+    cols_best = timed(lambda: snapshot.best_price_per_outcome(), args.repeat)
+    cols_best_rows = timed(lambda: snapshot.best_price_rows(), args.repeat)
+    loops_books = timed(lambda: books_for_selection_loops(games, target.game_id, "spreads", name), args.repeat)
+    cols_books = timed(lambda: snapshot.books_for_selection(target.game_id, "spreads", name), args.repeat)
+
+    print(f"{'query':<28}{'loops ms':>10}{'columnar ms':>13}")
+    print(f"{'best price per outcome':<28}{loops_best:>10.3f}{cols_best:>13.3f}")
+    print(f"{'  (row indices only)':<28}{'':>10}{cols_best_rows:>13.3f}")
+    print(f"{'books for selection':<28}{loops_books:>10.3f}{cols_books:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+ParlayBuilder leg matching benchmark - linear snapshot scans vs MarketSnapshotIndex.
+
+Validates a batch of candidate parlays (default 1,000 parlays of 2-5 legs)
+against a synthetic slate with alternate lines. Roughly a third of the legs
+are perturbed (other bookmaker, shifted line, unknown game) so the
+alternative-bookmaker path is exercised too. Compares:
+
+- linear: games_by_id lookup, then _find_matching_selection and
+  _find_alternative_bookmakers scanning the game's books
+- indexed: MarketSnapshotIndex built once per snapshot, then dict lookups
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from scripts.benchmarks.benchmark_odds_snapshot_store import build_games
+from tools.odds_fetcher_tool import GameOdds
+from tools.parlay_builder import ParlayBuilder, ParlayLeg, MarketSnapshotIndex
+
+
+def build_parlays(games: List[GameOdds], n_parlays: int, seed: int) -> List[List[ParlayLeg]]:
+    rng = random.Random(seed)
+    quotes = [(game.game_id, book, sel) for game in games for book in game.books for sel in book.selections]
+    bookmakers = sorted({book.bookmaker for _, book, _ in quotes}) + ["PointsBet"]
+
+    parlays = []
+    for _ in range(n_parlays):
+        legs = []
+        for _ in range(rng.randint(2, 5)):
+            game_id, book, sel = rng.choice(quotes)
+            bookmaker, line = book.bookmaker, sel.line
+            roll = rng.random()
+            if roll < 0.12:
+                bookmaker = rng.choice(bookmakers)
+            elif roll < 0.24 and line is not None:
+                line += rng.choice([-1.5, 1.5])
+            elif roll < 0.30:
+                game_id = "unknown_game"
+            legs.append(ParlayLeg(game_id, book.market, sel.name, bookmaker, sel.price_decimal, line))
+        parlays.append(legs)
+    return parlays
+
+
+def validate_linear(builder: ParlayBuilder, games: List[GameOdds], parlays: List[List[ParlayLeg]]) -> int:
+    matched = 0
+    for legs in parlays:
+        games_by_id = {game.game_id: game for game in games}
+        for leg in legs:
+            game_odds = games_by_id.get(leg.game_id)
+            if game_odds is None:
+                continue
+            if builder._find_matching_selection(leg, game_odds) is not None:
+                matched += 1
+            else:
+                builder._find_alternative_bookmakers(leg, game_odds)
+    return matched
+
+
+def validate_indexed(builder: ParlayBuilder, games: List[GameOdds], parlays: List[List[ParlayLeg]]) -> int:
+    matched = 0
+    for legs in parlays:
+        index = builder._get_market_index(games)
+        for leg in legs:
+            if leg.game_id not in index.games_by_id:
+                continue
+            if index.find_matching_selection(leg) is not None:
+                matched += 1
+            else:
+                index.find_alternative_bookmakers(leg)
+    return matched
+
+
+def timed(fn, repeat: int):
+    result = fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark ParlayBuilder leg matching")
+    parser.add_argument("--parlays", type=int, default=1000)
+    parser.add_argument("--games", type=int, default=15)
+    parser.add_argument("--books", type=int, default=10)
+    parser.add_argument("--alt-lines", type=int, default=4, help="Alternate lines per spread/total market")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    games = build_games(args.games, args.books, args.alt_lines)
+    parlays = build_parlays(games, args.parlays, args.seed)
+    n_legs = sum(len(legs) for legs in parlays)
+    builder = ParlayBuilder()
+    # Keep full collections over the loaded models out of the timings
+    gc.collect()
+    gc.freeze()
+
+    _, build_ms = timed(lambda: MarketSnapshotIndex(games), args.repeat)
+    linear_matched, linear_ms = timed(lambda: validate_linear(builder, games, parlays), args.repeat)
+    indexed_matched, indexed_ms = timed(lambda: validate_indexed(builder, games, parlays), args.repeat)
+    assert linear_matched == indexed_matched, "index disagrees with linear scan"
+
+    print(f"Slate: {args.games} games x {args.books} books, "
+          f"{sum(len(b.selections) for g in games for b in g.books)} quoted selections")
+    print(f"Parlays: {args.parlays} ({n_legs} legs, {linear_matched} matched at the requested book)")
+    print(f"Index build (once per snapshot): {build_ms:8.2f} ms")
+    print(f"{'path':<10}{'total ms':>10}{'us/leg':>10}")
+    for name, ms in (("linear", linear_ms), ("indexed", indexed_ms)):
+        print(f"{name:<10}{ms:>10.2f}{ms * 1000 / n_legs:>10.2f}")
+    print(f"speedup: {linear_ms / indexed_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+ParlayOptimizer benchmark - native branch-and-bound search vs one PuLP/CBC
+linear program per solution.
+
+Candidate pools of --pools legs (three legs per game, same-game pairs
+strongly correlated) share one fixed correlation matrix across solvers.
+Each solver returns --solutions parlays of up to --max-legs legs:
+
+- pulp: solver="pulp", the previous behaviour (per-leg correlation penalty,
+  no pairwise cap)
+- native, no cap: solver="native" with max_correlation_threshold=1.0, the
+  same constraints as the LP but the penalty charged per pair
+- native, cap: solver="native" with the builder's pairwise cap of 0.3
+
+Reported per pool: median wall time, the true objective (EV minus 0.1 x
+correlation of every selected pair above 0.3) of the best parlay and the
+mean over the returned parlays, and how many returned parlays contain a
+pair above the 0.3 cap.
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+import warnings
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from ml.ml_parlay_optimizer import ParlayOptimizer
+
+CAP = 0.3
+
+
+class FixedCorrelations:
+    """Correlation computer serving one precomputed matrix keyed by leg_id."""
+
+    def __init__(self, matrix: pd.DataFrame):
+        self.matrix = matrix
+
+    def compute_correlation_matrix(self, legs):
+        ids = [leg.leg_id for leg in legs]
+        return self.matrix.loc[ids, ids]
+
+
+def make_pool(size: int, seed: int):
+    rng = np.random.default_rng(seed)
+    legs = [{"leg_id": f"leg_{i}", "predicted_prob": float(rng.uniform(0.45, 0.7)),
+             "odds": float(rng.uniform(1.8, 2.6)), "game_id": f"game_{i // 3}"} for i in range(size)]
+    corr = np.eye(size)
+    for i, j in combinations(range(size), 2):
+        same_game = legs[i]["game_id"] == legs[j]["game_id"]
+        corr[i, j] = corr[j, i] = rng.uniform(0.2, 0.6) if same_game else 0.1 + rng.normal(0, 0.05)
+    ids = [leg["leg_id"] for leg in legs]
+    return legs, pd.DataFrame(corr, index=ids, columns=ids)
+
+
+def true_objective(parlay, matrix: pd.DataFrame) -> float:
+    ids = [leg.leg_id for leg in parlay.legs]
+    penalty = sum(0.1 * matrix.loc[a, b] for a, b in combinations(ids, 2) if matrix.loc[a, b] > 0.3)
+    return parlay.total_ev - penalty
+
+
+def run(solver: str, cap: float, legs, matrix, args):
+    optimizer = ParlayOptimizer(max_legs=args.max_legs, max_correlation_threshold=cap,
+                                min_ev_threshold=0.02, solver=solver)
+    optimizer.correlation_computer = FixedCorrelations(matrix)
+    times = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        parlays = optimizer.optimize_parlays(legs, num_solutions=args.solutions)
+        times.append(1000 * (time.perf_counter() - start))
+    objectives = [true_objective(parlay, matrix) for parlay in parlays]
+    violations = sum(
+        any(matrix.loc[a.leg_id, b.leg_id] > CAP for a, b in combinations(parlay.legs, 2)) for parlay in parlays
+    )
+    return statistics.median(times), objectives, violations
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark native vs PuLP parlay optimization")
+    parser.add_argument("--pools", type=int, nargs="+", default=[10, 20, 40], help="Candidate pool sizes")
+    parser.add_argument("--max-legs", type=int, default=5, help="Maximum legs per parlay")
+    parser.add_argument("--solutions", type=int, default=5, help="Parlays returned per call")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed calls per solver")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")  # PuLP 4.0 deprecation warnings
+
+    print(f"{args.solutions} parlays of up to {args.max_legs} legs; objective = EV - 0.1 x corr of pairs > 0.3")
+    print(f"{'legs':>5}  {'solver':<16}{'ms':>9}{'best obj':>10}{'mean obj':>10}{'> cap':>7}")
+    for size in args.pools:
+        legs, matrix = make_pool(size, seed=size)
+        results = {
+            "pulp": run("pulp", CAP, legs, matrix, args),
+            "native, no cap": run("native", 1.0, legs, matrix, args),
+            "native, cap 0.3": run("native", CAP, legs, matrix, args),
+        }
+        # Same constraints as the LP, so the exact search can never do worse
+        assert max(results["native, no cap"][1]) >= max(results["pulp"][1]) - 1e-9, "native worse than LP"
+        for name, (ms, objectives, violations) in results.items():
+            print(f"{size:>5}  {name:<16}{ms:>9.2f}{max(objectives):>10.3f}"
+                  f"{statistics.mean(objectives):>10.3f}{violations:>4}/{len(objectives)}")
+
+
+if __name__ == "__main__":
+    main()
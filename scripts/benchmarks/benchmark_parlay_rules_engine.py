@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Parlay rules benchmark - interpreted JSON rules vs CompiledRuleSet.
+
+Validates a batch of random candidate parlays (default 100,000 per sport, 2-6
+legs each) against config/nba_markets.json and config/nfl_markets.json with:
+
+- interpreted: ParlayRulesEngine(use_compiled_rules=False), every rule
+  dict re-read and team/player regexes re-run per leg pair
+- compiled: the default engine, legs featurized once into condition
+  bitmasks and interned names
+
+Both engines must agree on every parlay (validity, violation rule ids in
+order, and correlation tax) before timings are reported.
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from tools.parlay_rules_engine import ParlayRulesEngine
+
+TEAMS = {
+    "nba": [("Lakers", "Celtics"), ("Warriors", "Nets"), ("Heat", "Bulls"), ("Knicks", "Clippers"), ("Nuggets", "Suns")],
+    "nfl": [("Kansas City Chiefs", "Bills"), ("Dallas Cowboys", "New York Giants"), ("Patriots", "Dolphins"),
+            ("Ravens", "Steelers"), ("Packers", "Bears"), ("Eagles", "Commanders")]
+}
+PLAYERS = {
+    "nba": ["LeBron James", "Anthony Davis", "Jayson Tatum", "Stephen Curry", "Jimmy Butler", "Nikola Jokic"],
+    "nfl": ["Patrick Mahomes", "Travis Kelce", "Josh Allen", "Stefon Diggs", "Dak Prescott", "CeeDee Lamb"]
+}
+
+
+def make_leg(rng: random.Random, sport: str, markets: Dict[str, Any]) -> Dict[str, Any]:
+    home, away = rng.choice(TEAMS[sport])
+    game_id = f"{home}_vs_{away}".lower().replace(" ", "_")
+    market_type = rng.choice(list(markets))
+    group = markets[market_type].get("group")
+    side = rng.choice(["Over", "Under"])
+    line = rng.choice([0.5, 1.5, 3.5, 24.5, 45.5, 220.5, 275.5])
+
+    if group == "PLAYER_PROP" or market_type.startswith("player_"):
+        selection = f"{rng.choice(PLAYERS[sport])} {side} {line}"
+    elif "total" in market_type:
+        selection = f"{rng.choice([home, away])} {side} {line}" if "team" in market_type else f"{side} {line}"
+    elif "spread" in market_type:
+        selection = f"{rng.choice([home, away])} {rng.choice(['-', '+'])}{line}"
+    else:
+        selection = rng.choice([home, away])
+
+    return {
+        "game_id": game_id,
+        "market_type": market_type,
+        "selection_name": selection,
+        "odds_decimal": round(rng.uniform(1.05, 3.5), 2),
+        "line": line
+    }
+
+
+def build_parlays(sport: str, markets: Dict[str, Any], n_parlays: int, seed: int) -> List[List[Dict[str, Any]]]:
+    rng = random.Random(seed)
+    return [[make_leg(rng, sport, markets) for _ in range(rng.randint(2, 6))] for _ in range(n_parlays)]
+
+
+def run(engine: ParlayRulesEngine, sport: str, parlays: List[List[Dict[str, Any]]]):
+    start = time.perf_counter()
+    results = [engine.validate_parlay(legs, sport) for legs in parlays]
+    return results, time.perf_counter() - start
+
+
+def summarize(result) -> tuple:
+    return result.is_valid, [v.rule_id for v in result.violations], result.correlation_tax_multiplier
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark parlay rule validation")
+    parser.add_argument("--parlays", type=int, default=100_000, help="Candidate parlays per sport")
+    parser.add_argument("--sports", nargs="+", default=["nba", "nfl"])
+    parser.add_argument("--seed", type=int, default=13)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.disable(logging.WARNING)  # validate_parlay logs every parlay
+
+    print(f"{'sport':<6}{'parlays':>9}{'interpreted s':>15}{'compiled s':>12}{'speedup':>9}{'rejected':>10}")
+    for sport in args.sports:
+        interpreted_engine = ParlayRulesEngine(use_compiled_rules=False)
+        compiled_engine = ParlayRulesEngine()
+        parlays = build_parlays(sport, interpreted_engine.load_rules(sport)["market_definitions"],
+                                args.parlays, args.seed)
+
+        interpreted, interpreted_s = run(interpreted_engine, sport, parlays)
+        compiled, compiled_s = run(compiled_engine, sport, parlays)
+        mismatches = sum(summarize(a) != summarize(b) for a, b in zip(interpreted, compiled))
+        assert mismatches == 0, f"{mismatches} {sport} parlays validated differently"
+
+        rejected = sum(not result.is_valid for result in compiled)
+        print(f"{sport:<6}{len(parlays):>9}{interpreted_s:>15.2f}{compiled_s:>12.2f}"
+              f"{interpreted_s / compiled_s:>8.1f}x{rejected:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Prop leg scoring benchmark - per-leg HistoricalPropTrainer.predict vs
+predict_batch, using the trained models in models/prop_predictor_{nba,nfl}.
+
+Generates --legs candidate legs (half NBA, half NFL, randomised projections
+and odds) and times:
+
+- per-leg: the previous predict path (one-row DataFrame, default-filling
+  loop, transform and predict_proba per leg), as rank_legs_by_prop_ev used it
+- predict_batch: one transform and one predict_proba per sport
+- rank_legs_by_prop_ev: the full ParlayBuilder ranking path (feature
+  extraction, batched prediction, EV, sort)
+
+Per-leg and batched probabilities must agree before timings are reported.
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from ml.ml_prop_trainer import HistoricalPropTrainer
+from tools.parlay_builder import ParlayBuilder
+
+SPORT_KEYS = {"nba": "basketball_nba", "nfl": "americanfootball_nfl"}
+
+
+def make_leg(rng: random.Random, sport: str, i: int) -> dict:
+    leg = {"selection": f"{sport}_leg_{i}", "sport_key": SPORT_KEYS[sport],
+           "odds": rng.choice([round(rng.uniform(1.4, 3.5), 2), rng.choice(["+120", "-110", "+250", "-150"])]),
+           "home_away": rng.choice(["home", "away"]), "opponent_def_rating": rng.uniform(95, 120)}
+    if sport == "nba":
+        leg.update(projected_points=rng.uniform(5, 40), projected_rebounds=rng.uniform(0, 14),
+                   projected_assists=rng.uniform(0, 11), projected_minutes=rng.uniform(15, 40),
+                   season_avg_points=rng.uniform(5, 35), usage_rate=rng.uniform(12, 35))
+    else:
+        leg.update(projected_receiving_yards=rng.uniform(0, 140), projected_rushing_yards=rng.uniform(0, 120),
+                   projected_receptions=rng.uniform(0, 10), position=rng.choice(["QB", "RB", "WR", "TE"]),
+                   weather=rng.choice(["clear", "rain", "snow", "wind"]), season_avg_yards=rng.uniform(10, 120))
+    return leg
+
+
+def predict_per_leg(trainer: HistoricalPropTrainer, features: dict) -> float:
+    """The previous HistoricalPropTrainer.predict body."""
+    df = pd.DataFrame([features])
+    for feature in trainer.numerical_features + trainer.categorical_features:
+        if feature not in df.columns:
+            if feature in trainer.categorical_features:
+                df[feature] = 'Unknown' if trainer.sport == 'nba' else 'Other'
+            else:
+                df[feature] = 0.0
+    X_processed = trainer.preprocessor.transform(df[trainer.numerical_features + trainer.categorical_features])
+    return float(trainer.model.predict_proba(X_processed)[0, 1])
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark batched prop prediction")
+    parser.add_argument("--legs", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")  # sklearn version / unknown-category warnings on every transform
+    rng = random.Random(args.seed)
+
+    builder = ParlayBuilder("basketball_nba")
+    for sport in SPORT_KEYS:
+        if sport not in builder.prop_trainers:
+            trainer = HistoricalPropTrainer(sport)
+            trainer.load_model()
+            builder.prop_trainers[sport] = trainer
+
+    legs = [make_leg(rng, sport, i) for i in range(args.legs // 2) for sport in SPORT_KEYS]
+    features = {sport: [builder._extract_prop_features(leg, sport) for leg in legs
+                        if leg["sport_key"] == SPORT_KEYS[sport]] for sport in SPORT_KEYS}
+
+    timings, per_leg, batched = {}, {}, {}
+    start = time.perf_counter()
+    for sport, rows in features.items():
+        per_leg[sport] = np.array([predict_per_leg(builder.prop_trainers[sport], row) for row in rows])
+    timings["per-leg predict"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for sport, rows in features.items():
+        batched[sport] = builder.prop_trainers[sport].predict_batch(rows)
+    timings["predict_batch"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ranked = builder.rank_legs_by_prop_ev(legs, top_k=len(legs))
+    timings["rank_legs_by_prop_ev"] = time.perf_counter() - start
+
+    max_diff = max(float(np.abs(per_leg[sport] - batched[sport]).max()) for sport in SPORT_KEYS)
+    assert max_diff < 1e-5, f"probabilities differ by {max_diff}"
+    assert len(ranked) == len(legs)
+
+    print(f"{len(legs)} legs ({', '.join(f'{len(rows)} {sport}' for sport, rows in features.items())})")
+    print(f"{'path':<24}{'seconds':>10}{'legs/s':>12}")
+    for name, seconds in timings.items():
+        print(f"{name:<24}{seconds:>10.3f}{len(legs) / seconds:>12.0f}")
+    print(f"speedup {timings['per-leg predict'] / timings['predict_batch']:.0f}x, "
+          f"max probability difference {max_diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Knowledge-base cold-start benchmark - SportsKnowledgeRAG startup time and RSS.
+
+Starts a fresh interpreter per run (imports included, embedding and offset
+indexes already built in a temp directory) and reports:
+
+- serving: seconds until SportsKnowledgeRAG() returns, i.e. until the API
+  can answer health checks, and the peak RSS at that point
+- model ready: seconds until the embedding model and index are loaded
+  (the same moment for --mode eager), and the peak RSS after a query
+
+--mode background loads the model on a background thread
+(background_load=True); --mode eager waits for it in the constructor.
+
+Needs the SentenceTransformer model; --encoder random-minilm saves a
+randomly initialised model with the all-MiniLM-L6-v2 shape to a temp
+directory, so load cost and memory are realistic offline.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+
+def peak_rss_kb():
+    # ru_maxrss survives exec (it would report the parent's peak); VmHWM does not
+    try:
+        with open('/proc/self/status') as f:
+            return next(int(line.split()[1]) for line in f if line.startswith('VmHWM'))
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+sys.path.insert(0, {root!r})
+import logging
+logging.disable(logging.WARNING)
+from tools.knowledge_base_rag import SportsKnowledgeRAG
+options = dict(chunks_path={chunks!r}, embeddings_model={model!r}, index_dir={index_dir!r})
+if {background!r}:
+    options['background_load'] = True
+rag = SportsKnowledgeRAG(**options)
+serving_s = time.perf_counter() - start
+serving_rss = peak_rss_kb()
+if {background!r}:
+    rag.wait_until_ready()
+ready_s = time.perf_counter() - start
+result = rag.search_knowledge("kelly criterion bankroll sizing", top_k=5)
+print(json.dumps({{'serving_s': serving_s, 'ready_s': ready_s, 'serving_rss_kb': serving_rss,
+                  'peak_rss_kb': peak_rss_kb(),
+                  'chunks': len(rag.sports_betting_chunks), 'hits': len(result.chunks),
+                  'indexed': rag.embedding_index is not None}}))
+"""
+
+
+def run_child(chunks: str, model: str, index_dir: str, background: bool) -> dict:
+    code = CHILD.format(root=str(PROJECT_ROOT.resolve()), chunks=chunks, model=model, index_dir=index_dir,
+                        background=background)
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SportsKnowledgeRAG cold start")
+    parser.add_argument("--chunks", default="data/chunks/chunks.json")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--encoder", choices=["sentence-transformers", "random-minilm"],
+                        default="sentence-transformers")
+    parser.add_argument("--mode", choices=["eager", "background", "both"], default="both")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    modes = ["eager", "background"] if args.mode == "both" else [args.mode]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model = args.model
+        if args.encoder == "random-minilm":
+            from scripts.benchmarks.benchmark_embedder import random_minilm
+            model = str(Path(tmp) / "minilm")
+            random_minilm(Path("data"), Path(tmp)).save(model)
+
+        # Warm-up: builds the embedding index (and any other startup caches)
+        run_child(args.chunks, model, tmp, background=False)
+        results = {mode: [run_child(args.chunks, model, tmp, mode == "background") for _ in range(args.runs)]
+                   for mode in modes}
+
+    first = results[modes[0]][0]
+    assert first["indexed"], "embedding model did not load"
+    print(f"{first['chunks']} sports chunks, encoder {args.encoder}, median of {args.runs} cold starts")
+    print(f"{'mode':<12}{'serving (s)':>13}{'RSS (MB)':>10}{'ready (s)':>11}{'peak RSS (MB)':>15}")
+    for mode, runs in results.items():
+        def median(key):
+            return statistics.median(run[key] for run in runs)
+        print(f"{mode:<12}{median('serving_s'):>13.2f}{median('serving_rss_kb') / 1024:>10.0f}"
+              f"{median('ready_s'):>11.2f}{median('peak_rss_kb') / 1024:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Bulk parlay validation benchmark - validate_parlay loop vs validate_many.
+
+Draws a batch of candidate parlays (default 100,000 per sport, 2-6 legs) from
+a fixed pool of legs (default 80), the shape of an optimizer or simulator
+search, and validates them with:
+
+- loop: ParlayRulesEngine.validate_parlay per candidate (compiled rules,
+  per-parlay logging and config lookup)
+- many: validate_many, rule matches computed once per distinct leg pair
+- many xN: validate_many split across N worker processes (only pays off on
+  multi-core hosts with very large batches)
+
+All three must agree on every parlay before timings are reported.
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from scripts.benchmarks.benchmark_parlay_rules_engine import make_leg, summarize
+from tools.parlay_rules_engine import ParlayRulesEngine
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark bulk parlay validation")
+    parser.add_argument("--parlays", type=int, default=100_000, help="Candidate parlays per sport")
+    parser.add_argument("--pool-legs", type=int, default=80, help="Distinct legs candidates are drawn from")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sports", nargs="+", default=["nba", "nfl"])
+    parser.add_argument("--seed", type=int, default=13)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.disable(logging.WARNING)  # validate_parlay logs every parlay
+
+    many_n = f"many x{args.processes} s"
+    print(f"{'sport':<6}{'parlays':>9}{'loop s':>9}{'many s':>9}{many_n:>14}{'speedup':>9}{'rejected':>10}")
+    for sport in args.sports:
+        engine = ParlayRulesEngine()
+        rng = random.Random(args.seed)
+        markets = engine.load_rules(sport)["market_definitions"]
+        pool = [make_leg(rng, sport, markets) for _ in range(args.pool_legs)]
+        parlays = [rng.sample(pool, rng.randint(2, 6)) for _ in range(args.parlays)]
+        engine.get_compiled_rules(sport)  # compile outside the timings
+
+        looped, loop_s = timed(lambda: [engine.validate_parlay(legs, sport) for legs in parlays])
+        many, many_s = timed(lambda: engine.validate_many(parlays, sport))
+        chunk_size = -(-len(parlays) // args.processes)
+        pooled, pooled_s = timed(lambda: engine.validate_many(parlays, sport, processes=args.processes,
+                                                              chunk_size=chunk_size))
+
+        mismatches = sum(summarize(a) != summarize(b) or summarize(a) != summarize(c)
+                         for a, b, c in zip(looped, many, pooled))
+        assert mismatches == 0, f"{mismatches} {sport} parlays validated differently"
+
+        rejected = sum(not result.is_valid for result in many)
+        print(f"{sport:<6}{len(parlays):>9}{loop_s:>9.2f}{many_s:>9.2f}{pooled_s:>14.2f}"
+              f"{loop_s / many_s:>8.1f}x{rejected:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from tools.bets_logger import BetsLogger
 from tools.odds_fetcher_tool import OddsFetcherTool, GameOdds
+from tools.market_snapshot_cache import get_market_snapshot_cache
 
 
 logger = logging.getLogger(__name__)
@@ -70,7 +71,7 @@ def fetch_latest_odds(odds_fetcher: OddsFetcherTool, sport_key: str, regions: st
     markets_list = [m.strip() for m in markets.split(',')]
     
     try:
-        games = odds_fetcher.get_game_odds(sport_key, regions, markets_list)
+        games = get_market_snapshot_cache().get(sport_key, odds_fetcher.get_game_odds, regions, markets_list)
         logger.info(f"Fetched odds for {len(games)} games")
         return games
     except Exception as e:
@@ -16,6 +16,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from tools.odds_fetcher_tool import OddsFetcherTool, GameOdds, BookOdds, Selection
+from tools.odds_snapshot_store import ColumnarOddsSnapshot
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -178,29 +179,21 @@ def load_odds_snapshot(args: argparse.Namespace) -> List[GameOdds]:
 
 def build_candidate_pool(games: List[GameOdds], markets: List[str]) -> List[CandidateLeg]:
     """Build candidate pool of legs from odds data."""
-    candidates = []
-    seen = set()  # For deduplication
-    
-    for game in games:
-        for book in game.books:
-            if book.market not in markets:
-                continue
-            
-            for selection in book.selections:
-                # Create unique key for deduplication
-                key = (game.game_id, book.market, selection.name, selection.line, book.bookmaker)
-                if key in seen:
-                    continue
-                seen.add(key)
-                
-                candidates.append(CandidateLeg(
-                    game_id=game.game_id,
-                    bookmaker=book.bookmaker,
-                    market=book.market,
-                    selection_name=selection.name,
-                    line=selection.line,
-                    price_decimal=selection.price_decimal
-                ))
+    # Deduplicate on (game, market, selection, line, bookmaker) over the columnar snapshot
+    snapshot = ColumnarOddsSnapshot.from_game_odds(games)
+    rows = snapshot.unique_rows(markets=markets)
+    
+    candidates = [
+        CandidateLeg(
+            game_id=quote.game_id,
+            bookmaker=quote.bookmaker,
+            market=quote.market,
+            selection_name=quote.selection_name,
+            line=quote.line,
+            price_decimal=quote.price_decimal
+        )
+        for quote in snapshot.quotes(rows)
+    ]
     
     logger.info(f"Built candidate pool: {len(candidates)} unique legs from {len(games)} games")
     return candidates
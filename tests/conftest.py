@@ -0,0 +1,59 @@
+import importlib
+import zlib
+
+import numpy as np
+import pytest
+
+# Process-wide caches reset around every test: (module, reset function)
+SHARED_CACHE_RESETS = [
+    ("tools.market_snapshot_cache", "reset_market_snapshot_cache"),  # odds snapshots
+    ("tools.correlation_cache", "reset_correlation_cache"),  # memoized correlation scores
+    ("tools.rag_query_cache", "reset_rag_query_cache"),  # cached knowledge-base queries
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_caches():
+    """Keep the process-wide caches from leaking between tests."""
+    resets = []
+    for module_name, reset_name in SHARED_CACHE_RESETS:
+        try:
+            resets.append(getattr(importlib.import_module(module_name), reset_name))
+        except ImportError:
+            continue
+    for reset in resets:
+        reset()
+    yield
+    for reset in resets:
+        reset()
+
+
+class FakeClock:
+    """Manually advanced clock for caches that take a clock callable."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class HashingEncoder:
+    """Deterministic offline bag-of-words encoder with the SentenceTransformer interface."""
+
+    def __init__(self, *args, dim=64, **kwargs):
+        self.dim = dim
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        self.calls.append(len(texts))
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % self.dim] += 1.0
+        return vectors[0] if single else vectors
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the embedding search backends (exact and IVF-flat).
+"""
+
+import numpy as np
+import pytest
+
+from tools.ann_index import ExactSearchBackend, IVFFlatBackend, create_backend
+from tools.embedding_index import EmbeddingIndex, normalize_rows
+
+
+def clustered_vectors(n, dim=32, n_clusters=40, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, dim))
+    points = centers[rng.integers(n_clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    return normalize_rows(points)
+
+
+def recall_at_k(approximate, exact):
+    return len(set(approximate) & set(exact)) / len(exact)
+
+
+class TestIVFFlatBackend:
+    """Test suite for IVFFlatBackend."""
+
+    @pytest.fixture
+    def vectors(self):
+        return clustered_vectors(5000)
+
+    def test_recall_against_exact_search(self, vectors):
+        ivf = IVFFlatBackend(nprobe=8)
+        ivf.fit(vectors)
+        exact = ExactSearchBackend()
+
+        rng = np.random.default_rng(1)
+        queries = normalize_rows(vectors[rng.choice(len(vectors), 50)] + 0.1 * rng.normal(size=(50, 32)))
+        recalls = [recall_at_k(ivf.search(vectors, q, 10)[0], exact.search(vectors, q, 10)[0]) for q in queries]
+        assert np.mean(recalls) >= 0.9
+
+        # Scanning every list is exact
+        ivf.nprobe = len(ivf.centroids)
+        rows, scores = ivf.search(vectors, queries[0], 10)
+        exact_rows, exact_scores = exact.search(vectors, queries[0], 10)
+        np.testing.assert_allclose(scores, exact_scores, rtol=1e-6)
+
+    def test_filter_is_applied_inside_the_index(self, vectors):
+        ivf = IVFFlatBackend(nprobe=1)
+        ivf.fit(vectors)
+        allowed = np.zeros(len(vectors), dtype=bool)
+        allowed[::97] = True  # ~52 rows spread over all lists
+
+        rows, _ = ivf.search(vectors, vectors[0], 10, allowed)
+        assert len(rows) == 10  # probe widened until enough rows survive the filter
+        assert allowed[rows].all()
+
+    def test_incremental_add_matches_refit_assignments(self, vectors):
+        ivf = IVFFlatBackend()
+        ivf.fit(vectors[:4000])
+        ivf.add(vectors, 4000)
+        assert len(ivf.assignments) == 5000
+        np.testing.assert_array_equal(ivf.assignments[4000:], IVFFlatBackend._assign(vectors[4000:], ivf.centroids))
+
+        rows, scores = ivf.search(vectors, vectors[4500], 1)
+        assert rows[0] == 4500 and scores[0] == pytest.approx(1.0, abs=1e-5)
+
+    def test_auto_backend_selection(self):
+        assert create_backend("auto", 1_000).name == "exact"
+        assert create_backend("auto", 100_000).name == "ivf"
+        with pytest.raises(ValueError):
+            create_backend("hnsw")
+
+
+class TestEmbeddingIndexBackends:
+    """EmbeddingIndex with labels, incremental adds and persisted backend state."""
+
+    def test_label_mask_and_add(self):
+        vectors = clustered_vectors(300)
+        index = EmbeddingIndex(vectors[:200], list(range(200)))
+        index.set_labels([1 if i % 2 else 2 for i in range(200)])
+
+        assert all(row % 2 == 1 for row, _ in index.search(vectors[0], 20, label_mask=1))
+        assert index.search(vectors[0], 1, label_mask=2)[0][0] == 0
+
+        index.add(vectors[200:], list(range(200, 300)), [4] * 100)
+        assert [row for row, _ in index.search(vectors[250], 1, label_mask=4)] == [250]
+        with pytest.raises(ValueError):
+            index.add(vectors[:1], [300])
+
+    def test_backend_state_is_saved_and_reused(self, tmp_path):
+        chunks_path = tmp_path / "chunks.json"
+        chunks_path.write_text("[]")
+        vectors = clustered_vectors(2000)
+        index = EmbeddingIndex(vectors, list(range(2000)), content_hash="h1", model_name="m")
+        index.save(chunks_path)
+        index.use_backend(IVFFlatBackend(), chunks_path)
+        assert EmbeddingIndex.backend_path_for(chunks_path, "m", "ivf").exists()
+
+        restored = IVFFlatBackend(seed=99)
+        EmbeddingIndex(vectors, list(range(2000)), content_hash="h1", model_name="m").use_backend(restored, chunks_path)
+        np.testing.assert_array_equal(restored.centroids, index.backend.centroids)
+
+        # Stale content hash: retrained with its own seed
+        retrained = IVFFlatBackend(seed=99)
+        EmbeddingIndex(vectors, list(range(2000)), content_hash="h2", model_name="m").use_backend(retrained, chunks_path)
+        assert not np.array_equal(retrained.centroids, index.backend.centroids)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for the BM25 inverted index and hybrid knowledge-base retrieval.
+"""
+
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from tests.conftest import HashingEncoder
+from tests.test_embedding_index import write_chunks
+from tools.bm25_index import BM25Index, reciprocal_rank_fusion, tokenize
+from tools.knowledge_base_rag import SPORT_LABEL_BITS, SportsKnowledgeRAG, sport_label_bits
+
+TEXTS = [
+    "Kelly criterion bankroll sizing for a parlay",
+    "closing line value and sharp market moves",
+    "parlay correlation: same game parlay legs are correlated",
+    "bankroll bankroll bankroll management basics",
+    "NBA totals and the closing line",
+]
+
+
+def brute_force_bm25(texts, query, k1=1.2, b=0.75):
+    docs = [Counter(tokenize(text)) for text in texts]
+    avg_len = sum(sum(doc.values()) for doc in docs) / len(docs)
+    scores = []
+    for doc in docs:
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(term in other for other in docs)
+            if term in doc:
+                idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+                tf = doc[term]
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * sum(doc.values()) / avg_len))
+        scores.append(score)
+    return scores
+
+
+class TestBM25Index:
+    """Test suite for BM25Index."""
+
+    def test_scores_match_reference_bm25(self):
+        index = BM25Index.build(TEXTS, list(range(len(TEXTS))))
+        for query in ["bankroll parlay", "closing line", "correlated legs kelly", "unknown words"]:
+            expected = brute_force_bm25(TEXTS, query)
+            hits = index.search(query, top_k=len(TEXTS))
+            assert [row for row, _ in hits] == sorted((i for i, s in enumerate(expected) if s > 0),
+                                                     key=lambda i: -expected[i])
+            for row, score in hits:
+                assert score == pytest.approx(expected[row], rel=1e-5)
+
+    def test_incremental_add_saved_and_invalidated(self, tmp_path):
+        chunks_path = tmp_path / "chunks.json"
+        chunks_path.write_text("[]")
+        index = BM25Index.build(TEXTS[:2], [0, 1])
+        index.add(TEXTS[2:], [2, 3, 4])
+        full = BM25Index.build(TEXTS, [0, 1, 2, 3, 4])
+        assert index.search("bankroll closing", 5) == pytest.approx(full.search("bankroll closing", 5))
+
+        loaded = BM25Index.load_or_build(chunks_path, TEXTS, [0, 1, 2, 3, 4])
+        assert BM25Index.load(chunks_path).search("parlay", 3) == loaded.search("parlay", 3)
+        chunks_path.write_text("[ ]")
+        assert BM25Index.load(chunks_path) is None
+
+    def test_allowed_rows_and_rank_fusion(self):
+        index = BM25Index.build(TEXTS, list(range(len(TEXTS))))
+        allowed = np.array([False, True, True, True, True])
+        assert 0 not in [row for row, _ in index.search("kelly bankroll parlay", 5, allowed)]
+
+        labeled = BM25Index.build(TEXTS, list(range(len(TEXTS))), label_fn=lambda text: 2 if "NBA" in text else 1)
+        labeled.add(["NBA parlay"], [5], [2])
+        assert {row for row, _ in labeled.search("parlay closing", 6, labeled.allowed_rows(2))} == {4, 5}
+
+        fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1]], k=60)
+        assert [row for row, _ in fused] == [1, 3, 2]
+        assert fused[0][1] == pytest.approx(1 / 61 + 1 / 62)
+
+
+class TestHybridRetrieval:
+    """SportsKnowledgeRAG keyword (BM25) and hybrid retrieval modes."""
+
+    @pytest.fixture
+    def chunks_path(self, tmp_path, monkeypatch):
+        chunks_path = tmp_path / "chunks.json"
+        write_chunks(chunks_path)
+        monkeypatch.setattr("tools.knowledge_base_rag.SentenceTransformer", lambda name: HashingEncoder())
+        return chunks_path
+
+    def test_keyword_mode_uses_saved_inverted_index(self, chunks_path):
+        rag = SportsKnowledgeRAG(chunks_path=str(chunks_path), embeddings_model="hash-64", retrieval_mode="keyword")
+        assert BM25Index.path_for(chunks_path).exists()
+        result = rag.search_knowledge("kelly bankroll", top_k=5)
+        assert len(result.chunks) == 5 and result.chunks[0].relevance_score == 1.0
+        assert all({"kelly", "bankroll"} & set(chunk.content.split()) for chunk in result.chunks)
+        assert rag.embedding_model.calls == [300]  # index build only: no query encodes
+
+        with pytest.raises(ValueError):
+            SportsKnowledgeRAG(chunks_path=str(chunks_path), retrieval_mode="sparse")
+
+    def test_keyword_sport_filter_without_embeddings(self, chunks_path, monkeypatch):
+        monkeypatch.setattr("tools.knowledge_base_rag.SentenceTransformer", None)
+        monkeypatch.setattr("tools.knowledge_base_rag.HAS_EMBEDDINGS", False)
+        rag = SportsKnowledgeRAG(chunks_path=str(chunks_path), embeddings_model="hash-64")
+        assert rag.model_status == "unavailable"
+
+        filtered = rag.search_knowledge("nba spread closing line", top_k=10, sport_filter="NFL")
+        assert len(filtered.chunks) == 10
+        assert all(sport_label_bits(chunk.content) & SPORT_LABEL_BITS["NFL"] for chunk in filtered.chunks)
+
+        # Labels are saved with the postings and reused on the next load
+        reloaded = BM25Index.load(chunks_path)
+        assert reloaded.labels.tolist() == [sport_label_bits(text) for text in rag.sports_betting_chunks.contents()]
+
+    def test_hybrid_mode_fuses_vector_and_bm25_rankings(self, chunks_path):
+        rag = SportsKnowledgeRAG(chunks_path=str(chunks_path), embeddings_model="hash-64", retrieval_mode="hybrid")
+        target = rag.sports_betting_chunks[123]
+        result = rag.search_knowledge(target.content, top_k=5, min_relevance=0.0)
+        assert result.chunks[0].chunk_id == target.chunk_id
+        assert result.chunks[0].relevance_score == pytest.approx(1.0)
+
+        filtered = rag.search_knowledge("nba spread closing line", top_k=10, min_relevance=0.0, sport_filter="NFL")
+        assert len(filtered.chunks) == 10
+        assert all(sport_label_bits(chunk.content) & SPORT_LABEL_BITS["NFL"] for chunk in filtered.chunks)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Parity tests for CompiledFeaturePipeline against SportFeatureEngineer.engineer_features(fit=False).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml.feature_engineering import (
+    CompiledFeaturePipeline, MultiSportFeatureEngineer, SportFeatureEngineer, compiled_pipeline_path
+)
+
+SPORTS = ["nba", "nfl"]
+
+
+def training_frame(sport: str) -> pd.DataFrame:
+    return pd.read_csv(f"data/ml_training/{sport}_parlay_training_data.csv")
+
+
+@pytest.fixture(scope="module", params=SPORTS)
+def fitted(request, tmp_path_factory):
+    """(engineer fitted on the first 2000 rows, held-out rows, saved pipeline path)."""
+    df = training_frame(request.param)
+    engineer = SportFeatureEngineer(request.param)
+    engineer.engineer_features(df.iloc[:2000], fit=True)
+    path = tmp_path_factory.mktemp("feature_pipelines") / f"{request.param}_feature_pipeline.pkl"
+    engineer.save_pipeline(str(path))
+    return engineer, df.iloc[2000:2500].reset_index(drop=True), path
+
+
+def expected_matrix(engineer: SportFeatureEngineer, df: pd.DataFrame) -> np.ndarray:
+    engineered, _ = engineer.engineer_features(df, fit=False)
+    return engineered[engineer.feature_columns].values
+
+
+def assert_same_matrix(expected: np.ndarray, actual: np.ndarray):
+    assert expected.shape == actual.shape
+    for j in range(expected.shape[1]):
+        try:
+            np.testing.assert_array_equal(actual[:, j].astype(float), expected[:, j].astype(float))
+        except ValueError:  # passthrough text column
+            assert list(actual[:, j]) == list(expected[:, j])
+
+
+def test_save_pipeline_exports_compiled_copy(fitted):
+    engineer, _, path = fitted
+    compiled = CompiledFeaturePipeline.load(compiled_pipeline_path(path))
+    assert compiled.sport == engineer.sport
+    assert compiled.feature_columns == engineer.feature_columns
+
+
+def test_dict_rows_match_engineer_features(fitted):
+    engineer, df, path = fitted
+    compiled = CompiledFeaturePipeline.load(compiled_pipeline_path(path))
+    assert_same_matrix(expected_matrix(engineer, df), compiled.transform(df.to_dict("records")))
+    assert_same_matrix(expected_matrix(engineer, df.iloc[:1]), compiled.transform(df.iloc[0].to_dict()))
+
+
+def test_structured_array_matches_engineer_features(fitted):
+    engineer, df, path = fitted
+    records = df.to_records(index=False)
+    records = records.astype([(name, "U32" if records.dtype[name].kind == "O" else records.dtype[name])
+                              for name in records.dtype.names])
+    compiled = CompiledFeaturePipeline.load(compiled_pipeline_path(path))
+    assert_same_matrix(expected_matrix(engineer, df), compiled.transform(records))
+
+
+def test_edge_values_match_engineer_features(fitted):
+    engineer, df, path = fitted
+    edge = df.iloc[:6].copy()
+    edge["line_delta"] = [-10.0, -2.0, 2.0, 10.0, 10.5, -50.0]  # pd.cut bin edges are right-closed
+    edge.loc[0, "injury_status"] = "out"  # category never seen in training
+    edge.loc[1, "prop_type"] = "double_double"
+    edge.loc[3, "temperature"] = np.nan
+    compiled = CompiledFeaturePipeline.load(compiled_pipeline_path(path))
+    assert_same_matrix(expected_matrix(engineer, edge), compiled.transform(edge.to_dict("records")))
+
+
+def test_missing_column_raises_like_engineer_features(fitted):
+    engineer, df, path = fitted
+    compiled = CompiledFeaturePipeline.load(compiled_pipeline_path(path))
+    with pytest.raises(KeyError):
+        compiled.transform(df.drop(columns=["prop_odds"]).to_dict("records"))
+    with pytest.raises(KeyError):
+        engineer.engineer_features(df.drop(columns=["prop_odds"]), fit=False)
+    assert compiled.transform([]).shape == (0, len(engineer.feature_columns))
+
+
+def test_transform_records_matches_transform_new_data(fitted):
+    engineer, df, path = fitted
+    multi = MultiSportFeatureEngineer()
+    multi.output_dir = path.parent
+    rows = df.iloc[:20]
+    assert_same_matrix(multi.transform_new_data(engineer.sport, rows),
+                       multi.transform_records(engineer.sport, rows.to_dict("records")))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the memoized correlation cache.
+"""
+
+import numpy as np
+import pytest
+import torch
+
+from tests.conftest import FakeClock
+from tools.correlation_cache import CorrelationCache, leg_fingerprint
+from tools.correlation_model import DynamicCorrelationModel, CorrelationGNN, HAS_TORCH_GEOMETRIC
+
+
+def make_features(n, seed=0):
+    rng = np.random.default_rng(seed)
+    features = []
+    for i in range(n):
+        market = [0.0] * 5
+        market[i % 5] = 1.0
+        features.append(market + [float(rng.random()), float(rng.uniform(-1, 1)), 1.0, 0.0])
+    return features
+
+
+class TestCorrelationCache:
+    """Test suite for CorrelationCache."""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock(1000.0)
+
+    def test_fingerprints_are_stable(self):
+        features = [1.0, 0.0, 0.0, 0.0, 0.0, 0.185, -0.11, 1.0, 0.0]
+        assert leg_fingerprint(features, "g1") == leg_fingerprint(np.array(features, dtype=np.float32), "g1")
+        assert leg_fingerprint(features, "g1") != leg_fingerprint(features, "g2")
+
+    def test_pairs_are_order_independent(self, clock):
+        cache = CorrelationCache(clock=clock)
+        cache.put("ns", "a", "b", 0.4)
+        assert cache.get("ns", "b", "a") == 0.4
+        assert cache.get("other", "a", "b") is None
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_lru_eviction_and_ttl(self, clock):
+        cache = CorrelationCache(max_entries=2, ttl=10.0, clock=clock)
+        cache.put("ns", "a", "b", 0.1)
+        cache.put("ns", "a", "c", 0.2)
+        cache.get("ns", "a", "b")
+        cache.put("ns", "a", "d", 0.3)
+        assert cache.get("ns", "a", "c") is None  # least recently used
+        assert cache.stats()["evictions"] == 1
+
+        clock.now += 11
+        assert cache.get("ns", "a", "b") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_invalidate_by_prefix(self, clock):
+        cache = CorrelationCache(clock=clock)
+        cache.put("gnn:v1:0.5", "a", "b", 0.1)
+        cache.put("optimizer:x", "a", "b", 0.2)
+        assert cache.invalidate("gnn:v1:") == 1
+        assert cache.get("optimizer:x", "a", "b") == 0.2
+
+    def test_persistence_round_trip(self, clock, tmp_path):
+        path = tmp_path / "correlations.json"
+        cache = CorrelationCache(ttl=10.0, persist_path=str(path), clock=clock)
+        cache.put("ns", "a", "b", 0.7)
+        assert cache.save() == 1
+
+        restarted = CorrelationCache(persist_path=str(path), clock=clock)
+        assert restarted.load() == 1
+        assert restarted.get("ns", "a", "b") == 0.7
+
+        clock.now += 11
+        assert CorrelationCache(persist_path=str(path), clock=clock).load() == 0
+
+
+class TestCorrelationModelCaching:
+    """predict_correlation_matrix reuses cached pair scores."""
+
+    @pytest.fixture
+    def model(self, tmp_path):
+        return DynamicCorrelationModel(db_path=str(tmp_path / "bets.sqlite"),
+                                       model_save_path=str(tmp_path / "model"),
+                                       correlation_cache=CorrelationCache())
+
+    def test_repeat_pool_is_served_from_cache(self, model):
+        features = make_features(8)
+        game_ids = [f"g{i % 3}" for i in range(8)]
+        first = model.predict_correlation_matrix(features, game_ids=game_ids)
+
+        # Pool grown by two legs: only the 17 new pairs are scored
+        more = features + make_features(2, seed=1)
+        second = model.predict_correlation_matrix(more, game_ids=game_ids + ["g0", "g9"])
+        np.testing.assert_array_equal(second[:8, :8], first)
+
+        stats = model.correlation_cache.stats()
+        assert stats["hits"] == 28
+        assert stats["misses"] == 28 + 17
+
+    @pytest.mark.skipif(not HAS_TORCH_GEOMETRIC, reason="torch_geometric not installed")
+    def test_checkpoint_change_invalidates_scores(self, model):
+        torch.manual_seed(0)
+        model.model = CorrelationGNN(input_dim=9)
+        model.save_model()
+        features = make_features(6)
+        model.predict_correlation_matrix(features)
+        assert model.correlation_cache.stats()["entries"] == 15
+
+        # Retrained checkpoint: scores from the old weights must not be served
+        torch.manual_seed(1)
+        model.model = CorrelationGNN(input_dim=9)
+        model.save_model()
+        assert model.correlation_cache.stats()["entries"] == 0
+
+        rescored = model.predict_correlation_matrix(features)
+        assert rescored[0, 1] == pytest.approx(model.predict_correlation(features[0], features[1]), abs=1e-6)
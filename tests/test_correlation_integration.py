@@ -15,8 +15,12 @@ import sys
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+import numpy as np
+
+import tools.correlation_model
 from tools.parlay_builder import ParlayBuilder, ParlayLeg
 from tools.bets_logger import BetsLogger
+from tools.correlation_model import DynamicCorrelationModel, CorrelationGNN
 
 
 class TestCorrelationIntegration(unittest.TestCase):
@@ -307,6 +311,54 @@ class TestCorrelationModelFallback(unittest.TestCase):
             self.assertGreaterEqual(same_market_corr, 0.5)
 
 
+class TestCorrelationMatrix(unittest.TestCase):
+    """Test batched predict_correlation_matrix against per-pair predict_correlation."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.model = DynamicCorrelationModel(
+            db_path=os.path.join(self.temp_dir.name, "bets.sqlite"),
+            model_save_path=os.path.join(self.temp_dir.name, "model")
+        )
+        rng = np.random.default_rng(0)
+        self.features = []
+        for i in range(12):
+            market = [0.0] * 5
+            market[i % 5] = 1.0
+            self.features.append(market + [float(rng.random()), float(rng.uniform(-1, 1)), 1.0, 0.0])
+        self.game_ids = [f"game_{i % 4}" for i in range(12)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_rule_based_matrix_matches_pairwise(self):
+        """Without a trained model the matrix applies the rule-based fallback and same-game boost."""
+        matrix = self.model.predict_correlation_matrix(self.features, game_ids=self.game_ids)
+
+        self.assertEqual(matrix.shape, (12, 12))
+        np.testing.assert_array_equal(matrix, matrix.T)
+        for i in range(12):
+            for j in range(i + 1, 12):
+                expected = self.model._rule_based_correlation(self.features[i], self.features[j], 0.5)
+                if self.game_ids[i] == self.game_ids[j]:
+                    expected = max(expected, 0.8)
+                self.assertAlmostEqual(matrix[i, j], expected)
+
+    @unittest.skipIf(not tools.correlation_model.HAS_TORCH_GEOMETRIC, "torch_geometric not installed")
+    def test_gnn_matrix_matches_pairwise(self):
+        """One batched forward pass gives the same scores as one graph per pair."""
+        import torch
+        
+        torch.manual_seed(0)
+        self.model.model = CorrelationGNN(input_dim=9).to(self.model.device)
+
+        matrix = self.model.predict_correlation_matrix(self.features, batch_size=7)
+        for i in range(12):
+            for j in range(i + 1, 12):
+                expected = self.model.predict_correlation(self.features[i], self.features[j])
+                self.assertAlmostEqual(matrix[i, j], expected, places=5)
+
+
 if __name__ == '__main__':
     # Set up logging for tests
     import logging
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched document embedding pipeline.
+"""
+
+import pytest
+from qdrant_client import QdrantClient
+
+from tests.conftest import HashingEncoder
+from tests.test_embedding_index import WORDS
+from tools.embedder import EmbeddingPipeline, discover_files, point_id
+
+
+def write_source(path, n_words, seed=0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    words = [WORDS[(seed + i * 7) % len(WORDS)] for i in range(n_words)]
+    path.write_text("\n\n".join(" ".join(words[i:i + 40]) for i in range(0, n_words, 40)))
+
+
+class TestEmbeddingPipeline:
+    """Test suite for EmbeddingPipeline."""
+
+    @pytest.fixture
+    def data_dir(self, tmp_path):
+        data = tmp_path / "data"
+        write_source(data / "the_ringer" / "articles" / "a.md", 900, seed=1)
+        write_source(data / "action_network.md", 600, seed=2)
+        write_source(data / "notes.txt", 300, seed=3)
+        write_source(data / "chunks" / "ignored.md", 300)
+        return data
+
+    def make_pipeline(self, tmp_path, qdrant, encoder, **kwargs):
+        options = dict(batch_size=4, encode_window=16, upsert_batch_size=32, workers=1,
+                       manifest_path=str(tmp_path / "manifest.json"))
+        options.update(kwargs)
+        return EmbeddingPipeline(model=encoder, qdrant=qdrant, **options)
+
+    def test_embeds_in_batches_and_bulk_upserts(self, tmp_path, data_dir):
+        assert [p.name for p in discover_files(data_dir)] == ["action_network.md", "notes.txt", "a.md"]
+        qdrant, encoder = QdrantClient(":memory:"), HashingEncoder()
+
+        stats = self.make_pipeline(tmp_path, qdrant, encoder).run(str(data_dir))
+        assert stats.files_embedded == 3 and stats.chunks > 32
+        assert qdrant.count("sports_knowledge_base").count == stats.chunks
+        # Encode windows span files: every encode call but the last is full
+        assert all(size == 16 for size in encoder.calls[:-1])
+        assert stats.upserts <= stats.chunks // 32 + 1
+        assert stats.chunks_per_second > 0
+
+        point = qdrant.retrieve("sports_knowledge_base", [point_id(str(data_dir / "the_ringer/articles/a.md"), 1)],
+                                with_payload=True)[0]
+        assert point.payload["source"] == "the_ringer" and point.payload["source_relevance"] == 0.88
+        assert point.payload["chunk_index"] == 1
+
+    def test_rerun_skips_unchanged_and_replaces_changed_files(self, tmp_path, data_dir):
+        qdrant, encoder = QdrantClient(":memory:"), HashingEncoder()
+        first = self.make_pipeline(tmp_path, qdrant, encoder).run(str(data_dir))
+        encoder.calls.clear()
+
+        rerun = self.make_pipeline(tmp_path, qdrant, encoder).run(str(data_dir))
+        assert (rerun.files_skipped, rerun.chunks, encoder.calls) == (3, 0, [])
+
+        # Shrunk file: re-embedded, points past its new length deleted
+        write_source(data_dir / "the_ringer" / "articles" / "a.md", 100, seed=5)
+        changed = self.make_pipeline(tmp_path, qdrant, encoder).run(str(data_dir))
+        assert (changed.files_embedded, changed.files_skipped) == (1, 2)
+        assert changed.points_deleted > 0
+        assert qdrant.count("sports_knowledge_base").count == first.chunks - changed.points_deleted
+
+    def test_process_pool_matches_inline_chunking(self, tmp_path, data_dir):
+        inline, pooled = QdrantClient(":memory:"), QdrantClient(":memory:")
+        self.make_pipeline(tmp_path, inline, HashingEncoder(), manifest_path=None).run(str(data_dir))
+        self.make_pipeline(tmp_path, pooled, HashingEncoder(), manifest_path=None, workers=2).run(str(data_dir))
+
+        def texts(client):
+            points, _ = client.scroll("sports_knowledge_base", limit=1000, with_payload=True)
+            return sorted((str(p.id), p.payload["text"]) for p in points)
+        assert texts(inline) == texts(pooled)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for the precomputed, memory-mapped knowledge-base embedding index.
+"""
+
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from tests.conftest import HashingEncoder
+from tools.chunk_store import ChunkStore
+from tools.embedding_index import EmbeddingIndex
+from tools.knowledge_base_rag import SPORT_LABEL_BITS, SportsKnowledgeRAG, sport_label_bits
+
+
+WORDS = ["value", "edge", "kelly", "bankroll", "parlay", "correlation", "variance", "nfl",
+         "nba", "spread", "total", "line", "closing", "sharp", "market", "probability"]
+
+
+def write_chunks(path, n=450, seed=0):
+    rng = np.random.default_rng(seed)
+    sources = ["data/knowledge_base/Mathletics_-_Wayne_Winston.pdf",
+               "data/knowledge_base/Ed_Miller_logic_of_sports_betting.pdf",
+               "data/the_ringer/articles/nba.md"]
+    chunks = [{"content": " ".join(rng.choice(WORDS, size=12)),
+               "metadata": {"source": sources[i % 3]}} for i in range(n)]
+    path.write_text(json.dumps(chunks))
+    return chunks
+
+
+class TestEmbeddingIndex:
+    """Test suite for EmbeddingIndex."""
+
+    def test_search_matches_brute_force_cosine(self):
+        encoder = HashingEncoder()
+        texts = [" ".join(np.random.default_rng(i).choice(WORDS, size=8)) for i in range(500)]
+        index = EmbeddingIndex.build(texts, list(range(500)), encoder)
+
+        query = index.encode_query(encoder, "kelly bankroll variance")
+        matrix = encoder.encode(texts)
+        expected = matrix @ encoder.encode(["kelly bankroll variance"])[0]
+        expected /= np.linalg.norm(matrix, axis=1) * np.linalg.norm(encoder.encode(["kelly bankroll variance"])[0])
+
+        results = index.search(query, top_k=10)
+        assert [score for _, score in results] == pytest.approx(sorted(expected, reverse=True)[:10], abs=1e-5)
+        assert all(score >= 0.5 for _, score in index.search(query, top_k=10, min_score=0.5))
+
+    def test_saved_index_is_memory_mapped_and_invalidated(self, tmp_path):
+        chunks_path = tmp_path / "chunks.json"
+        chunks_path.write_text("[1, 2, 3]")
+        encoder = HashingEncoder()
+
+        built = EmbeddingIndex.load_or_build(chunks_path, ["a b", "b c", "c d"], [0, 1, 2], encoder, "hash-64")
+        assert isinstance(built.vectors, np.memmap)
+        assert encoder.calls == [3]
+
+        reloaded = EmbeddingIndex.load_or_build(chunks_path, ["a b", "b c", "c d"], [0, 1, 2], encoder, "hash-64")
+        assert encoder.calls == [3]  # served from disk
+        np.testing.assert_array_equal(np.asarray(reloaded.vectors), np.asarray(built.vectors))
+
+        # Edited chunks file or a different model: rebuilt
+        chunks_path.write_text("[1, 2, 3, 4]")
+        EmbeddingIndex.load_or_build(chunks_path, ["a b", "b c", "c d"], [0, 1, 2], encoder, "hash-64")
+        EmbeddingIndex.load_or_build(chunks_path, ["a b", "b c", "c d"], [0, 1, 2], encoder, "other-model")
+        assert encoder.calls == [3, 3, 3]
+
+
+class TestKnowledgeBaseVectorSearch:
+    """SportsKnowledgeRAG vector search over the precomputed index."""
+
+    @pytest.fixture
+    def rag(self, tmp_path, monkeypatch):
+        chunks_path = tmp_path / "chunks.json"
+        write_chunks(chunks_path)
+        monkeypatch.setattr("tools.knowledge_base_rag.SentenceTransformer", lambda name: HashingEncoder())
+        return SportsKnowledgeRAG(chunks_path=str(chunks_path), embeddings_model="hash-64")
+
+    def test_searches_full_corpus_with_one_encode_per_query(self, rag):
+        assert len(rag.embedding_index) == len(rag.sports_betting_chunks) == 300
+        encoder = rag.embedding_model
+        encoder.calls.clear()
+
+        result = rag.search_knowledge("kelly bankroll closing line", top_k=5, min_relevance=0.0)
+        assert encoder.calls == [1]
+        assert len(result.chunks) == 5
+        scores = [chunk.relevance_score for chunk in result.chunks]
+        assert scores == sorted(scores, reverse=True)
+
+        # Chunks past the old 200-chunk encode window are reachable
+        last = rag.sports_betting_chunks[-1]
+        exact = rag.search_knowledge(last.content, top_k=5, min_relevance=0.999).chunks
+        assert last.chunk_id in [chunk.chunk_id for chunk in exact]
+
+    def test_results_do_not_mutate_shared_chunks(self, rag):
+        rag.search_knowledge("parlay correlation", top_k=3, min_relevance=0.0)
+        assert all(chunk.relevance_score == 0.0 for chunk in rag.sports_betting_chunks)
+
+    def test_sport_filter_is_applied_inside_the_index(self, rag):
+        result = rag.search_knowledge("nba spread closing line", top_k=10, min_relevance=0.0, sport_filter="NFL")
+        assert len(result.chunks) == 10
+        assert all(sport_label_bits(chunk.content) & SPORT_LABEL_BITS["NFL"] for chunk in result.chunks)
+        assert rag._filter_chunks_by_sport(result.chunks, "NFL") == result.chunks
+
+    def test_jsonl_store_reencodes_only_new_chunks(self, tmp_path, monkeypatch):
+        encoder = HashingEncoder()
+        monkeypatch.setattr("tools.knowledge_base_rag.SentenceTransformer", lambda name: encoder)
+        store = ChunkStore(str(tmp_path / "chunks.jsonl"))
+        chunks = write_chunks(tmp_path / "legacy.json")
+        store.append({"chunk_id": i, **chunk} for i, chunk in enumerate(chunks))
+
+        rag = SportsKnowledgeRAG(chunks_path=str(store.path), embeddings_model="hash-64")
+        assert encoder.calls == [300]
+
+        # One edited chunk (new id, old one tombstoned) plus one new chunk
+        store.delete([0])
+        store.append([{"chunk_id": 450, "content": "kelly edge", "metadata": chunks[0]["metadata"]},
+                      {"chunk_id": 451, "content": "sharp closing line", "metadata": chunks[3]["metadata"]}])
+        rag = SportsKnowledgeRAG(chunks_path=str(store.path), embeddings_model="hash-64")
+        assert encoder.calls == [300, 2]
+        assert len(rag.embedding_index) == 301
+        top = rag.search_knowledge("sharp closing line", top_k=1, min_relevance=0.999).chunks
+        assert [chunk.chunk_id for chunk in top] == [451]
+
+    def test_background_load_serves_keyword_search_until_ready(self, tmp_path, monkeypatch):
+        chunks_path = tmp_path / "chunks.json"
+        write_chunks(chunks_path)
+        release = threading.Event()
+
+        def slow_encoder(name):
+            release.wait(5)
+            return HashingEncoder()
+
+        monkeypatch.setattr("tools.knowledge_base_rag.SentenceTransformer", slow_encoder)
+        rag = SportsKnowledgeRAG(chunks_path=str(chunks_path), embeddings_model="hash-64", background_load=True)
+        assert rag.model_status == "loading"
+        assert len(rag.sports_betting_chunks) == 300
+        keyword = rag.search_knowledge("kelly bankroll", top_k=3)
+        assert keyword.chunks and rag.embedding_index is None
+
+        release.set()
+        assert rag.wait_until_ready(5)
+        assert rag.model_status == "ready"
+        result = rag.search_knowledge("kelly bankroll", top_k=3, min_relevance=0.0)
+        assert len(result.chunks) == 3 and rag.embedding_model.calls == [300, 1]
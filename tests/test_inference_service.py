@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched transformer inference service.
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+import torch
+
+from tools.inference_service import InferenceService, get_inference_service, reset_inference_services
+
+
+class WordTokenizer:
+    """Tokenizer stand-in: one id per word, padded to the longest text in the call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, truncation=True, padding=True, max_length=512, return_tensors="pt"):
+        ids = [[len(word) for word in text.split()][:max_length] for text in texts]
+        width = max(len(row) for row in ids)
+        self.calls.append((len(texts), width))
+        input_ids = torch.tensor([row + [0] * (width - len(row)) for row in ids])
+        attention_mask = torch.tensor([[1] * len(row) + [0] * (width - len(row)) for row in ids])
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+class MeanLengthClassifier(torch.nn.Module):
+    """Logits from the mean word length, so padding must not change the answer."""
+
+    def __init__(self):
+        super().__init__()
+        self.grad_enabled = []
+
+    def forward(self, input_ids, attention_mask):
+        self.grad_enabled.append(torch.is_grad_enabled())
+        mean = (input_ids * attention_mask).sum(dim=1) / attention_mask.sum(dim=1)
+        return type("Output", (), {"logits": torch.stack([mean, -mean], dim=1).float()})()
+
+
+def expected(text):
+    mean = np.mean([len(word) for word in text.split()])
+    logits = np.array([mean, -mean])
+    return np.exp(logits) / np.exp(logits).sum()
+
+
+@pytest.fixture
+def service():
+    service = InferenceService(MeanLengthClassifier(), WordTokenizer(), max_batch_size=8, max_wait_ms=50)
+    yield service
+    service.close()
+
+
+class TestInferenceService:
+    """Test suite for InferenceService."""
+
+    def test_concurrent_requests_share_a_padded_batch(self, service):
+        texts = ["a bb", "ccc dddd eeeee", "ff", "g hh iii jjjj"]
+        results = {}
+        barrier = threading.Barrier(len(texts))
+
+        def call(text):
+            barrier.wait()
+            results[text] = service.predict(text)
+
+        threads = [threading.Thread(target=call, args=(text,)) for text in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for text in texts:
+            np.testing.assert_allclose(results[text], expected(text), rtol=1e-5)
+        assert service.stats()["batches"] == 1
+        assert service.tokenizer.calls == [(4, 4)]  # padded to the longest text only
+        assert service.model.grad_enabled == [False]
+
+    def test_predict_many_keeps_order_and_splits_full_batches(self, service):
+        texts = [" ".join("x" * (i % 5 + 1) for _ in range(i % 3 + 1)) for i in range(20)]
+        probabilities = service.predict_many(texts)
+        np.testing.assert_allclose(probabilities, np.stack([expected(text) for text in texts]), rtol=1e-5)
+        stats = service.stats()
+        assert stats["items"] == 20
+        assert stats["batches"] == 3  # 8 + 8 + 4
+        assert max(size for size, _ in service.tokenizer.calls) == 8
+
+    def test_async_api(self, service):
+        async def main():
+            return await asyncio.gather(*(service.predict_async(text) for text in ["aa bb", "c"]))
+
+        first, second = asyncio.run(main())
+        np.testing.assert_allclose(first, expected("aa bb"), rtol=1e-5)
+        np.testing.assert_allclose(second, expected("c"), rtol=1e-5)
+
+    def test_batch_errors_reach_every_caller(self):
+        service = InferenceService(MeanLengthClassifier(), lambda *args, **kwargs: 1 / 0, max_wait_ms=1)
+        with pytest.raises(ZeroDivisionError):
+            service.predict("boom")
+        assert service.stats()["errors"] == 1
+        service.close()
+        with pytest.raises(RuntimeError):
+            service.submit("late")
+
+
+def test_shared_service_loads_each_model_once(tmp_path):
+    loads = []
+
+    def loader(model_dir):
+        loads.append(model_dir)
+        return MeanLengthClassifier(), WordTokenizer()
+
+    try:
+        first = get_inference_service(str(tmp_path), loader=loader)
+        assert get_inference_service(str(tmp_path), loader=loader) is first
+        assert get_inference_service(str(tmp_path), max_length=128, loader=loader) is not first
+        assert len(loads) == 2
+        np.testing.assert_allclose(first.predict("abc"), expected("abc"), rtol=1e-5)
+    finally:
+        reset_inference_services()
@@ -1,5 +1,6 @@
 import pytest
-from tools.knowledge_ingestor import ingest_documents, chunk_documents, save_chunks
+from tools.chunk_store import ChunkOffsetIndex, ChunkStore, load_chunk_records
+from tools.knowledge_ingestor import ingest_documents, chunk_documents, save_chunks, IncrementalIngestor
 from pathlib import Path
 import json
 import os
@@ -31,4 +32,127 @@ def test_save_chunks(tmp_path):
         assert isinstance(data, list), "Should be a list of chunks"
         assert len(data) > 0, "Should have at least one chunk"
         assert "content" in data[0], "Chunk should have content"
-        assert "metadata" in data[0], "Chunk should have metadata"
\ No newline at end of file
+        assert "metadata" in data[0], "Chunk should have metadata"
+
+
+def write_doc(path, paragraphs, seed=0):
+    path.write_text("\n\n".join(f"Paragraph {seed}-{i}: kelly bankroll value edge parlay correlation " * 8
+                                 for i in range(paragraphs)))
+
+
+class TestIncrementalIngestor:
+    """Manifest-driven incremental ingestion into the JSONL chunk store."""
+
+    @pytest.fixture
+    def sources(self, tmp_path):
+        source_dir = tmp_path / "kb"
+        source_dir.mkdir()
+        for i in range(3):
+            write_doc(source_dir / f"doc{i}.md", 6, seed=i)
+        return source_dir
+
+    def ingest(self, tmp_path, sources):
+        ingestor = IncrementalIngestor(str(tmp_path / "chunks.jsonl"))
+        return ingestor, ingestor.ingest(sorted(sources.glob("*.md")))
+
+    def test_only_changed_files_are_rechunked(self, tmp_path, sources):
+        _, first = self.ingest(tmp_path, sources)
+        assert (first.files_added, first.chunks_deleted) == (3, 0)
+        records = load_chunk_records(tmp_path / "chunks.jsonl")
+        assert len(records) == first.chunks_added
+
+        _, unchanged = self.ingest(tmp_path, sources)
+        assert (unchanged.files_unchanged, unchanged.chunks_added) == (3, 0)
+
+        # Touched, not edited: hash matches, nothing re-chunked
+        os.utime(sources / "doc0.md", ns=(1, 1))
+        _, touched = self.ingest(tmp_path, sources)
+        assert (touched.files_unchanged, touched.chunks_added) == (3, 0)
+
+        write_doc(sources / "doc1.md", 2, seed=9)
+        _, edited = self.ingest(tmp_path, sources)
+        assert (edited.files_changed, edited.files_unchanged) == (1, 2)
+        after = load_chunk_records(tmp_path / "chunks.jsonl")
+        doc1 = [r for r in after if r["metadata"]["source"].endswith("doc1.md")]
+        assert len(doc1) == edited.chunks_added and all("9-" in r["content"] for r in doc1)
+        # Untouched files keep their chunk ids; new chunks get fresh ones
+        kept = {r["chunk_id"] for r in records if not r["metadata"]["source"].endswith("doc1.md")}
+        assert kept <= {r["chunk_id"] for r in after}
+        assert min(r["chunk_id"] for r in doc1) > max(r["chunk_id"] for r in records)
+
+    def test_deleted_files_are_pruned_and_store_compacted(self, tmp_path, sources):
+        ingestor, _ = self.ingest(tmp_path, sources)
+        (sources / "doc0.md").unlink()
+        (sources / "doc2.md").unlink()
+        stats = ingestor.ingest(sorted(sources.glob("*.md")))
+        assert stats.files_removed == 2 and stats.compacted
+
+        live = load_chunk_records(tmp_path / "chunks.jsonl")
+        assert {r["metadata"]["source"] for r in live} == {str(sources / "doc1.md")}
+        assert sum(1 for _ in open(tmp_path / "chunks.jsonl")) == len(live)
+
+    def test_legacy_array_migration_keeps_chunk_ids(self, tmp_path, sources):
+        legacy = tmp_path / "chunks.json"
+        legacy.write_text(json.dumps([{"content": "old", "metadata": {"source": "gone.pdf"}},
+                                      {"content": "doc", "metadata": {"source": str(sources / "doc0.md")}}]))
+        ingestor = IncrementalIngestor(str(tmp_path / "chunks.jsonl"))
+        assert ingestor.migrate(str(legacy)) == 2
+        assert load_chunk_records(tmp_path / "chunks.jsonl") == load_chunk_records(legacy)
+
+        # Migrated doc0 counts as current; untracked legacy sources are never pruned
+        stats = ingestor.ingest(sorted(sources.glob("*.md")))
+        assert (stats.files_added, stats.files_unchanged, stats.files_removed) == (2, 1, 0)
+        assert min(r["chunk_id"] for r in load_chunk_records(tmp_path / "chunks.jsonl")[2:]) == 2
+
+    def test_lost_manifest_is_rebuilt_without_reusing_ids(self, tmp_path, sources):
+        ingestor, first = self.ingest(tmp_path, sources)
+        ingestor.manifest_path.unlink()
+        rebuilt = IncrementalIngestor(str(tmp_path / "chunks.jsonl"))
+        assert rebuilt.manifest["next_chunk_id"] == first.chunks_added
+        assert ChunkStore(str(tmp_path / "chunks.jsonl")).delete([0]) == 1
+        assert 0 not in {r["chunk_id"] for r in load_chunk_records(tmp_path / "chunks.jsonl")}
+
+
+class TestChunkOffsetIndex:
+    """Offset index reads match full parses of the chunks file."""
+
+    def records(self, count, start=0):
+        return [{"chunk_id": i, "content": f"chunk {i} caf\u00e9 \u2013 kelly", "metadata": {"source": f"Ed_Miller_{i % 3}.pdf"}}
+                for i in range(start, start + count)]
+
+    def test_reads_match_legacy_array_and_store(self, tmp_path):
+        legacy = tmp_path / "chunks.json"
+        legacy.write_text(json.dumps([{k: v for k, v in r.items() if k != "chunk_id"} for r in self.records(20)],
+                                     indent=2, ensure_ascii=False), encoding="utf-8")
+        store = ChunkStore(str(tmp_path / "chunks.jsonl"))
+        store.append(self.records(20))
+        store.delete([3, 7])
+
+        for path in (legacy, store.path):
+            offsets = ChunkOffsetIndex.load_or_build(path)
+            assert list(offsets.iter_records()) == list(load_chunk_records(path))
+            assert offsets.source(1) == "Ed_Miller_1.pdf" and len(offsets.sources) == 3
+            offsets.close()
+
+    def test_appends_are_scanned_incrementally(self, tmp_path, monkeypatch):
+        store = ChunkStore(str(tmp_path / "chunks.jsonl"))
+        store.append(self.records(10))
+        ChunkOffsetIndex.load_or_build(store.path).close()
+
+        store.delete([2])
+        store.append(self.records(5, start=10))
+        scanned = []
+        original_scan = ChunkOffsetIndex._scan.__func__
+        monkeypatch.setattr(ChunkOffsetIndex, "_scan", classmethod(
+            lambda cls, path, f, stat, live, start: scanned.append(start) or original_scan(cls, path, f, stat, live, start)))
+        offsets = ChunkOffsetIndex.load_or_build(store.path)
+        assert scanned and scanned[0] > 0
+        assert list(offsets.iter_records()) == list(load_chunk_records(store.path))
+
+        # Compaction replaces the file: full rescan; the open index still reads its own file
+        store.rewrite(load_chunk_records(store.path))
+        assert offsets.read(0) == self.records(1)[0]
+        rebuilt = ChunkOffsetIndex.load_or_build(store.path)
+        assert scanned[-1] == 0 and len(rebuilt) == 14
+        offsets.close()
+        rebuilt.close()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared market snapshot cache.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tools.market_snapshot_cache import (
+    MarketSnapshotCache,
+    get_market_snapshot_cache,
+    reset_market_snapshot_cache
+)
+from tests.conftest import FakeClock
+from tools.odds_fetcher_tool import GameOdds
+
+
+def make_games(sport_key):
+    return [GameOdds(sport_key=sport_key, game_id=f"{sport_key}_1",
+                     commence_time="2030-01-01T00:00:00Z", books=[])]
+
+
+class TestMarketSnapshotCache:
+    """Test suite for MarketSnapshotCache."""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def calls(self):
+        return []
+
+    @pytest.fixture
+    def fetch(self, calls):
+        def _fetch(sport_key, regions, markets):
+            calls.append((sport_key, regions, tuple(markets)))
+            return make_games(sport_key)
+        return _fetch
+
+    def test_hit_after_miss(self, clock, calls, fetch):
+        cache = MarketSnapshotCache(default_ttl=30, clock=clock)
+
+        first = cache.get("basketball_nba", fetch)
+        second = cache.get("basketball_nba", fetch, markets=["totals", "h2h", "spreads"])
+
+        assert first is second  # market order does not change the key
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+
+    def test_ttl_expiry_and_per_sport_ttl(self, clock, calls, fetch):
+        cache = MarketSnapshotCache(default_ttl=30, ttl_by_sport={"americanfootball_nfl": 120}, clock=clock)
+
+        cache.get("basketball_nba", fetch)
+        cache.get("americanfootball_nfl", fetch)
+        clock.now = 60
+        cache.get("basketball_nba", fetch)
+        cache.get("americanfootball_nfl", fetch)
+
+        assert [c[0] for c in calls] == ["basketball_nba", "americanfootball_nfl", "basketball_nba"]
+
+    def test_max_age_forces_refetch(self, clock, calls, fetch):
+        cache = MarketSnapshotCache(default_ttl=300, clock=clock)
+
+        cache.get("basketball_nba", fetch)
+        clock.now = 20
+        cache.get("basketball_nba", fetch, max_age=60)
+        cache.get("basketball_nba", fetch, max_age=10)
+
+        assert len(calls) == 2
+
+    def test_lru_eviction(self, clock, calls, fetch):
+        cache = MarketSnapshotCache(default_ttl=300, max_entries=2, clock=clock)
+
+        cache.get("a", fetch)
+        cache.get("b", fetch)
+        cache.get("a", fetch)  # a becomes most recently used
+        cache.get("c", fetch)  # evicts b
+        cache.get("a", fetch)
+        cache.get("b", fetch)
+
+        assert [c[0] for c in calls] == ["a", "b", "c", "b"]
+        assert cache.stats()['evictions'] == 2
+
+    def test_errors_are_not_cached(self, clock):
+        cache = MarketSnapshotCache(clock=clock)
+        attempts = []
+
+        def flaky(sport_key, regions, markets):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("upstream down")
+            return make_games(sport_key)
+
+        with pytest.raises(RuntimeError):
+            cache.get("basketball_nba", flaky)
+        assert cache.get("basketball_nba", flaky)[0].game_id == "basketball_nba_1"
+        assert cache.stats()['fetch_errors'] == 1
+
+    def test_single_flight_threads(self):
+        cache = MarketSnapshotCache()
+        calls = []
+        release = threading.Event()
+
+        def slow_fetch(sport_key, regions, markets):
+            calls.append(1)
+            release.wait(5)
+            return make_games(sport_key)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get("basketball_nba", slow_fetch)))
+                   for _ in range(50)]
+        for t in threads:
+            t.start()
+        # Give every thread time to join the in-flight fetch before releasing it
+        deadline = time.time() + 5
+        while cache.stats()['coalesced'] < 49 and time.time() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert len(results) == 50
+        assert all(r is results[0] for r in results)
+        stats = cache.stats()
+        assert stats['coalesced'] == 49
+        assert stats['upstream_calls_saved'] == 49
+
+    @pytest.mark.asyncio
+    async def test_single_flight_async(self):
+        cache = MarketSnapshotCache()
+        calls = []
+
+        async def slow_fetch(sport_key, regions, markets):
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return make_games(sport_key)
+
+        results = await asyncio.gather(*(cache.get_async("basketball_nba", slow_fetch) for _ in range(50)))
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert cache.stats()['coalesced'] == 49
+
+    @pytest.mark.asyncio
+    async def test_sync_caller_never_waits_on_its_own_loop(self, calls, fetch):
+        cache = MarketSnapshotCache()
+        started = asyncio.Event()
+
+        async def slow_fetch(sport_key, regions, markets):
+            started.set()
+            await asyncio.sleep(0.05)
+            return make_games(sport_key)
+
+        leader = asyncio.ensure_future(cache.get_async("basketball_nba", slow_fetch))
+        await started.wait()
+
+        # Blocking on the async leader here would stall the loop running it
+        games = cache.get("basketball_nba", fetch)
+        assert games[0].sport_key == "basketball_nba"
+        assert len(calls) == 1
+
+        await leader
+        assert cache.get("basketball_nba", fetch) is leader.result()
+        assert cache.stats()['misses'] == 2
+
+    def test_invalidate_by_sport(self, calls, fetch):
+        cache = MarketSnapshotCache()
+        cache.get("basketball_nba", fetch)
+        cache.get("americanfootball_nfl", fetch)
+
+        assert cache.invalidate("basketball_nba") == 1
+        cache.get("basketball_nba", fetch)
+        cache.get("americanfootball_nfl", fetch)
+
+        assert len(calls) == 3
+
+    def test_shared_instance(self):
+        cache = get_market_snapshot_cache()
+        assert get_market_snapshot_cache() is cache
+        reset_market_snapshot_cache()
+        assert get_market_snapshot_cache() is not cache
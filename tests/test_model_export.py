@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the int8 / ONNX Runtime fast-inference export.
+"""
+
+import json
+
+import numpy as np
+import pytest
+import torch
+
+from tools.inference_service import reset_inference_services
+from tools.model_export import (
+    DEFAULT_PARITY_TEXTS, FAST_DIRNAME, HAS_ONNXRUNTIME, MANIFEST_FILENAME, check_parity,
+    export_fast_inference, load_fast_sequence_classifier, parse_export_backends, predict_probabilities,
+    resolve_backend
+)
+from tools.parlay_confidence_predictor import ParlayConfidencePredictor
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    """A small random RoBERTa classifier saved like the training scripts save theirs."""
+    from transformers import BertTokenizerFast, RobertaConfig, RobertaForSequenceClassification
+
+    path = tmp_path_factory.mktemp("parlay_confidence_classifier")
+    words = sorted({word for text in DEFAULT_PARITY_TEXTS for word in text.lower().split()})
+    (path / "vocab.txt").write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words))
+    BertTokenizerFast(vocab_file=str(path / "vocab.txt")).save_pretrained(path)
+    torch.manual_seed(0)
+    config = RobertaConfig(vocab_size=len(words) + 5, hidden_size=64, num_hidden_layers=2, num_attention_heads=4,
+                           intermediate_size=128, num_labels=2, pad_token_id=0,
+                           id2label={0: "low_confidence", 1: "high_confidence"},
+                           label2id={"low_confidence": 0, "high_confidence": 1})
+    RobertaForSequenceClassification(config).save_pretrained(path)
+    return path
+
+
+def test_check_parity_reports_agreement_and_accuracy():
+    reference = np.array([[0.9, 0.1], [0.2, 0.8], [0.6, 0.4]])
+    candidate = np.array([[0.8, 0.2], [0.3, 0.7], [0.4, 0.6]])
+    parity = check_parity(reference, candidate, labels=[0, 1, 1], min_agreement=0.9)
+    assert parity["agreement"] == pytest.approx(2 / 3)
+    assert parity["max_prob_diff"] == pytest.approx(0.2)
+    assert parity["fp32_accuracy"] == pytest.approx(2 / 3)
+    assert parity["accuracy"] == 1.0
+    assert not parity["passed"]
+
+
+def test_parse_export_backends():
+    assert parse_export_backends("none") == []
+    assert parse_export_backends("all") == ["int8", "onnx", "onnx_int8"]
+    assert parse_export_backends("int8, onnx_int8") == ["int8", "onnx_int8"]
+
+
+def test_int8_export_matches_fp32(model_dir):
+    manifest = export_fast_inference(str(model_dir), ["int8"], parity_labels=[0, 1] * 5)
+    entry = manifest["backends"]["int8"]
+    assert entry["passed"] and entry["max_prob_diff"] < 0.05
+    assert {"accuracy", "fp32_accuracy", "ms_per_batch", "size_mb"} <= entry.keys()
+    assert entry["size_mb"] < manifest["fp32"]["size_mb"]
+
+    with open(model_dir / FAST_DIRNAME / MANIFEST_FILENAME) as f:
+        assert json.load(f)["backends"]["int8"]["path"] == "model_int8.pt"
+    assert resolve_backend(str(model_dir)) == "int8"
+
+    model, tokenizer = load_fast_sequence_classifier(str(model_dir), "int8")
+    fp32, _ = load_fast_sequence_classifier(str(model_dir), "fp32")
+    fast_probs, _ = predict_probabilities(model, tokenizer, DEFAULT_PARITY_TEXTS)
+    fp32_probs, _ = predict_probabilities(fp32, tokenizer, DEFAULT_PARITY_TEXTS)
+    np.testing.assert_allclose(fast_probs, fp32_probs, atol=0.05)
+
+
+@pytest.mark.skipif(not HAS_ONNXRUNTIME, reason="onnxruntime not installed")
+def test_onnx_exports_match_fp32(model_dir):
+    manifest = export_fast_inference(str(model_dir), ["int8", "onnx", "onnx_int8"])
+    assert manifest["backends"]["onnx"]["max_prob_diff"] < 1e-4
+    assert manifest["backends"]["onnx_int8"]["passed"]
+    assert resolve_backend(str(model_dir)) == "onnx_int8"
+
+    model, tokenizer = load_fast_sequence_classifier(str(model_dir), "onnx")
+    probs, _ = predict_probabilities(model, tokenizer, DEFAULT_PARITY_TEXTS[:3])
+    assert probs.shape == (3, 2)
+
+
+def test_failed_parity_is_not_served(model_dir):
+    export_fast_inference(str(model_dir), ["int8"], min_agreement=1.01)
+    assert resolve_backend(str(model_dir), "int8") == "fp32"
+    assert resolve_backend(str(model_dir), "auto") in ("fp32", "onnx_int8", "onnx")
+    export_fast_inference(str(model_dir), ["int8"])
+
+
+def test_predictor_fast_inference_mode(model_dir):
+    export_fast_inference(str(model_dir), ["int8"])
+    try:
+        fast = ParlayConfidencePredictor(str(model_dir), fast_inference=True)
+        fp32 = ParlayConfidencePredictor(str(model_dir))
+        text = "Strong reasoning: line moved two points on sharp money."
+        fast_result, fp32_result = fast.predict(text), fp32.predict(text)
+        assert fast.backend in ("int8", "onnx_int8") and fp32.backend == "fp32"
+        assert fast.get_model_info()["backend"] == fast.backend
+        assert fast_result["confidence_probabilities"]["high_confidence"] == pytest.approx(
+            fp32_result["confidence_probabilities"]["high_confidence"], abs=0.05)
+    finally:
+        reset_inference_services()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the process-wide model registry and ParlayBuilder's use of it.
+"""
+
+import gc
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from tools.model_registry import (ALL_SPORTS, UNTRAINED_VERSION, ModelRegistry, ModelSpec, artifact_version,
+                                  default_model_specs)
+from tools.parlay_builder import ParlayBuilder
+from tools.parlay_rules_engine import ParlayRulesEngine
+
+
+class CountingLoader:
+    """Loader that records the sports it was asked for."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = []
+        self.delay = delay
+
+    def __call__(self, sport):
+        self.calls.append(sport)
+        time.sleep(self.delay)
+        return SimpleNamespace(sport=sport, is_loaded=True, is_trained=True)
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    path = tmp_path / "model.pt"
+    path.write_bytes(b"weights-v1")
+    return path
+
+
+def registry_for(checkpoint, loader):
+    return ModelRegistry(specs={"model": ModelSpec(loader, lambda sport: [checkpoint])})
+
+
+def test_artifact_version_tracks_file_changes(checkpoint, tmp_path):
+    assert artifact_version([tmp_path / "missing.pt"]) == UNTRAINED_VERSION
+    first = artifact_version([checkpoint])
+    assert artifact_version([tmp_path]) != UNTRAINED_VERSION  # directories hash their files
+
+    checkpoint.write_bytes(b"weights-v2-longer")
+    assert artifact_version([checkpoint]) != first
+
+
+def test_get_loads_once_per_key(checkpoint):
+    loader = CountingLoader()
+    registry = registry_for(checkpoint, loader)
+
+    nba = registry.get("model", "nba")
+    assert registry.get("model", "nba") is nba
+    assert registry.get("model", "nfl") is not nba
+    assert loader.calls == ["nba", "nfl"]
+    assert registry.stats()["loads"] == 2 and registry.stats()["hits"] == 1
+
+
+def test_new_artifact_version_replaces_stale_instance(checkpoint):
+    loader = CountingLoader()
+    registry = registry_for(checkpoint, loader)
+    old = registry.get("model", "nba")
+    old_key = registry.key("model", "nba")
+
+    checkpoint.write_bytes(b"weights-v2-longer")
+    os.utime(checkpoint, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+    new = registry.get("model", "nba")
+
+    assert new is not old
+    assert registry.loaded() == [registry.key("model", "nba")]
+    assert old_key not in registry.loaded()
+
+
+def test_loader_errors_are_not_cached(checkpoint):
+    attempts = []
+
+    def flaky(sport):
+        attempts.append(sport)
+        if len(attempts) == 1:
+            raise RuntimeError("checkpoint busy")
+        return object()
+
+    registry = registry_for(checkpoint, flaky)
+    with pytest.raises(RuntimeError):
+        registry.get("model")
+    assert registry.get("model") is registry.get("model")
+    assert len(attempts) == 2
+
+
+def test_concurrent_first_requests_share_one_load(checkpoint):
+    loader = CountingLoader(delay=0.05)
+    registry = registry_for(checkpoint, loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("model", "nba"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loader.calls == ["nba"]
+    assert all(result is results[0] for result in results)
+
+
+def test_unknown_kind_raises(checkpoint):
+    with pytest.raises(KeyError):
+        registry_for(checkpoint, CountingLoader()).get("tokenizer")
+
+
+@pytest.fixture
+def fake_registry(checkpoint):
+    loaders = {kind: CountingLoader() for kind in
+               ("correlation_model", "confidence_predictor", "parlay_strategist", "prop_trainer", "qlearning_agent")}
+    registry = ModelRegistry(specs={kind: ModelSpec(loader, lambda sport: [checkpoint])
+                                    for kind, loader in loaders.items()})
+    return registry, loaders
+
+
+def test_builders_share_registry_models(fake_registry):
+    registry, loaders = fake_registry
+    first = ParlayBuilder("basketball_nba", model_registry=registry)
+    second = ParlayBuilder("basketball_nba", model_registry=registry)
+
+    assert first.correlation_model is second.correlation_model
+    assert first.prop_trainers["nba"] is second.prop_trainers["nba"]
+    assert first.prop_trainers is not second.prop_trainers  # per-builder dict of shared trainers
+    assert first.parlay_optimizer is not second.parlay_optimizer  # mutable settings stay per builder
+    assert first.qlearning_enabled and second.qlearning_enabled
+    assert all(len(loader.calls) == 1 for loader in loaders.values())
+
+    both = ParlayBuilder("all_sports", model_registry=registry)
+    assert set(both.prop_trainers) == {"nba", "nfl"}
+    assert loaders["prop_trainer"].calls == ["nba", "nfl"]
+
+
+def test_discarded_builders_do_not_accumulate_subscriptions(fake_registry):
+    registry, _ = fake_registry
+    for _ in range(5):
+        ParlayBuilder("basketball_nba", model_registry=registry)
+    gc.collect()
+
+    builder = ParlayBuilder("basketball_nba", model_registry=registry)
+    builder._shared_model("prop_trainer", "nba")  # subscribing twice is a no-op
+    assert registry._subscribers and all(len(refs) == 1 for refs in registry._subscribers.values())
+
+
+def test_rules_engine_reaches_optimizer_and_qlearning_agent(fake_registry):
+    registry, _ = fake_registry
+    builder = ParlayBuilder("basketball_nba", model_registry=registry, default_sportsbook="FANDUEL")
+    assert builder.parlay_optimizer.rules_engine is builder.rules_engine is not None
+    assert builder.parlay_optimizer.sportsbook == "FANDUEL"
+
+    agent = default_model_specs()["qlearning_agent"].loader(ALL_SPORTS)
+    assert isinstance(agent.rules_engine, ParlayRulesEngine)
+
+
+def test_lazy_builder_loads_on_first_use(fake_registry):
+    registry, loaders = fake_registry
+    builder = ParlayBuilder("americanfootball_nfl", model_registry=registry, lazy_models=True)
+    assert registry.loaded() == []
+
+    assert builder.prop_trainers["nfl"].sport == "nfl"
+    assert loaders["prop_trainer"].calls == ["nfl"]
+    assert loaders["qlearning_agent"].calls == []
+
+    builder.qlearning_enabled = False  # plain attribute override still works
+    assert builder.qlearning_enabled is False
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for hot model reloads: ModelWatcher, registry pinning/promotion and
+ParlayBuilder swaps.
+"""
+
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ml.ml_prop_trainer import HistoricalPropTrainer
+from tools.model_registry import ModelRegistry, ModelSpec, default_model_specs
+from tools.model_watcher import SERVED_MODELS, ModelWatcher
+from tools.parlay_builder import ParlayBuilder
+
+KINDS = ("correlation_model", "confidence_predictor", "parlay_strategist", "prop_trainer", "qlearning_agent")
+
+
+class VersionedLoader:
+    """Loads a namespace stamped with the checkpoint's current contents."""
+
+    def __init__(self, checkpoint):
+        self.checkpoint = checkpoint
+        self.loads = 0
+
+    def __call__(self, sport):
+        self.loads += 1
+        return SimpleNamespace(sport=sport, weights=self.checkpoint.read_bytes(), is_loaded=True, is_trained=True)
+
+
+def rewrite(path, content: bytes) -> None:
+    path.write_bytes(content)
+    stamp = time.time_ns() + 1_000_000_000
+    os.utime(path, ns=(stamp, stamp))
+
+
+def reject_bad_weights(model):
+    if model.weights.startswith(b"bad"):
+        raise ValueError("bad weights")
+
+
+@pytest.fixture
+def setup(tmp_path):
+    checkpoint = tmp_path / "model.pt"
+    checkpoint.write_bytes(b"v1")
+    loader = VersionedLoader(checkpoint)
+    retired = []
+    registry = ModelRegistry(specs={
+        kind: ModelSpec(loader, lambda sport: [checkpoint], smoke_test=reject_bad_weights, retire=retired.append)
+        for kind in KINDS
+    })
+    watcher = ModelWatcher(registry, poll_interval=0.01, settle_seconds=0.0)
+    return registry, watcher, checkpoint, loader, retired
+
+
+def test_pinned_model_waits_for_promotion(setup):
+    registry, watcher, checkpoint, loader, _ = setup
+    watcher.watch("prop_trainer", "nba")
+    old = registry.get("prop_trainer", "nba")
+
+    rewrite(checkpoint, b"v2")
+    assert registry.get("prop_trainer", "nba") is old  # not loaded behind the watcher's back
+    [result] = watcher.check_now()
+
+    assert result.success and result.old_version != result.new_version
+    assert result.swap_ms >= 0.0 and result.load_seconds >= 0.0
+    new = registry.get("prop_trainer", "nba")
+    assert new is not old and new.weights == b"v2"
+    assert old.weights == b"v1"  # holders of the old instance finish with it
+    assert watcher.check_now() == []
+
+
+def test_failed_smoke_test_keeps_old_version(setup):
+    registry, watcher, checkpoint, loader, retired = setup
+    watcher.watch("qlearning_agent")
+    old = registry.get("qlearning_agent")
+
+    rewrite(checkpoint, b"bad-v2")
+    [result] = watcher.check_now()
+    assert not result.success and "smoke test failed" in result.error
+    assert registry.get("qlearning_agent") is old
+    assert retired and retired[-1].weights == b"bad-v2"
+
+    loads = loader.loads
+    assert watcher.check_now() == []  # rejected version is not retried
+    assert loader.loads == loads
+
+    rewrite(checkpoint, b"v3")
+    [result] = watcher.check_now()
+    assert result.success and registry.get("qlearning_agent").weights == b"v3"
+
+
+def test_new_version_must_settle(setup):
+    registry, _, checkpoint, loader, _ = setup
+    watcher = ModelWatcher(registry, settle_seconds=60.0)
+    watcher.watch("prop_trainer", "nfl")
+
+    rewrite(checkpoint, b"v2")
+    assert watcher.check_now() == []
+    assert registry.get("prop_trainer", "nfl").weights == b"v1"
+
+
+def test_builder_swaps_promoted_models(setup):
+    registry, watcher, checkpoint, _, retired = setup
+    builder = ParlayBuilder("basketball_nba", model_registry=registry)
+    assert watcher.watch_active() == len(KINDS)
+    old_trainer = builder.prop_trainers["nba"]
+
+    rewrite(checkpoint, b"v2")
+    results = watcher.check_now()
+    assert all(result.success for result in results) and len(results) == len(KINDS)
+
+    assert builder.prop_trainers["nba"] is not old_trainer
+    assert builder.prop_trainers["nba"].weights == b"v2"
+    assert builder.correlation_model.weights == b"v2"
+    assert builder.qlearning_agent.weights == b"v2" and builder.qlearning_enabled
+    assert old_trainer in retired
+    assert watcher.stats()["reloads"][-1]["success"]
+
+
+def test_background_thread_reloads(setup):
+    registry, watcher, checkpoint, _, _ = setup
+    watcher.watch("correlation_model")
+    watcher.start()
+    try:
+        rewrite(checkpoint, b"v2")
+        deadline = time.monotonic() + 5.0
+        while not watcher.history and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+    assert watcher.history and watcher.history[-1].success
+    assert registry.get("correlation_model").weights == b"v2"
+
+
+def test_prop_trainer_smoke_test():
+    smoke_test = default_model_specs()["prop_trainer"].smoke_test
+    with pytest.raises(ValueError):
+        smoke_test(HistoricalPropTrainer("nba"))
+    trainer = HistoricalPropTrainer("nba")
+    trainer.load_model()
+    smoke_test(trainer)
+
+
+def test_api_startup_watches_served_models(setup, monkeypatch):
+    pytest.importorskip("fastapi")
+    import app.main
+
+    registry, _, checkpoint, _, _ = setup
+    watcher = ModelWatcher(registry, poll_interval=60.0, settle_seconds=0.0)
+    monkeypatch.setattr(app.main, "get_model_watcher", lambda: watcher)
+    monkeypatch.setattr(app.main, "SportsKnowledgeRAG", lambda **kwargs: SimpleNamespace())
+    monkeypatch.setattr(app.main, "create_unified_agent", lambda sport, knowledge_base: SimpleNamespace())
+
+    asyncio.run(app.main.startup_event())
+    try:
+        # The agents load nothing at startup, yet builders created later are covered
+        assert set(watcher.stats()["watched"]) == {f"{kind}:{sport}" for kind, sport in SERVED_MODELS}
+        assert watcher.stats()["running"]
+
+        builder = ParlayBuilder("basketball_nba", model_registry=registry)
+        rewrite(checkpoint, b"v2")
+        assert all(result.success for result in watcher.check_now())
+        assert builder.prop_trainers["nba"].weights == b"v2"
+    finally:
+        asyncio.run(app.main.shutdown_event())
+    assert not watcher.stats()["running"]
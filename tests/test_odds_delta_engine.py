@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental odds delta engine.
+"""
+
+import copy
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import tools.advanced_arbitrage_integration as arbitrage_integration
+import tools.arbitrage_detector_tool as arbitrage_detector_tool
+import tools.vectorized_arbitrage_scanner as vectorized_arbitrage_scanner
+from tools.advanced_arbitrage_integration import AdvancedArbitrageIntegration
+from tools.market_discrepancy_monitor import MarketDiscrepancyMonitor, MonitoringConfig
+from tools.odds_delta_engine import OddsDeltaEngine, ChangedGameTracker
+from tools.odds_fetcher_tool import GameOdds, BookOdds, Selection
+
+
+def make_game(game_id, lakers_price=1.90, spread=-2.5):
+    return GameOdds(sport_key="basketball_nba", game_id=game_id, commence_time="2030-01-01T00:00:00Z", books=[
+        BookOdds(bookmaker="DraftKings", market="h2h", selections=[
+            Selection(name="Lakers", price_decimal=lakers_price),
+            Selection(name="Celtics", price_decimal=1.95)
+        ]),
+        BookOdds(bookmaker="FanDuel", market="spreads", selections=[
+            Selection(name="Lakers", price_decimal=1.91, line=spread),
+            Selection(name="Celtics", price_decimal=1.91, line=-spread)
+        ])
+    ])
+
+
+class TestOddsDeltaEngine:
+    """Test suite for OddsDeltaEngine."""
+
+    @pytest.fixture
+    def engine(self):
+        return OddsDeltaEngine()
+
+    def test_first_ingest_reports_new_games(self, engine):
+        batch = engine.ingest([make_game("g1")])
+        assert batch.new_game_ids == {"g1"}
+        assert len(batch) == 4
+        assert {delta.kind for delta in batch.deltas} == {"added"}
+
+    def test_unchanged_games_are_skipped(self, engine):
+        games = [make_game("g1"), make_game("g2")]
+        engine.ingest(games)
+
+        # Same objects (snapshot cache hit) and an identical refetch both produce nothing
+        assert not engine.ingest(games)
+        assert not engine.ingest(copy.deepcopy(games))
+        assert engine.stats()["games_skipped"] == 4
+
+    def test_price_and_line_moves(self, engine):
+        engine.ingest([make_game("g1")])
+        batch = engine.ingest([make_game("g1", lakers_price=2.05, spread=-3.0)])
+
+        changed = [d for d in batch.deltas if d.kind == "changed"]
+        assert [(d.bookmaker, d.selection_name, d.previous_price, d.price_decimal) for d in changed] == [
+            ("DraftKings", "Lakers", 1.90, 2.05)
+        ]
+        # A line move is the old line removed and the new one added
+        assert sorted((d.kind, d.selection_name, d.line) for d in batch.deltas if d.market == "spreads") == [
+            ("added", "Celtics", 3.0), ("added", "Lakers", -3.0),
+            ("removed", "Celtics", 2.5), ("removed", "Lakers", -2.5)
+        ]
+        assert batch.changed_game_ids == {"g1"}
+
+    def test_complete_snapshot_removes_missing_games(self, engine):
+        engine.ingest([make_game("g1"), make_game("g2")])
+        assert not engine.ingest([make_game("g1")])
+
+        batch = engine.ingest([make_game("g1")], complete=True)
+        assert batch.removed_game_ids == {"g2"}
+        assert {d.kind for d in batch.deltas} == {"removed"}
+        assert engine.latest_game("g2") is None
+
+    def test_subscribers_only_hear_about_their_games(self, engine):
+        everything, g2_only = [], []
+        engine.subscribe(everything.append)
+        unsubscribe = engine.subscribe(g2_only.append, game_ids=["g2"])
+        engine.subscribe(lambda batch: 1 / 0)  # failing subscribers are logged, not raised
+
+        engine.ingest([make_game("g1"), make_game("g2")])
+        engine.ingest([make_game("g1", lakers_price=2.2), make_game("g2")])
+        assert len(everything) == 2
+        assert len(g2_only) == 1
+        assert g2_only[0].changed_game_ids == {"g2"}
+
+        unsubscribe()
+        engine.ingest([make_game("g2", lakers_price=2.2)])
+        assert len(g2_only) == 1
+
+
+class TestChangedGameTracker:
+    """Test suite for ChangedGameTracker."""
+
+    def test_take_hands_out_new_and_changed_games(self):
+        engine = OddsDeltaEngine()
+        tracker = ChangedGameTracker()
+        engine.subscribe(tracker)
+
+        engine.ingest([make_game("g1"), make_game("g2")])
+        assert tracker.take(["g1", "g2", "g3"]) == ["g1", "g2", "g3"]
+        assert tracker.take(["g1", "g2", "g3"]) == []
+
+        engine.ingest([make_game("g2", lakers_price=2.5)])
+        assert tracker.take(["g1", "g2", "g3"]) == ["g2"]
+
+        tracker.mark(["g1"])
+        assert tracker.take(["g1", "g2"]) == ["g1"]
+
+
+class TestMonitorChangeOnlyScans:
+    """MarketDiscrepancyMonitor only rescans games whose odds moved."""
+
+    def test_games_due_for_scan_follows_feed(self):
+        slates = [
+            [make_game("g1"), make_game("g2")],
+            [make_game("g1"), make_game("g2")],
+            [make_game("g1"), make_game("g2", lakers_price=2.4)]
+        ]
+        monitor = MarketDiscrepancyMonitor(MonitoringConfig(enable_final_verification=False),
+                                           odds_feed=lambda: slates.pop(0))
+
+        assert monitor._games_due_for_scan(["g1", "g2"]) == ["g1", "g2"]
+        assert monitor._games_due_for_scan(["g1", "g2"]) == []
+        assert monitor._games_due_for_scan(["g1", "g2"]) == ["g2"]
+        assert monitor.games_skipped_unchanged == 3
+
+    def test_without_feed_every_game_is_scanned(self):
+        monitor = MarketDiscrepancyMonitor(MonitoringConfig(enable_final_verification=False))
+        assert monitor._games_due_for_scan(["g1", "g2"]) == ["g1", "g2"]
+        assert monitor._games_due_for_scan(["g1", "g2"]) == ["g1", "g2"]
+
+
+class ShiftedDatetime(datetime):
+    """datetime whose now() runs `offset` ahead of the wall clock."""
+    offset = timedelta(0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.now(tz) + cls.offset
+
+
+class TestArbitrageScanReuse:
+    """Unchanged games reuse their opportunities only while they are live."""
+
+    @pytest.fixture
+    def feed(self):
+        """What the fake odds feed serves: moved odds (no arbitrage left) and/or stale timestamps."""
+        return {"moved": False, "stale": False}
+
+    @pytest.fixture
+    def integration(self, monkeypatch, tmp_path, feed):
+        monkeypatch.setattr(ShiftedDatetime, "offset", timedelta(0))
+        for module in (arbitrage_integration, arbitrage_detector_tool, vectorized_arbitrage_scanner):
+            monkeypatch.setattr(module, "datetime", ShiftedDatetime)
+
+        integration = AdvancedArbitrageIntegration(confidence_filter="low", enable_cross_validation=False)
+        integration.latency_monitor = None
+        integration.arbitrage_detector.odds_fetcher = None  # no fresh-odds network check
+        integration.arbitrage_detector.db_path = tmp_path / "arbitrage.sqlite"
+
+        def fetch_live_odds_data(game_ids):
+            integration.delta_engine.ingest([make_game("g1", lakers_price=2.05 if feed["moved"] else 1.90)],
+                                            complete=True)
+            price = -130 if feed["moved"] else 110
+            age = timedelta(seconds=120 if feed["stale"] else 0)
+            return {"g1": {"game_id": "g1", "timestamp": (ShiftedDatetime.now(timezone.utc) - age).isoformat(),
+                           "books": [{"name": "draftkings", "odds": {"home": price, "away": -130}},
+                                     {"name": "fanduel", "odds": {"home": -130, "away": price}}]}}
+
+        monkeypatch.setattr(integration, "fetch_live_odds_data", fetch_live_odds_data)
+        return integration
+
+    def test_expired_opportunities_are_detected_again(self, integration, monkeypatch):
+        [first] = integration.scan_multiple_games(["g1"]).opportunities
+        [reused] = integration.scan_multiple_games(["g1"]).opportunities
+        assert reused is first and integration.games_reused_unchanged == 1
+
+        window = integration.arbitrage_detector.execution_window
+        monkeypatch.setattr(ShiftedDatetime, "offset", timedelta(seconds=window + 1))
+        [fresh] = integration.scan_multiple_games(["g1"]).opportunities
+        assert fresh is not first and integration.games_reused_unchanged == 1
+        assert datetime.fromisoformat(fresh.expires_at) > ShiftedDatetime.now(timezone.utc)
+
+    def test_stale_odds_are_rejected_for_unchanged_games(self, integration, feed):
+        integration.scan_multiple_games(["g1"])
+        feed["stale"] = True
+
+        report = integration.scan_multiple_games(["g1"])
+        assert report.opportunities == [] and report.stale_signals_rejected == 1
+
+    def test_moved_odds_rejected_as_stale_are_not_reused_later(self, integration, feed):
+        assert len(integration.scan_multiple_games(["g1"]).opportunities) == 1
+
+        # The odds move, but the first read of them is stale
+        feed.update(moved=True, stale=True)
+        assert integration.scan_multiple_games(["g1"]).opportunities == []
+
+        # Fresh moved odds have no arbitrage; the pre-move result must not come back
+        feed["stale"] = False
+        assert integration.scan_multiple_games(["g1"]).opportunities == []
+        assert integration.games_reused_unchanged == 0
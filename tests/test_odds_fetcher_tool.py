@@ -1,5 +1,6 @@
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
+from datetime import datetime, timezone
 from typing import List, Dict, Any
 import os
 
@@ -355,3 +356,69 @@ class TestOddsFetcherTool:
                 game = result[0]
                 assert game.sport_key == "basketball_nba"
                 assert len(game.books) == 1
+
+    @pytest.mark.asyncio
+    async def test_get_game_odds_async_success(self, odds_fetcher, sample_api_response):
+        """Test the async fetch path normalizes like the sync one."""
+        with patch.object(odds_fetcher.async_api_fetcher, 'fetch', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = sample_api_response
+            
+            result = await odds_fetcher.get_game_odds_async("basketball_nba", "us", ["h2h", "spreads"])
+            
+            assert len(result) == 1
+            assert result[0].game_id == "test_game_1"
+            assert len(result[0].books) == 3
+            call_args = mock_fetch.call_args
+            assert "basketball_nba" in call_args[0][0]
+            assert call_args[1]["params"]["markets"] == "h2h,spreads"
+
+    @pytest.mark.asyncio
+    async def test_get_game_odds_async_no_fallback_configured(self, odds_fetcher):
+        """Test that async primary failure raises when no fallback is configured."""
+        with patch.object(odds_fetcher.async_api_fetcher, 'fetch', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.side_effect = Exception("Primary API failed")
+            
+            with pytest.raises(OddsFetcherError) as exc_info:
+                await odds_fetcher.get_game_odds_async("basketball_nba", "us", ["h2h"])
+            
+            assert "All odds providers failed" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_get_multi_sport_odds_merges_market_groups(self, odds_fetcher, sample_api_response):
+        """Test concurrent multi-sport fetch merges market groups per game."""
+        async def fake_fetch(url, params=None, **kwargs):
+            return sample_api_response
+        
+        with patch.object(odds_fetcher.async_api_fetcher, 'fetch', side_effect=fake_fetch) as mock_fetch:
+            result = await odds_fetcher.get_multi_sport_odds(
+                ["basketball_nba", "americanfootball_nfl"],
+                market_groups=[["h2h"], ["totals"]]
+            )
+            
+            assert mock_fetch.call_count == 4
+            assert set(result.keys()) == {"basketball_nba", "americanfootball_nfl"}
+            nba_games = result["basketball_nba"]
+            assert len(nba_games) == 1
+            assert len(nba_games[0].books) == 6  # 3 book-markets from each of two groups
+            assert result["americanfootball_nfl"][0].sport_key == "americanfootball_nfl"
+
+    @pytest.mark.asyncio
+    async def test_get_multi_sport_odds_all_failed(self, odds_fetcher):
+        """Test that multi-sport fetch raises only when every request fails."""
+        with patch.object(odds_fetcher, 'get_game_odds_async', new_callable=AsyncMock) as mock_get:
+            mock_get.side_effect = OddsFetcherError("down")
+            
+            with pytest.raises(OddsFetcherError):
+                await odds_fetcher.get_multi_sport_odds(["basketball_nba"])
+
+    @pytest.mark.asyncio
+    async def test_fetch_nba_odds_date_range(self, odds_fetcher, sample_api_response):
+        """Test the adapter-facing fetch filters by commence time."""
+        with patch.object(odds_fetcher.async_api_fetcher, 'fetch', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = sample_api_response
+            
+            inside = (datetime(2024, 1, 15, tzinfo=timezone.utc), datetime(2024, 1, 16, tzinfo=timezone.utc))
+            outside = (datetime(2024, 2, 1, tzinfo=timezone.utc), datetime(2024, 2, 2, tzinfo=timezone.utc))
+            
+            assert len(await odds_fetcher.fetch_nba_odds(inside)) == 1
+            assert len(await odds_fetcher.fetch_nba_odds(outside)) == 0
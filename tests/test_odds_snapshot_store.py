@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar odds snapshot store.
+"""
+
+import numpy as np
+import pytest
+
+from tools.odds_fetcher_tool import GameOdds, BookOdds, Selection
+from tools.odds_snapshot_store import ColumnarOddsSnapshot
+
+
+def make_games():
+    return [
+        GameOdds(sport_key="basketball_nba", game_id="g1", commence_time="2030-01-01T00:00:00Z", books=[
+            BookOdds(bookmaker="DraftKings", market="h2h", selections=[
+                Selection(name="Lakers", price_decimal=1.90),
+                Selection(name="Celtics", price_decimal=1.95)
+            ]),
+            BookOdds(bookmaker="FanDuel", market="h2h", selections=[
+                Selection(name="Lakers", price_decimal=2.05),
+                Selection(name="Celtics", price_decimal=1.80)
+            ]),
+            BookOdds(bookmaker="DraftKings", market="spreads", selections=[
+                Selection(name="Lakers", price_decimal=1.91, line=-2.5),
+                Selection(name="Celtics", price_decimal=1.91, line=2.5)
+            ]),
+            BookOdds(bookmaker="FanDuel", market="spreads", selections=[
+                Selection(name="Lakers", price_decimal=1.87, line=-3.0),
+                Selection(name="Celtics", price_decimal=1.95, line=3.0)
+            ]),
+            BookOdds(bookmaker="BetMGM", market="spreads", selections=[])
+        ]),
+        GameOdds(sport_key="basketball_nba", game_id="g2", commence_time="2030-01-02T00:00:00Z", books=[]),
+        GameOdds(sport_key="basketball_nba", game_id="g3", commence_time="2030-01-03T00:00:00Z", books=[
+            BookOdds(bookmaker="DraftKings", market="totals", selections=[
+                Selection(name="Over", price_decimal=1.90, line=220.5),
+                Selection(name="Under", price_decimal=1.90, line=220.5)
+            ]),
+            BookOdds(bookmaker="DraftKings", market="totals", selections=[
+                Selection(name="Over", price_decimal=1.90, line=220.5)
+            ])
+        ])
+    ]
+
+
+class TestColumnarOddsSnapshot:
+    """Test suite for ColumnarOddsSnapshot."""
+
+    @pytest.fixture
+    def snapshot(self):
+        return ColumnarOddsSnapshot.from_game_odds(make_games())
+
+    def test_round_trip_preserves_tree(self, snapshot):
+        """Empty games, empty and duplicate book blocks survive the round trip."""
+        assert snapshot.to_game_odds() == make_games()
+        assert len(snapshot) == 11
+        assert snapshot.price.dtype == np.float64
+        assert np.isnan(snapshot.line[0])
+
+    def test_rows_filters_are_combined(self, snapshot):
+        rows = snapshot.rows(game_id="g1", market="spreads", bookmaker="fanduel")
+        quotes = snapshot.quotes(rows)
+        assert [(q.selection_name, q.line) for q in quotes] == [("Lakers", -3.0), ("Celtics", 3.0)]
+        assert snapshot.rows(game_id="missing").size == 0
+        assert snapshot.rows(market="h2h", markets=["spreads"]).size == 0
+
+    def test_best_price_per_outcome(self, snapshot):
+        best = snapshot.best_price_per_outcome(game_id="g1", market="h2h")
+        by_name = {q.selection_name: (q.bookmaker, q.price_decimal) for q in best}
+        assert by_name == {"Lakers": ("FanDuel", 2.05), "Celtics": ("DraftKings", 1.95)}
+
+        # Different spread lines are separate outcomes unless by_line is off
+        assert len(snapshot.best_price_per_outcome(game_id="g1", market="spreads")) == 4
+        merged = snapshot.best_price_per_outcome(game_id="g1", market="spreads", by_line=False)
+        assert {q.selection_name: q.price_decimal for q in merged} == {"Lakers": 1.91, "Celtics": 1.95}
+
+    def test_books_for_selection_line_tolerance(self, snapshot):
+        quotes = snapshot.books_for_selection("g1", "spreads", "lakers", line=-2.5)
+        assert [q.bookmaker for q in quotes] == ["DraftKings", "FanDuel"]
+
+        quotes = snapshot.books_for_selection("g1", "spreads", "Lakers", line=-2.5, line_tolerance=0.25)
+        assert [q.bookmaker for q in quotes] == ["DraftKings"]
+
+        quotes = snapshot.books_for_selection("g1", "h2h", "Lakers")
+        assert [q.price_decimal for q in quotes] == [2.05, 1.90]
+
+    def test_unique_rows_drops_duplicates_in_row_order(self, snapshot):
+        rows = snapshot.unique_rows()
+        assert len(rows) == 10
+        assert list(rows) == sorted(rows)
+
+        totals = snapshot.quotes(snapshot.unique_rows(markets=["totals"]))
+        assert [q.selection_name for q in totals] == ["Over", "Under"]
+
+    def test_empty_snapshot(self):
+        snapshot = ColumnarOddsSnapshot.from_game_odds([])
+        assert len(snapshot) == 0
+        assert snapshot.best_price_per_outcome() == []
+        assert snapshot.unique_rows().size == 0
+        assert snapshot.to_game_odds() == []
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Tests for the native branch-and-bound parlay search in ParlayOptimizer.
+"""
+
+from itertools import combinations
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml.ml_parlay_optimizer import HAS_PULP, OptimizedParlay, ParlayOptimizer, search_parlays
+
+
+def make_problem(n, seed=0):
+    rng = np.random.default_rng(seed)
+    ev = rng.uniform(0.02, 0.8, n)
+    corr = rng.uniform(-0.1, 0.6, (n, n))
+    corr = np.triu(corr, 1)
+    corr = corr + corr.T + np.eye(n)
+    return ev, corr
+
+
+def objective(ev, corr, legs):
+    penalty = sum(0.1 * corr[i, j] for i, j in combinations(legs, 2) if corr[i, j] > 0.3)
+    return ev[list(legs)].sum() - penalty
+
+
+def brute_force(ev, corr, num_solutions, max_legs, cap=None, conflicts=()):
+    """Reference: every feasible parlay, picked in objective order skipping supersets of earlier picks."""
+    blocked = {frozenset(pair) for pair in conflicts}
+    feasible = []
+    for size in range(2, max_legs + 1):
+        for legs in combinations(range(len(ev)), size):
+            pairs = list(combinations(legs, 2))
+            if cap is not None and any(corr[i, j] > cap for i, j in pairs):
+                continue
+            if any(frozenset(pair) in blocked for pair in pairs):
+                continue
+            feasible.append((objective(ev, corr, legs), legs))
+    picks = []
+    for score, legs in sorted(feasible, reverse=True):
+        if not any(set(earlier) <= set(legs) for _, earlier in picks):
+            picks.append((score, legs))
+        if len(picks) == num_solutions:
+            break
+    return picks
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_exhaustive_search(seed):
+    ev, corr = make_problem(12, seed)
+    conflicts = [(0, 1), (2, 5)]
+    picks = search_parlays(ev, corr, 6, max_legs=4, max_pair_correlation=0.45, conflicts=conflicts)
+    expected = brute_force(ev, corr, 6, max_legs=4, cap=0.45, conflicts=conflicts)
+
+    assert [legs for _, legs in picks] == [legs for _, legs in expected]
+    np.testing.assert_allclose([score for score, _ in picks], [score for score, _ in expected])
+
+
+@pytest.mark.parametrize("seed", [1594, 1882, 2077, 2718, *range(200)])
+def test_negative_evs_match_exhaustive_search(seed):
+    # Negative EVs fill the pool with parlays the bound then prunes past,
+    # which must still grow the pool when picks run short
+    rng = np.random.default_rng(seed)
+    n, num_solutions, max_legs = int(rng.integers(4, 10)), int(rng.integers(1, 6)), int(rng.integers(2, 5))
+    ev = rng.uniform(-0.1, 0.3, n)
+    corr = np.triu(rng.uniform(-0.1, 0.6, (n, n)), 1)
+    corr = corr + corr.T + np.eye(n)
+    picks = search_parlays(ev, corr, num_solutions, max_legs=max_legs, max_pair_correlation=0.3)
+    expected = brute_force(ev, corr, num_solutions, max_legs=max_legs, cap=0.3)
+
+    assert [legs for _, legs in picks] == [legs for _, legs in expected]
+
+
+def test_constraints_and_diversity():
+    ev, corr = make_problem(30, seed=7)
+    picks = search_parlays(ev, corr, 10, max_legs=5, max_pair_correlation=0.3, conflicts=[(0, 1)])
+
+    assert len(picks) == 10
+    scores = [score for score, _ in picks]
+    assert scores == sorted(scores, reverse=True)
+    for index, (_, legs) in enumerate(picks):
+        assert 2 <= len(legs) <= 5
+        assert all(corr[i, j] <= 0.3 for i, j in combinations(legs, 2))
+        assert not {0, 1} <= set(legs)
+        assert not any(set(earlier) <= set(legs) for _, earlier in picks[:index])
+
+
+def test_infeasible_pool_returns_what_exists():
+    ev = np.array([0.5, 0.4, 0.3])
+    corr = np.full((3, 3), 0.9)
+    assert search_parlays(ev, corr, 3, max_legs=3, max_pair_correlation=0.5) == []
+    assert len(search_parlays(ev, corr, 10, max_legs=3)) == 4  # every pair and the triple
+
+
+class FixedCorrelations:
+    def __init__(self, corr):
+        self.corr = corr
+
+    def compute_correlation_matrix(self, legs):
+        ids = [leg.leg_id for leg in legs]
+        idx = [int(leg_id.split("_")[1]) for leg_id in ids]
+        return pd.DataFrame(self.corr[np.ix_(idx, idx)], index=ids, columns=ids)
+
+
+class BlockFirstPair:
+    """Rules engine that hard-blocks combining the first two legs."""
+
+    def compatibility_matrix(self, legs, sport):
+        compatible = np.ones((len(legs), len(legs)), dtype=bool)
+        compatible[0, 1] = compatible[1, 0] = False
+        return compatible
+
+    def validate_many(self, parlays, sport, sportsbook):
+        return [SimpleNamespace(has_hard_blocks=lambda: False) for _ in parlays]
+
+
+def make_candidates(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{"leg_id": f"leg_{i}", "predicted_prob": float(rng.uniform(0.45, 0.7)),
+             "odds": float(rng.uniform(1.8, 2.6)), "game_id": f"game_{i // 3}"} for i in range(n)]
+
+
+def make_optimizer(corr, **kwargs):
+    optimizer = ParlayOptimizer(max_legs=4, max_correlation_threshold=0.4, min_ev_threshold=0.0, **kwargs)
+    optimizer.correlation_computer = FixedCorrelations(corr)
+    return optimizer
+
+
+def test_optimizer_returns_optimized_parlays():
+    _, corr = make_problem(15, seed=3)
+    optimizer = make_optimizer(corr, rules_engine=BlockFirstPair())
+    parlays = optimizer.optimize_parlays(make_candidates(15), num_solutions=5)
+
+    assert len(parlays) == 5
+    for parlay in parlays:
+        assert isinstance(parlay, OptimizedParlay)
+        ids = [leg.leg_id for leg in parlay.legs]
+        assert not {"leg_0", "leg_1"} <= set(ids)
+        idx = [int(leg_id.split("_")[1]) for leg_id in ids]
+        assert parlay.total_ev == pytest.approx(sum(leg.expected_value() for leg in parlay.legs))
+        assert parlay.total_odds == pytest.approx(np.prod([leg.odds for leg in parlay.legs]))
+        assert parlay.correlation_score == pytest.approx(sum(corr[i, j] for i, j in combinations(idx, 2)))
+        assert all(corr[i, j] <= 0.4 for i, j in combinations(idx, 2))
+    scores = [parlay.optimization_score for parlay in parlays]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_unknown_solver_rejected():
+    with pytest.raises(ValueError):
+        ParlayOptimizer(solver="simplex")
+
+
+@pytest.mark.skipif(not HAS_PULP, reason="PuLP not installed")
+def test_pulp_solver_still_available():
+    _, corr = make_problem(10, seed=5)
+    optimizer = make_optimizer(corr, solver="pulp")
+    parlays = optimizer.optimize_parlays(make_candidates(10), num_solutions=2)
+    assert 1 <= len(parlays) <= 2
+    assert all(2 <= len(parlay.legs) <= 4 for parlay in parlays)
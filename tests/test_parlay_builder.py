@@ -17,7 +17,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'tools'))
 
 from parlay_builder import (
     ParlayBuilder, ParlayLeg, ValidationResult, ParlayValidation,
-    ParlayBuilderError, create_sample_legs
+    ParlayBuilderError, MarketSnapshotIndex, create_sample_legs
 )
 from odds_fetcher_tool import GameOdds, BookOdds, Selection
 
@@ -444,6 +444,51 @@ class TestParlayBuilder(unittest.TestCase):
         self.assertIn("BetMGM", result["bookmakers"])
 
 
+class TestMarketSnapshotIndex(unittest.TestCase):
+    """Test the snapshot index agrees with the linear leg-matching scans."""
+    
+    def setUp(self):
+        """Build a snapshot with duplicate blocks, alternate lines and line-less quotes."""
+        self.builder = ParlayBuilder()
+        
+        books = []
+        for bookmaker in ["DraftKings", "FanDuel", "BetMGM"]:
+            books.append(BookOdds(bookmaker, "h2h", [Selection("Lakers", 1.85), Selection("Celtics", 1.95)]))
+            books.append(BookOdds(bookmaker, "spreads", [
+                Selection("Lakers", 1.91, -2.5), Selection("Lakers", 2.05, -3.5),
+                Selection("Celtics", 1.91, 2.5)
+            ]))
+        books.append(BookOdds("draftkings", "spreads", [Selection("lakers", 1.80, -3.0)]))
+        books.append(BookOdds("Caesars", "spreads", [Selection("Lakers", 1.88)]))
+        self.games = [GameOdds("basketball_nba", "game_1", "2025-01-15T20:00:00Z", books)]
+        self.index = MarketSnapshotIndex(self.games)
+    
+    def test_matches_linear_scan(self):
+        """Every leg variant resolves to the same selection and alternatives."""
+        for market, name, line in [("h2h", "Lakers", None), ("spreads", "LAKERS", -3.0),
+                                   ("spreads", "Lakers", -2.0), ("spreads", "Lakers", -4.0),
+                                   ("spreads", "Lakers", -5.0), ("spreads", "Celtics", None),
+                                   ("totals", "Over", 220.5)]:
+            for bookmaker in ["DraftKings", "fanduel", "Caesars", "PointsBet"]:
+                leg = ParlayLeg("game_1", market, name, bookmaker, 1.9, line)
+                with self.subTest(leg=leg):
+                    expected = self.builder._find_matching_selection(leg, self.games[0])
+                    actual = self.index.find_matching_selection(leg)
+                    if expected is None:
+                        self.assertIsNone(actual)
+                    else:
+                        self.assertIs(actual[0], expected[0])
+                        self.assertIs(actual[1], expected[1])
+                    self.assertEqual(self.index.find_alternative_bookmakers(leg),
+                                     self.builder._find_alternative_bookmakers(leg, self.games[0]))
+    
+    def test_index_rebuilt_only_on_new_snapshot(self):
+        """The builder reuses its index until a different snapshot arrives."""
+        index = self.builder._get_market_index(self.games)
+        self.assertIs(self.builder._get_market_index(self.games), index)
+        self.assertIsNot(self.builder._get_market_index(list(self.games)), index)
+
+
 class TestOffSeasonScenarios(unittest.TestCase):
     """Test ParlayBuilder behavior during NBA off-season."""
     
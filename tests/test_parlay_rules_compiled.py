@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the precompiled parlay rule matcher (CompiledRuleSet).
+
+The compiled path must reproduce the interpreted JSON rule evaluation
+exactly: same violations in the same order and the same correlation tax.
+"""
+
+import random
+
+import pytest
+
+from tools.parlay_rules_engine import ParlayRulesEngine, ValidationLevel
+
+LEG_POOL = {
+    "nba": [
+        {"game_id": "lal_bos", "market_type": "player_points_over", "selection_name": "LeBron James Over 25.5 Points"},
+        {"game_id": "lal_bos", "market_type": "player_points_under", "selection_name": "LeBron James Under 25.5 Points"},
+        {"game_id": "lal_bos", "market_type": "player_rebounds_over", "selection_name": "Anthony Davis Over 11.5 Rebounds"},
+        {"game_id": "lal_bos", "market_type": "h2h", "selection_name": "Lakers"},
+        {"game_id": "lal_bos", "market_type": "h2h", "selection_name": "Celtics"},
+        {"game_id": "lal_bos", "market_type": "spreads", "selection_name": "Lakers -4.5"},
+        {"game_id": "lal_bos", "market_type": "spreads", "selection_name": "Celtics +4.5"},
+        {"game_id": "lal_bos", "market_type": "totals", "selection_name": "Over 221.5"},
+        {"game_id": "lal_bos", "market_type": "totals", "selection_name": "Under 221.5"},
+        {"game_id": "lal_bos", "market_type": "team_total_over", "selection_name": "Lakers Over 112.5"},
+        {"game_id": "lal_bos", "market_type": "team_total_under", "selection_name": "Lakers Under 112.5"},
+        {"game_id": "gsw_mia", "market_type": "moneyline", "selection_name": "Warriors"},
+        {"game_id": "gsw_mia", "market_type": "player_points_over", "selection_name": "Stephen Curry Over 28.5 Points"},
+        {"game_id": "gsw_mia", "market_type": "totals", "selection_name": "Over 230.5"},
+        {"market_type": "player_assists_over", "selection_name": "Jimmy Butler Over 5.5 Assists"},
+    ],
+    "nfl": [
+        {"game_id": "kc_buf", "market_type": "moneyline", "selection_name": "Kansas City Chiefs"},
+        {"game_id": "kc_buf", "market_type": "moneyline", "selection_name": "Bills"},
+        {"game_id": "kc_buf", "market_type": "spread", "selection_name": "Kansas City Chiefs -2.5"},
+        {"game_id": "kc_buf", "market_type": "total_points", "selection_name": "Over 47.5"},
+        {"game_id": "kc_buf", "market_type": "total_points", "selection_name": "Under 47.5"},
+        {"game_id": "kc_buf", "market_type": "player_passing_yards", "selection_name": "Patrick Mahomes Over 275.5 Yards"},
+        {"game_id": "kc_buf", "market_type": "player_passing_yards", "selection_name": "Patrick Mahomes Under 275.5 Yards"},
+        {"game_id": "kc_buf", "market_type": "player_receiving_yards", "selection_name": "Travis Kelce Over 65.5 Yards"},
+        {"game_id": "kc_buf", "market_type": "player_passing_touchdowns", "selection_name": "Patrick Mahomes Over 1.5"},
+        {"game_id": "kc_buf", "market_type": "team_total_points", "selection_name": "Chiefs Over 24.5"},
+        {"game_id": "kc_buf", "market_type": "first_touchdown_scorer", "selection_name": "Travis Kelce"},
+        {"game_id": "kc_buf", "market_type": "first_touchdown_scorer", "selection_name": "Stefon Diggs"},
+        {"game_id": "dal_nyg", "market_type": "moneyline", "selection_name": "Dallas Cowboys"},
+        {"game_id": "dal_nyg", "market_type": "spread", "selection_name": "Dallas Cowboys -3.5"},
+        {"game_id": "dal_nyg", "market_type": "player_rushing_yards", "selection_name": "Tony Pollard Over 70.5 Yards"},
+    ]
+}
+
+
+def summarize(result):
+    return (result.is_valid,
+            [(v.rule_id, v.severity, v.leg1_identifier, v.leg2_identifier, v.correlation_multiplier, v.tags)
+             for v in result.violations],
+            result.correlation_tax_multiplier,
+            result.warnings)
+
+
+class TestCompiledRuleSet:
+    """Test suite for CompiledRuleSet."""
+
+    @pytest.mark.parametrize("sport", ["nba", "nfl"])
+    def test_matches_interpreted_rules(self, sport):
+        interpreted = ParlayRulesEngine(use_compiled_rules=False)
+        compiled = ParlayRulesEngine()
+        rng = random.Random(5)
+
+        for _ in range(2000):
+            legs = [dict(leg, odds_decimal=rng.choice([1.05, 1.9, 2.4]))
+                    for leg in rng.sample(LEG_POOL[sport], rng.randint(2, 6))]
+            assert summarize(compiled.validate_parlay(legs, sport)) == \
+                summarize(interpreted.validate_parlay(legs, sport)), legs
+
+    def test_any_rule_needs_both_legs_on_one_condition(self):
+        engine = ParlayRulesEngine()
+        legs = [LEG_POOL["nba"][0], LEG_POOL["nba"][1]]  # LeBron points over + under
+        result = engine.validate_parlay(legs, "nba")
+        assert not result.is_valid
+        assert result.violations[0].severity == ValidationLevel.HARD_BLOCK
+
+        # Points and rebounds props match different 'any' conditions: no contradiction
+        result = engine.validate_parlay([LEG_POOL["nba"][0], LEG_POOL["nba"][2]], "nba")
+        assert all(v.rule_type != "EXCLUSION" for v in result.violations)
+
+    def test_legs_are_featurized_once(self):
+        engine = ParlayRulesEngine()
+        rules = engine.get_compiled_rules("nfl")
+        legs = LEG_POOL["nfl"][:4]
+        for _ in range(10):
+            engine.validate_parlay(legs, "nfl")
+        assert len(rules._leg_cache) == 4
+        assert engine.get_compiled_rules("nfl") is rules
+
+    def test_reloaded_config_is_recompiled(self):
+        engine = ParlayRulesEngine()
+        first = engine.get_compiled_rules("nba")
+        engine.sport_configs.pop("nba")
+        assert engine.get_compiled_rules("nba") is not first
+
+
+class TestValidateMany:
+    """Test suite for ParlayRulesEngine.validate_many and the pool pair table."""
+
+    @staticmethod
+    def candidates(sport, n, seed=11):
+        rng = random.Random(seed)
+        pool = [dict(leg, odds_decimal=rng.choice([1.05, 1.9, 2.4])) for leg in LEG_POOL[sport]]
+        parlays = [rng.sample(pool, rng.randint(0, 7)) for _ in range(n)]
+        # Copies of pool legs and a leg repeated within one parlay
+        parlays.append([dict(leg) for leg in pool[:4]])
+        parlays.append([pool[0], pool[0], pool[1]])
+        return parlays
+
+    @pytest.mark.parametrize("sport", ["nba", "nfl"])
+    def test_matches_validate_parlay(self, sport):
+        engine = ParlayRulesEngine()
+        parlays = self.candidates(sport, 1500)
+        results = engine.validate_many(parlays, sport, "FANDUEL")
+        assert [summarize(r) for r in results] == \
+            [summarize(engine.validate_parlay(legs, sport, "FANDUEL")) for legs in parlays]
+
+    def test_process_pool_matches_in_process(self):
+        engine = ParlayRulesEngine()
+        parlays = self.candidates("nfl", 300)
+        pooled = engine.validate_many(parlays, "nfl", processes=2, chunk_size=100)
+        assert [summarize(r) for r in pooled] == [summarize(r) for r in engine.validate_many(parlays, "nfl")]
+
+    def test_unknown_sport(self):
+        results = ParlayRulesEngine().validate_many([LEG_POOL["nba"][:2]] * 3, "cricket")
+        assert len(results) == 3
+        assert not any(r.is_valid for r in results)
+        assert "Failed to load cricket rules" in results[0].warnings[0]
+
+    def test_compatibility_matrix(self):
+        engine = ParlayRulesEngine()
+        legs = LEG_POOL["nba"][:4]  # LeBron over/under, Davis rebounds, Lakers ML
+        compatible = engine.compatibility_matrix(legs, "nba")
+        assert compatible.shape == (4, 4)
+        assert not compatible[0, 1] and not compatible[1, 0]
+        assert compatible[0, 2] and compatible[2, 3] and compatible.diagonal().all()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for batched prop prediction (HistoricalPropTrainer.predict_batch) and
+the ParlayBuilder / strategist paths that use it.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+xgb = pytest.importorskip("xgboost")
+
+from ml.ml_prop_trainer import HistoricalPropTrainer
+from tools.parlay_builder import ParlayBuilder
+from tools.parlay_strategist_agent import EnhancedParlayStrategistAgent
+
+
+@pytest.fixture(scope="module")
+def nfl_trainer():
+    """A small NFL model fitted in memory (nothing written to models/)."""
+    rng = np.random.default_rng(0)
+    trainer = HistoricalPropTrainer("nfl", {"n_estimators": 20, "max_depth": 3, "random_state": 0})
+    n = 400
+    df = pd.DataFrame({feature: rng.uniform(0, 100, n) for feature in trainer.numerical_features})
+    df["weather_conditions"] = rng.choice(["clear", "rain", "snow"], n)
+    df["position"] = rng.choice(["QB", "RB", "WR", "TE"], n)
+    df["home_away"] = rng.choice(["home", "away"], n)
+    df["hit_prop"] = (df["receiving_yards"] + df["rushing_yards"] > 100).astype(int)
+    X, y = trainer.preprocess_features(df)
+    trainer.model = xgb.XGBClassifier(**trainer.params).fit(X, y)
+    trainer.is_trained = True
+    return trainer
+
+
+class CountingTrainer:
+    """Wraps a trainer and counts predict / predict_batch calls."""
+
+    def __init__(self, trainer):
+        self.trainer = trainer
+        self.single_calls = 0
+        self.batch_calls = 0
+
+    def predict(self, features):
+        self.single_calls += 1
+        return self.trainer.predict(features)
+
+    def predict_batch(self, features):
+        self.batch_calls += 1
+        return self.trainer.predict_batch(features)
+
+
+def test_predict_batch_matches_predict(nfl_trainer):
+    rows = [
+        {"receiving_yards": 80.0, "position": "WR"},
+        {"rushing_yards": 120.0, "receiving_yards": 10.0, "home_away": "away"},
+        {},
+        {"passing_yards": 300.0, "position": "QB", "weather_conditions": "snow", "dome_game": 1},
+    ]
+    batch = nfl_trainer.predict_batch(rows)
+    assert batch.shape == (4,)
+    np.testing.assert_allclose(batch, [nfl_trainer.predict(row) for row in rows], atol=1e-6)
+    np.testing.assert_allclose(nfl_trainer.predict_batch(pd.DataFrame(rows)), batch, atol=1e-6)
+    assert nfl_trainer.predict_batch([]).shape == (0,)
+
+
+def test_predict_batch_requires_trained_model():
+    with pytest.raises(ValueError):
+        HistoricalPropTrainer("nba").predict_batch([{}])
+
+
+def test_builder_ranks_and_enhances_legs_with_one_batch(nfl_trainer):
+    builder = ParlayBuilder("americanfootball_nfl")
+    trainer = CountingTrainer(nfl_trainer)
+    builder.prop_trainers = {"nfl": trainer}
+    legs = [{"selection": f"leg_{i}", "sport_key": "americanfootball_nfl", "odds": 1.5 + i / 10,
+             "projected_receiving_yards": 15.0 * i} for i in range(12)]
+    legs.append({"selection": "american_odds", "sport_key": "americanfootball_nfl", "odds": "+150"})
+
+    ranked = builder.rank_legs_by_prop_ev(legs, top_k=20)
+    assert trainer.batch_calls == 1 and trainer.single_calls == 0
+    assert len(ranked) == len(legs)
+    evs = [ev for _, _, ev in ranked]
+    assert evs == sorted(evs, reverse=True)
+    for leg, probability, ev in ranked:
+        expected = nfl_trainer.predict(builder._extract_prop_features(leg, "nfl"))
+        odds = builder._convert_american_to_decimal(leg["odds"]) if isinstance(leg["odds"], str) else leg["odds"]
+        assert probability == pytest.approx(expected, abs=1e-6)
+        assert ev == pytest.approx(expected * (odds - 1) - (1 - expected), abs=1e-6)
+
+    candidates = [{"sport": "nfl", "market_type": "receiving_yards", "line_value": 10.0 * i} for i in range(5)]
+    candidates.append({"sport": "nfl", "predicted_prob": 0.9})
+    enhanced = builder._enhance_legs_with_predictions(candidates)
+    assert trainer.batch_calls == 2
+    assert enhanced[-1]["predicted_prob"] == 0.9
+    for leg in enhanced[:-1]:
+        expected = nfl_trainer.predict(builder._extract_prop_features_from_leg(leg, "nfl"))
+        assert leg["predicted_prob"] == pytest.approx(expected, abs=1e-6)
+
+
+def test_strategist_scores_opportunities_in_one_batch(nfl_trainer):
+    strategist = EnhancedParlayStrategistAgent(use_injury_classifier=False, sport="nfl")
+    trainer = CountingTrainer(nfl_trainer)
+    strategist.prop_trainer = trainer
+    opportunities = [{"market_type": "receiving_yards", "line": 20.0 * i, "odds_decimal": 1.6 + i / 5}
+                     for i in range(6)]
+
+    scores = strategist._calculate_prop_ev_scores(opportunities)
+    assert trainer.batch_calls == 1 and trainer.single_calls == 0
+    assert scores == pytest.approx([strategist._calculate_prop_ev_score(opp) for opp in opportunities])
+    assert all(0.0 <= score <= 1.0 for score in scores)
+
+
+class RejectsNegativeLines:
+    """Prop trainer whose batch call fails if any leg has a negative line."""
+
+    def predict_batch(self, features):
+        if any(row["receiving_yards"] < 0 for row in features):
+            raise ValueError("negative line")
+        return np.full(len(features), 0.6)
+
+
+def test_strategist_prediction_failure_only_resets_that_leg():
+    strategist = EnhancedParlayStrategistAgent(use_injury_classifier=False, sport="nfl")
+    strategist.prop_trainer = RejectsNegativeLines()
+    opportunities = [{"game_id": f"g{i}", "selection_name": f"leg {i}", "market_type": "receiving_yards",
+                      "line": -1.0 if i == 1 else 40.0, "odds_decimal": 2.0, "reasoning_factors": []}
+                     for i in range(3)]
+    analyses = [{"opportunities": [opportunity], "injury_intel": [], "line_movement": None,
+                 "public_betting_info": None} for opportunity in opportunities]
+
+    selected = {opp["game_id"]: opp for opp in strategist._select_best_opportunities(analyses, target_legs=3)}
+    assert selected["g1"]["prop_ev_score"] == 0.5
+    assert selected["g1"]["combined_score"] == selected["g1"]["opportunity_score"]
+    for game_id in ("g0", "g2"):
+        assert selected[game_id]["prop_ev_score"] == pytest.approx(0.6)
+        assert selected[game_id]["combined_score"] == pytest.approx(0.7 * selected[game_id]["opportunity_score"] + 0.18)
@@ -1,9 +1,19 @@
 import pytest
 import tempfile
 import shutil
+from datetime import date
 from pathlib import Path
 from unittest.mock import patch, MagicMock
-from tools.multi_sport_embedder import MultiSportEmbedder, COLLECTIONS, NFL_TEAMS, NFL_PLAYERS
+
+from qdrant_client import QdrantClient
+
+from tests.conftest import HashingEncoder
+from tools.multi_sport_embedder import MultiSportEmbedder, COLLECTIONS, NFL_TEAMS, NFL_PLAYERS, PARTITIONS
+
+
+def searched_collections(mock_qdrant):
+    return [call[1]["collection_name"] for call in mock_qdrant.query_points.call_args_list]
+
 
 class TestMultiSportEmbedder:
     """Test suite for multi-sport RAG embedder"""
@@ -118,7 +128,8 @@ class TestMultiSportEmbedder:
             "player": "Patrick Mahomes"
         }
         mock_hit.score = 0.95
-        mock_qdrant.search.return_value = [mock_hit]
+        mock_qdrant.query_points.side_effect = lambda **kwargs: MagicMock(
+            points=[mock_hit] if kwargs["collection_name"] == COLLECTIONS["nfl"] else [])
         
         # Create new embedder with mocked client
         embedder = MultiSportEmbedder()
@@ -132,10 +143,8 @@ class TestMultiSportEmbedder:
         assert results[0]["metadata"]["sport"] == "NFL"
         assert results[0]["score"] == 0.95
         
-        # Verify correct collection was searched
-        mock_qdrant.search.assert_called_once()
-        call_args = mock_qdrant.search.call_args
-        assert call_args[1]["collection_name"] == "sports_knowledge_base_nfl"
+        # Verify only the NFL and general partitions were searched
+        assert searched_collections(mock_qdrant) == ["sports_knowledge_base_nfl", PARTITIONS["general"]]
     
     def test_nfl_teams_mapping(self):
         """Test that NFL teams mapping is comprehensive"""
@@ -244,21 +253,20 @@ class TestRAGIngestionWorkflow:
                 "source": "pff"
             }
             mock_hit.score = 0.9
-            mock_qdrant.search.return_value = [mock_hit]
+            mock_qdrant.query_points.side_effect = lambda **kwargs: MagicMock(
+                points=[mock_hit] if kwargs["collection_name"] == COLLECTIONS["nfl"] else [])
             
-            # Perform NFL query
-            results = self.embedder.retrieve_sport_context("Mahomes injury", "nfl")
+            # Perform a recency-sensitive NFL query
+            results = self.embedder.retrieve_sport_context("Mahomes injury", "nfl", max_age_days=7)
             
             # Verify results are NFL-specific
             assert len(results) == 1
             assert results[0]["metadata"]["sport"] == "NFL"
             
-            # Verify correct filter was applied
-            search_call = mock_qdrant.search.call_args
-            query_filter = search_call[1]["query_filter"]
-            
-            # The filter should ensure only NFL content is returned
-            assert query_filter is not None
+            # The NBA partition is never searched; the NFL one is date-filtered
+            assert COLLECTIONS["nba"] not in searched_collections(mock_qdrant)
+            search_call = mock_qdrant.query_points.call_args_list[0]
+            assert search_call[1]["query_filter"] is not None
 
 class TestIntegrationWithExistingRAG:
     """Test integration with existing NBA RAG system"""
@@ -276,18 +284,18 @@ class TestIntegrationWithExistingRAG:
                 "source": "the_ringer"
             }
             mock_hit.score = 0.88
-            mock_qdrant.search.return_value = [mock_hit]
+            mock_qdrant.query_points.return_value = MagicMock(points=[mock_hit])
             
             # Perform NBA query
-            results = embedder.retrieve_sport_context("LeBron injury impact", "nba")
+            results = embedder.retrieve_sport_context("LeBron injury impact", "nba", include_general=False)
             
-            # Verify NBA collection was searched
-            search_call = mock_qdrant.search.call_args
-            assert search_call[1]["collection_name"] == "sports_knowledge_base_nba"
-            
-            # Verify NBA-specific filter
-            query_filter = search_call[1]["query_filter"]
-            assert query_filter is not None
+            # Partitioning replaces the sport filter: without the general partition
+            # neither the NFL nor the general collection may be searched
+            searched = searched_collections(mock_qdrant)
+            assert COLLECTIONS["nfl"] not in searched
+            assert PARTITIONS["general"] not in searched
+            assert searched == ["sports_knowledge_base_nba"]
+            assert results[0]["metadata"]["sport"] == "NBA"
     
     def test_separate_collections_maintained(self):
         """Test that NBA and NFL content is stored in separate collections"""
@@ -295,6 +303,54 @@ class TestIntegrationWithExistingRAG:
         assert "nba" in COLLECTIONS["nba"]
         assert "nfl" in COLLECTIONS["nfl"]
 
+class TestSportPartitions:
+    """Partitioned collections against a local Qdrant (no server or model download)."""
+
+    @pytest.fixture
+    def embedder(self, monkeypatch):
+        monkeypatch.setattr("tools.multi_sport_embedder.SentenceTransformer", HashingEncoder)
+        monkeypatch.setattr("tools.multi_sport_embedder.QdrantClient", lambda **kwargs: QdrantClient(":memory:"))
+        return MultiSportEmbedder()
+
+    def write(self, path, sentence, repeats=6):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n\n".join(f"{sentence} Paragraph {i}." for i in range(repeats)))
+        return path
+
+    def count(self, embedder, partition):
+        return embedder.qdrant.count(PARTITIONS[partition]).count
+
+    def test_chunks_are_routed_to_sport_and_general_partitions(self, embedder, tmp_path):
+        embedder.process_file(self.write(tmp_path / "nfl_articles" / "chiefs.md",
+                                         "Patrick Mahomes and the Chiefs offense moved the chains in the red zone."))
+        embedder.process_file(self.write(tmp_path / "books" / "theory.md",
+                                         "Expected value and bankroll sizing matter more than picking winners."))
+        embedder.process_file(self.write(tmp_path / "books" / "closing_lines.md",
+                                         "The Lakers closing line moved two points before tipoff tonight."))
+        assert self.count(embedder, "nfl") > 0
+        assert self.count(embedder, "general") > 0
+        assert self.count(embedder, "nba") > 0
+
+        results = embedder.retrieve_sport_context("Mahomes red zone chains", "nfl", limit=20)
+        sports = {result["metadata"]["sport"] for result in results}
+        assert sports <= {"NFL", "GENERAL"} and "NFL" in sports
+        scores = [result["score"] for result in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_date_window_prunes_old_sport_chunks(self, embedder, tmp_path):
+        embedder.process_file(self.write(tmp_path / "nfl_articles" / "week1.md",
+                                         "Injury report 2025-01-02: Josh Allen limited in practice for the Bills."))
+        embedder.process_file(self.write(tmp_path / "nfl_articles" / "week9.md",
+                                         "Injury report 2025-03-01: Josh Allen full participant for the Bills."))
+        recent = embedder.retrieve_sport_context("Josh Allen injury report", "nfl", limit=20,
+                                                 include_general=False, max_age_days=14,
+                                                 as_of=date(2025, 3, 5))
+        assert recent and {result["metadata"]["date"] for result in recent} == {"2025-03-01"}
+        everything = embedder.retrieve_sport_context("Josh Allen injury report", "nfl", limit=20,
+                                                     include_general=False)
+        assert len(everything) > len(recent)
+
+
 def test_sample_nfl_content_creation():
     """Test creation of sample NFL content for validation"""
     embedder = MultiSportEmbedder()
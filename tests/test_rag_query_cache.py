@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared knowledge-base query cache.
+"""
+
+import numpy as np
+import pytest
+
+from tests.conftest import HashingEncoder
+from tests.test_embedding_index import write_chunks
+from tools.knowledge_base_rag import KnowledgeChunk, SportsKnowledgeRAG
+from tools.rag_query_cache import RAGQueryCache, get_rag_query_cache
+
+
+class TestRAGQueryCache:
+    """Test suite for RAGQueryCache."""
+
+    def test_embeddings_are_read_only_and_lru_bounded(self):
+        cache = RAGQueryCache(max_embeddings=2)
+        stored = cache.put_embedding("m", "a", np.ones(4))
+        with pytest.raises(ValueError):
+            stored[0] = 2.0
+        cache.put_embedding("m", "b", np.ones(4))
+        cache.get_embedding("m", "a")
+        cache.put_embedding("m", "c", np.ones(4))
+        assert cache.get_embedding("m", "b") is None  # least recently used
+        assert cache.get_embedding("other-model", "a") is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_new_index_version_drops_old_results(self):
+        cache = RAGQueryCache()
+        cache.put_result("kb", "v1", ("q", 5), "old")
+        cache.put_result("other-kb", "v1", ("q", 5), "kept")
+        assert cache.get_result("kb", "v1", ("q", 5)) == "old"
+
+        assert cache.get_result("kb", "v2", ("q", 5)) is None
+        assert cache.get_result("kb", "v1", ("q", 5)) is None  # dropped, not resurrected
+        assert cache.get_result("other-kb", "v1", ("q", 5)) == "kept"
+        assert cache.stats()["invalidations"] == 2
+
+
+class TestKnowledgeBaseQueryCaching:
+    """SportsKnowledgeRAG serves repeated queries from the shared cache."""
+
+    @pytest.fixture
+    def chunks_path(self, tmp_path, monkeypatch):
+        path = tmp_path / "chunks.json"
+        write_chunks(path)
+        monkeypatch.setattr("tools.knowledge_base_rag.SentenceTransformer", lambda name: HashingEncoder())
+        return path
+
+    def test_repeat_query_skips_encode_and_search(self, chunks_path):
+        rag = SportsKnowledgeRAG(chunks_path=str(chunks_path), embeddings_model="hash-64")
+        rag.embedding_model.calls.clear()
+
+        first = rag.search_knowledge("parlay correlation risk", top_k=5, min_relevance=0.0)
+        first.chunks.clear()  # callers may filter the returned lists in place
+        second = rag.search_knowledge("parlay correlation risk", top_k=5, min_relevance=0.0)
+        assert rag.embedding_model.calls == [1]
+        assert len(second.chunks) == 5
+
+        # Different parameters are separate entries; the query embedding is reused
+        filtered = rag.search_knowledge("parlay correlation risk", top_k=5, min_relevance=0.0, sport_filter="NBA")
+        assert rag.embedding_model.calls == [1]
+        assert len(filtered.chunks) == 5
+        stats = rag.query_cache.stats()
+        assert (stats["result_hits"], stats["result_misses"], stats["embedding_hits"]) == (1, 2, 1)
+
+    def test_cache_is_shared_across_agents_knowledge_bases(self, chunks_path):
+        nba = SportsKnowledgeRAG(chunks_path=str(chunks_path), embeddings_model="hash-64")
+        nfl = SportsKnowledgeRAG(chunks_path=str(chunks_path), embeddings_model="hash-64")
+        assert nba.query_cache is nfl.query_cache is get_rag_query_cache()
+
+        nba.get_value_betting_insights()
+        nfl.get_value_betting_insights()
+        assert nfl.embedding_model.calls == []  # index loaded from disk, query served from cache
+        assert get_rag_query_cache().stats()["result_hits"] == 1
+
+    def test_adding_chunks_invalidates_results(self, chunks_path):
+        rag = SportsKnowledgeRAG(chunks_path=str(chunks_path), embeddings_model="hash-64")
+        query = "zebra quagga okapi"
+        assert rag.search_knowledge(query, top_k=3, min_relevance=0.999).chunks == []
+
+        rag.add_chunks([KnowledgeChunk(content=query, source="Ed_Miller_new.pdf", chunk_id=10_000)])
+        result = rag.search_knowledge(query, top_k=3, min_relevance=0.999)
+        assert [chunk.chunk_id for chunk in result.chunks] == [10_000]
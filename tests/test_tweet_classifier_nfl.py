@@ -177,7 +177,7 @@ class TestSportSpecificContext:
             
             # Check that tokenizer was called with sport prefix
             mock_tokenizer.assert_called_with(
-                "[NFL] Player is injured",
+                ["[NFL] Player is injured"],
                 truncation=True,
                 padding=True,
                 max_length=128,
@@ -188,7 +188,7 @@ class TestSportSpecificContext:
             classifier.classify_tweet("Player is injured", "nba")
             
             mock_tokenizer.assert_called_with(
-                "[NBA] Player is injured",
+                ["[NBA] Player is injured"],
                 truncation=True,
                 padding=True,
                 max_length=128,
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized cross-book arbitrage scanner.
+"""
+
+from datetime import datetime, timezone
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from tools.advanced_arbitrage_integration import AdvancedArbitrageIntegration
+from tools.arbitrage_detector_tool import ArbitrageDetectorTool
+from tools.odds_fetcher_tool import GameOdds, BookOdds, Selection
+from tools.vectorized_arbitrage_scanner import (
+    MarketMatrix, VectorizedArbitrageScanner, build_market_matrices
+)
+
+BOOKS = ["draftkings", "fanduel", "betmgm", "caesars", "pointsbet"]
+
+
+@pytest.fixture
+def detector(tmp_path):
+    return ArbitrageDetectorTool(min_profit_threshold=0.005, db_path=str(tmp_path / "arb.sqlite"))
+
+
+def best_scalar_two_way(detector, matrix):
+    """Brute force: every ordered pair of distinct books through detect_arbitrage_two_way."""
+    best = None
+    for a, b in permutations(range(len(matrix.books)), 2):
+        home, away = matrix.odds[0, a], matrix.odds[1, b]
+        if np.isnan(home) or np.isnan(away):
+            continue
+        opportunity = detector.detect_arbitrage_two_way(home, matrix.books[a], away, matrix.books[b],
+                                                        sport=matrix.sport)
+        if opportunity and (best is None or opportunity.profit_margin > best.profit_margin):
+            best = opportunity
+    return best
+
+
+class TestVectorizedArbitrageScanner:
+    """Test suite for VectorizedArbitrageScanner."""
+
+    def test_matches_scalar_two_way_detector(self, detector):
+        rng = np.random.default_rng(3)
+        matrices = []
+        for i in range(60):
+            odds = rng.choice([-130, -120, -110, -105, 100, 105, 110, 115, 125], size=(2, len(BOOKS))).astype(float)
+            odds[rng.random(odds.shape) < 0.2] = np.nan
+            matrices.append(MarketMatrix(f"g{i}", "h2h", ["home", "away"], BOOKS, odds,
+                                         sport="nfl" if i % 3 == 0 else "nba"))
+
+        found = {opp.game_id: opp for opp in VectorizedArbitrageScanner(detector).scan(matrices)}
+        for matrix in matrices:
+            expected = best_scalar_two_way(detector, matrix)
+            actual = found.get(matrix.game_id)
+            assert (expected is None) == (actual is None), matrix.game_id
+            if expected is not None:
+                assert actual.profit_margin == pytest.approx(expected.profit_margin)
+                assert actual.stake_ratios == pytest.approx(expected.stake_ratios)
+                assert actual.confidence_level == expected.confidence_level
+        assert any(found.values())
+
+    def test_legs_must_use_different_books(self, detector):
+        # The only arbitrage-looking pair is both sides at one book
+        odds = np.array([[150.0, -200.0], [150.0, -200.0]])
+        matrix = MarketMatrix("g1", "h2h", ["home", "away"], ["draftkings", "fanduel"], odds)
+        assert VectorizedArbitrageScanner(detector).scan([matrix]) == []
+
+    def test_three_way_market(self, detector):
+        odds = np.array([[320.0, 250.0, np.nan],
+                         [240.0, 280.0, 330.0],
+                         [150.0, 110.0, 100.0]])
+        matrix = MarketMatrix("g1", "h2h", ["home", "draw", "away"], ["draftkings", "fanduel", "betmgm"], odds)
+
+        opportunities = VectorizedArbitrageScanner(detector).scan([matrix])
+        assert len(opportunities) == 1
+        opportunity = opportunities[0]
+        assert opportunity.type == "3-way"
+        assert len({leg.book for leg in opportunity.legs}) == 3
+        assert opportunity.profit_margin >= detector.min_profit_threshold
+        assert opportunity in detector.opportunities_detected
+
+
+class TestIntegrationSlateScan:
+    """AdvancedArbitrageIntegration scans every due game's markets in one call."""
+
+    @pytest.fixture
+    def integration(self, monkeypatch, tmp_path):
+        integration = AdvancedArbitrageIntegration(confidence_filter="low", enable_cross_validation=False)
+        integration.latency_monitor = None
+        integration.arbitrage_detector.odds_fetcher = None  # no fresh-odds network check
+        integration.arbitrage_detector.db_path = tmp_path / "arbitrage.sqlite"
+
+        def fetch_live_odds_data(game_ids):
+            quotes = {
+                "arb": {"draftkings": {"home": 110, "away": -130}, "fanduel": {"home": -130, "away": 110}},
+                "flat": {"draftkings": {"home": -110, "away": -110}, "fanduel": {"home": -110, "away": -110}},
+                "3way": {"draftkings": {"win": 320, "draw": 240, "loss": 150},
+                         "fanduel": {"win": 250, "draw": 280, "loss": 110},
+                         "betmgm": {"win": 200, "draw": 330, "loss": 100}}
+            }
+            timestamp = datetime.now(timezone.utc).isoformat()
+            return {game_id: {"game_id": game_id, "timestamp": timestamp,
+                              "books": [{"name": name, "odds": odds} for name, odds in quotes[game_id].items()]}
+                    for game_id in game_ids}
+
+        monkeypatch.setattr(integration, "fetch_live_odds_data", fetch_live_odds_data)
+        return integration
+
+    def test_one_scan_for_the_whole_slate(self, integration, monkeypatch):
+        scanned = []
+        scan = integration.matrix_scanner.scan
+
+        def counting_scan(matrices, log_opportunities=False):
+            scanned.append([(matrix.game_id, matrix.market_type) for matrix in matrices])
+            return scan(matrices, log_opportunities)
+
+        monkeypatch.setattr(integration.matrix_scanner, "scan", counting_scan)
+        report = integration.scan_multiple_games(["arb", "flat", "3way"])
+
+        assert scanned == [[("arb", "h2h"), ("flat", "h2h"), ("3way", "3way")]]
+        assert [(opp.game_id, opp.market_type) for opp in report.opportunities] == [("arb", "h2h"), ("3way", "3way")]
+        assert [leg.team for leg in report.opportunities[1].legs] == ["win", "draw", "loss"]
+
+
+class TestBuildMarketMatrices:
+    """Test suite for build_market_matrices."""
+
+    def test_groups_spreads_and_totals_by_line(self):
+        game = GameOdds(sport_key="americanfootball_nfl", game_id="g1", commence_time="2030-01-01T00:00:00Z", books=[
+            BookOdds(bookmaker="DraftKings", market="spreads", selections=[
+                Selection(name="Bills", price_decimal=1.91, line=-2.5),
+                Selection(name="Jets", price_decimal=1.91, line=2.5)
+            ]),
+            BookOdds(bookmaker="FanDuel", market="spreads", selections=[
+                Selection(name="Bills", price_decimal=2.05, line=-2.5),
+                Selection(name="Jets", price_decimal=1.80, line=2.5)
+            ]),
+            BookOdds(bookmaker="FanDuel", market="totals", selections=[
+                Selection(name="Over", price_decimal=1.90, line=44.5),
+                Selection(name="Under", price_decimal=1.90, line=44.5)
+            ]),
+            BookOdds(bookmaker="BetMGM", market="totals", selections=[
+                Selection(name="Over", price_decimal=1.95, line=45.5),
+                Selection(name="Under", price_decimal=1.87, line=45.5)
+            ])
+        ])
+
+        matrices = build_market_matrices([game])
+        # Totals at different lines never pair up, so only the spread market qualifies
+        assert len(matrices) == 1
+        spread = matrices[0]
+        assert spread.market_type == "spreads -2.5"
+        assert spread.sport == "nfl"
+        assert spread.outcomes == ["Bills", "Jets"]
+        assert spread.books == ["DraftKings", "FanDuel"]
+        np.testing.assert_allclose(spread.odds, [[-109.89, 105.0], [-109.89, -125.0]], atol=0.01)
@@ -14,15 +14,19 @@ with real-world hedge fund-level sophistication.
 
 import logging
 import asyncio
+import numpy as np
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass, asdict
 
 from tools.arbitrage_detector_tool import ArbitrageDetectorTool, ArbitrageOpportunity
+from tools.vectorized_arbitrage_scanner import VectorizedArbitrageScanner, MarketMatrix
+from tools.odds_delta_engine import OddsDeltaEngine, ChangedGameTracker
 
 # Import existing tools
 try:
     from tools.odds_fetcher_tool import OddsFetcherTool, GameOdds
+    from tools.market_snapshot_cache import get_market_snapshot_cache
     HAS_ODDS_FETCHER = True
 except ImportError:
     HAS_ODDS_FETCHER = False
@@ -102,25 +106,38 @@ class AdvancedArbitrageIntegration:
             max_latency_threshold=max_latency_seconds,
             false_positive_epsilon=0.0005  # Stricter FP suppression
         )
+        self.matrix_scanner = VectorizedArbitrageScanner(self.arbitrage_detector)
         
         # Initialize external integrations
         self.odds_fetcher = OddsFetcherTool() if HAS_ODDS_FETCHER else None
         self.latency_monitor = OddsLatencyMonitor() if HAS_LATENCY_MONITOR else None
         self.market_discrepancy = MarketDiscrepancyDetector() if HAS_MARKET_DISCREPANCY else None
         
+        # Live slates are diffed so unchanged games reuse their last result
+        self.delta_engine = OddsDeltaEngine()
+        self._changed_games = ChangedGameTracker()
+        self.delta_engine.subscribe(self._changed_games)
+        self._opportunities_by_game: Dict[str, List[ArbitrageOpportunity]] = {}
+        
         # Performance tracking
         self.execution_reports = []
         self.alerts_suppressed = 0
         self.cross_validations_performed = 0
+        self.games_reused_unchanged = 0
         
         logger.info(f"AdvancedArbitrageIntegration initialized - Min edge: {min_profit_threshold:.2%}")
     
-    def fetch_live_odds_data(self, game_ids: List[str]) -> Dict[str, Any]:
+    def fetch_live_odds_data(self, game_ids: List[str], sport_key: str = "basketball_nba") -> Dict[str, Any]:
         """
         Fetch live odds data using JIRA-004 OddsFetcherTool.
         
+        The whole slate is fetched once through the shared market snapshot
+        cache (no older than max_latency_seconds) and the requested games are
+        picked out of it, instead of one upstream request per game.
+        
         Args:
             game_ids: List of game identifiers
+            sport_key: Sport the games belong to
             
         Returns:
             Dictionary of game_id -> odds data
@@ -131,15 +148,22 @@ class AdvancedArbitrageIntegration:
         
         odds_data = {}
         
+        try:
+            slate = get_market_snapshot_cache().get(
+                sport_key, self.odds_fetcher.get_game_odds, max_age=self.max_latency_seconds
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch odds for {sport_key}: {e}")
+            return odds_data
+        
+        self.delta_engine.ingest(slate, complete=True)
+        games_by_id = {game.game_id: game for game in slate}
         for game_id in game_ids:
-            try:
-                game_odds = self.odds_fetcher.get_game_odds(game_id)
-                if game_odds:
-                    odds_data[game_id] = self._extract_arbitrage_odds(game_odds)
-                else:
-                    logger.warning(f"No odds data available for game {game_id}")
-            except Exception as e:
-                logger.error(f"Failed to fetch odds for game {game_id}: {e}")
+            game_odds = games_by_id.get(game_id)
+            if game_odds:
+                odds_data[game_id] = self._extract_arbitrage_odds(game_odds)
+            else:
+                logger.warning(f"No odds data available for game {game_id}")
         
         return odds_data
     
@@ -303,72 +327,79 @@ class AdvancedArbitrageIntegration:
         Returns:
             List of validated arbitrage opportunities
         """
-        opportunities = []
-        
-        if 'books' not in odds_data or len(odds_data['books']) < 2:
-            return opportunities
-        
-        books_data = odds_data['books']
-        
-        # Extract odds for two-way arbitrage detection
-        home_odds = []
-        away_odds = []
-        
-        for book in books_data:
-            book_name = book['name']
-            if 'home' in book['odds'] and 'away' in book['odds']:
-                home_odds.append((book['odds']['home'], book_name))
-                away_odds.append((book['odds']['away'], book_name))
-        
-        # Detect two-way arbitrages
-        for home_odds_val, home_book in home_odds:
-            for away_odds_val, away_book in away_odds:
-                if home_book != away_book:  # Different books
-                    arbitrage = self.arbitrage_detector.detect_arbitrage_two_way(
-                        home_odds_val, home_book, away_odds_val, away_book
-                    )
-                    
-                    if arbitrage:
-                        # Set game context
-                        arbitrage.game_id = game_id
-                        arbitrage.market_type = "h2h"
-                        
-                        # Apply confidence filter
-                        if self._passes_confidence_filter(arbitrage):
-                            # Cross-validate if enabled
-                            if self.cross_validate_with_market_discrepancy(arbitrage, game_id):
-                                opportunities.append(arbitrage)
-                            else:
-                                logger.info(f"Arbitrage rejected by cross-validation: {game_id}")
-                        else:
-                            logger.info(f"Arbitrage below confidence threshold: {arbitrage.confidence_level}")
-        
-        # Detect three-way arbitrages if enough books
-        if len(books_data) >= 3:
-            # Look for three-way markets (Win/Draw/Loss)
-            three_way_odds = []
-            for book in books_data:
-                if len(book['odds']) >= 3:
-                    odds_values = list(book['odds'].values())[:3]
-                    for i, odds_val in enumerate(odds_values):
-                        three_way_odds.append((odds_val, f"{book['name']}_outcome_{i}"))
+        return self._detect_arbitrage_for_games({game_id: odds_data})[game_id]
+    
+    def _detect_arbitrage_for_games(self,
+                                    odds_by_game: Dict[str, Dict[str, Any]]) -> Dict[str, List[ArbitrageOpportunity]]:
+        """
+        Detect arbitrage across games with one vectorized scan of all their markets.
+        
+        Args:
+            odds_by_game: Odds data per game identifier
             
-            if len(three_way_odds) >= 3:
-                # Take first three for simplicity
-                arbitrage = self.arbitrage_detector.detect_arbitrage_three_way(
-                    three_way_odds[:3]
-                )
-                
-                if arbitrage:
-                    arbitrage.game_id = game_id
-                    arbitrage.market_type = "3way"
-                    
-                    if self._passes_confidence_filter(arbitrage):
-                        if self.cross_validate_with_market_discrepancy(arbitrage, game_id):
-                            opportunities.append(arbitrage)
+        Returns:
+            Opportunities passing the confidence filter and cross-validation, per game
+        """
+        matrices = []
+        for game_id, odds_data in odds_by_game.items():
+            matrices.extend(self._market_matrices(odds_data, game_id))
+        
+        opportunities = {game_id: [] for game_id in odds_by_game}
+        for arbitrage in self.matrix_scanner.scan(matrices, log_opportunities=True):
+            game_id = arbitrage.game_id
+            # Apply confidence filter
+            if not self._passes_confidence_filter(arbitrage):
+                logger.info(f"Arbitrage below confidence threshold: {arbitrage.confidence_level}")
+            # Cross-validate if enabled
+            elif self.cross_validate_with_market_discrepancy(arbitrage, game_id):
+                opportunities[game_id].append(arbitrage)
+            else:
+                logger.info(f"Arbitrage rejected by cross-validation: {game_id}")
         
         return opportunities
     
+    def _market_matrices(self, odds_data: Dict[str, Any], game_id: str) -> List[MarketMatrix]:
+        """Two-way moneyline and three-way (Win/Draw/Loss) market matrices of one game."""
+        books_data = odds_data.get('books', [])
+        if len(books_data) < 2:
+            return []
+        
+        matrices = []
+        
+        # Two-way moneyline: one (home/away x books) matrix, best distinct-book pair in one pass
+        two_way_books = [book for book in books_data if 'home' in book['odds'] and 'away' in book['odds']]
+        if len(two_way_books) >= 2:
+            matrices.append(MarketMatrix(
+                game_id=game_id,
+                market_type="h2h",
+                outcomes=["home", "away"],
+                books=[book['name'] for book in two_way_books],
+                odds=np.array([[book['odds']['home'] for book in two_way_books],
+                               [book['odds']['away'] for book in two_way_books]], dtype=float)
+            ))
+        
+        # Three-way markets (Win/Draw/Loss, NFL only): one leg per outcome at distinct books
+        three_way_books = [book for book in books_data if len(book['odds']) >= 3]
+        if three_way_books:
+            outcomes = list(three_way_books[0]['odds'])[:3]
+            quoting_books = [book for book in three_way_books if all(o in book['odds'] for o in outcomes)]
+            if len(quoting_books) >= 3:
+                matrices.append(MarketMatrix(
+                    game_id=game_id,
+                    market_type="3way",
+                    outcomes=outcomes,
+                    books=[book['name'] for book in quoting_books],
+                    odds=np.array([[book['odds'][o] for book in quoting_books] for o in outcomes], dtype=float),
+                    sport="nfl"
+                ))
+        
+        return matrices
+    
+    @staticmethod
+    def _is_expired(opportunity: ArbitrageOpportunity, now: datetime) -> bool:
+        """Whether the opportunity's execution window has closed (as validate_arbitrage_opportunity checks)."""
+        return now >= datetime.fromisoformat(opportunity.expires_at.replace('Z', '+00:00'))
+    
     def _passes_confidence_filter(self, arbitrage: ArbitrageOpportunity) -> bool:
         """Check if arbitrage passes minimum confidence filter."""
         confidence_levels = {"low": 0, "medium": 1, "high": 2}
@@ -395,32 +426,62 @@ class AdvancedArbitrageIntegration:
         # Fetch live odds data
         odds_data = self.fetch_live_odds_data(game_ids)
         
-        all_opportunities = []
+        # Only games whose odds moved are re-detected (mock data is never diffed)
+        if self.delta_engine.ingests:
+            due_games = set(self._changed_games.take(game_ids))
+        else:
+            due_games = set(game_ids)
+        
         stale_rejected = 0
         false_positives = 0
+        reused_by_game = {}
+        due_odds = {}
         
         for game_id in game_ids:
             if game_id not in odds_data:
+                self._opportunities_by_game.pop(game_id, None)
                 continue
             
             game_odds = odds_data[game_id]
             
-            # Validate signal freshness
+            # Validate signal freshness; the game's change flag is already taken,
+            # so its previous result must not be reused once fresh odds arrive
             if not self.validate_signal_freshness(game_odds):
+                self._opportunities_by_game.pop(game_id, None)
                 stale_rejected += 1
                 continue
             
-            # Detect arbitrage opportunities
-            opportunities = self.detect_arbitrage_opportunities(game_odds, game_id)
+            if game_id not in due_games and game_id in self._opportunities_by_game:
+                cached = self._opportunities_by_game[game_id]
+                if not any(self._is_expired(opp, scan_start) for opp in cached):
+                    reused_by_game[game_id] = cached
+                    self.games_reused_unchanged += 1
+                    continue
+                # An execution window closed: detect again as if the odds had moved
+                del self._opportunities_by_game[game_id]
+            
+            due_odds[game_id] = game_odds
+        
+        # Detect arbitrage opportunities: one scan over every due game's markets
+        detected_by_game = self._detect_arbitrage_for_games(due_odds)
+        
+        all_opportunities = []
+        for game_id in game_ids:
+            if game_id in reused_by_game:
+                all_opportunities.extend(reused_by_game[game_id])
+                continue
+            if game_id not in detected_by_game:
+                continue
             
             # Final validation of each opportunity
             validated_opportunities = []
-            for opp in opportunities:
+            for opp in detected_by_game.pop(game_id):
                 if self.arbitrage_detector.validate_arbitrage_opportunity(opp):
                     validated_opportunities.append(opp)
                 else:
                     false_positives += 1
             
+            self._opportunities_by_game[game_id] = validated_opportunities
             all_opportunities.extend(validated_opportunities)
         
         # Calculate metrics
@@ -522,6 +583,8 @@ class AdvancedArbitrageIntegration:
                 "execution_reports_generated": len(self.execution_reports),
                 "alerts_suppressed": self.alerts_suppressed,
                 "cross_validations_performed": self.cross_validations_performed,
+                "games_reused_unchanged": self.games_reused_unchanged,
+                "odds_delta_stats": self.delta_engine.stats(),
                 "detector_stats": self.arbitrage_detector.get_execution_summary()
             },
             "last_scan": (
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+ANN Index - nearest-neighbour search backends for EmbeddingIndex
+
+Brute-force cosine over every chunk is fine for the books corpus today, but
+the ingestion scripts keep growing it. EmbeddingIndex delegates search to a
+backend:
+
+- ExactSearchBackend: one matrix-vector product over all (allowed) rows
+- IVFFlatBackend: spherical k-means coarse quantizer; a query scores the
+  centroids, then only the rows in the nprobe closest lists
+
+Both take an optional boolean row mask (e.g. chunks relevant to a sport), so
+metadata filters are applied while searching instead of after top-k. IVF
+lists are extended past nprobe when the mask leaves fewer than top_k
+candidates. New rows are assigned to their nearest list (incremental add);
+retraining is only needed when the corpus drifts far from the centroids.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def top_k_rows(scores: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(rows, scores) of the k best scores, best first."""
+    if k <= 0 or len(scores) == 0:
+        return rows[:0], scores[:0]
+    if k < len(scores):
+        best = np.argpartition(-scores, k - 1)[:k]
+    else:
+        best = np.arange(len(scores))
+    best = best[np.argsort(-scores[best], kind='stable')]
+    return rows[best], scores[best]
+
+
+class SearchBackend:
+    """Interface of an EmbeddingIndex search backend."""
+
+    name = "base"
+
+    def fit(self, vectors: np.ndarray) -> None:
+        """Build search structures for all rows of vectors."""
+
+    def add(self, vectors: np.ndarray, start: int) -> None:
+        """Index rows vectors[start:], appended after the last fit/add."""
+
+    def search(self, vectors: np.ndarray, query: np.ndarray, k: int,
+               allowed: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best k rows by inner product with the query.
+
+        Args:
+            vectors: Unit-norm row matrix the backend was fit on
+            query: Unit-norm query vector
+            k: Number of results
+            allowed: Optional boolean mask over rows; masked-out rows are never returned
+
+        Returns:
+            (rows, scores), best first
+        """
+        raise NotImplementedError
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Arrays to persist (empty: nothing worth saving)."""
+        return {}
+
+    def load_state(self, state: Dict[str, np.ndarray], n_vectors: int) -> bool:
+        """Restore persisted arrays; False if they do not fit n_vectors rows."""
+        return False
+
+
+class ExactSearchBackend(SearchBackend):
+    """Brute-force inner product over every allowed row."""
+
+    name = "exact"
+
+    def search(self, vectors: np.ndarray, query: np.ndarray, k: int,
+               allowed: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        if allowed is None:
+            return top_k_rows(vectors @ query, np.arange(len(vectors)), k)
+        rows = np.flatnonzero(allowed)
+        return top_k_rows(vectors[rows] @ query, rows, k)
+
+
+class IVFFlatBackend(SearchBackend):
+    """Inverted-file index with uncompressed (flat) vectors and a spherical k-means quantizer."""
+
+    name = "ivf"
+
+    def __init__(self, n_lists: Optional[int] = None, nprobe: int = 8,
+                 train_iterations: int = 10, max_train_points: int = 256, seed: int = 0):
+        """
+        Args:
+            n_lists: Number of inverted lists (default ~4 * sqrt(n_vectors))
+            nprobe: Lists scanned per query; higher trades latency for recall
+            train_iterations: k-means iterations
+            max_train_points: k-means sample size per list
+            seed: Random seed for centroid initialisation and sampling
+        """
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.train_iterations = train_iterations
+        self.max_train_points = max_train_points
+        self.seed = seed
+
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self._list_rows = np.zeros(0, dtype=np.int64)
+        self._list_offsets = np.zeros(1, dtype=np.int64)
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray, batch_size: int = 65_536) -> np.ndarray:
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), batch_size):
+            block = np.asarray(vectors[start:start + batch_size], dtype=np.float32)
+            assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return assignments
+
+    def _rebuild_lists(self) -> None:
+        self._list_rows = np.argsort(self.assignments, kind='stable')
+        counts = np.bincount(self.assignments, minlength=len(self.centroids))
+        self._list_offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def fit(self, vectors: np.ndarray) -> None:
+        n = len(vectors)
+        if n == 0:
+            return
+        n_lists = min(self.n_lists or max(1, int(round(4 * math.sqrt(n)))), n)
+        rng = np.random.default_rng(self.seed)
+
+        sample_size = min(n, n_lists * self.max_train_points)
+        sample = np.asarray(vectors[np.sort(rng.choice(n, sample_size, replace=False))], dtype=np.float32)
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+        for _ in range(self.train_iterations):
+            labels = self._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1)
+            empty = norms == 0
+            if empty.any():
+                # Re-seed empty lists with random sample points
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()), replace=False)]
+                norms[empty] = np.linalg.norm(sums[empty], axis=1)
+            centroids = sums / np.maximum(norms, 1e-12)[:, None]
+
+        self.centroids = centroids.astype(np.float32)
+        self.assignments = self._assign(vectors, self.centroids)
+        self._rebuild_lists()
+        logger.info(f"IVF index trained: {n} vectors in {n_lists} lists")
+
+    def add(self, vectors: np.ndarray, start: int) -> None:
+        if len(self.centroids) == 0:
+            self.fit(vectors)
+            return
+        self.assignments = np.concatenate([self.assignments[:start], self._assign(vectors[start:], self.centroids)])
+        self._rebuild_lists()
+
+    def search(self, vectors: np.ndarray, query: np.ndarray, k: int,
+               allowed: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        n_lists = len(self.centroids)
+        if n_lists == 0 or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        order = np.argsort(-(self.centroids @ query))
+        offsets, list_rows = self._list_offsets, self._list_rows
+        probed = min(self.nprobe, n_lists)
+        while True:
+            rows = np.concatenate([list_rows[offsets[i]:offsets[i + 1]] for i in order[:probed]])
+            if allowed is not None:
+                rows = rows[allowed[rows]]
+            # Too few candidates survive the filter: widen the probe
+            if len(rows) >= k or probed == n_lists:
+                break
+            probed = min(n_lists, probed * 2)
+
+        return top_k_rows(np.asarray(vectors[rows]) @ query, rows, k)
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {'centroids': self.centroids, 'assignments': self.assignments}
+
+    def load_state(self, state: Dict[str, np.ndarray], n_vectors: int) -> bool:
+        if 'centroids' not in state or len(state.get('assignments', ())) != n_vectors:
+            return False
+        self.centroids = np.asarray(state['centroids'], dtype=np.float32)
+        self.assignments = np.asarray(state['assignments'], dtype=np.int32)
+        self._rebuild_lists()
+        return True
+
+
+def create_backend(name: str, n_vectors: int = 0, auto_threshold: int = 50_000, **kwargs) -> SearchBackend:
+    """
+    Search backend by name.
+
+    Args:
+        name: 'exact', 'ivf' or 'auto' (exact below auto_threshold vectors, IVF above)
+        n_vectors: Corpus size, used by 'auto'
+        auto_threshold: Corpus size at which 'auto' switches to IVF
+        **kwargs: Backend options (e.g. nprobe, n_lists for IVF)
+
+    Returns:
+        SearchBackend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name == 'auto':
+        name = 'ivf' if n_vectors >= auto_threshold else 'exact'
+    if name == 'exact':
+        return ExactSearchBackend()
+    if name == 'ivf':
+        return IVFFlatBackend(**kwargs)
+    raise ValueError(f"Unknown search backend: {name}")
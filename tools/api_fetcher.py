@@ -1,4 +1,6 @@
 
+import asyncio
+import aiohttp
 import requests
 import time
 import logging
@@ -43,3 +45,93 @@ class ApiFetcher:
                 logging.error(f"Unexpected error for {url}: {e}")
                 raise Exception(str(e))
         raise Exception(f"Failed after {max_retries} retries: {url}")
+
+
+class AsyncApiFetcher:
+    """
+    asyncio counterpart of ApiFetcher.
+
+    Reuses a single aiohttp session (and therefore its keep-alive connection
+    pool) across calls and bounds the number of in-flight requests with a
+    semaphore, so many fetches can be gathered without blocking the event loop.
+    """
+
+    def __init__(self, api_key: str = None, max_connections: int = 20,
+                 max_concurrency: int = 10, keepalive_timeout: float = 30.0,
+                 timeout: float = 10.0):
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session = None
+        self._semaphore = None
+        self._loop = None
+
+    async def _get_session(self):
+        # Sessions are bound to the loop they were created on; callers that
+        # drive us through asyncio.run() get a fresh pool per loop.
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._session
+
+    async def fetch(self, url: str, headers: dict = None, params: dict = None, max_retries: int = 3, backoff_factor: float = 2.0):
+        session = await self._get_session()
+        retries = 0
+        delay = 1
+        while retries < max_retries:
+            try:
+                async with self._semaphore:
+                    async with session.get(url, headers=headers, params=params) as response:
+                        if response.status == 401:
+                            logging.error(f"401 Unauthorized: {url}")
+                            raise Exception("Unauthorized: Check your API key and permissions.")
+                        if response.status == 404:
+                            logging.error(f"404 Not Found: {url}")
+                            raise Exception("Not Found: The requested resource does not exist.")
+                        if response.status != 429:
+                            response.raise_for_status()
+                            return await response.json()
+                logging.warning(f"429 Rate Limit: {url}. Retrying in {delay} seconds...")
+                await asyncio.sleep(delay)
+                retries += 1
+                delay *= backoff_factor
+            except asyncio.TimeoutError:
+                logging.error(f"Timeout occurred for {url}. Retrying in {delay} seconds...")
+                await asyncio.sleep(delay)
+                retries += 1
+                delay *= backoff_factor
+            except aiohttp.ClientConnectionError:
+                logging.error(f"Connection error for {url}. Retrying in {delay} seconds...")
+                await asyncio.sleep(delay)
+                retries += 1
+                delay *= backoff_factor
+            except Exception as e:
+                logging.error(f"Unexpected error for {url}: {e}")
+                raise Exception(str(e))
+        raise Exception(f"Failed after {max_retries} retries: {url}")
+
+    async def close(self):
+        """Close the pooled session and release its connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._semaphore = None
+        self._loop = None
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
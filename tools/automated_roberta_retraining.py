@@ -24,6 +24,7 @@ try:
     from transformers import DataCollatorWithPadding
     from datasets import Dataset
     from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+    from tools.model_export import export_fast_inference
     HAS_TRANSFORMERS = True
 except ImportError:
     HAS_TRANSFORMERS = False
@@ -50,6 +51,8 @@ class RetrainingConfig:
     validation_split: float = 0.2
     min_samples_per_class: int = 50
     early_stopping_patience: int = 2
+    # Fast CPU artifacts exported after each retrain (see tools/model_export.py)
+    export_backends: Tuple[str, ...] = ("int8", "onnx_int8")
 
 
 @dataclass
@@ -440,6 +443,18 @@ class AutomatedRoBERTaRetrainer:
                 "final_metrics": eval_results
             }
             
+            # Fast CPU artifacts, parity-checked against the retrained fp32 model
+            if self.config.export_backends:
+                try:
+                    manifest = export_fast_inference(
+                        self.config.output_dir, self.config.export_backends,
+                        parity_texts=eval_dataset["text"], parity_labels=eval_dataset["labels"],
+                        max_length=self.config.max_length
+                    )
+                    metadata["fast_export"] = manifest["backends"]
+                except Exception as e:
+                    logger.warning(f"Fast CPU export failed, serving fp32 only: {e}")
+            
             with open(Path(self.config.output_dir) / "training_metadata.json", 'w') as f:
                 json.dump(metadata, f, indent=2)
             
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+BM25 Index
+
+Inverted index over the knowledge-base chunks with Okapi BM25 scoring.
+SportsKnowledgeRAG's keyword fallback used to lowercase and split every
+chunk's content on every query; here chunks are tokenized once into a CSR
+posting list (term -> chunk rows and term frequencies) saved beside the
+chunks file, so a query only touches the postings of its own terms.
+
+Key Features:
+- Postings, document lengths and vocabulary in one .npz, written atomically
+  and invalidated by a content hash of the chunks file (like EmbeddingIndex)
+- Per-posting BM25 weights precomputed on load: a query is one scatter-add
+  per query term plus a top-k selection
+- Optional per-row label bitmasks (e.g. sports) saved with the postings, so
+  filtered keyword search does not depend on the embedding index; rows line
+  up with the embedding index rows, so one boolean row mask filters both
+- Incremental adds for chunks ingested at runtime
+- reciprocal_rank_fusion() merges BM25 and vector rankings (hybrid search)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tools.embedding_index import file_content_hash
+
+logger = logging.getLogger(__name__)
+
+BM25_FORMAT_VERSION = 1
+
+# Conventional Okapi BM25 parameters
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+# k in 1 / (k + rank): damps the influence of any single ranking's top ranks
+RRF_K = 60
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = RRF_K) -> List[Tuple[int, float]]:
+    """
+    Merge rankings by reciprocal rank: score(row) = sum of 1 / (k + rank).
+
+    Args:
+        rankings: Row ids, best first, one sequence per retriever
+        k: Rank damping constant
+
+    Returns:
+        (row, fused score) pairs, best first (ties keep first-seen order)
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, 1):
+            scores[row] = scores.get(row, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+class BM25Index:
+    """CSR inverted index of chunk rows with BM25 scoring."""
+
+    def __init__(self, vocabulary: Sequence[str], term_offsets: np.ndarray, posting_rows: np.ndarray,
+                 posting_tfs: np.ndarray, doc_lengths: np.ndarray, chunk_ids: Sequence[int],
+                 content_hash: str = "", k1: float = DEFAULT_K1, b: float = DEFAULT_B,
+                 labels: Optional[np.ndarray] = None):
+        self.vocabulary = list(vocabulary)
+        self.term_ids = {term: i for i, term in enumerate(self.vocabulary)}
+        self.term_offsets = np.asarray(term_offsets, dtype=np.int64)
+        self.posting_rows = np.asarray(posting_rows, dtype=np.int32)
+        self.posting_tfs = np.asarray(posting_tfs, dtype=np.float32)
+        self.doc_lengths = np.asarray(doc_lengths, dtype=np.float32)
+        self.chunk_ids = np.asarray(chunk_ids, dtype=np.int64)
+        self.content_hash = content_hash
+        self.k1 = k1
+        self.b = b
+        self.labels = None if labels is None else np.asarray(labels, dtype=np.uint32)
+        self._allowed: Dict[int, np.ndarray] = {}
+        self.weights = self._posting_weights()
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    @property
+    def version(self) -> str:
+        """Changes whenever search results could change (rebuild or add)."""
+        return f"bm25:{self.content_hash}:{len(self)}"
+
+    def _posting_weights(self) -> np.ndarray:
+        """idf(term) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avg_len)) per posting."""
+        if len(self.posting_rows) == 0:
+            return np.zeros(0, dtype=np.float32)
+        doc_freqs = np.diff(self.term_offsets).astype(np.float32)
+        n_docs = np.float32(len(self))
+        idf = np.log1p((n_docs - doc_freqs + 0.5) / (doc_freqs + 0.5))
+        length_norm = 1 - self.b + self.b * self.doc_lengths / max(float(self.doc_lengths.mean()), 1.0)
+        tf = self.posting_tfs
+        saturation = tf * (self.k1 + 1) / (tf + self.k1 * length_norm[self.posting_rows])
+        return (np.repeat(idf, np.diff(self.term_offsets)) * saturation).astype(np.float32)
+
+    @classmethod
+    def build(cls, texts: Sequence[str], chunk_ids: Sequence[int], content_hash: str = "",
+              k1: float = DEFAULT_K1, b: float = DEFAULT_B,
+              label_fn: Optional[Callable[[str], int]] = None) -> BM25Index:
+        """
+        Tokenize every chunk once.
+
+        Args:
+            texts: Chunk contents, in row order
+            chunk_ids: Chunk id of each text
+            content_hash: Hash of the chunks file recorded in the index
+            k1: Term-frequency saturation
+            b: Document-length normalization
+            label_fn: Label bitmask of a text, stored per row for allowed_rows (None: no labels)
+
+        Returns:
+            In-memory BM25Index
+        """
+        index = cls([], np.zeros(1, dtype=np.int64), np.zeros(0), np.zeros(0), np.zeros(0), [],
+                    content_hash, k1, b, labels=None if label_fn is None else np.zeros(0))
+        index.add(texts, chunk_ids, None if label_fn is None else [label_fn(text) for text in texts])
+        logger.info(f"Indexed {len(index)} chunks, {len(index.vocabulary)} terms for BM25")
+        return index
+
+    def add(self, texts: Sequence[str], chunk_ids: Sequence[int],
+            labels: Optional[Sequence[int]] = None) -> None:
+        """
+        Append rows for new chunks (re-sorts the postings; meant for small batches).
+
+        Args:
+            texts: New chunk contents
+            chunk_ids: Chunk id of each text
+            labels: Label bitmask of each text (required once labels are set)
+        """
+        if len(texts) != len(chunk_ids):
+            raise ValueError(f"Expected {len(texts)} chunk ids, got {len(chunk_ids)}")
+        if self.labels is not None:
+            if labels is None:
+                raise ValueError("Labels are set on this index; new rows need labels too")
+            self.labels = np.concatenate([self.labels, np.asarray(labels, dtype=np.uint32)])
+            self._allowed.clear()
+        first_row = len(self)
+        terms, rows, tfs, lengths = [], [], [], []
+        for offset, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                term_id = self.term_ids.get(term)
+                if term_id is None:
+                    term_id = self.term_ids[term] = len(self.vocabulary)
+                    self.vocabulary.append(term)
+                terms.append(term_id)
+                rows.append(first_row + offset)
+                tfs.append(count)
+
+        # Existing postings as (term, row, tf) triples plus the new ones, back into CSR
+        old_terms = np.repeat(np.arange(len(self.term_offsets) - 1), np.diff(self.term_offsets))
+        all_terms = np.concatenate([old_terms, np.asarray(terms, dtype=np.int64)])
+        order = np.argsort(all_terms, kind='stable')
+        self.posting_rows = np.concatenate([self.posting_rows, np.asarray(rows, dtype=np.int32)])[order]
+        self.posting_tfs = np.concatenate([self.posting_tfs, np.asarray(tfs, dtype=np.float32)])[order]
+        self.term_offsets = np.concatenate([[0], np.cumsum(np.bincount(all_terms, minlength=len(self.vocabulary)))])
+        self.doc_lengths = np.concatenate([self.doc_lengths, np.asarray(lengths, dtype=np.float32)])
+        self.chunk_ids = np.concatenate([self.chunk_ids, np.asarray(chunk_ids, dtype=np.int64)])
+        self.weights = self._posting_weights()
+
+    def allowed_rows(self, label_mask: int) -> Optional[np.ndarray]:
+        """Boolean row mask of rows sharing a bit with label_mask (None: no filter)."""
+        if not label_mask or self.labels is None:
+            return None
+        allowed = self._allowed.get(label_mask)
+        if allowed is None:
+            allowed = self._allowed[label_mask] = (self.labels & np.uint32(label_mask)) != 0
+        return allowed
+
+    def search(self, query: str, top_k: int,
+               allowed: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        BM25 top-k for a query.
+
+        Args:
+            query: Query text
+            top_k: Number of results
+            allowed: Boolean row mask (None: all rows)
+
+        Returns:
+            (row, score) pairs with a positive score, best first
+        """
+        if len(self) == 0 or top_k <= 0:
+            return []
+        term_ids = {self.term_ids[term] for term in tokenize(query) if term in self.term_ids}
+        if not term_ids:
+            return []
+
+        scores = np.zeros(len(self), dtype=np.float32)
+        for term_id in term_ids:
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            # Rows are unique within one term's postings
+            scores[self.posting_rows[start:end]] += self.weights[start:end]
+        if allowed is not None:
+            scores[~allowed] = 0.0
+
+        rows = np.flatnonzero(scores)
+        if len(rows) > top_k:
+            rows = rows[np.argpartition(-scores[rows], top_k - 1)[:top_k]]
+        rows = rows[np.argsort(-scores[rows], kind='stable')]
+        return [(int(row), float(scores[row])) for row in rows]
+
+    @staticmethod
+    def path_for(chunks_path: Path, index_dir: Optional[Path] = None) -> Path:
+        """Path of the saved BM25 index of a chunks file."""
+        chunks_path = Path(chunks_path)
+        return Path(index_dir or chunks_path.parent) / f"{chunks_path.name}.bm25.npz"
+
+    def save(self, chunks_path: Path, index_dir: Optional[Path] = None) -> Path:
+        """Write the index beside the chunks file (atomic replace)."""
+        path = self.path_for(chunks_path, index_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {'format_version': BM25_FORMAT_VERSION, 'content_hash': self.content_hash,
+                'k1': self.k1, 'b': self.b}
+        arrays = {} if self.labels is None else {'labels': self.labels}
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, vocabulary=np.array(self.vocabulary, dtype=str), term_offsets=self.term_offsets,
+                     posting_rows=self.posting_rows, posting_tfs=self.posting_tfs.astype(np.uint16),
+                     doc_lengths=self.doc_lengths, chunk_ids=self.chunk_ids, meta=np.array(json.dumps(meta)),
+                     **arrays)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved BM25 index of {len(self)} chunks to {path}")
+        return path
+
+    @classmethod
+    def load(cls, chunks_path: Path, index_dir: Optional[Path] = None,
+             content_hash: Optional[str] = None) -> Optional[BM25Index]:
+        """
+        Load a saved index if it is current.
+
+        Returns:
+            BM25Index, or None if the index is missing, unreadable or stale
+        """
+        path = cls.path_for(chunks_path, index_dir)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data['meta']))
+                content_hash = content_hash or file_content_hash(Path(chunks_path))
+                if meta.get('format_version') != BM25_FORMAT_VERSION or meta.get('content_hash') != content_hash:
+                    logger.info(f"BM25 index {path} is stale - rebuilding")
+                    return None
+                return cls(data['vocabulary'].tolist(), data['term_offsets'], data['posting_rows'],
+                           data['posting_tfs'], data['doc_lengths'], data['chunk_ids'], content_hash,
+                           meta['k1'], meta['b'], data['labels'] if 'labels' in data.files else None)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load BM25 index {path}: {e}")
+            return None
+
+    @classmethod
+    def load_or_build(cls, chunks_path: Path, texts: Sequence[str], chunk_ids: Sequence[int],
+                      index_dir: Optional[Path] = None,
+                      label_fn: Optional[Callable[[str], int]] = None) -> BM25Index:
+        """
+        Load the saved index, or build and save it if missing or stale.
+
+        Args:
+            chunks_path: Chunks file the texts were read from
+            texts: Chunk contents, in row order
+            chunk_ids: Chunk id of each text
+            index_dir: Directory holding the index (default: beside the chunks file)
+            label_fn: Label bitmask of a text; a saved index without labels is rebuilt
+
+        Returns:
+            BM25Index
+        """
+        content_hash = file_content_hash(Path(chunks_path))
+        index = cls.load(chunks_path, index_dir, content_hash)
+        if (index is not None and index.chunk_ids.tolist() == list(chunk_ids)
+                and (label_fn is None or index.labels is not None)):
+            return index
+
+        index = cls.build(texts, chunk_ids, content_hash, label_fn=label_fn)
+        try:
+            index.save(chunks_path, index_dir)
+        except OSError as e:
+            logger.warning(f"Could not save BM25 index ({e}); keeping it in memory")
+        return index
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Chunk Store - append-friendly knowledge-base chunk file
+
+Chunks used to live in one JSON array (data/chunks/chunks.json). Adding a
+document meant parsing and rewriting the whole array, and a chunk's id was
+its position in it. The store is a JSON Lines file instead:
+
+    {"chunk_id": 17, "content": "...", "metadata": {"source": "..."}}
+    {"chunk_id": 17, "deleted": true}
+
+- New chunks are appended with fresh, never reused chunk ids
+- Deleting chunks appends tombstones; compaction rewrites the live records
+- Reading is one streaming pass (later lines win)
+
+The legacy JSON array is still readable; its chunk ids are array positions.
+
+ChunkOffsetIndex keeps only the byte offset and source of each live record
+(saved beside the chunks file), so readers can leave chunk text on disk and
+parse just the records they need.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNKS_PATH = "data/chunks/chunks.jsonl"
+LEGACY_CHUNKS_PATH = "data/chunks/chunks.json"
+
+OFFSET_INDEX_VERSION = 1
+
+# Bytes before the end of the indexed extent that must be unchanged for an
+# append-only update of the offset index
+_TAIL_CHECK_BYTES = 4096
+
+
+def resolve_chunks_path(chunks_path: Optional[str] = None) -> Path:
+    """The given chunks file, else the JSONL store if it exists, else the legacy JSON array."""
+    if chunks_path:
+        return Path(chunks_path)
+    if Path(DEFAULT_CHUNKS_PATH).exists():
+        return Path(DEFAULT_CHUNKS_PATH)
+    return Path(LEGACY_CHUNKS_PATH)
+
+
+def load_chunk_records(chunks_path: Path) -> List[Dict[str, Any]]:
+    """
+    Live chunk records of a chunks file, in first-written order.
+
+    Args:
+        chunks_path: JSONL store or legacy JSON array
+
+    Returns:
+        Records with chunk_id, content and metadata
+    """
+    chunks_path = Path(chunks_path)
+    if chunks_path.suffix != '.jsonl':
+        with open(chunks_path, 'r', encoding='utf-8') as f:
+            return [{'chunk_id': i, **record} for i, record in enumerate(json.load(f))]
+    return list(ChunkStore(chunks_path).iter_records())
+
+
+class ChunkStore:
+    """JSON Lines chunk file with append, tombstone delete and compaction."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: JSONL file (created on first write)
+        """
+        self.path = Path(path)
+
+    def iter_records(self) -> Iterable[Dict[str, Any]]:
+        """Live records; a tombstone removes every earlier record with its chunk id."""
+        if not self.path.exists():
+            return []
+        records: Dict[int, Dict[str, Any]] = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from an interrupted append
+                    logger.warning(f"Skipping unreadable line {line_number} of {self.path}")
+                    continue
+                if record.get('deleted'):
+                    records.pop(record['chunk_id'], None)
+                else:
+                    records[record['chunk_id']] = record
+        return records.values()
+
+    def append(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append chunk records (each with a chunk_id not currently live).
+
+        Returns:
+            Number of records written
+        """
+        return self._append_lines(records)
+
+    def delete(self, chunk_ids: Iterable[int]) -> int:
+        """
+        Append tombstones for chunk ids.
+
+        Returns:
+            Number of tombstones written
+        """
+        return self._append_lines({'chunk_id': chunk_id, 'deleted': True} for chunk_id in chunk_ids)
+
+    def _append_lines(self, records: Iterable[Dict[str, Any]]) -> int:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        written = 0
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                written += 1
+        return written
+
+    def rewrite(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Replace the file with exactly these records (atomic).
+
+        Returns:
+            Number of records written
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        written = 0
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                written += 1
+        os.replace(tmp_path, self.path)
+        return written
+
+
+class ChunkOffsetIndex:
+    """
+    Byte offsets of the live records of a chunks file.
+
+    Holds chunk id, offset, length and source of each record (live-record
+    order, as load_chunk_records) and reads records on demand. Saved as
+    <chunks file>.offsets.npz; a JSONL store that was only appended to since
+    is updated by scanning just the new lines.
+
+    The chunks file stays open: records are read from the file as indexed,
+    even if a compaction replaces it later.
+    """
+
+    def __init__(self, chunks_path: Path, chunk_ids: np.ndarray, offsets: np.ndarray,
+                 lengths: np.ndarray, source_ids: np.ndarray, sources: Sequence[str],
+                 stamp: Dict[str, Any]):
+        self.chunks_path = Path(chunks_path)
+        self.chunk_ids = np.asarray(chunk_ids, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.source_ids = np.asarray(source_ids, dtype=np.int32)
+        self.sources = list(sources)
+        self.stamp = stamp
+        self._file = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    @staticmethod
+    def path_for(chunks_path: Path, index_dir: Optional[Path] = None) -> Path:
+        """Path of the saved offset index of a chunks file."""
+        chunks_path = Path(chunks_path)
+        return Path(index_dir or chunks_path.parent) / f"{chunks_path.name}.offsets.npz"
+
+    @classmethod
+    def load_or_build(cls, chunks_path: Path, index_dir: Optional[Path] = None) -> ChunkOffsetIndex:
+        """
+        Load the saved offset index if current, else update or rebuild and save it.
+
+        Args:
+            chunks_path: JSONL store or legacy JSON array
+            index_dir: Directory holding the offset index (default: beside the chunks file)
+
+        Returns:
+            ChunkOffsetIndex with the chunks file open for reads
+        """
+        chunks_path = Path(chunks_path)
+        index_path = cls.path_for(chunks_path, index_dir)
+        with open(chunks_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            saved = cls._load(chunks_path, index_path)
+            if saved is not None and saved._matches(stat):
+                index = saved
+            else:
+                if saved is not None and chunks_path.suffix == '.jsonl' and saved._appended_to(f, stat):
+                    live = saved._live_records()
+                    start = saved.stamp['extent']
+                else:
+                    live, start = {}, 0
+                index = cls._scan(chunks_path, f, stat, live, start)
+                try:
+                    index.save(index_path)
+                except OSError as e:
+                    logger.warning(f"Could not save chunk offset index ({e}); keeping it in memory")
+            # Keep this handle: offsets stay valid for it even if the file is replaced
+            index._file = os.fdopen(os.dup(f.fileno()), 'rb')
+        return index
+
+    @classmethod
+    def _load(cls, chunks_path: Path, index_path: Path) -> Optional[ChunkOffsetIndex]:
+        if not index_path.exists():
+            return None
+        try:
+            with np.load(index_path, allow_pickle=False) as data:
+                stamp = json.loads(str(data['stamp']))
+                if stamp.get('format_version') != OFFSET_INDEX_VERSION:
+                    return None
+                return cls(chunks_path, data['chunk_ids'], data['offsets'], data['lengths'],
+                           data['source_ids'], data['sources'].tolist(), stamp)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load chunk offset index {index_path}: {e}")
+            return None
+
+    def _matches(self, stat: os.stat_result) -> bool:
+        return (self.stamp.get('inode') == stat.st_ino and self.stamp.get('size') == stat.st_size
+                and self.stamp.get('mtime_ns') == stat.st_mtime_ns)
+
+    def _appended_to(self, f, stat: os.stat_result) -> bool:
+        """The file is the indexed one with only bytes added after the indexed extent."""
+        extent = self.stamp.get('extent', 0)
+        return (self.stamp.get('inode') == stat.st_ino and stat.st_size >= extent
+                and _tail_digest(f, extent) == self.stamp.get('tail_digest'))
+
+    def _live_records(self) -> Dict[int, Tuple[int, int, str]]:
+        return {int(chunk_id): (int(offset), int(length), self.sources[source_id])
+                for chunk_id, offset, length, source_id
+                in zip(self.chunk_ids, self.offsets, self.lengths, self.source_ids)}
+
+    @classmethod
+    def _scan(cls, chunks_path: Path, f, stat: os.stat_result,
+              live: Dict[int, Tuple[int, int, str]], start: int) -> ChunkOffsetIndex:
+        f.seek(start)
+        if chunks_path.suffix == '.jsonl':
+            extent = _scan_jsonl(f, live, start)
+        else:
+            extent = _scan_json_array(f.read(), live)
+        logger.info(f"Indexed offsets of {len(live)} chunks in {chunks_path}")
+
+        sources: Dict[str, int] = {}
+        source_ids = [sources.setdefault(source, len(sources)) for _, _, source in live.values()]
+        stamp = {
+            'format_version': OFFSET_INDEX_VERSION,
+            'inode': stat.st_ino,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'extent': extent,
+            'tail_digest': _tail_digest(f, extent)
+        }
+        return cls(chunks_path, np.fromiter(live.keys(), dtype=np.int64, count=len(live)),
+                   np.array([offset for offset, _, _ in live.values()], dtype=np.int64),
+                   np.array([length for _, length, _ in live.values()], dtype=np.int64),
+                   np.array(source_ids, dtype=np.int32), list(sources), stamp)
+
+    def save(self, index_path: Path) -> None:
+        """Write the offset index (atomic replace)."""
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_name(index_path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, chunk_ids=self.chunk_ids, offsets=self.offsets, lengths=self.lengths,
+                     source_ids=self.source_ids, sources=np.array(self.sources, dtype=str),
+                     stamp=np.array(json.dumps(self.stamp)))
+        os.replace(tmp_path, index_path)
+
+    def source(self, position: int) -> str:
+        """Source of the record at a position, without reading the record."""
+        return self.sources[self.source_ids[position]]
+
+    def read(self, position: int) -> Dict[str, Any]:
+        """
+        Parse one record from the chunks file.
+
+        Args:
+            position: Position in live-record order
+
+        Returns:
+            Record with chunk_id, content and metadata
+        """
+        with self._lock:
+            self._file.seek(int(self.offsets[position]))
+            raw = self._file.read(int(self.lengths[position]))
+        return {**json.loads(raw), 'chunk_id': int(self.chunk_ids[position])}
+
+    def iter_records(self, positions: Optional[Iterable[int]] = None) -> Iterable[Dict[str, Any]]:
+        """Records at positions (default: every live record), read one at a time."""
+        for position in range(len(self)) if positions is None else positions:
+            yield self.read(position)
+
+    def close(self) -> None:
+        """Close the chunks file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _tail_digest(f, extent: int) -> str:
+    """Digest of the bytes just before extent."""
+    start = max(0, extent - _TAIL_CHECK_BYTES)
+    f.seek(start)
+    return hashlib.blake2b(f.read(extent - start), digest_size=16).hexdigest()
+
+
+def _scan_jsonl(f, live: Dict[int, Tuple[int, int, str]], start: int) -> int:
+    """Apply the lines from start on to live; returns the end of the last complete line."""
+    offset = start
+    for line in f:
+        if not line.endswith(b'\n'):
+            # Torn final line: rescanned once an append completes it
+            break
+        stripped = line.rstrip()
+        if stripped:
+            try:
+                record = json.loads(stripped)
+            except ValueError:
+                logger.warning(f"Skipping unreadable chunk record at byte {offset}")
+                record = None
+            if record is not None and record.get('deleted'):
+                live.pop(record['chunk_id'], None)
+            elif record is not None:
+                live[record['chunk_id']] = (offset, len(stripped), record.get('metadata', {}).get('source', ''))
+        offset += len(line)
+    return offset
+
+
+def _scan_json_array(data: bytes, live: Dict[int, Tuple[int, int, str]]) -> int:
+    """Offsets of the elements of a legacy JSON array (chunk id = array position)."""
+    text = data.decode('utf-8')
+    ascii_only = len(text) == len(data)
+    decoder = json.JSONDecoder()
+    separators = re.compile(r'[\s,]*')
+    position = separators.match(text, text.index('[') + 1).end()
+    byte_position, char_position = position, position
+    while position < len(text) and text[position] != ']':
+        record, end = decoder.raw_decode(text, position)
+        if ascii_only:
+            start_byte, end_byte = position, end
+        else:
+            start_byte = byte_position + len(text[char_position:position].encode('utf-8'))
+            end_byte = start_byte + len(text[position:end].encode('utf-8'))
+            byte_position, char_position = end_byte, end
+        live[len(live)] = (start_byte, end_byte - start_byte, record.get('metadata', {}).get('source', ''))
+        position = separators.match(text, end).end()
+    return len(data)
@@ -1,8 +1,11 @@
 import argparse
+import sys
 from pathlib import Path
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
+sys.path.append(str(Path(__file__).parent.parent))
+
 LABELS = ["injury_news", "lineup_news", "general_commentary", "irrelevant"]
 
 
@@ -10,11 +13,16 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--text", required=True)
     parser.add_argument("--model-dir", default="models/tweet_classifier")
+    parser.add_argument("--fast", action="store_true", help="Use the int8/ONNX CPU export if one passed parity")
     args = parser.parse_args()
 
     model_dir = Path(args.model_dir)
-    tokenizer = AutoTokenizer.from_pretrained(model_dir)
-    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    if args.fast:
+        from tools.model_export import load_fast_sequence_classifier
+        model, tokenizer = load_fast_sequence_classifier(str(model_dir))
+    else:
+        tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        model = AutoModelForSequenceClassification.from_pretrained(model_dir)
 
     enc = tokenizer(args.text, return_tensors="pt", truncation=True, padding=True)
     with torch.no_grad():
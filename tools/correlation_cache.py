@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Correlation Cache
+
+Process-wide memo of leg-pair correlation scores. The scheduler and the API
+regenerate parlays for the same slate many times, and every pass used to
+re-score the same pairs through the correlation GNN, the rule-based fallback
+or the optimizer's correlation rules. Scores are cached per scorer
+namespace under an order-independent pair of leg fingerprints.
+
+Key Features:
+- Leg fingerprints: stable digest of a feature vector (e.g.
+  BetNode.to_feature_vector()) plus the game_id
+- LRU eviction at max_entries and a TTL per entry
+- Namespace invalidation, used when the correlation model checkpoint changes
+- Optional JSON persistence so a restart starts warm
+- Hit/miss/eviction counters for monitoring
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import numbers
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (namespace, fingerprint_a, fingerprint_b) with fingerprint_a <= fingerprint_b
+PairKey = Tuple[str, str, str]
+
+
+def leg_fingerprint(features: Sequence[Any], game_id: Optional[str] = None) -> str:
+    """
+    Stable fingerprint of one leg.
+
+    Floats are rounded to 6 decimals so float32/float64 round trips of the
+    same feature vector fingerprint identically.
+
+    Args:
+        features: Feature vector or other JSON-serializable leg attributes
+        game_id: Game the leg belongs to
+
+    Returns:
+        Hex digest, identical across processes and restarts
+    """
+    parts = [
+        round(float(value), 6)
+        if isinstance(value, numbers.Real) and not isinstance(value, numbers.Integral) else value
+        for value in features
+    ]
+    payload = json.dumps([game_id, parts], separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _pair_key(namespace: str, fingerprint_a: str, fingerprint_b: str) -> PairKey:
+    if fingerprint_b < fingerprint_a:
+        fingerprint_a, fingerprint_b = fingerprint_b, fingerprint_a
+    return namespace, fingerprint_a, fingerprint_b
+
+
+class CorrelationCache:
+    """Bounded LRU + TTL cache of pairwise correlation scores."""
+
+    def __init__(self, max_entries: int = 200_000, ttl: float = 6 * 3600.0,
+                 persist_path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of pair scores kept before LRU eviction
+            ttl: Seconds a cached score stays valid
+            persist_path: JSON file used by save()/load() (no persistence if None)
+            clock: Wall-clock time source; wall time keeps persisted expiries meaningful
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persist_path = Path(persist_path) if persist_path else None
+        self._clock = clock
+
+        self._entries: "OrderedDict[PairKey, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, namespace: str, fingerprint_a: str, fingerprint_b: str) -> Optional[float]:
+        """Cached score for a pair, or None on a miss."""
+        return self.get_many(namespace, [(fingerprint_a, fingerprint_b)])[0]
+
+    def get_many(self, namespace: str, pairs: Iterable[Tuple[str, str]]) -> List[Optional[float]]:
+        """
+        Look up many pairs under one lock acquisition.
+
+        Args:
+            namespace: Scorer namespace (scores from different scorers never mix)
+            pairs: (fingerprint_a, fingerprint_b) pairs, in either order
+
+        Returns:
+            Score or None per pair, in input order
+        """
+        results: List[Optional[float]] = []
+        now = self._clock()
+        with self._lock:
+            for fingerprint_a, fingerprint_b in pairs:
+                key = _pair_key(namespace, fingerprint_a, fingerprint_b)
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] <= now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    results.append(entry[0])
+        return results
+
+    def put(self, namespace: str, fingerprint_a: str, fingerprint_b: str, score: float) -> None:
+        """Store the score for a pair."""
+        self.put_many(namespace, [(fingerprint_a, fingerprint_b, score)])
+
+    def put_many(self, namespace: str, scored_pairs: Iterable[Tuple[str, str, float]]) -> None:
+        """Store (fingerprint_a, fingerprint_b, score) triples under one lock acquisition."""
+        expires_at = self._clock() + self.ttl
+        with self._lock:
+            for fingerprint_a, fingerprint_b, score in scored_pairs:
+                key = _pair_key(namespace, fingerprint_a, fingerprint_b)
+                self._entries[key] = (float(score), expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, namespace: str, fingerprint_a: str, fingerprint_b: str,
+                       compute: Callable[[], float]) -> float:
+        """Cached score for a pair, computing and storing it on a miss."""
+        score = self.get(namespace, fingerprint_a, fingerprint_b)
+        if score is None:
+            score = compute()
+            self.put(namespace, fingerprint_a, fingerprint_b, score)
+        return score
+
+    def invalidate(self, namespace_prefix: Optional[str] = None) -> int:
+        """
+        Drop cached scores.
+
+        Args:
+            namespace_prefix: Only drop namespaces starting with this prefix (all if None)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if namespace_prefix is None:
+                stale = list(self._entries)
+            else:
+                stale = [key for key in self._entries if key[0].startswith(namespace_prefix)]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self.invalidations += 1
+            return len(stale)
+
+    def save(self, path: Optional[str] = None) -> int:
+        """
+        Write unexpired entries to JSON.
+
+        Args:
+            path: Target file (defaults to persist_path)
+
+        Returns:
+            Number of entries written (0 when no path is configured)
+        """
+        target = Path(path) if path else self.persist_path
+        if target is None:
+            return 0
+        now = self._clock()
+        with self._lock:
+            rows = [[*key, score, expires_at] for key, (score, expires_at) in self._entries.items()
+                    if expires_at > now]
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(target.suffix + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": 1, "entries": rows}, f)
+        os.replace(tmp, target)
+        return len(rows)
+
+    def load(self, path: Optional[str] = None) -> int:
+        """
+        Merge unexpired entries from a JSON file written by save().
+
+        Args:
+            path: Source file (defaults to persist_path)
+
+        Returns:
+            Number of entries loaded (0 if the file is missing or unreadable)
+        """
+        source = Path(path) if path else self.persist_path
+        if source is None or not source.exists():
+            return 0
+        try:
+            with open(source) as f:
+                rows = json.load(f)["entries"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable correlation cache {source}: {e}")
+            return 0
+
+        now = self._clock()
+        loaded = 0
+        with self._lock:
+            for namespace, fingerprint_a, fingerprint_b, score, expires_at in rows:
+                if expires_at > now:
+                    self._entries[(namespace, fingerprint_a, fingerprint_b)] = (score, expires_at)
+                    loaded += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.info(f"Loaded {loaded} correlation scores from {source}")
+        return loaded
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring how much re-scoring the cache saves."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'lookups': lookups,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+_shared_cache: Optional[CorrelationCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_correlation_cache() -> CorrelationCache:
+    """
+    Return the process-wide CorrelationCache.
+
+    Configured from CORRELATION_CACHE_MAX_ENTRIES, CORRELATION_CACHE_TTL_SECONDS
+    and CORRELATION_CACHE_PATH. With a path set, the cache is loaded on first
+    use and saved at interpreter exit.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                cache = CorrelationCache(
+                    max_entries=int(os.getenv("CORRELATION_CACHE_MAX_ENTRIES", "200000")),
+                    ttl=float(os.getenv("CORRELATION_CACHE_TTL_SECONDS", str(6 * 3600))),
+                    persist_path=os.getenv("CORRELATION_CACHE_PATH") or None
+                )
+                if cache.persist_path is not None:
+                    cache.load()
+                    atexit.register(cache.save)
+                _shared_cache = cache
+    return _shared_cache
+
+
+def reset_correlation_cache() -> None:
+    """Discard the process-wide cache and its counters (next call builds a new one)."""
+    global _shared_cache
+    with _shared_cache_lock:
+        _shared_cache = None
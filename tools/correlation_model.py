@@ -12,6 +12,7 @@ Key Features:
 - Integration with ParlayBuilder for correlated leg detection
 """
 
+import hashlib
 import logging
 import sqlite3
 import numpy as np
@@ -44,6 +45,8 @@ try:
 except ImportError:
     HAS_SKLEARN = False
 
+from tools.correlation_cache import CorrelationCache, get_correlation_cache, leg_fingerprint
+
 logger = logging.getLogger(__name__)
 
 
@@ -343,13 +346,16 @@ class CorrelationGNN(nn.Module):
 class DynamicCorrelationModel:
     """Main class for dynamic correlation rules modeling."""
     
-    def __init__(self, db_path: str, model_save_path: str = "models/correlation_model"):
+    def __init__(self, db_path: str, model_save_path: str = "models/correlation_model",
+                 correlation_cache: Optional[CorrelationCache] = None):
         self.db_path = db_path
         self.model_save_path = Path(model_save_path)
         self.model_save_path.mkdir(parents=True, exist_ok=True)
         
         self.data_processor = BetDataProcessor(db_path)
         self.model = None
+        self.model_version: Optional[str] = None  # checkpoint signature of the loaded model
+        self.correlation_cache = correlation_cache or get_correlation_cache()
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         
         logger.info(f"Initialized CorrelationModel with device: {self.device}")
@@ -578,7 +584,134 @@ class DynamicCorrelationModel:
             correlation_score = self.model(x, edge_index).item()
         
         return correlation_score
-    
+
+    def predict_correlation_matrix(self, feature_vectors: List[List[float]],
+                                   correlation_strength: float = 0.5,
+                                   game_ids: Optional[List[str]] = None,
+                                   same_game_floor: float = 0.8,
+                                   batch_size: int = 4096) -> np.ndarray:
+        """
+        Predict correlation scores for every pair of legs at once.
+
+        All N*(N-1)/2 pairs are laid out as disjoint two-node graphs in one
+        batch (chunked by batch_size pairs), so the GNN runs a handful of
+        forward passes instead of one per pair. Scores are identical to
+        predict_correlation on each pair.
+
+        Pair scores are memoized in the correlation cache under the legs'
+        fingerprints (feature vector + game_id), so only pairs not seen since
+        the current checkpoint was loaded reach the model.
+
+        Args:
+            feature_vectors: One BetNode feature vector per leg
+            correlation_strength: Base strength for the rule-based fallback
+            game_ids: Game per leg; same-game pairs are raised to same_game_floor
+            same_game_floor: Minimum score for two legs from the same game
+            batch_size: Maximum pairs per forward pass
+
+        Returns:
+            Symmetric N x N matrix of pair scores (diagonal = 1.0)
+        """
+        n = len(feature_vectors)
+        matrix = np.eye(n)
+        if n < 2:
+            return matrix
+
+        if not self.model:
+            self.load_model()
+
+        rows, cols = np.triu_indices(n, k=1)
+        if game_ids is None:
+            game_ids = [None] * n
+        fingerprints = np.array([leg_fingerprint(f, g) for f, g in zip(feature_vectors, game_ids)], dtype=object)
+        namespace = self._cache_namespace(correlation_strength, same_game_floor)
+
+        cached = self.correlation_cache.get_many(namespace, zip(fingerprints[rows], fingerprints[cols]))
+        missing = np.array([i for i, score in enumerate(cached) if score is None], dtype=np.int64)
+        scores = np.array([np.nan if score is None else score for score in cached])
+
+        if len(missing):
+            features = np.asarray(feature_vectors, dtype=np.float32)
+            rows_missing, cols_missing = rows[missing], cols[missing]
+            new_scores = self._score_pairs(features, rows_missing, cols_missing, correlation_strength, batch_size)
+
+            games = np.asarray(game_ids, dtype=object)
+            has_game = np.array([game_id is not None for game_id in game_ids])
+            same_game = has_game[rows_missing] & (games[rows_missing] == games[cols_missing])
+            new_scores = np.where(same_game, np.maximum(new_scores, same_game_floor), new_scores)
+
+            scores[missing] = new_scores
+            self.correlation_cache.put_many(namespace, zip(
+                fingerprints[rows_missing], fingerprints[cols_missing], new_scores.tolist()
+            ))
+
+        matrix[rows, cols] = scores
+        matrix[cols, rows] = scores
+        return matrix
+
+    def _cache_namespace(self, correlation_strength: float, same_game_floor: float) -> str:
+        """Cache namespace for the current scorer (checkpoint, or rules when no model)."""
+        if not self.model:
+            version = "rules"
+        else:
+            version = self.model_version or f"in-memory-{id(self.model)}"
+        return f"gnn:{version}:{correlation_strength}:{same_game_floor}"
+
+    def _set_model_version(self, version: str) -> None:
+        """Record the active checkpoint; scores cached for a replaced checkpoint are dropped."""
+        previous = self.model_version
+        self.model_version = version
+        if previous is not None and previous != version:
+            removed = self.correlation_cache.invalidate(f"gnn:{previous}:")
+            logger.info(f"Correlation checkpoint changed, dropped {removed} cached scores")
+
+    @staticmethod
+    def _checkpoint_signature(model_file: Path) -> str:
+        return hashlib.blake2b(model_file.read_bytes(), digest_size=8).hexdigest()
+
+    def _score_pairs(self, features: np.ndarray, rows: np.ndarray, cols: np.ndarray,
+                     correlation_strength: float, batch_size: int) -> np.ndarray:
+        """Model (or rule-based) scores for index pairs (rows[k], cols[k]), before the same-game floor."""
+        if not self.model:
+            logger.warning("No trained model available. Using rule-based correlation.")
+            scores = self._rule_based_correlation_pairs(features, rows, cols, correlation_strength)
+        else:
+            scores = np.empty(len(rows))
+            x_all = torch.from_numpy(features).to(self.device)
+            self.model.eval()
+            with torch.no_grad():
+                for start in range(0, len(rows), batch_size):
+                    pair_rows = torch.from_numpy(rows[start:start + batch_size]).to(self.device)
+                    pair_cols = torch.from_numpy(cols[start:start + batch_size]).to(self.device)
+                    n_pairs = len(pair_rows)
+
+                    # Pair p is nodes 2p and 2p+1, linked in both directions
+                    x = torch.stack([x_all[pair_rows], x_all[pair_cols]], dim=1).reshape(2 * n_pairs, -1)
+                    first = torch.arange(0, 2 * n_pairs, 2, device=self.device)
+                    edge_index = torch.stack([
+                        torch.stack([first, first + 1], dim=1).reshape(-1),
+                        torch.stack([first + 1, first], dim=1).reshape(-1)
+                    ])
+                    batch = torch.arange(n_pairs, device=self.device).repeat_interleave(2)
+
+                    output = self.model(x, edge_index, batch)
+                    scores[start:start + n_pairs] = output.view(-1).cpu().numpy()
+        return scores
+
+    def _rule_based_correlation_pairs(self, features: np.ndarray, rows: np.ndarray, cols: np.ndarray,
+                                      correlation_strength: float) -> np.ndarray:
+        """_rule_based_correlation over index pairs (rows[k], cols[k])."""
+        market = np.argmax(features[:, :5], axis=1)
+        market1, market2 = market[rows], market[cols]
+
+        # h2h-spreads, spreads-totals
+        low, high = np.minimum(market1, market2), np.maximum(market1, market2)
+        related = ((low == 0) & (high == 1)) | ((low == 1) & (high == 2))
+
+        scores = np.full(len(rows), float(correlation_strength))
+        scores = np.where(related, min(0.6, correlation_strength + 0.1), scores)
+        return np.where(market1 == market2, min(0.8, correlation_strength + 0.3), scores)
+
     def _rule_based_correlation(self, bet_features_1: List[float], bet_features_2: List[float], 
                               correlation_strength: float) -> float:
         """Fallback rule-based correlation when no trained model is available."""
@@ -612,6 +745,7 @@ class DynamicCorrelationModel:
                 },
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }, self.model_save_path / 'correlation_model.pth')
+            self._set_model_version(self._checkpoint_signature(self.model_save_path / 'correlation_model.pth'))
             
             logger.info(f"Model saved to {self.model_save_path}")
     
@@ -635,6 +769,7 @@ class DynamicCorrelationModel:
             
             self.model.load_state_dict(checkpoint['model_state_dict'])
             self.model.eval()
+            self._set_model_version(self._checkpoint_signature(model_file))
             
             logger.info(f"Model loaded from {model_file}")
             return True
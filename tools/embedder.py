@@ -1,13 +1,64 @@
+#!/usr/bin/env python3
+"""
+Embedder - batched document embedding pipeline for the sports knowledge base
+
+Embeds the markdown/text sources under data/ into the Qdrant knowledge-base
+collection. Re-embedding used to encode one chunk per model call and upsert
+once per file, so a run was dominated by per-call overhead. The pipeline
+streams three stages:
+
+1. Discovery: walk data/ for source files (data/chunks/ is skipped)
+2. Chunking: read, hash and split files in a process pool
+3. Encoding: buffer chunks from any number of files into an encode window
+   and encode it in one model call, then upsert the points to Qdrant in
+   bulk batches. Within a window SentenceTransformer sorts texts by length
+   before forming batch_size batches, so batches carry little padding.
+
+A manifest of file content hashes lets re-runs skip unchanged files. Point
+ids are derived from (file, chunk index), so re-embedding a changed file
+overwrites its points in place and deletes the ones it no longer has.
+Progress and the final summary report throughput in chunks per second.
+
+Usage:
+    python -m tools.embedder                         # Qdrant at QDRANT_HOST:QDRANT_PORT
+    python -m tools.embedder --qdrant-path /tmp/kb   # on-disk local Qdrant
+    python -m tools.embedder --in-memory --force     # throwaway in-memory run
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
 import os
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+except ImportError:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+try:
+    from sentence_transformers import SentenceTransformer
+    HAS_EMBEDDINGS = True
+except ImportError:
+    HAS_EMBEDDINGS = False
+
+try:
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import PointStruct, VectorParams, Distance
+    HAS_QDRANT = True
+except ImportError:
+    HAS_QDRANT = False
 
-from langchain_community.document_loaders import TextLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from sentence_transformers import SentenceTransformer
-from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, VectorParams, Distance
+from tools.embedding_index import file_content_hash
+
+logger = logging.getLogger(__name__)
 
 
 # --- Configuration ---
@@ -17,6 +68,11 @@ QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
 CHUNK_SIZE = 400
 CHUNK_OVERLAP = 40
+SOURCE_EXTENSIONS = (".md", ".txt")
+DEFAULT_MANIFEST_PATH = "data/chunks/embedder_manifest.json"
+
+# Namespace for deterministic point ids
+POINT_NAMESPACE = uuid.UUID("6f1c1a52-8a35-4f0e-9d7e-3b1f0c2d4e5a")
 
 # Prefer detailed mapping; falls back to 0.7 if no match
 SOURCE_RELEVANCE: Dict[str, float] = {
@@ -29,27 +85,6 @@ SOURCE_RELEVANCE: Dict[str, float] = {
 }
 
 
-# --- Loaders and Embedding Model ---
-embedder = SentenceTransformer(EMBED_MODEL_NAME)
-qdrant = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
-text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=CHUNK_SIZE,
-    chunk_overlap=CHUNK_OVERLAP,
-)
-
-
-# --- Create collection if not exists ---
-existing = [c.name for c in qdrant.get_collections().collections]
-if QDRANT_COLLECTION_NAME not in existing:
-    qdrant.recreate_collection(
-        collection_name=QDRANT_COLLECTION_NAME,
-        vectors_config=VectorParams(
-            size=embedder.get_sentence_embedding_dimension(),
-            distance=Distance.COSINE,
-        ),
-    )
-
-
 def determine_source_name(file_path: Path) -> str:
     """Infer a normalized source name from path.
 
@@ -89,45 +124,348 @@ def relevance_for_source(source_name: str) -> float:
     return 0.7
 
 
-# --- Ingest and Embed ---
-def process_file(file_path: Path) -> None:
-    loader = TextLoader(str(file_path), encoding="utf-8")
-    docs = loader.load()
-    chunks = text_splitter.split_documents(docs)
-
-    source_name = determine_source_name(file_path)
-    relevance = relevance_for_source(source_name)
-
-    points: List[PointStruct] = []
-    for i, chunk in enumerate(chunks):
-        text = (chunk.page_content or "").strip()
-        if not text:
-            continue
-        vector = embedder.encode(text).tolist()
-        metadata = {
-            "source": source_name,
-            "source_relevance": relevance,
-            "filename": file_path.name,
-            "chunk_index": i,
-            "page": chunk.metadata.get("page"),
-            "text": text,
-        }
-        points.append(PointStruct(id=str(uuid.uuid4()), vector=vector, payload=metadata))
-
-    if points:
-        qdrant.upsert(collection_name=QDRANT_COLLECTION_NAME, points=points)
-        print(f"✅ {file_path.name} — {len(points)} chunks embedded.")
+def point_id(file_key: str, chunk_index: int) -> str:
+    """Deterministic Qdrant point id of one chunk of one file."""
+    return str(uuid.uuid5(POINT_NAMESPACE, f"{file_key}#{chunk_index}"))
 
 
-if __name__ == "__main__":
-    data_dir = Path("data")
-    # Iterate markdown/text across data, skip large JSON in chunks dir
-    for ext in (".md", ".txt"):
-        for file in data_dir.rglob(f"*{ext}"):
-            if "data/chunks/" in str(file):
+def discover_files(data_dir: Path, extensions: Sequence[str] = SOURCE_EXTENSIONS) -> Iterator[Path]:
+    """Source files under data_dir in a stable order, skipping generated chunk files."""
+    for path in sorted(Path(data_dir).rglob("*")):
+        if path.suffix in extensions and path.is_file() and "chunks" not in path.parts:
+            yield path
+
+
+@dataclass
+class FileChunks:
+    """Chunking-stage output for one file."""
+    path: Path
+    content_hash: str
+    # None when the file is unchanged since the last run
+    texts: Optional[List[str]] = None
+    n_splits: int = 0
+
+
+_splitters: Dict[Tuple[int, int], RecursiveCharacterTextSplitter] = {}
+
+
+def split_file(path: Path, known_hash: Optional[str] = None,
+               chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP) -> FileChunks:
+    """
+    Hash and split one file (runs in the chunking process pool).
+
+    Args:
+        path: Source file
+        known_hash: Content hash recorded by the last run; the file is not
+            split when it still matches
+        chunk_size: Splitter chunk size in characters
+        chunk_overlap: Splitter overlap in characters
+
+    Returns:
+        FileChunks; texts is None for unchanged files. Empty splits are kept
+        as "" so chunk indices stay aligned with the splitter output.
+    """
+    content_hash = file_content_hash(path)
+    if content_hash == known_hash:
+        return FileChunks(path, content_hash)
+
+    splitter = _splitters.get((chunk_size, chunk_overlap))
+    if splitter is None:
+        splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        _splitters[(chunk_size, chunk_overlap)] = splitter
+    splits = splitter.split_text(path.read_text(encoding="utf-8"))
+    return FileChunks(path, content_hash, [text.strip() for text in splits], len(splits))
+
+
+def _split_file_task(args: Tuple[Path, Optional[str], int, int]) -> FileChunks:
+    return split_file(*args)
+
+
+@dataclass
+class EmbeddingStats:
+    """Counters of one pipeline run."""
+    files_seen: int = 0
+    files_skipped: int = 0
+    files_embedded: int = 0
+    chunks: int = 0
+    encode_calls: int = 0
+    upserts: int = 0
+    points_deleted: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    elapsed_s: float = 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.files_embedded} files embedded, {self.files_skipped} unchanged skipped, "
+                f"{self.chunks} chunks in {self.elapsed_s:.1f}s "
+                f"({self.chunks_per_second:.0f} chunks/s, {self.encode_calls} encode calls, "
+                f"{self.upserts} upserts)")
+
+
+class EmbeddingPipeline:
+    """Streaming discovery → chunking → batched encoding → bulk upsert pipeline."""
+
+    def __init__(self,
+                 model: Any = None,
+                 qdrant: Any = None,
+                 collection_name: str = QDRANT_COLLECTION_NAME,
+                 batch_size: int = 32,
+                 encode_window: int = 512,
+                 upsert_batch_size: int = 512,
+                 workers: Optional[int] = None,
+                 manifest_path: Optional[str] = DEFAULT_MANIFEST_PATH,
+                 chunk_size: int = CHUNK_SIZE,
+                 chunk_overlap: int = CHUNK_OVERLAP,
+                 progress_interval_s: float = 5.0):
+        """
+        Initialize the pipeline.
+
+        Args:
+            model: Encoder with a SentenceTransformer-style encode()
+                (default: EMBED_MODEL_NAME)
+            qdrant: QdrantClient (default: QDRANT_HOST:QDRANT_PORT); a local
+                QdrantClient(":memory:") or QdrantClient(path=...) also works
+            collection_name: Target collection, created on first upsert
+            batch_size: Model batch size (texts per forward pass)
+            encode_window: Chunks buffered per encode call; larger windows
+                group similar-length chunks into the same batch
+            upsert_batch_size: Points per Qdrant upsert request
+            workers: Chunking processes (default: CPU count, capped at 8; 1 chunks inline)
+            manifest_path: JSON file of per-file content hashes (None disables dedup)
+            chunk_size: Splitter chunk size in characters
+            chunk_overlap: Splitter overlap in characters
+            progress_interval_s: Seconds between progress log lines
+        """
+        if model is None:
+            if not HAS_EMBEDDINGS:
+                raise ImportError("sentence-transformers is required to embed documents")
+            model = SentenceTransformer(EMBED_MODEL_NAME)
+        if qdrant is None:
+            if not HAS_QDRANT:
+                raise ImportError("qdrant-client is required to store embeddings")
+            qdrant = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+
+        self.model = model
+        self.qdrant = qdrant
+        self.collection_name = collection_name
+        self.batch_size = batch_size
+        self.encode_window = encode_window
+        self.upsert_batch_size = upsert_batch_size
+        self.workers = workers if workers is not None else min(8, os.cpu_count() or 1)
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.progress_interval_s = progress_interval_s
+
+        self.manifest: Dict[str, Dict[str, Any]] = self._load_manifest()
+        self._collection_ready = False
+
+    # --- Manifest ---
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        if self.manifest_path is None or not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get("collection") != self.collection_name:
+                return {}
+            return manifest["files"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable embedder manifest {self.manifest_path}: {e}")
+            return {}
+
+    def _save_manifest(self) -> None:
+        if self.manifest_path is None:
+            return
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(self.manifest_path.suffix + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"collection": self.collection_name, "files": self.manifest}, f, indent=1)
+        os.replace(tmp, self.manifest_path)
+
+    # --- Stages ---
+
+    def _chunk_files(self, paths: Iterable[Path], force: bool) -> Iterator[FileChunks]:
+        """Chunking stage: FileChunks per path, in order, from the process pool."""
+        tasks = ((path, None if force else self.manifest.get(str(path), {}).get("content_hash"),
+                  self.chunk_size, self.chunk_overlap) for path in paths)
+        if self.workers <= 1:
+            yield from map(_split_file_task, tasks)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            yield from executor.map(_split_file_task, tasks, chunksize=4)
+
+    def _ensure_collection(self, dim: int) -> None:
+        if self._collection_ready:
+            return
+        existing = [c.name for c in self.qdrant.get_collections().collections]
+        if self.collection_name not in existing:
+            self.qdrant.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=VectorParams(size=dim, distance=Distance.COSINE),
+            )
+        self._collection_ready = True
+
+    def run(self, data_dir: Optional[str] = "data", files: Optional[Iterable[Path]] = None,
+            force: bool = False) -> EmbeddingStats:
+        """
+        Embed every new or changed source file.
+
+        Args:
+            data_dir: Directory to discover source files in
+            files: Explicit files to embed instead of discovering data_dir
+            force: Re-embed files even if their content hash is unchanged
+
+        Returns:
+            EmbeddingStats of the run
+        """
+        stats = EmbeddingStats()
+        paths = files if files is not None else discover_files(Path(data_dir))
+
+        # Encode buffer of (point id, text, payload). A file enters the manifest
+        # only once all its points are encoded and upserted, so an interrupted
+        # run re-embeds it next time
+        pending: List[Tuple[str, str, Dict[str, Any]]] = []
+        points: List[Any] = []
+        encoded_files: List[Tuple[str, Dict[str, Any], int]] = []
+        upserted_files: List[Tuple[str, Dict[str, Any]]] = []
+        last_progress = time.perf_counter()
+
+        def encode_batch(batch: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+            vectors = self.model.encode([text for _, text, _ in batch], batch_size=self.batch_size,
+                                        show_progress_bar=False)
+            self._ensure_collection(int(len(vectors[0])))
+            points.extend(PointStruct(id=pid, vector=vector.tolist(), payload=payload)
+                          for (pid, _, payload), vector in zip(batch, vectors))
+            stats.encode_calls += 1
+            stats.chunks += len(batch)
+
+        def flush_points() -> None:
+            for start in range(0, len(points), self.upsert_batch_size):
+                self.qdrant.upsert(collection_name=self.collection_name,
+                                   points=points[start:start + self.upsert_batch_size])
+                stats.upserts += 1
+            points.clear()
+            for file_key, entry in upserted_files:
+                self.manifest[file_key] = entry
+            upserted_files.clear()
+
+        for file_chunks in self._chunk_files(paths, force):
+            stats.files_seen += 1
+            file_key = str(file_chunks.path)
+            if file_chunks.texts is None:
+                stats.files_skipped += 1
                 continue
-            process_file(file)
 
-    print("✅ Embedding complete.")
+            source_name = determine_source_name(file_chunks.path)
+            relevance = relevance_for_source(source_name)
+            for i, text in enumerate(file_chunks.texts):
+                if not text:
+                    continue
+                pending.append((point_id(file_key, i), text, {
+                    "source": source_name,
+                    "source_relevance": relevance,
+                    "filename": file_chunks.path.name,
+                    "path": file_key,
+                    "chunk_index": i,
+                    "page": None,
+                    "text": text,
+                }))
+
+            # Points past the new chunk count belong to an older version of the file
+            previous = self.manifest.get(file_key, {}).get("n_splits", 0)
+            if previous > file_chunks.n_splits and self._collection_ready_or_exists():
+                stale = [point_id(file_key, i) for i in range(file_chunks.n_splits, previous)]
+                self.qdrant.delete(collection_name=self.collection_name, points_selector=stale)
+                stats.points_deleted += len(stale)
+
+            stats.files_embedded += 1
+            encoded_files.append((file_key, {"content_hash": file_chunks.content_hash,
+                                             "n_splits": file_chunks.n_splits}, len(pending)))
+
+            while len(pending) >= self.encode_window:
+                batch, pending = pending[:self.encode_window], pending[self.encode_window:]
+                encode_batch(batch)
+                self._advance(encoded_files, upserted_files, len(batch))
+                if len(points) >= self.upsert_batch_size:
+                    flush_points()
+
+            now = time.perf_counter()
+            if now - last_progress >= self.progress_interval_s:
+                elapsed = now - stats.started_at
+                logger.info(f"{stats.files_seen} files, {stats.chunks} chunks embedded "
+                            f"({stats.chunks / elapsed:.0f} chunks/s)")
+                last_progress = now
+
+        if pending:
+            encode_batch(pending)
+        self._advance(encoded_files, upserted_files, len(pending))
+        flush_points()
+        self._save_manifest()
+
+        stats.elapsed_s = time.perf_counter() - stats.started_at
+        logger.info(f"Embedding complete: {stats.summary()}")
+        return stats
+
+    @staticmethod
+    def _advance(encoded_files: List[Tuple[str, Dict[str, Any], int]],
+                 upserted_files: List[Tuple[str, Dict[str, Any]]], n_encoded: int) -> None:
+        """Move files whose last chunk was just encoded to the awaiting-upsert list."""
+        remaining = []
+        for file_key, entry, position in encoded_files:
+            if position <= n_encoded:
+                upserted_files.append((file_key, entry))
+            else:
+                remaining.append((file_key, entry, position - n_encoded))
+        encoded_files[:] = remaining
+
+    def _collection_ready_or_exists(self) -> bool:
+        if not self._collection_ready:
+            existing = [c.name for c in self.qdrant.get_collections().collections]
+            self._collection_ready = self.collection_name in existing
+        return self._collection_ready
 
 
+# --- Ingest and Embed ---
+def process_file(file_path: Path, pipeline: Optional[EmbeddingPipeline] = None) -> EmbeddingStats:
+    """Embed a single file (re-embedded even if unchanged)."""
+    pipeline = pipeline or EmbeddingPipeline(workers=1)
+    stats = pipeline.run(files=[Path(file_path)], force=True)
+    print(f"✅ {Path(file_path).name} — {stats.chunks} chunks embedded.")
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Embed data/ sources into the Qdrant knowledge base")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--batch-size", type=int, default=32, help="Model batch size")
+    parser.add_argument("--encode-window", type=int, default=512, help="Chunks per encode call")
+    parser.add_argument("--upsert-batch-size", type=int, default=512, help="Points per Qdrant upsert")
+    parser.add_argument("--workers", type=int, default=None, help="Chunking processes")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST_PATH, help="Content-hash manifest path")
+    parser.add_argument("--force", action="store_true", help="Re-embed unchanged files")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--qdrant-path", help="Use an on-disk local Qdrant at this path")
+    target.add_argument("--in-memory", action="store_true", help="Use a throwaway in-memory Qdrant")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    qdrant = None
+    if args.in_memory:
+        qdrant = QdrantClient(":memory:")
+    elif args.qdrant_path:
+        qdrant = QdrantClient(path=args.qdrant_path)
+
+    pipeline = EmbeddingPipeline(qdrant=qdrant, batch_size=args.batch_size, encode_window=args.encode_window,
+                                 upsert_batch_size=args.upsert_batch_size, workers=args.workers,
+                                 manifest_path=args.manifest)
+    stats = pipeline.run(args.data_dir, force=args.force)
+    print(f"✅ Embedding complete: {stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Embedding Index
+
+Precomputed chunk embeddings for knowledge-base retrieval. SportsKnowledgeRAG
+used to re-encode up to 200 chunks with SentenceTransformer on every query
+(and ignore the rest of the corpus). Here every chunk is encoded once into a
+row-normalized float32 matrix saved next to the chunks file and memory-mapped
+on later startups, so a query costs one query encode plus one matrix-vector
+product over the full corpus.
+
+Key Features:
+- .npy matrix + JSON metadata, written atomically beside the chunks file
+- Invalidated by a content hash of the chunks file and the model name; with
+  stable chunk ids (the JSONL chunk store) a stale index is updated by
+  encoding only the chunks it does not have
+- Memory-mapped reads: pages are shared across worker processes
+- Cosine top-k through a pluggable search backend (tools/ann_index: exact
+  or IVF-flat), with per-row label bitmasks filtered inside the search
+- Incremental adds; backend state saved beside the matrix
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tools.ann_index import ExactSearchBackend, SearchBackend
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+
+
+def file_content_hash(path: Path, block_size: int = 1 << 20) -> str:
+    """blake2b digest of a file's bytes."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """float32 copy of vectors scaled to unit L2 norm (zero rows stay zero)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, np.float32(1e-12))
+
+
+class EmbeddingIndex:
+    """Row-normalized chunk embedding matrix searched through a pluggable backend."""
+
+    def __init__(self, vectors: np.ndarray, chunk_ids: Sequence[int],
+                 content_hash: str = "", model_name: str = "",
+                 backend: Optional[SearchBackend] = None):
+        """
+        Args:
+            vectors: (n_chunks, dim) float32 matrix with unit-norm rows (may be a memmap)
+            chunk_ids: Chunk id of each row
+            content_hash: Hash of the chunks file the vectors were built from
+            model_name: Embedding model that produced the vectors
+            backend: Search backend (default: exact search)
+        """
+        self.vectors = vectors
+        self.chunk_ids = np.asarray(chunk_ids, dtype=np.int64)
+        self.content_hash = content_hash
+        self.model_name = model_name
+        self.backend = backend or ExactSearchBackend()
+        self.labels: Optional[np.ndarray] = None
+        self._allowed: Dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return int(self.vectors.shape[0])
+
+    @property
+    def dim(self) -> int:
+        return int(self.vectors.shape[1]) if self.vectors.ndim == 2 else 0
+
+    @property
+    def version(self) -> str:
+        """Changes whenever search results could change (rebuild, model swap or add)."""
+        return f"{self.content_hash}:{self.model_name}:{len(self)}:{self.backend.name}"
+
+    @staticmethod
+    def paths_for(chunks_path: Path, model_name: str, index_dir: Optional[Path] = None) -> Tuple[Path, Path]:
+        """(matrix path, metadata path) of the index for a chunks file and model."""
+        chunks_path = Path(chunks_path)
+        model_slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+        # JSONL stores get their own files: their rows are reused by chunk id,
+        # which is only sound for indexes built from a store
+        name = chunks_path.stem if chunks_path.suffix == '.json' else chunks_path.name
+        stem = Path(index_dir or chunks_path.parent) / f"{name}.{model_slug}.embeddings"
+        return stem.with_suffix('.npy'), stem.with_suffix('.json')
+
+    @classmethod
+    def backend_path_for(cls, chunks_path: Path, model_name: str, backend_name: str,
+                         index_dir: Optional[Path] = None) -> Path:
+        """Path of a search backend's saved state."""
+        matrix_path, _ = cls.paths_for(chunks_path, model_name, index_dir)
+        return matrix_path.with_suffix(f'.{backend_name}.npz')
+
+    def set_labels(self, labels: Sequence[int]) -> None:
+        """
+        Per-row label bitmasks (e.g. one bit per sport) used by search(label_mask=...).
+
+        Args:
+            labels: One integer bitmask per row
+        """
+        labels = np.asarray(labels, dtype=np.uint32)
+        if len(labels) != len(self):
+            raise ValueError(f"Expected {len(self)} labels, got {len(labels)}")
+        self.labels = labels
+        self._allowed.clear()
+
+    def use_backend(self, backend: SearchBackend, chunks_path: Optional[Path] = None,
+                    index_dir: Optional[Path] = None) -> None:
+        """
+        Switch search backend, restoring its saved state or fitting (and saving) it.
+
+        Args:
+            backend: Backend to search with
+            chunks_path: Chunks file the index belongs to (enables state persistence)
+            index_dir: Directory holding the index (default: beside the chunks file)
+        """
+        self.backend = backend
+        state_path = (self.backend_path_for(chunks_path, self.model_name, backend.name, index_dir)
+                      if chunks_path is not None else None)
+
+        if state_path is not None and state_path.exists():
+            try:
+                with np.load(state_path) as saved:
+                    state = {key: saved[key] for key in saved.files}
+                if (str(state.pop('content_hash', '')) == self.content_hash
+                        and backend.load_state(state, len(self))):
+                    logger.info(f"Loaded {backend.name} search state from {state_path}")
+                    return
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load {state_path}: {e}")
+
+        backend.fit(self.vectors)
+        if state_path is not None:
+            self._save_backend_state(state_path)
+
+    def _save_backend_state(self, state_path: Path) -> None:
+        state = self.backend.state()
+        if not state:
+            return
+        try:
+            tmp_path = state_path.with_name(state_path.name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, content_hash=np.array(self.content_hash), **state)
+            os.replace(tmp_path, state_path)
+        except OSError as e:
+            logger.warning(f"Could not save {self.backend.name} search state: {e}")
+
+    def add(self, vectors: np.ndarray, chunk_ids: Sequence[int],
+            labels: Optional[Sequence[int]] = None) -> None:
+        """
+        Append embeddings for new chunks (the matrix moves into memory until the next save).
+
+        Args:
+            vectors: (n_new, dim) embeddings, normalized here
+            chunk_ids: Chunk id of each new row
+            labels: Label bitmask of each new row (required once labels are set)
+        """
+        vectors = normalize_rows(vectors)
+        start = len(self)
+        if start:
+            self.vectors = np.concatenate([np.asarray(self.vectors), vectors])
+        else:
+            self.vectors = vectors
+        self.chunk_ids = np.concatenate([self.chunk_ids, np.asarray(chunk_ids, dtype=np.int64)])
+        if self.labels is not None:
+            if labels is None:
+                raise ValueError("Labels are set on this index; new rows need labels too")
+            self.labels = np.concatenate([self.labels, np.asarray(labels, dtype=np.uint32)])
+            self._allowed.clear()
+        self.backend.add(self.vectors, start)
+
+    @classmethod
+    def _read_meta(cls, chunks_path: Path, model_name: str,
+                   index_dir: Optional[Path] = None) -> Optional[Tuple[Path, Dict[str, Any]]]:
+        matrix_path, meta_path = cls.paths_for(chunks_path, model_name, index_dir)
+        if not matrix_path.exists() or not meta_path.exists():
+            return None
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != INDEX_FORMAT_VERSION or meta.get('model_name') != model_name:
+            return None
+        return matrix_path, meta
+
+    @classmethod
+    def load(cls, chunks_path: Path, model_name: str, index_dir: Optional[Path] = None,
+             content_hash: Optional[str] = None) -> Optional[EmbeddingIndex]:
+        """
+        Memory-map a saved index if it is current.
+
+        Args:
+            chunks_path: Chunks file the index was built from
+            model_name: Embedding model name
+            index_dir: Directory holding the index (default: beside the chunks file)
+            content_hash: Precomputed hash of the chunks file
+
+        Returns:
+            EmbeddingIndex backed by a read-only memmap, or None if the index is
+            missing, unreadable or stale
+        """
+        try:
+            found = cls._read_meta(chunks_path, model_name, index_dir)
+            if found is None:
+                return None
+            matrix_path, meta = found
+            content_hash = content_hash or file_content_hash(Path(chunks_path))
+            if meta.get('content_hash') != content_hash:
+                logger.info(f"Embedding index {matrix_path} is stale - rebuilding")
+                return None
+
+            vectors = np.load(matrix_path, mmap_mode='r')
+            if vectors.shape[0] != len(meta['chunk_ids']):
+                logger.warning(f"Embedding index {matrix_path} is truncated - rebuilding")
+                return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load embedding index {matrix_path}: {e}")
+            return None
+
+        return cls(vectors, meta['chunk_ids'], content_hash, model_name)
+
+    @classmethod
+    def build(cls, texts: Sequence[str], chunk_ids: Sequence[int], model: Any,
+              model_name: str = "", content_hash: str = "", batch_size: int = 64) -> EmbeddingIndex:
+        """
+        Encode every chunk once.
+
+        Args:
+            texts: Chunk contents
+            chunk_ids: Chunk id of each text
+            model: Encoder with a SentenceTransformer-style encode(texts, batch_size=...)
+            model_name: Embedding model name recorded in the metadata
+            content_hash: Hash of the chunks file recorded in the metadata
+            batch_size: Texts per encode batch
+
+        Returns:
+            In-memory EmbeddingIndex
+        """
+        if texts:
+            vectors = normalize_rows(model.encode(list(texts), batch_size=batch_size,
+                                                  show_progress_bar=False))
+        else:
+            vectors = np.zeros((0, 0), dtype=np.float32)
+        logger.info(f"Encoded {len(texts)} chunks into a {vectors.shape} embedding matrix")
+        return cls(vectors, chunk_ids, content_hash, model_name)
+
+    @classmethod
+    def rebuild(cls, chunks_path: Path, texts: Sequence[str], chunk_ids: Sequence[int], model: Any,
+                model_name: str, index_dir: Optional[Path] = None, content_hash: str = "",
+                batch_size: int = 64) -> EmbeddingIndex:
+        """
+        Build an index reusing the rows of a stale saved index by chunk id.
+
+        Only valid when chunk ids are never reused for different content (the
+        JSONL chunk store assigns fresh ids to re-chunked files); only the
+        chunks missing from the saved index are encoded.
+
+        Args:
+            chunks_path: Chunks file the texts were read from
+            texts: Chunk contents, in index row order
+            chunk_ids: Chunk id of each text
+            model: Encoder for the new chunks
+            model_name: Embedding model name
+            index_dir: Directory holding the index (default: beside the chunks file)
+            content_hash: Hash of the chunks file recorded in the metadata
+            batch_size: Texts per encode batch
+
+        Returns:
+            In-memory EmbeddingIndex
+        """
+        try:
+            found = cls._read_meta(chunks_path, model_name, index_dir)
+            old_vectors = np.load(found[0], mmap_mode='r') if found else None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read previous embedding index: {e}")
+            found, old_vectors = None, None
+        if found is None or old_vectors is None or old_vectors.shape[0] != len(found[1]['chunk_ids']):
+            return cls.build(texts, chunk_ids, model, model_name, content_hash, batch_size)
+
+        old_rows = {chunk_id: row for row, chunk_id in enumerate(found[1]['chunk_ids'])}
+        reused = [(i, old_rows[chunk_id]) for i, chunk_id in enumerate(chunk_ids) if chunk_id in old_rows]
+        missing = [i for i, chunk_id in enumerate(chunk_ids) if chunk_id not in old_rows]
+
+        vectors = np.empty((len(chunk_ids), old_vectors.shape[1]), dtype=np.float32)
+        if reused:
+            new_positions, old_positions = map(list, zip(*reused))
+            vectors[new_positions] = old_vectors[old_positions]
+        if missing:
+            encoded = normalize_rows(model.encode([texts[i] for i in missing], batch_size=batch_size,
+                                                  show_progress_bar=False))
+            if encoded.shape[1] != vectors.shape[1]:
+                return cls.build(texts, chunk_ids, model, model_name, content_hash, batch_size)
+            vectors[missing] = encoded
+        logger.info(f"Embedding index updated: {len(reused)} chunk embeddings reused, {len(missing)} encoded")
+        return cls(vectors, chunk_ids, content_hash, model_name)
+
+    def save(self, chunks_path: Path, index_dir: Optional[Path] = None,
+             content_hash: Optional[str] = None) -> Path:
+        """
+        Write the matrix, metadata and backend state beside the chunks file (atomic replace).
+
+        Args:
+            chunks_path: Chunks file the index belongs to
+            index_dir: Directory holding the index (default: beside the chunks file)
+            content_hash: New hash of the chunks file (after incremental adds)
+
+        Returns:
+            Path of the saved matrix
+        """
+        if content_hash is not None:
+            self.content_hash = content_hash
+        matrix_path, meta_path = self.paths_for(chunks_path, self.model_name, index_dir)
+        matrix_path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_matrix = matrix_path.with_name(matrix_path.name + '.tmp')
+        with open(tmp_matrix, 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.vectors, dtype=np.float32))
+        os.replace(tmp_matrix, matrix_path)
+
+        meta = {
+            'format_version': INDEX_FORMAT_VERSION,
+            'content_hash': self.content_hash,
+            'model_name': self.model_name,
+            'dim': self.dim,
+            'chunk_ids': self.chunk_ids.tolist()
+        }
+        tmp_meta = meta_path.with_name(meta_path.name + '.tmp')
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+        self._save_backend_state(self.backend_path_for(chunks_path, self.model_name, self.backend.name, index_dir))
+
+        logger.info(f"Saved {len(self)} chunk embeddings to {matrix_path}")
+        return matrix_path
+
+    @classmethod
+    def load_or_build(cls, chunks_path: Path, texts: Sequence[str], chunk_ids: Sequence[int],
+                      model: Any, model_name: str, index_dir: Optional[Path] = None,
+                      batch_size: int = 64, reuse_rows: bool = False) -> EmbeddingIndex:
+        """
+        Memory-map the saved index, or build and save it if missing or stale.
+
+        Args:
+            chunks_path: Chunks file the texts were read from
+            texts: Chunk contents, in index row order
+            chunk_ids: Chunk id of each text
+            model: Encoder used when the index has to be (re)built
+            model_name: Embedding model name
+            index_dir: Directory holding the index (default: beside the chunks file)
+            batch_size: Texts per encode batch when building
+            reuse_rows: Chunk ids are stable (JSONL chunk store): a stale index
+                is updated by encoding only the new chunks
+
+        Returns:
+            EmbeddingIndex (memory-mapped when it could be saved)
+        """
+        content_hash = file_content_hash(Path(chunks_path))
+        index = cls.load(chunks_path, model_name, index_dir, content_hash)
+        if index is not None and index.chunk_ids.tolist() == list(chunk_ids):
+            logger.info(f"Memory-mapped {len(index)} chunk embeddings")
+            return index
+
+        if reuse_rows:
+            index = cls.rebuild(chunks_path, texts, chunk_ids, model, model_name, index_dir, content_hash, batch_size)
+        else:
+            index = cls.build(texts, chunk_ids, model, model_name, content_hash, batch_size)
+        try:
+            index.save(chunks_path, index_dir)
+            return cls.load(chunks_path, model_name, index_dir, content_hash) or index
+        except OSError as e:
+            logger.warning(f"Could not save embedding index ({e}); keeping it in memory")
+            return index
+
+    def encode_query(self, model: Any, query: str) -> np.ndarray:
+        """Unit-norm float32 embedding of one query."""
+        return normalize_rows(model.encode([query], show_progress_bar=False))[0]
+
+    def allowed_rows(self, label_mask: int) -> Optional[np.ndarray]:
+        """Boolean row mask of rows sharing a bit with label_mask (None: no filter)."""
+        if not label_mask or self.labels is None:
+            return None
+        allowed = self._allowed.get(label_mask)
+        if allowed is None:
+            allowed = self._allowed[label_mask] = (self.labels & np.uint32(label_mask)) != 0
+        return allowed
+
+    def search(self, query_vector: np.ndarray, top_k: int,
+               min_score: Optional[float] = None, label_mask: int = 0) -> List[Tuple[int, float]]:
+        """
+        Cosine top-k over the chunks through the search backend.
+
+        Args:
+            query_vector: Unit-norm query embedding
+            top_k: Number of results
+            min_score: Drop results scoring below this
+            label_mask: Only return rows whose label shares a bit with this mask (0: all rows)
+
+        Returns:
+            (row, score) pairs, best first
+        """
+        if len(self) == 0 or top_k <= 0:
+            return []
+
+        rows, scores = self.backend.search(self.vectors, np.asarray(query_vector, dtype=np.float32),
+                                           top_k, self.allowed_rows(label_mask))
+        return [(int(row), float(score)) for row, score in zip(rows, scores)
+                if min_score is None or score >= min_score]
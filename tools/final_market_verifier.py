@@ -9,7 +9,7 @@ available at the specified odds right before sending notifications.
 
 import logging
 import time
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, List, Optional, Set, Tuple, Any, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from enum import Enum
@@ -17,6 +17,7 @@ from enum import Enum
 # Import core dependencies
 try:
     from tools.odds_fetcher_tool import OddsFetcherTool, GameOdds, BookOdds, Selection
+    from tools.market_snapshot_cache import get_market_snapshot_cache
     HAS_ODDS_FETCHER = True
 except ImportError:
     HAS_ODDS_FETCHER = False
@@ -334,7 +335,12 @@ class FinalMarketVerifier:
                 # Convert game_id to sport_key format if needed
                 sport_key = self._convert_game_id_to_sport_key(game_id)
                 
-                odds_data = self.odds_fetcher.get_game_odds(sport_key, markets=markets)
+                # Shared snapshot, but never older than the verifier tolerates;
+                # retries bypass whatever the first attempt saw
+                max_age = self.config.max_data_age_seconds if attempt == 0 else 0.0
+                odds_data = get_market_snapshot_cache().get(
+                    sport_key, self.odds_fetcher.get_game_odds, markets=markets, max_age=max_age
+                )
                 
                 if odds_data:
                     return odds_data
@@ -517,6 +523,28 @@ class FinalMarketVerifier:
         for key in expired_keys:
             del self.verification_cache[key]
     
+    def invalidate_games(self, game_ids: Set[str]) -> int:
+        """
+        Drop cached verifications for games whose odds moved.
+        
+        Args:
+            game_ids: Games to invalidate
+            
+        Returns:
+            Number of cache entries removed
+        """
+        prefixes = tuple(f"{game_id}_" for game_id in game_ids)
+        stale = [key for key in self.verification_cache if key.startswith(prefixes)]
+        for key in stale:
+            del self.verification_cache[key]
+        return len(stale)
+    
+    def on_odds_delta(self, batch: 'OddsDeltaBatch') -> None:
+        """OddsDeltaEngine subscriber: forget verifications of games that moved."""
+        removed = self.invalidate_games(batch.changed_game_ids)
+        if removed:
+            logger.debug(f"Invalidated {removed} cached verifications after odds moved")
+    
     def get_verification_stats(self) -> Dict[str, Any]:
         """Get verification statistics."""
         success_rate = 0.0
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Batched Transformer Inference Service
+
+Shared in-process micro-batcher for the sequence classifiers (RoBERTa tweet
+classifiers, BioBERT injury classifiers, parlay confidence predictor).
+Callers used to tokenize and run one text at a time; here every request goes
+onto a queue and a worker thread runs them together.
+
+Key Features:
+- Micro-batching: a batch closes after max_batch_size items or max_wait_ms
+  after its first item, whichever comes first
+- Dynamic padding: each batch is padded to its longest item, not max_length
+- Forward passes run under torch.inference_mode
+- CPU thread-count policy applied once per process (INFERENCE_NUM_THREADS)
+- Async API (predict_async) plus sync shims (predict, predict_many)
+- One service per model directory, shared by every caller in the process
+- Optional fast CPU backends (int8 / ONNX Runtime, see tools.model_export)
+
+Services hand back softmax probability rows as float32 NumPy arrays; callers
+map them to their own labels.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT_MS = 5.0
+
+_threads_configured = False
+_threads_lock = threading.Lock()
+
+
+def configure_cpu_threads(num_threads: Optional[int] = None) -> int:
+    """
+    Apply the process-wide torch CPU thread policy (first call wins).
+
+    Intra-op threads come from num_threads, else INFERENCE_NUM_THREADS, else
+    the CPU count capped at 8 (BERT-base matmuls stop scaling past that and
+    the extra threads only contend with the event loop). Inter-op threads are
+    pinned to 1: the service runs one forward pass at a time.
+
+    Returns:
+        The intra-op thread count in effect
+    """
+    global _threads_configured
+    with _threads_lock:
+        if not _threads_configured:
+            if num_threads is None:
+                num_threads = int(os.getenv("INFERENCE_NUM_THREADS", "0")) or min(os.cpu_count() or 1, 8)
+            torch.set_num_threads(num_threads)
+            try:
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                # Already set, or inter-op work has started in this process
+                pass
+            _threads_configured = True
+    return torch.get_num_threads()
+
+
+@dataclass
+class _Request:
+    """One queued text and the future its probability row is delivered to."""
+    text: str
+    future: Future
+
+
+_STOP = object()
+
+
+class InferenceService:
+    """Micro-batching wrapper around a tokenizer and sequence classifier."""
+
+    def __init__(self, model: Any, tokenizer: Any, max_length: int = 512,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                 device: Optional[torch.device] = None,
+                 num_threads: Optional[int] = None,
+                 name: str = "classifier"):
+        """
+        Initialize the service (the worker thread starts on first submit).
+
+        Args:
+            model: Sequence classification model returning .logits
+            tokenizer: Matching Hugging Face tokenizer
+            max_length: Truncation length in tokens
+            max_batch_size: Most texts per forward pass
+            max_wait_ms: Longest a request waits for the batch to fill
+            device: Device the model runs on (default: CPU)
+            num_threads: CPU intra-op threads (see configure_cpu_threads)
+            name: Label used in logs and stats
+        """
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.device = device or torch.device("cpu")
+        self.name = name
+        self._num_threads = num_threads
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.inference_seconds = 0.0
+
+    def _ensure_worker(self) -> None:
+        if self._closed:
+            raise RuntimeError(f"InferenceService '{self.name}' is closed")
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                configure_cpu_threads(self._num_threads)
+                if hasattr(self.model, "eval"):
+                    self.model.eval()
+                self._worker = threading.Thread(target=self._run, name=f"inference-{self.name}", daemon=True)
+                self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue one text; the future resolves to its probability row."""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put(_Request(text, future))
+        return future
+
+    async def predict_async(self, text: str) -> np.ndarray:
+        """Probability row for one text, awaited without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def predict(self, text: str) -> np.ndarray:
+        """Probability row for one text (sync shim; batches with concurrent callers)."""
+        return self.submit(text).result()
+
+    def predict_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Probability matrix for texts, in order (queued together so they batch)."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        futures = [self.submit(text) for text in texts]
+        return np.stack([future.result() for future in futures])
+
+    def _collect_batch(self, first: _Request) -> Tuple[List[_Request], bool]:
+        """Gather requests after first until the batch is full or the wait expires."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch, stop = self._collect_batch(item)
+            batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                probabilities = self._forward([request.text for request in batch])
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"InferenceService '{self.name}' batch of {len(batch)} failed: {e}")
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            for request, row in zip(batch, probabilities):
+                request.future.set_result(row)
+
+    def _forward(self, texts: List[str]) -> np.ndarray:
+        """One padded-to-longest forward pass over texts."""
+        start = time.perf_counter()
+        inputs = self.tokenizer(
+            texts,
+            truncation=True,
+            padding=True,
+            max_length=self.max_length,
+            return_tensors="pt"
+        )
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        with torch.inference_mode():
+            logits = self.model(**inputs).logits
+            probabilities = torch.softmax(logits.float(), dim=-1).cpu().numpy()
+        self.inference_seconds += time.perf_counter() - start
+        self.batches += 1
+        self.items += len(texts)
+        return probabilities
+
+    def close(self) -> None:
+        """Stop the worker after the queued requests are served."""
+        with self._start_lock:
+            self._closed = True
+            worker = self._worker
+        if worker is not None:
+            self._queue.put(_STOP)
+            worker.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counters for throughput reporting."""
+        return {
+            'name': self.name,
+            'batches': self.batches,
+            'items': self.items,
+            'errors': self.errors,
+            'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+            'inference_seconds': self.inference_seconds,
+            'queued': self._queue.qsize()
+        }
+
+
+def load_sequence_classifier(model_dir: str) -> Tuple[Any, Any]:
+    """Default loader: (model, tokenizer) from a saved Hugging Face directory."""
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    return model, tokenizer
+
+
+_shared_services: Dict[Tuple[str, int, str, str], InferenceService] = {}
+_shared_services_lock = threading.Lock()
+
+
+def get_inference_service(model_dir: str, max_length: int = 512,
+                          loader: Optional[Callable[[str], Tuple[Any, Any]]] = None,
+                          device: Optional[torch.device] = None,
+                          backend: str = "fp32",
+                          version: str = "",
+                          **options: Any) -> InferenceService:
+    """
+    Return the process-wide service for a model directory.
+
+    The model is loaded once per (model_dir, max_length, backend); later
+    callers share its weights and its batching queue. backend "fp32" loads
+    the saved PyTorch model; "auto", "int8", "onnx" and "onnx_int8" load the
+    fast CPU artifacts from tools.model_export (falling back to fp32 when
+    none passed parity). Batch options come from INFERENCE_MAX_BATCH_SIZE and
+    INFERENCE_MAX_WAIT_MS unless given. Callers that hot-reload a directory
+    pass its artifact version, so a retrained model gets its own service.
+    """
+    key = (str(Path(model_dir)), max_length, backend, version)
+    service = _shared_services.get(key)
+    if service is None:
+        with _shared_services_lock:
+            service = _shared_services.get(key)
+            if service is None:
+                if loader is None and backend != "fp32":
+                    from tools.model_export import load_fast_sequence_classifier
+                    model, tokenizer = load_fast_sequence_classifier(str(model_dir), backend)
+                else:
+                    model, tokenizer = (loader or load_sequence_classifier)(str(model_dir))
+                if device is not None:
+                    model.to(device)
+                options.setdefault("max_batch_size", int(os.getenv("INFERENCE_MAX_BATCH_SIZE", str(DEFAULT_MAX_BATCH_SIZE))))
+                options.setdefault("max_wait_ms", float(os.getenv("INFERENCE_MAX_WAIT_MS", str(DEFAULT_MAX_WAIT_MS))))
+                service = InferenceService(model, tokenizer, max_length=max_length, device=device,
+                                           name=Path(model_dir).name, **options)
+                _shared_services[key] = service
+    return service
+
+
+def discard_inference_service(service: InferenceService) -> None:
+    """Stop handing out a service (e.g. a replaced model version) without closing it."""
+    with _shared_services_lock:
+        for key in [key for key, shared in _shared_services.items() if shared is service]:
+            del _shared_services[key]
+
+
+def reset_inference_services() -> None:
+    """Close and discard every shared service (next call reloads)."""
+    with _shared_services_lock:
+        services = list(_shared_services.values())
+        _shared_services.clear()
+    for service in services:
+        service.close()
@@ -11,36 +11,92 @@ Key Features:
 - Integration with NFL and NBA strategist agents
 - Sports betting theory and mathematical models
 - Value betting and edge detection insights
+- BM25 keyword search and hybrid (reciprocal-rank fusion) retrieval
 """
 
-import json
+import importlib.util
 import logging
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+import threading
+from collections.abc import Sequence
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from dataclasses import dataclass, replace
 from pathlib import Path
 import re
 
-# Vector search and embedding imports
-try:
-    from sentence_transformers import SentenceTransformer
-    import numpy as np
-    from sklearn.metrics.pairwise import cosine_similarity
-    HAS_EMBEDDINGS = True
-except ImportError:
-    HAS_EMBEDDINGS = False
-
-# Qdrant vector database imports
-try:
-    from qdrant_client import QdrantClient
-    from qdrant_client.models import Distance, VectorParams, PointStruct
-    HAS_QDRANT = True
-except ImportError:
-    HAS_QDRANT = False
+import numpy as np
+
+# sentence_transformers (torch) and qdrant_client take seconds to import:
+# both are imported on first use
+HAS_EMBEDDINGS = importlib.util.find_spec("sentence_transformers") is not None
+HAS_QDRANT = importlib.util.find_spec("qdrant_client") is not None
+
+# Embedding model class, resolved on first use (tests and benchmarks may set it)
+SentenceTransformer = None
+
+from tools.ann_index import create_backend
+from tools.bm25_index import RRF_K, BM25Index, reciprocal_rank_fusion
+from tools.chunk_store import ChunkOffsetIndex, resolve_chunks_path
+from tools.embedding_index import EmbeddingIndex, normalize_rows
+from tools.rag_query_cache import RAGQueryCache, get_rag_query_cache
 
 logger = logging.getLogger(__name__)
 
+# Keywords marking a chunk as about one sport
+SPORT_KEYWORDS = {
+    'NFL': ['football', 'nfl', 'quarterback', 'touchdown', 'yard', 'rushing', 'passing', 'down', 'field goal'],
+    'NBA': ['basketball', 'nba', 'points', 'rebounds', 'assists', 'three-point', 'player', 'court', 'shot']
+}
 
-@dataclass
+# One label bit per sport in the embedding index
+SPORT_LABEL_BITS = {sport: 1 << i for i, sport in enumerate(SPORT_KEYWORDS)}
+
+# 'vector': embeddings (BM25 until the model is loaded), 'keyword': BM25 only,
+# 'hybrid': reciprocal-rank fusion of both
+RETRIEVAL_MODES = ("vector", "keyword", "hybrid")
+
+# Candidates taken from each ranking per hybrid result
+HYBRID_CANDIDATE_FACTOR = 4
+
+# Sports betting concepts looked for in retrieved chunks (lowercase patterns)
+INSIGHT_CONCEPTS = {
+    concept: re.compile(pattern) for concept, pattern in {
+        "value betting": r"value|edge|positive expectation|expected value",
+        "bankroll management": r"bankroll|money management|kelly|bet sizing",
+        "correlation": r"correlation|correlated|dependent|related outcomes",
+        "market efficiency": r"efficient market|line movement|sharp money|public",
+        "statistical analysis": r"statistics|probability|variance|regression",
+        "arbitrage": r"arbitrage|sure bet|guaranteed profit|risk-free"
+    }.items()
+}
+
+
+def sport_label_bits(content: str) -> int:
+    """
+    Label bitmask of the sports a chunk is relevant to.
+
+    A chunk is relevant to a sport if it mentions that sport's keywords or
+    mentions no other sport's keywords (general betting theory).
+    """
+    content_lower = content.lower()
+    mentions = {sport: any(keyword in content_lower for keyword in keywords)
+                for sport, keywords in SPORT_KEYWORDS.items()}
+    bits = 0
+    for sport, bit in SPORT_LABEL_BITS.items():
+        if mentions[sport] or not any(other for name, other in mentions.items() if name != sport):
+            bits |= bit
+    return bits
+
+
+def _sentence_transformer_class():
+    """The SentenceTransformer class, imported on first call."""
+    global SentenceTransformer
+    if SentenceTransformer is None:
+        from sentence_transformers import SentenceTransformer as model_class
+        SentenceTransformer = model_class
+    return SentenceTransformer
+
+
+@dataclass(slots=True)
 class KnowledgeChunk:
     """A chunk of knowledge from the sports betting books."""
     content: str
@@ -60,6 +116,82 @@ class RAGResult:
     insights: List[str]
 
 
+class LazyChunkList(Sequence):
+    """
+    Knowledge chunks read from the chunks file on access.
+
+    Holds only positions into the chunk offset index; each access parses one
+    record into a fresh KnowledgeChunk, so chunk text is materialized for
+    search hits only. Chunks added at runtime follow the file's chunks and
+    stay in memory.
+    """
+
+    def __init__(self, offsets: ChunkOffsetIndex, positions: np.ndarray):
+        self.offsets = offsets
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self._added: List[KnowledgeChunk] = []
+
+    def __len__(self) -> int:
+        return len(self.positions) + len(self._added)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("chunk index out of range")
+        if index >= len(self.positions):
+            return self._added[index - len(self.positions)]
+        return self._materialize(self.offsets.read(self.positions[index]))
+
+    def __iter__(self) -> Iterator[KnowledgeChunk]:
+        for record in self.offsets.iter_records(self.positions):
+            yield self._materialize(record)
+        yield from self._added
+
+    @property
+    def chunk_ids(self) -> List[int]:
+        """Chunk id of every chunk, without reading the chunks."""
+        return self.offsets.chunk_ids[self.positions].tolist() + [chunk.chunk_id for chunk in self._added]
+
+    def contents(self) -> Sequence:
+        """Lazy view of the chunk contents (for index builds)."""
+        return _ChunkContents(self)
+
+    def extend(self, chunks: List[KnowledgeChunk]) -> None:
+        """Append runtime-added chunks."""
+        self._added.extend(chunks)
+
+    @staticmethod
+    def _materialize(record: Dict[str, Any]) -> KnowledgeChunk:
+        metadata = record.get("metadata", {})
+        return KnowledgeChunk(
+            content=record["content"],
+            source=metadata.get("source", ""),
+            chunk_id=record["chunk_id"],
+            metadata=metadata
+        )
+
+
+class _ChunkContents(Sequence):
+    """Contents of a LazyChunkList, read on access."""
+
+    def __init__(self, chunks: LazyChunkList):
+        self._chunks = chunks
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [chunk.content for chunk in self._chunks[index]]
+        return self._chunks[index].content
+
+    def __iter__(self) -> Iterator[str]:
+        return (chunk.content for chunk in self._chunks)
+
+
 class SportsKnowledgeRAG:
     """
     RAG system for sports betting knowledge base.
@@ -69,111 +201,275 @@ class SportsKnowledgeRAG:
     """
     
     def __init__(self, 
-                 chunks_path: str = "data/chunks/chunks.json",
+                 chunks_path: Optional[str] = None,
                  embeddings_model: str = "all-MiniLM-L6-v2",
-                 use_qdrant: bool = False):
+                 use_qdrant: bool = False,
+                 index_dir: Optional[str] = None,
+                 index_backend: str = "auto",
+                 index_options: Optional[Dict[str, Any]] = None,
+                 query_cache: Optional[RAGQueryCache] = None,
+                 background_load: bool = False,
+                 retrieval_mode: str = "vector"):
         """
         Initialize the Knowledge Base RAG system.
         
         Args:
-            chunks_path: Path to the chunks.json file
+            chunks_path: Chunks file (default: data/chunks/chunks.jsonl, or the
+                legacy data/chunks/chunks.json array if not migrated yet)
             embeddings_model: Sentence transformer model for embeddings
             use_qdrant: Whether to use Qdrant vector database
+            index_dir: Directory for the precomputed embedding index
+                (default: next to the chunks file)
+            index_backend: Embedding search backend: 'exact', 'ivf' or
+                'auto' (IVF once the corpus is large enough to need it)
+            index_options: Backend options (e.g. {'nprobe': 16} for IVF)
+            query_cache: Query embedding / result cache (defaults to the
+                process-wide cache, shared by every knowledge base instance)
+            background_load: Load the embedding model and index on a background
+                thread; searches use keyword matching until it finishes (see
+                model_status / wait_until_ready)
+            retrieval_mode: 'vector', 'keyword' (BM25) or 'hybrid' (reciprocal-rank
+                fusion of vector and BM25 results)
+
+        Raises:
+            ValueError: Unknown retrieval mode
         """
-        self.chunks_path = Path(chunks_path)
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode {retrieval_mode!r} (expected one of {RETRIEVAL_MODES})")
+        self.retrieval_mode = retrieval_mode
+        self.chunks_path = resolve_chunks_path(chunks_path)
+        self._resolved_chunks_path = self.chunks_path.resolve()
+        self.embeddings_model_name = embeddings_model
+        self.index_dir = Path(index_dir) if index_dir else None
+        self.index_backend = index_backend
+        self.index_options = index_options or {}
         self.use_qdrant = use_qdrant and HAS_QDRANT
+        self.query_cache = query_cache or get_rag_query_cache()
         
-        # Load chunks
-        self.chunks = self._load_chunks()
+        # Chunk offsets and sources only: chunk text stays on disk
+        self.chunk_offsets = self._load_chunk_offsets()
         self.sports_betting_chunks = self._filter_sports_betting_chunks()
         
-        # Initialize embedding model
+        # Inverted index for keyword search, loaded before the embedding model
+        # so keyword queries are served while it loads
+        self.bm25_index = self._load_bm25_index()
+        
+        # Embedding model, chunk embeddings (memory-mapped from disk) and vector database
         self.embedding_model = None
-        if HAS_EMBEDDINGS:
-            try:
-                self.embedding_model = SentenceTransformer(embeddings_model)
-                logger.info(f"Loaded embedding model: {embeddings_model}")
-            except Exception as e:
-                logger.warning(f"Could not load embedding model: {e}")
-        
-        # Initialize vector database
+        self.embedding_index: Optional[EmbeddingIndex] = None
         self.qdrant_client = None
-        if self.use_qdrant:
-            try:
-                self.qdrant_client = QdrantClient(":memory:")  # In-memory for development
-                self._initialize_qdrant_collection()
-                logger.info("Qdrant vector database initialized")
-            except Exception as e:
-                logger.warning(f"Could not initialize Qdrant: {e}")
-                self.use_qdrant = False
+        self._ready = threading.Event()
+        if background_load:
+            threading.Thread(target=self._load_models, name="knowledge-base-loader", daemon=True).start()
+        else:
+            self._load_models()
         
         logger.info(f"Sports Knowledge RAG initialized with {len(self.sports_betting_chunks)} sports betting chunks")
     
-    def _load_chunks(self) -> List[Dict[str, Any]]:
-        """Load chunks from JSON file."""
+    def _load_chunk_offsets(self) -> Optional[ChunkOffsetIndex]:
+        """Offset index of the JSONL chunk store (or legacy JSON array)."""
         try:
-            with open(self.chunks_path, 'r', encoding='utf-8') as f:
-                chunks = json.load(f)
-            logger.info(f"Loaded {len(chunks)} chunks from {self.chunks_path}")
-            return chunks
+            offsets = ChunkOffsetIndex.load_or_build(self.chunks_path, self.index_dir)
+            logger.info(f"Indexed {len(offsets)} chunks in {self.chunks_path}")
+            return offsets
         except Exception as e:
             logger.error(f"Error loading chunks: {e}")
-            return []
+            return None
     
-    def _filter_sports_betting_chunks(self) -> List[KnowledgeChunk]:
+    def _filter_sports_betting_chunks(self) -> Sequence:
         """Filter chunks to only include sports betting books."""
-        sports_betting_chunks = []
+        if self.chunk_offsets is None:
+            return []
+        
+        # Check which sources are our sports betting books, once per source
+        books = ["Ed_Miller", "Mathletics", "logic_of_sports_betting"]
+        is_book = np.array([any(book in source for book in books) for source in self.chunk_offsets.sources],
+                           dtype=bool)
+        positions = np.flatnonzero(is_book[self.chunk_offsets.source_ids])
+        
+        logger.info(f"Filtered to {len(positions)} sports betting chunks")
+        return LazyChunkList(self.chunk_offsets, positions)
+    
+    def _load_bm25_index(self) -> Optional[BM25Index]:
+        """Load the BM25 index saved beside the chunks file, building it first if missing or stale."""
+        if self.chunk_offsets is None:
+            return BM25Index.build([], [], label_fn=sport_label_bits)
         
-        for i, chunk_data in enumerate(self.chunks):
-            source = chunk_data.get("metadata", {}).get("source", "")
+        try:
+            # Sport labels live with the postings so keyword search can filter without embeddings
+            return BM25Index.load_or_build(self.chunks_path, self.sports_betting_chunks.contents(),
+                                           self.sports_betting_chunks.chunk_ids, self.index_dir,
+                                           label_fn=sport_label_bits)
+        except Exception as e:
+            logger.warning(f"Could not build BM25 index: {e}")
+            return None
+    
+    def _load_models(self) -> None:
+        """Load the embedding model, embedding index and Qdrant collection, then mark ready."""
+        try:
+            model = None
+            if SentenceTransformer is not None or HAS_EMBEDDINGS:
+                try:
+                    model = _sentence_transformer_class()(self.embeddings_model_name)
+                    logger.info(f"Loaded embedding model: {self.embeddings_model_name}")
+                except Exception as e:
+                    logger.warning(f"Could not load embedding model: {e}")
             
-            # Check if chunk is from our sports betting books
-            if any(book in source for book in ["Ed_Miller", "Mathletics", "logic_of_sports_betting"]):
-                knowledge_chunk = KnowledgeChunk(
-                    content=chunk_data["content"],
-                    source=source,
-                    chunk_id=i,
-                    metadata=chunk_data.get("metadata", {})
-                )
-                sports_betting_chunks.append(knowledge_chunk)
+            if model is not None:
+                # Index first: searches switch to embeddings once the model is set
+                self.embedding_index = self._load_embedding_index(model)
+                self.embedding_model = model
+            
+            if self.use_qdrant:
+                try:
+                    from qdrant_client import QdrantClient
+                    client = QdrantClient(":memory:")  # In-memory for development
+                    self._initialize_qdrant_collection(client)
+                    self.qdrant_client = client
+                    logger.info("Qdrant vector database initialized")
+                except Exception as e:
+                    logger.warning(f"Could not initialize Qdrant: {e}")
+                    self.use_qdrant = False
+        finally:
+            self._ready.set()
+    
+    @property
+    def model_status(self) -> str:
+        """'loading' during a background load, then 'ready', or 'unavailable' (keyword search only)."""
+        if not self._ready.is_set():
+            return "loading"
+        return "ready" if self.embedding_model is not None and self.embedding_index is not None else "unavailable"
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the embedding model and index have loaded (or failed to).
+
+        Args:
+            timeout: Seconds to wait (None: no limit)
+
+        Returns:
+            False if the timeout expired first
+        """
+        return self._ready.wait(timeout)
+    
+    def _load_embedding_index(self, model: Any) -> Optional[EmbeddingIndex]:
+        """Memory-map the chunk embedding index, building it first if missing or stale."""
+        if self.chunk_offsets is None:
+            return None
+        
+        try:
+            contents = self.sports_betting_chunks.contents()
+            index = EmbeddingIndex.load_or_build(
+                self.chunks_path,
+                contents,
+                self.sports_betting_chunks.chunk_ids,
+                model,
+                self.embeddings_model_name,
+                index_dir=self.index_dir,
+                # JSONL chunk ids are never reused: only new chunks are encoded
+                reuse_rows=self.chunks_path.suffix == '.jsonl'
+            )
+            # Sport filters are applied inside the index search
+            if self.bm25_index is not None and self.bm25_index.labels is not None:
+                index.set_labels(self.bm25_index.labels)
+            else:
+                index.set_labels([sport_label_bits(content) for content in contents])
+            index.use_backend(create_backend(self.index_backend, len(index), **self.index_options),
+                              self.chunks_path, self.index_dir)
+            return index
+        except Exception as e:
+            logger.warning(f"Could not build embedding index: {e}")
+            return None
+    
+    def add_chunks(self, chunks: List[KnowledgeChunk]) -> None:
+        """
+        Add newly ingested chunks to the in-memory corpus and embedding index.
+
+        Args:
+            chunks: Chunks with chunk ids not already in the corpus
+        """
+        if not chunks:
+            return
         
-        logger.info(f"Filtered to {len(sports_betting_chunks)} sports betting chunks")
-        return sports_betting_chunks
+        # Index rows follow chunk positions: let a background load finish first
+        self.wait_until_ready()
+        self.sports_betting_chunks.extend(chunks)
+        if self.embedding_index is not None:
+            vectors = self.embedding_model.encode([chunk.content for chunk in chunks], show_progress_bar=False)
+            self.embedding_index.add(vectors, [chunk.chunk_id for chunk in chunks],
+                                     [sport_label_bits(chunk.content) for chunk in chunks])
+        if self.bm25_index is not None:
+            self.bm25_index.add([chunk.content for chunk in chunks], [chunk.chunk_id for chunk in chunks],
+                                [sport_label_bits(chunk.content) for chunk in chunks])
+        logger.info(f"Added {len(chunks)} chunks ({len(self.sports_betting_chunks)} total)")
     
-    def _initialize_qdrant_collection(self):
+    @property
+    def cache_namespace(self) -> str:
+        """Query cache namespace: knowledge bases over the same chunks and model share results."""
+        mode = "qdrant" if self.use_qdrant else "local"
+        return f"{self._resolved_chunks_path}:{self.embeddings_model_name}:{mode}:{self.retrieval_mode}"
+    
+    @property
+    def index_version(self) -> str:
+        """Version of the searchable corpus; cached results from other versions are dropped."""
+        versions = []
+        if (self.retrieval_mode != "keyword" and self.embedding_model is not None
+                and self.embedding_index is not None):
+            versions.append(self.embedding_index.version)
+        if not versions or self.retrieval_mode == "hybrid":
+            versions.append(self.bm25_index.version if self.bm25_index is not None
+                            else f"keywords:{len(self.sports_betting_chunks)}")
+        return "|".join(versions)
+    
+    def _encode_query(self, query: str) -> np.ndarray:
+        """Unit-norm query embedding, encoded once per model and query text."""
+        vector = self.query_cache.get_embedding(self.embeddings_model_name, query)
+        if vector is None:
+            encoded = normalize_rows(self.embedding_model.encode([query], show_progress_bar=False))[0]
+            vector = self.query_cache.put_embedding(self.embeddings_model_name, query, encoded)
+        return vector
+    
+    def _initialize_qdrant_collection(self, client: Any):
         """Initialize Qdrant collection for vector storage."""
-        if not self.qdrant_client or not self.embedding_model:
+        if not self.embedding_model:
             return
         
+        from qdrant_client.models import Distance, VectorParams, PointStruct
+        
         collection_name = "sports_betting_knowledge"
         
+        # Every chunk, reusing the precomputed embeddings when available
+        if self.embedding_index is not None:
+            vectors = self.embedding_index.vectors
+        else:
+            vectors = normalize_rows(self.embedding_model.encode(
+                [chunk.content for chunk in self.sports_betting_chunks], show_progress_bar=False))
+        if len(vectors) == 0:
+            return
+        
         # Create collection
-        self.qdrant_client.recreate_collection(
+        client.recreate_collection(
             collection_name=collection_name,
-            vectors_config=VectorParams(size=384, distance=Distance.COSINE)  # MiniLM embedding size
+            vectors_config=VectorParams(size=int(vectors.shape[1]), distance=Distance.COSINE)
         )
         
-        # Index chunks
-        points = []
-        for chunk in self.sports_betting_chunks[:100]:  # Limit for demo
-            try:
-                embedding = self.embedding_model.encode(chunk.content)
-                point = PointStruct(
+        # Index chunks in bulk batches
+        batch_size = 256
+        for start in range(0, len(self.sports_betting_chunks), batch_size):
+            points = [
+                PointStruct(
                     id=chunk.chunk_id,
-                    vector=embedding.tolist(),
+                    vector=vectors[start + offset].tolist(),
                     payload={
                         "content": chunk.content,
                         "source": chunk.source,
                         "chunk_id": chunk.chunk_id
                     }
                 )
-                points.append(point)
-            except Exception as e:
-                logger.warning(f"Error embedding chunk {chunk.chunk_id}: {e}")
-        
-        if points:
-            self.qdrant_client.upsert(collection_name=collection_name, points=points)
-            logger.info(f"Indexed {len(points)} chunks in Qdrant")
+                for offset, chunk in enumerate(self.sports_betting_chunks[start:start + batch_size])
+            ]
+            client.upsert(collection_name=collection_name, points=points)
+        logger.info(f"Indexed {len(self.sports_betting_chunks)} chunks in Qdrant")
     
     def search_knowledge(self, 
                         query: str, 
@@ -195,8 +491,21 @@ class SportsKnowledgeRAG:
         import time
         start_time = time.time()
         
+        # Repeated templated queries are served from the shared cache
+        cache_key = (query, top_k, min_relevance, sport_filter.upper() if sport_filter else None)
+        namespace, version = self.cache_namespace, self.index_version
+        cached = self.query_cache.get_result(namespace, version, cache_key)
+        if cached is not None:
+            # Fresh lists: callers (e.g. the strategist agents) filter result.chunks in place
+            return replace(cached, chunks=list(cached.chunks), insights=list(cached.insights),
+                           search_time_ms=(time.time() - start_time) * 1000)
+        
         if self.use_qdrant and self.qdrant_client:
             results = self._search_with_qdrant(query, top_k, sport_filter)
+        elif self.retrieval_mode == "keyword":
+            results = self._search_with_keywords(query, top_k, sport_filter)
+        elif self.retrieval_mode == "hybrid":
+            results = self._search_hybrid(query, top_k, min_relevance, sport_filter)
         else:
             results = self._search_with_similarity(query, top_k, min_relevance, sport_filter)
         
@@ -205,13 +514,15 @@ class SportsKnowledgeRAG:
         # Generate insights from retrieved chunks
         insights = self._generate_insights(query, results)
         
-        return RAGResult(
+        result = RAGResult(
             query=query,
             chunks=results,
             total_chunks_searched=len(self.sports_betting_chunks),
             search_time_ms=search_time_ms,
             insights=insights
         )
+        self.query_cache.put_result(namespace, version, cache_key, result)
+        return replace(result, chunks=list(results), insights=list(insights))
     
     def _search_with_qdrant(self, query: str, top_k: int, sport_filter: Optional[str] = None) -> List[KnowledgeChunk]:
         """Search using Qdrant vector database."""
@@ -219,15 +530,16 @@ class SportsKnowledgeRAG:
             return []
         
         try:
-            query_embedding = self.embedding_model.encode(query)
-            search_results = self.qdrant_client.search(
+            query_embedding = self._encode_query(query)
+            search_results = self.qdrant_client.query_points(
                 collection_name="sports_betting_knowledge",
-                query_vector=query_embedding.tolist(),
-                limit=top_k
+                query=query_embedding.tolist(),
+                limit=top_k,
+                with_payload=True
             )
             
             results = []
-            for result in search_results:
+            for result in search_results.points:
                 chunk = KnowledgeChunk(
                     content=result.payload["content"],
                     source=result.payload["source"],
@@ -247,87 +559,73 @@ class SportsKnowledgeRAG:
         if not sport_filter:
             return chunks
         
-        sport_keywords = {
-            'NFL': ['football', 'nfl', 'quarterback', 'touchdown', 'yard', 'rushing', 'passing', 'down', 'field goal'],
-            'NBA': ['basketball', 'nba', 'points', 'rebounds', 'assists', 'three-point', 'player', 'court', 'shot']
-        }
-        
-        relevant_keywords = sport_keywords.get(sport_filter.upper(), [])
-        if not relevant_keywords:
+        sport_bit = SPORT_LABEL_BITS.get(sport_filter.upper())
+        if not sport_bit:
             return chunks
         
-        filtered_chunks = []
-        for chunk in chunks:
-            content_lower = chunk.content.lower()
-            
-            # Check for sport-specific keywords
-            has_sport_keywords = any(keyword in content_lower for keyword in relevant_keywords)
-            
-            # Check if it's explicitly about another sport
-            other_sports = [s for s in sport_keywords.keys() if s != sport_filter.upper()]
-            has_other_sport = any(
-                any(keyword in content_lower for keyword in sport_keywords[other_sport])
-                for other_sport in other_sports
-            )
-            
-            # Include if it has sport keywords or if it's general (no specific sport keywords)
-            if has_sport_keywords or not has_other_sport:
-                filtered_chunks.append(chunk)
-        
-        return filtered_chunks
+        # Include if it has sport keywords or if it's general (no specific sport keywords)
+        return [chunk for chunk in chunks if sport_label_bits(chunk.content) & sport_bit]
     
     def _search_with_similarity(self, query: str, top_k: int, min_relevance: float, sport_filter: Optional[str] = None) -> List[KnowledgeChunk]:
-        """Search using basic similarity scoring."""
-        if not self.embedding_model:
-            return self._search_with_keywords(query, top_k)
+        """Search using cosine similarity over the precomputed chunk embeddings."""
+        if not self.embedding_model or self.embedding_index is None:
+            return self._search_with_keywords(query, top_k, sport_filter)
         
         try:
-            # Get query embedding
-            query_embedding = self.embedding_model.encode([query])
-            
-            # Get embeddings for chunks (simplified - would cache in production)
-            chunk_texts = [chunk.content for chunk in self.sports_betting_chunks[:200]]  # Limit for performance
-            chunk_embeddings = self.embedding_model.encode(chunk_texts)
-            
-            # Calculate similarities
-            similarities = cosine_similarity(query_embedding, chunk_embeddings)[0]
-            
-            # Get top results
-            top_indices = np.argsort(similarities)[::-1][:top_k]
+            # One query encode + one index search, sport filter applied inside the index
+            query_embedding = self._encode_query(query)
+            label_mask = SPORT_LABEL_BITS.get(sport_filter.upper(), 0) if sport_filter else 0
             
             results = []
-            for idx in top_indices:
-                if similarities[idx] >= min_relevance:
-                    chunk = self.sports_betting_chunks[idx]
-                    chunk.relevance_score = similarities[idx]
-                    results.append(chunk)
-            
-            # Apply sport filtering
-            filtered_results = self._filter_chunks_by_sport(results, sport_filter)
+            for idx, similarity in self.embedding_index.search(query_embedding, top_k, min_relevance, label_mask):
+                # Copy: chunks are shared across queries
+                results.append(replace(self.sports_betting_chunks[idx], relevance_score=similarity))
             
-            return filtered_results
+            return results
             
         except Exception as e:
             logger.error(f"Similarity search error: {e}")
-            return self._search_with_keywords(query, top_k)
+            return self._search_with_keywords(query, top_k, sport_filter)
+    
+    def _sport_rows(self, sport_filter: Optional[str]) -> Optional[np.ndarray]:
+        """Row mask of a sport filter from the BM25 index's sport labels (None: no filter)."""
+        if not sport_filter or self.bm25_index is None:
+            return None
+        return self.bm25_index.allowed_rows(SPORT_LABEL_BITS.get(sport_filter.upper(), 0))
+    
+    def _search_with_keywords(self, query: str, top_k: int, sport_filter: Optional[str] = None) -> List[KnowledgeChunk]:
+        """BM25 keyword search over the inverted index (scores relative to the best hit)."""
+        if self.bm25_index is None:
+            return []
+        
+        hits = self.bm25_index.search(query, top_k, self._sport_rows(sport_filter))
+        if not hits:
+            return []
+        best = hits[0][1]
+        return [replace(self.sports_betting_chunks[row], relevance_score=score / best) for row, score in hits]
     
-    def _search_with_keywords(self, query: str, top_k: int) -> List[KnowledgeChunk]:
-        """Fallback keyword-based search."""
-        query_words = set(query.lower().split())
-        
-        scored_chunks = []
-        for chunk in self.sports_betting_chunks:
-            content_words = set(chunk.content.lower().split())
-            overlap = len(query_words.intersection(content_words))
+    def _search_hybrid(self, query: str, top_k: int, min_relevance: float, sport_filter: Optional[str] = None) -> List[KnowledgeChunk]:
+        """Reciprocal-rank fusion of the vector and BM25 rankings."""
+        if not self.embedding_model or self.embedding_index is None:
+            return self._search_with_keywords(query, top_k, sport_filter)
+        if self.bm25_index is None:
+            return self._search_with_similarity(query, top_k, min_relevance, sport_filter)
+        
+        try:
+            candidates = top_k * HYBRID_CANDIDATE_FACTOR
+            label_mask = SPORT_LABEL_BITS.get(sport_filter.upper(), 0) if sport_filter else 0
+            dense = self.embedding_index.search(self._encode_query(query), candidates, min_relevance, label_mask)
+            sparse = self.bm25_index.search(query, candidates, self._sport_rows(sport_filter))
+            fused = reciprocal_rank_fusion([[row for row, _ in dense], [row for row, _ in sparse]])
+            
+            # Scaled so a chunk ranked first by both retrievers scores 1.0
+            best = 2.0 / (RRF_K + 1)
+            return [replace(self.sports_betting_chunks[row], relevance_score=score / best)
+                    for row, score in fused[:top_k]]
             
-            if overlap > 0:
-                score = overlap / len(query_words)
-                chunk.relevance_score = score
-                scored_chunks.append(chunk)
-        
-        # Sort by score and return top k
-        scored_chunks.sort(key=lambda x: x.relevance_score, reverse=True)
-        return scored_chunks[:top_k]
+        except Exception as e:
+            logger.error(f"Hybrid search error: {e}")
+            return self._search_with_keywords(query, top_k, sport_filter)
     
     def _generate_insights(self, query: str, chunks: List[KnowledgeChunk]) -> List[str]:
         """Generate actionable insights from retrieved chunks."""
@@ -336,23 +634,12 @@ class SportsKnowledgeRAG:
         if not chunks:
             return ["No relevant knowledge found for this query."]
         
-        # Analyze chunks for key concepts
-        all_content = " ".join([chunk.content for chunk in chunks])
+        # Analyze chunks for key concepts (lowercased once: case-insensitive
+        # alternations are several times slower)
+        all_content = " ".join([chunk.content for chunk in chunks]).lower()
         
         # Look for specific sports betting concepts
-        concepts = {
-            "value betting": r"value|edge|positive expectation|expected value",
-            "bankroll management": r"bankroll|money management|kelly|bet sizing",
-            "correlation": r"correlation|correlated|dependent|related outcomes",
-            "market efficiency": r"efficient market|line movement|sharp money|public",
-            "statistical analysis": r"statistics|probability|variance|regression",
-            "arbitrage": r"arbitrage|sure bet|guaranteed profit|risk-free"
-        }
-        
-        found_concepts = []
-        for concept, pattern in concepts.items():
-            if re.search(pattern, all_content, re.IGNORECASE):
-                found_concepts.append(concept)
+        found_concepts = [concept for concept, pattern in INSIGHT_CONCEPTS.items() if pattern.search(all_content)]
         
         # Generate insights based on found concepts
         if "value betting" in found_concepts:
@@ -1,52 +1,79 @@
-from pypdf import PdfReader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+"""
+Knowledge Ingestor - chunk knowledge-base documents into the chunk store
+
+Ingestion is incremental. A manifest beside the chunk store records, per
+source file, its mtime/size, content hash and the chunk ids it produced:
+
+- unchanged files (same mtime and size, or same hash) are not re-read
+- changed files are re-chunked under fresh chunk ids and their old chunks
+  are tombstoned, so SportsKnowledgeRAG re-embeds only the new chunks
+- files that disappeared have their chunks tombstoned
+- the store is compacted once tombstoned records outweigh live ones
+
+Usage:
+    python -m tools.knowledge_ingestor              # data/knowledge_base
+    python -m tools.knowledge_ingestor --from-data  # listings, articles, knowledge_base
+    python -m tools.knowledge_ingestor --force      # rebuild from scratch
+
+A legacy data/chunks/chunks.json array is migrated to the JSONL store on the
+first run, keeping its chunk ids.
+"""
+
+try:
+    from pypdf import PdfReader
+    HAS_PDF = True
+except ImportError:
+    HAS_PDF = False
+try:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+except ImportError:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict
+from typing import Any, Dict, List, Optional
 import argparse
 import json
+import logging
 import os
 
+from tools.chunk_store import DEFAULT_CHUNKS_PATH, LEGACY_CHUNKS_PATH, ChunkStore
+from tools.embedding_index import file_content_hash
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def read_document(file: Path) -> Optional[Dict]:
+    """Text and source metadata of one PDF/markdown/text file (None for other types)."""
+    if file.suffix.lower() == ".pdf":
+        if not HAS_PDF:
+            raise ImportError("pypdf is required to ingest PDF files")
+        reader = PdfReader(str(file))
+        text = ""
+        for page in reader.pages:
+            text += page.extract_text()
+    elif file.suffix.lower() in [".md", ".txt"]:
+        with open(file, 'r', encoding='utf-8') as f:
+            text = f.read()
+    else:
+        return None
+    return {
+        "page_content": text,
+        "metadata": {"source": str(file)}
+    }
+
+
 def ingest_documents(directory: str):
-    all_docs = []
-    for file in Path(directory).glob("*"):
-        if file.suffix == ".pdf":
-            reader = PdfReader(str(file))
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            all_docs.append({
-                "page_content": text,
-                "metadata": {"source": str(file)}
-            })
-        elif file.suffix in [".md", ".txt"]:
-            with open(file, 'r', encoding='utf-8') as f:
-                text = f.read()
-            all_docs.append({
-                "page_content": text,
-                "metadata": {"source": str(file)}
-            })
-    return all_docs
+    return ingest_files(collect_directory_files(directory))
 
 
 def ingest_files(file_paths: List[Path]) -> List[Dict]:
     docs: List[Dict] = []
     for file in file_paths:
-        if file.suffix.lower() == ".pdf":
-            reader = PdfReader(str(file))
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            docs.append({
-                "page_content": text,
-                "metadata": {"source": str(file)}
-            })
-        elif file.suffix.lower() in [".md", ".txt"]:
-            with open(file, 'r', encoding='utf-8') as f:
-                text = f.read()
-            docs.append({
-                "page_content": text,
-                "metadata": {"source": str(file)}
-            })
+        doc = read_document(file)
+        if doc is not None:
+            docs.append(doc)
     return docs
 
 def chunk_documents(docs, chunk_size=1000, chunk_overlap=200):
@@ -86,6 +113,10 @@ def load_existing_sources(chunks_path: str) -> List[str]:
         return []
 
 
+def collect_directory_files(directory: str) -> List[Path]:
+    return sorted(file for file in Path(directory).glob("*") if file.suffix in [".pdf", ".md", ".txt"])
+
+
 def collect_data_md_files(base_dir: str = "data") -> List[Path]:
     base = Path(base_dir)
     candidates: List[Path] = []
@@ -104,43 +135,237 @@ def collect_data_md_files(base_dir: str = "data") -> List[Path]:
         candidates.extend(kb_dir.glob("*.txt"))
     return candidates
 
+
+@dataclass
+class IngestStats:
+    """What one incremental ingestion run changed."""
+    files_added: int = 0
+    files_changed: int = 0
+    files_unchanged: int = 0
+    files_removed: int = 0
+    chunks_added: int = 0
+    chunks_deleted: int = 0
+    compacted: bool = False
+
+
+class IncrementalIngestor:
+    """Keeps the JSONL chunk store in sync with its source files via a manifest."""
+
+    def __init__(self,
+                 chunks_path: str = DEFAULT_CHUNKS_PATH,
+                 manifest_path: Optional[str] = None,
+                 chunk_size: int = 1000,
+                 chunk_overlap: int = 200,
+                 compact_ratio: float = 0.5):
+        """
+        Initialize the ingestor.
+
+        Args:
+            chunks_path: JSONL chunk store
+            manifest_path: Manifest file (default: <chunks stem>.manifest.json beside the store)
+            chunk_size: Splitter chunk size in characters
+            chunk_overlap: Splitter overlap in characters
+            compact_ratio: Compact the store once this fraction of its records are tombstoned
+        """
+        self.store = ChunkStore(chunks_path)
+        self.manifest_path = (Path(manifest_path) if manifest_path
+                              else self.store.path.with_name(f"{self.store.path.stem}.manifest.json"))
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.compact_ratio = compact_ratio
+        self.manifest = self._load_manifest()
+
+    def _empty_manifest(self) -> Dict[str, Any]:
+        return {
+            "version": MANIFEST_VERSION,
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "next_chunk_id": 0,
+            "live_records": 0,
+            "dead_records": 0,
+            "files": {}
+        }
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if not self.store.path.exists():
+            return self._empty_manifest()
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError) as e:
+            logger.warning(f"Rebuilding ingestion manifest {self.manifest_path} from the chunk store: {e}")
+        return self._manifest_from_store()
+
+    def _manifest_from_store(self) -> Dict[str, Any]:
+        """Manifest for a store without one: every source untracked, ids continuing after the store's."""
+        manifest = self._empty_manifest()
+        for record in self.store.iter_records():
+            source = record.get("metadata", {}).get("source", "")
+            manifest["files"].setdefault(source, {"chunk_ids": []})["chunk_ids"].append(record["chunk_id"])
+            manifest["next_chunk_id"] = max(manifest["next_chunk_id"], record["chunk_id"] + 1)
+            manifest["live_records"] += 1
+        return manifest
+
+    def _save_manifest(self) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def reset(self) -> None:
+        """Empty the store and manifest; chunk ids keep counting up so they are never reused."""
+        next_chunk_id = self.manifest["next_chunk_id"]
+        self.manifest = self._empty_manifest()
+        self.manifest["next_chunk_id"] = next_chunk_id
+        self.store.rewrite([])
+        self._save_manifest()
+
+    def migrate(self, legacy_path: str = LEGACY_CHUNKS_PATH) -> int:
+        """
+        Convert a legacy chunks.json array into the JSONL store, keeping chunk ids.
+
+        Sources that still exist are recorded with their current mtime and
+        hash (so they are not re-chunked); the others are kept as untracked.
+
+        Returns:
+            Number of chunks migrated
+        """
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+        records = [{"chunk_id": i, "content": item["content"], "metadata": item.get("metadata", {})}
+                   for i, item in enumerate(legacy)]
+        self.store.rewrite(records)
+
+        manifest = self._manifest_from_store()
+        for source, entry in manifest["files"].items():
+            path = Path(source)
+            if source and path.is_file():
+                stat = path.stat()
+                entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size, content_hash=file_content_hash(path))
+        self.manifest = manifest
+        self._save_manifest()
+        logger.info(f"Migrated {len(records)} chunks from {legacy_path} to {self.store.path}")
+        return len(records)
+
+    def ingest(self, file_paths: List[Path], prune_missing: bool = True) -> IngestStats:
+        """
+        Bring the chunk store up to date with the given source files.
+
+        Args:
+            file_paths: Source files to ingest
+            prune_missing: Tombstone chunks of tracked files that no longer exist
+
+        Returns:
+            IngestStats of the run
+        """
+        stats = IngestStats()
+        files = self.manifest["files"]
+        # Different splitter settings invalidate every tracked file
+        resplit = (self.manifest["chunk_size"], self.manifest["chunk_overlap"]) != (self.chunk_size, self.chunk_overlap)
+        self.manifest["chunk_size"], self.manifest["chunk_overlap"] = self.chunk_size, self.chunk_overlap
+
+        new_records: List[Dict[str, Any]] = []
+        stale_ids: List[int] = []
+        for path in file_paths:
+            key = str(path)
+            entry = files.get(key)
+            stat = path.stat()
+            if entry is not None and not resplit:
+                if entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+                    stats.files_unchanged += 1
+                    continue
+                content_hash = file_content_hash(path)
+                if entry.get("content_hash") == content_hash:
+                    # Touched but not edited
+                    entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                    stats.files_unchanged += 1
+                    continue
+            else:
+                content_hash = file_content_hash(path)
+
+            doc = read_document(path)
+            if doc is None:
+                continue
+            chunks = chunk_documents([doc], self.chunk_size, self.chunk_overlap)
+            first_id = self.manifest["next_chunk_id"]
+            chunk_ids = list(range(first_id, first_id + len(chunks)))
+            self.manifest["next_chunk_id"] = first_id + len(chunks)
+            new_records.extend({"chunk_id": chunk_id, "content": chunk.page_content, "metadata": chunk.metadata}
+                               for chunk_id, chunk in zip(chunk_ids, chunks))
+
+            if entry is None:
+                stats.files_added += 1
+            else:
+                stats.files_changed += 1
+                stale_ids.extend(entry["chunk_ids"])
+            files[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                          "content_hash": content_hash, "chunk_ids": chunk_ids}
+
+        if prune_missing:
+            for key in [key for key, entry in files.items()
+                        if entry.get("mtime_ns") is not None and not Path(key).exists()]:
+                stale_ids.extend(files.pop(key)["chunk_ids"])
+                stats.files_removed += 1
+
+        # Chunk records first, manifest second: an interrupted run leaves
+        # unowned records, which the next compaction drops
+        stats.chunks_added = self.store.append(new_records)
+        stats.chunks_deleted = self.store.delete(stale_ids)
+        self.manifest["live_records"] += stats.chunks_added - stats.chunks_deleted
+        # A record and its tombstone both become dead lines
+        self.manifest["dead_records"] += 2 * stats.chunks_deleted
+        self._save_manifest()
+
+        total = self.manifest["live_records"] + self.manifest["dead_records"]
+        if total and self.manifest["dead_records"] / total > self.compact_ratio:
+            self.compact()
+            stats.compacted = True
+
+        logger.info(f"Ingested: {stats}")
+        return stats
+
+    def compact(self) -> int:
+        """
+        Rewrite the store with only the records owned by manifest files.
+
+        Returns:
+            Number of live records kept
+        """
+        owned = {chunk_id for entry in self.manifest["files"].values() for chunk_id in entry["chunk_ids"]}
+        kept = self.store.rewrite(record for record in self.store.iter_records() if record["chunk_id"] in owned)
+        self.manifest["live_records"], self.manifest["dead_records"] = kept, 0
+        self._save_manifest()
+        logger.info(f"Compacted {self.store.path} to {kept} records")
+        return kept
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Ingest and chunk documents")
     parser.add_argument("--from-data", action="store_true", help="Collect appropriate files from data directory (listings, articles, knowledge_base)")
-    parser.add_argument("--output", default="data/chunks/chunks.json", help="Output chunks JSON path")
+    parser.add_argument("--output", default=DEFAULT_CHUNKS_PATH, help="Output JSONL chunk store path")
+    parser.add_argument("--legacy", default=LEGACY_CHUNKS_PATH, help="Legacy chunks JSON array migrated on first run")
     parser.add_argument("--force", action="store_true", help="Ignore existing chunks and rebuild from scratch")
+    parser.add_argument("--no-prune", action="store_true", help="Keep chunks of source files that no longer exist")
     args = parser.parse_args()
 
-    output_path = args.output
-    existing_sources = [] if args.force else load_existing_sources(output_path)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    ingestor = IncrementalIngestor(args.output)
+    if args.force:
+        ingestor.reset()
+    elif not ingestor.store.path.exists() and os.path.exists(args.legacy):
+        ingestor.migrate(args.legacy)
 
     if args.from_data:
         file_paths = collect_data_md_files("data")
-        # Filter out already-chunked sources
-        file_paths = [p for p in file_paths if str(p) not in existing_sources]
-        docs = ingest_files(file_paths)
-        print(f"Loaded {len(docs)} documents from data")
-    else:
-        docs = ingest_documents("data/knowledge_base")
-        if not args.force:
-            # Filter out already-chunked sources
-            docs = [d for d in docs if d["metadata"].get("source") not in existing_sources]
-        print(f"Loaded {len(docs)} documents from knowledge_base")
-
-    chunks = chunk_documents(docs)
-    print(f"Split into {len(chunks)} new chunks")
-
-    # If we are not forcing and file exists, append to existing
-    if os.path.exists(output_path) and not args.force:
-        try:
-            with open(output_path, "r", encoding="utf-8") as f:
-                existing = json.load(f)
-        except Exception:
-            existing = []
-        merged = existing + [{"content": c.page_content, "metadata": c.metadata} for c in chunks]
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(merged, f, indent=2)
     else:
-        save_chunks(chunks, output_path)
+        file_paths = collect_directory_files("data/knowledge_base")
+    print(f"Found {len(file_paths)} source files")
 
-    print(f"Chunks saved to {output_path}")
\ No newline at end of file
+    stats = ingestor.ingest(file_paths, prune_missing=not args.no_prune)
+    print(f"{stats.files_added} added, {stats.files_changed} changed, {stats.files_unchanged} unchanged, "
+          f"{stats.files_removed} removed files; {stats.chunks_added} chunks added, "
+          f"{stats.chunks_deleted} deleted")
+    print(f"Chunks saved to {args.output}")
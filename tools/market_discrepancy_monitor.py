@@ -17,6 +17,7 @@ from threading import Thread, Event
 import queue
 
 from tools.market_discrepancy_detector import MarketDiscrepancyDetector, ArbitrageOpportunity, ValueOpportunity
+from tools.odds_delta_engine import OddsDeltaEngine, OddsDeltaBatch, ChangedGameTracker
 
 # Import final market verifier (JIRA-024)
 try:
@@ -94,16 +95,21 @@ class MarketDiscrepancyMonitor:
     
     def __init__(self, 
                  config: Optional[MonitoringConfig] = None,
-                 alert_handlers: Optional[List[Callable]] = None):
+                 alert_handlers: Optional[List[Callable]] = None,
+                 odds_feed: Optional[Callable[[], List[Any]]] = None):
         """
         Initialize the market discrepancy monitor.
         
         Args:
             config: Monitoring configuration
             alert_handlers: List of functions to handle alerts
+            odds_feed: Optional callable returning the latest List[GameOdds]; when
+                set (or when odds are pushed via ingest_odds), each scan only
+                revisits games whose odds moved
         """
         self.config = config or MonitoringConfig()
         self.alert_handlers = alert_handlers or []
+        self.odds_feed = odds_feed
         
         # Initialize detector
         self.detector = MarketDiscrepancyDetector(
@@ -119,6 +125,13 @@ class MarketDiscrepancyMonitor:
         else:
             logger.warning("Final market verification disabled or unavailable")
         
+        # Change-only scanning: the tracker collects games that moved between scans
+        self.delta_engine = OddsDeltaEngine()
+        self._changed_games = ChangedGameTracker()
+        self.delta_engine.subscribe(self._changed_games)
+        if self.final_verifier:
+            self.delta_engine.subscribe(self.final_verifier.on_odds_delta)
+        
         # Monitoring state
         self.is_monitoring = False
         self.monitor_thread = None
@@ -132,6 +145,8 @@ class MarketDiscrepancyMonitor:
         
         # Statistics
         self.scan_count = 0
+        self.games_scanned = 0
+        self.games_skipped_unchanged = 0
         self.total_alerts_generated = 0
         self.alerts_verified = 0
         self.alerts_cancelled_verification = 0
@@ -184,6 +199,35 @@ class MarketDiscrepancyMonitor:
         
         logger.info("Stopped monitoring")
     
+    def ingest_odds(self, games: List[Any], complete: bool = False) -> OddsDeltaBatch:
+        """
+        Push a market snapshot; games whose odds moved are rescanned on the next pass.
+        
+        Args:
+            games: Latest GameOdds
+            complete: The snapshot covers every live game
+            
+        Returns:
+            Deltas against the previous snapshot
+        """
+        return self.delta_engine.ingest(games, complete=complete)
+    
+    def _games_due_for_scan(self, game_ids: List[str]) -> List[str]:
+        """Games to scan this pass: all of them until odds deltas are available."""
+        if self.odds_feed is not None:
+            try:
+                self.ingest_odds(self.odds_feed(), complete=True)
+            except Exception as e:
+                logger.error(f"Odds feed failed, rescanning all games: {e}")
+                self._changed_games.mark(game_ids)
+        
+        if self.odds_feed is None and self.delta_engine.ingests == 0:
+            return list(game_ids)
+        
+        due = self._changed_games.take(game_ids)
+        self.games_skipped_unchanged += len(game_ids) - len(due)
+        return due
+    
     def _monitoring_loop(self, game_ids: List[str]):
         """Main monitoring loop."""
         logger.info("Monitoring loop started")
@@ -192,8 +236,10 @@ class MarketDiscrepancyMonitor:
             try:
                 scan_start = time.time()
                 
-                # Scan for discrepancies
-                discrepancies = self.detector.scan_multiple_games(game_ids)
+                # Scan for discrepancies (only games whose odds moved, when deltas are available)
+                due_games = self._games_due_for_scan(game_ids)
+                self.games_scanned += len(due_games)
+                discrepancies = self.detector.scan_multiple_games(due_games) if due_games else {}
                 
                 # Process discrepancies into alerts
                 self._process_discrepancies(discrepancies)
@@ -444,6 +490,9 @@ class MarketDiscrepancyMonitor:
             'is_monitoring': self.is_monitoring,
             'uptime_seconds': uptime,
             'scan_count': self.scan_count,
+            'games_scanned': self.games_scanned,
+            'games_skipped_unchanged': self.games_skipped_unchanged,
+            'odds_delta_stats': self.delta_engine.stats(),
             'total_alerts_generated': self.total_alerts_generated,
             'active_alerts': len(self.active_alerts),
             'alert_history_count': len(self.alert_history),
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Market Snapshot Cache
+
+Process-wide cache of Odds API market snapshots keyed by
+(sport_key, regions, markets). ParlayBuilder, FinalMarketVerifier,
+AdvancedArbitrageIntegration and the closing-line script all ask for the same
+slate; routing them through one cache means one upstream request per key per
+TTL window instead of one per caller.
+
+Key Features:
+- Per-key TTLs (per call, per sport, or the cache default)
+- LRU eviction once max_entries is reached
+- Single-flight coalescing: concurrent misses for the same key (threads or
+  coroutines) wait on one upstream fetch
+- Hit/miss/coalesced counters for API quota reporting
+
+Cached GameOdds lists are shared between callers and must be treated as
+read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from tools.odds_fetcher_tool import GameOdds
+
+logger = logging.getLogger(__name__)
+
+SnapshotKey = Tuple[str, str, Tuple[str, ...]]
+
+DEFAULT_MARKETS = ["h2h", "spreads", "totals"]
+
+
+@dataclass
+class _SnapshotEntry:
+    """A cached snapshot and its expiry time."""
+    games: List[GameOdds]
+    fetched_at: float
+    expires_at: float
+
+
+class MarketSnapshotCache:
+    """TTL + LRU cache of market snapshots with single-flight fetches."""
+
+    def __init__(self, default_ttl: float = 30.0, max_entries: int = 64,
+                 ttl_by_sport: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            default_ttl: Seconds a snapshot stays fresh when no other TTL applies
+            max_entries: Maximum number of keys kept before LRU eviction
+            ttl_by_sport: Optional per-sport TTL overrides (sport_key -> seconds)
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.ttl_by_sport = dict(ttl_by_sport or {})
+        self._clock = clock
+
+        self._entries: "OrderedDict[SnapshotKey, _SnapshotEntry]" = OrderedDict()
+        self._in_flight: Dict[SnapshotKey, Future] = {}
+        # Event loop running each async leader's fetch
+        self._leader_loops: Dict[SnapshotKey, asyncio.AbstractEventLoop] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.fetch_errors = 0
+
+    @staticmethod
+    def make_key(sport_key: str, regions: str = "us",
+                 markets: Optional[List[str]] = None) -> SnapshotKey:
+        """Normalize request parameters into a cache key (market order is irrelevant)."""
+        if markets is None:
+            markets = DEFAULT_MARKETS
+        return sport_key, regions, tuple(sorted(m.strip() for m in markets))
+
+    def _ttl_for(self, sport_key: str, ttl: Optional[float]) -> float:
+        if ttl is not None:
+            return ttl
+        return self.ttl_by_sport.get(sport_key, self.default_ttl)
+
+    def _lookup_or_join(self, key: SnapshotKey, max_age: Optional[float] = None,
+                        leader_loop: Optional[asyncio.AbstractEventLoop] = None,
+                        blocking_loop: Optional[asyncio.AbstractEventLoop] = None
+                        ) -> Tuple[Optional[List[GameOdds]], Optional[Future], bool]:
+        """
+        Resolve a key under the lock.
+
+        An entry older than max_age is treated as a miss even if its TTL has
+        not expired, so strict callers can demand fresher data than others.
+
+        Args:
+            leader_loop: Loop an async caller would run the fetch on if it leads
+            blocking_loop: Loop a sync caller would block by waiting; it never
+                joins a fetch led on that loop, which could not finish
+
+        Returns:
+            (games, future, is_leader): games is set on a hit; otherwise future
+            is the in-flight fetch to wait on, and is_leader says whether this
+            caller must perform it. A leader without a future fetches on its
+            own and leaves the in-flight fetch to complete the entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                now = self._clock()
+                fresh_enough = max_age is None or now - entry.fetched_at <= max_age
+                if entry.expires_at > now and fresh_enough:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.games, None, False
+                if entry.expires_at <= now:
+                    del self._entries[key]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                if blocking_loop is not None and self._leader_loops.get(key) is blocking_loop:
+                    self.misses += 1
+                    return None, None, True
+                self.coalesced += 1
+                return None, future, False
+
+            future = Future()
+            self._in_flight[key] = future
+            if leader_loop is not None:
+                self._leader_loops[key] = leader_loop
+            self.misses += 1
+            return None, future, True
+
+    def _complete(self, key: SnapshotKey, future: Future, ttl: float,
+                  games: Optional[List[GameOdds]] = None,
+                  error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+            self._leader_loops.pop(key, None)
+            if error is None:
+                now = self._clock()
+                self._entries[key] = _SnapshotEntry(games=games, fetched_at=now, expires_at=now + ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self.fetch_errors += 1
+
+        if error is None:
+            future.set_result(games)
+        else:
+            future.set_exception(error)
+
+    def get(self, sport_key: str, fetch: Callable[[str, str, List[str]], List[GameOdds]],
+            regions: str = "us", markets: Optional[List[str]] = None,
+            ttl: Optional[float] = None, max_age: Optional[float] = None) -> List[GameOdds]:
+        """
+        Return a cached snapshot, fetching it at most once across concurrent callers.
+
+        Args:
+            sport_key: Sport key (e.g., 'basketball_nba')
+            fetch: Callable(sport_key, regions, markets) -> List[GameOdds] used on a miss
+            regions: Regions string passed to the Odds API
+            markets: Markets list (defaults to h2h, spreads, totals)
+            ttl: Freshness for this key if fetched now (overrides sport/default TTL)
+            max_age: Reject a cached snapshot older than this many seconds
+
+        Returns:
+            List of GameOdds (shared, read-only)
+
+        Raises:
+            Whatever fetch raises; errors are propagated to coalesced waiters and not cached
+        """
+        if markets is None:
+            markets = list(DEFAULT_MARKETS)
+        key = self.make_key(sport_key, regions, markets)
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        games, future, is_leader = self._lookup_or_join(key, max_age, blocking_loop=running_loop)
+        if not is_leader:
+            return games if future is None else future.result()
+        if future is None:
+            # The in-flight fetch is a coroutine on this thread's loop, which
+            # cannot run while we wait for it
+            return fetch(sport_key, regions, markets)
+
+        try:
+            games = fetch(sport_key, regions, markets)
+        except BaseException as e:
+            self._complete(key, future, 0.0, error=e)
+            raise
+        self._complete(key, future, self._ttl_for(sport_key, ttl), games=games)
+        return games
+
+    async def get_async(self, sport_key: str, fetch: Callable[[str, str, List[str]], Awaitable[List[GameOdds]]],
+                        regions: str = "us", markets: Optional[List[str]] = None,
+                        ttl: Optional[float] = None, max_age: Optional[float] = None) -> List[GameOdds]:
+        """
+        Coroutine variant of get(); fetch must be a coroutine function.
+
+        Async and sync callers share the same entries and in-flight fetches.
+        """
+        if markets is None:
+            markets = list(DEFAULT_MARKETS)
+        key = self.make_key(sport_key, regions, markets)
+
+        games, future, is_leader = self._lookup_or_join(key, max_age, leader_loop=asyncio.get_running_loop())
+        if future is None:
+            return games
+        if not is_leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            games = await fetch(sport_key, regions, markets)
+        except BaseException as e:
+            self._complete(key, future, 0.0, error=e)
+            raise
+        self._complete(key, future, self._ttl_for(sport_key, ttl), games=games)
+        return games
+
+    def invalidate(self, sport_key: Optional[str] = None) -> int:
+        """
+        Drop cached snapshots.
+
+        Args:
+            sport_key: Only drop keys for this sport (all keys if None)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if sport_key is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            stale = [key for key in self._entries if key[0] == sport_key]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring how much upstream quota the cache saves."""
+        with self._lock:
+            requests = self.hits + self.misses + self.coalesced
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'fetch_errors': self.fetch_errors,
+                'entries': len(self._entries),
+                'in_flight': len(self._in_flight),
+                'requests': requests,
+                'upstream_fetches': self.misses,
+                'upstream_calls_saved': self.hits + self.coalesced,
+                'hit_rate': (self.hits + self.coalesced) / requests if requests else 0.0
+            }
+
+
+_shared_cache: Optional[MarketSnapshotCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_market_snapshot_cache() -> MarketSnapshotCache:
+    """
+    Return the process-wide MarketSnapshotCache.
+
+    Configured from MARKET_SNAPSHOT_TTL_SECONDS and MARKET_SNAPSHOT_MAX_ENTRIES.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = MarketSnapshotCache(
+                    default_ttl=float(os.getenv("MARKET_SNAPSHOT_TTL_SECONDS", "30")),
+                    max_entries=int(os.getenv("MARKET_SNAPSHOT_MAX_ENTRIES", "64"))
+                )
+    return _shared_cache
+
+
+def reset_market_snapshot_cache() -> None:
+    """Discard the process-wide cache and its counters (next call builds a new one)."""
+    global _shared_cache
+    with _shared_cache_lock:
+        _shared_cache = None
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Fast CPU Inference Export for Sequence Classifiers
+
+Exports a saved fp32 Hugging Face classifier (tweet classifiers, BioBERT
+injury classifiers, parlay confidence classifier) to CPU-friendly artifacts
+under <model_dir>/fast/:
+
+- int8:      PyTorch dynamic quantization (nn.Linear weights to qint8)
+- onnx:      ONNX graph run by ONNX Runtime (fp32)
+- onnx_int8: the ONNX graph with ONNX Runtime dynamic int8 quantization
+
+Every artifact is checked against the fp32 model on held-out texts before it
+is marked usable: argmax agreement, max probability difference, accuracy when
+labels are given, batch latency and size on disk are written to
+export_manifest.json. load_fast_sequence_classifier only serves artifacts
+that passed, and falls back to fp32 otherwise.
+
+onnx and onnxruntime are optional; without them only int8 is exported.
+"""
+
+import importlib.util
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+HAS_ONNXRUNTIME = (importlib.util.find_spec("onnxruntime") is not None
+                   and importlib.util.find_spec("onnx") is not None)
+
+FAST_DIRNAME = "fast"
+MANIFEST_FILENAME = "export_manifest.json"
+BACKEND_FILES = {
+    "int8": "model_int8.pt",
+    "onnx": "model.onnx",
+    "onnx_int8": "model_int8.onnx",
+}
+# Preference order for backend="auto"
+AUTO_BACKENDS = ["onnx_int8", "int8", "onnx"]
+TOKENIZER_INPUTS = ["input_ids", "attention_mask", "token_type_ids"]
+
+DEFAULT_MIN_AGREEMENT = 0.98
+
+# Fallback parity texts when a training script has no held-out split at hand
+DEFAULT_PARITY_TEXTS = [
+    "[NFL] Chiefs QB Patrick Mahomes out 2-3 weeks with ankle sprain sustained in practice",
+    "[NBA] LeBron James questionable tonight with left foot soreness",
+    "[NFL] Bills starting lineup: Allen, Diggs confirmed for Sunday",
+    "[NBA] Warriors start Curry, Thompson, Green tonight against the Suns",
+    "Join our $5K fantasy contest tonight!",
+    "Torn ACL confirmed, he will miss the rest of the season",
+    "Day-to-day with knee soreness, expected to play Sunday",
+    "Team sources say the hamstring tightness is minor and precautionary",
+    "Strong reasoning: line moved two points on sharp money and the injury report favours the over.",
+    "Gut feeling parlay, no real edge, just vibes.",
+]
+
+
+def quantize_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """Dynamic int8 quantization of every nn.Linear (weights int8, activations fp32)."""
+    return torch.ao.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxSequenceClassifier:
+    """ONNX Runtime session with the model(**inputs).logits interface of a HF classifier."""
+
+    def __init__(self, onnx_path: str, num_threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [node.name for node in self.session.get_inputs()]
+
+    def __call__(self, **inputs: Any) -> SimpleNamespace:
+        feed = {name: inputs[name].cpu().numpy().astype(np.int64) for name in self.input_names}
+        logits = self.session.run(["logits"], feed)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+    def eval(self) -> "OnnxSequenceClassifier":
+        return self
+
+    def to(self, device: Any) -> "OnnxSequenceClassifier":
+        # ONNX Runtime sessions run on their execution provider (CPU)
+        return self
+
+
+def _tokenize(tokenizer: Any, texts: Sequence[str], max_length: int) -> Dict[str, torch.Tensor]:
+    inputs = tokenizer(list(texts), truncation=True, padding=True, max_length=max_length, return_tensors="pt")
+    return {name: inputs[name] for name in TOKENIZER_INPUTS if name in inputs}
+
+
+def predict_probabilities(model: Any, tokenizer: Any, texts: Sequence[str], max_length: int = 512,
+                          batch_size: int = 16) -> Tuple[np.ndarray, float]:
+    """
+    Softmax probabilities for texts in padded-to-longest batches.
+
+    Returns:
+        (probabilities, mean milliseconds per batch)
+    """
+    rows, elapsed, batches = [], 0.0, 0
+    for i in range(0, len(texts), batch_size):
+        inputs = _tokenize(tokenizer, texts[i:i + batch_size], max_length)
+        start = time.perf_counter()
+        with torch.inference_mode():
+            logits = model(**inputs).logits
+        elapsed += time.perf_counter() - start
+        batches += 1
+        rows.append(torch.softmax(logits.float(), dim=-1).numpy())
+    return np.concatenate(rows), 1000.0 * elapsed / max(batches, 1)
+
+
+def check_parity(reference: np.ndarray, candidate: np.ndarray, labels: Optional[Sequence[int]] = None,
+                 min_agreement: float = DEFAULT_MIN_AGREEMENT) -> Dict[str, Any]:
+    """Compare a fast backend's probabilities with the fp32 model's."""
+    agreement = float((reference.argmax(axis=1) == candidate.argmax(axis=1)).mean())
+    parity = {
+        "agreement": agreement,
+        "max_prob_diff": float(np.abs(reference - candidate).max()),
+        "passed": agreement >= min_agreement,
+    }
+    if labels is not None:
+        labels = np.asarray(labels)
+        parity["fp32_accuracy"] = float((reference.argmax(axis=1) == labels).mean())
+        parity["accuracy"] = float((candidate.argmax(axis=1) == labels).mean())
+    return parity
+
+
+def _export_onnx(model: torch.nn.Module, tokenizer: Any, path: Path, max_length: int) -> None:
+    inputs = _tokenize(tokenizer, DEFAULT_PARITY_TEXTS[:2], max_length)
+    names = list(inputs)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in names}
+    dynamic_axes["logits"] = {0: "batch"}
+    options = dict(input_names=names, output_names=["logits"], dynamic_axes=dynamic_axes, opset_version=17)
+    try:
+        # The TorchScript exporter: its graphs quantize cleanly with ONNX Runtime
+        torch.onnx.export(model, (dict(inputs),), str(path), dynamo=False, **options)
+    except TypeError:
+        # torch < 2.5 has no dynamo switch (TorchScript is the only exporter)
+        torch.onnx.export(model, (dict(inputs),), str(path), **options)
+
+
+def export_fast_inference(model_dir: str, backends: Sequence[str] = ("int8", "onnx_int8"),
+                          parity_texts: Optional[Sequence[str]] = None,
+                          parity_labels: Optional[Sequence[int]] = None,
+                          max_length: int = 512,
+                          min_agreement: float = DEFAULT_MIN_AGREEMENT) -> Dict[str, Any]:
+    """
+    Export a saved fp32 classifier to fast CPU artifacts and parity-check them.
+
+    Args:
+        model_dir: Directory written by save_pretrained (model + tokenizer)
+        backends: Any of "int8", "onnx", "onnx_int8"
+        parity_texts: Held-out texts for the parity check (default: a fixed sample)
+        parity_labels: Gold label ids for parity_texts, to report accuracy
+        max_length: Truncation length used at inference
+        min_agreement: Minimum argmax agreement with fp32 for an artifact to be served
+
+    Returns:
+        The manifest written to <model_dir>/fast/export_manifest.json
+    """
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    unknown = set(backends) - set(BACKEND_FILES)
+    if unknown:
+        raise ValueError(f"Unknown export backends: {sorted(unknown)}. Use {list(BACKEND_FILES)}")
+
+    model_dir = Path(model_dir)
+    fast_dir = model_dir / FAST_DIRNAME
+    fast_dir.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir).eval()
+
+    texts = list(parity_texts or DEFAULT_PARITY_TEXTS)
+    if parity_labels is not None and len(parity_labels) != len(texts):
+        raise ValueError("parity_labels must line up with parity_texts")
+    reference, fp32_ms = predict_probabilities(model, tokenizer, texts, max_length)
+
+    weight_files = list(model_dir.glob("*.safetensors")) or list(model_dir.glob("*.bin"))
+    manifest = {
+        "created_at": datetime.now().isoformat(),
+        "parity_texts": len(texts),
+        "min_agreement": min_agreement,
+        "fp32": {"ms_per_batch": fp32_ms, "size_mb": sum(p.stat().st_size for p in weight_files) / 1e6},
+        "backends": {},
+    }
+    onnx_path = fast_dir / BACKEND_FILES["onnx"]
+    onnx_exported = False
+
+    for backend in backends:
+        path = fast_dir / BACKEND_FILES[backend]
+        if backend.startswith("onnx") and not HAS_ONNXRUNTIME:
+            logger.warning(f"Skipping {backend} export: onnx/onnxruntime not installed")
+            continue
+        if backend == "int8":
+            candidate = quantize_int8(AutoModelForSequenceClassification.from_pretrained(model_dir))
+            torch.save(candidate.state_dict(), path)
+        else:
+            if not onnx_exported:
+                _export_onnx(model, tokenizer, onnx_path, max_length)
+                onnx_exported = True
+            if backend == "onnx_int8":
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                quantize_dynamic(str(onnx_path), str(path), weight_type=QuantType.QInt8)
+            candidate = OnnxSequenceClassifier(str(path))
+
+        probabilities, ms_per_batch = predict_probabilities(candidate, tokenizer, texts, max_length)
+        entry = check_parity(reference, probabilities, parity_labels, min_agreement)
+        entry.update(path=path.name, ms_per_batch=ms_per_batch, size_mb=path.stat().st_size / 1e6)
+        manifest["backends"][backend] = entry
+        logger.info(f"Exported {backend} to {path}: agreement {entry['agreement']:.3f}, "
+                    f"{ms_per_batch:.1f} ms/batch vs {fp32_ms:.1f} fp32, {entry['size_mb']:.1f} MB")
+        if not entry["passed"]:
+            logger.warning(f"{backend} export failed parity ({entry['agreement']:.3f} < {min_agreement}); "
+                           f"it will not be served")
+
+    # The fp32 graph is only an intermediate unless it was asked for
+    if onnx_exported and "onnx" not in backends:
+        onnx_path.unlink()
+
+    with open(fast_dir / MANIFEST_FILENAME, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_export_manifest(model_dir: str) -> Optional[Dict[str, Any]]:
+    """The export manifest for a model directory, if one was written."""
+    path = Path(model_dir) / FAST_DIRNAME / MANIFEST_FILENAME
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def resolve_backend(model_dir: str, backend: str = "auto") -> str:
+    """
+    The backend that will actually serve model_dir.
+
+    "auto" picks the first exported, parity-passing backend in AUTO_BACKENDS;
+    a named backend that is missing or failed parity falls back to "fp32".
+    """
+    if backend == "fp32":
+        return "fp32"
+    manifest = read_export_manifest(model_dir) or {"backends": {}}
+    candidates = AUTO_BACKENDS if backend == "auto" else [backend]
+    for name in candidates:
+        entry = manifest["backends"].get(name)
+        if not entry or not entry.get("passed"):
+            continue
+        if name.startswith("onnx") and not HAS_ONNXRUNTIME:
+            continue
+        if (Path(model_dir) / FAST_DIRNAME / entry["path"]).exists():
+            return name
+    if backend != "auto":
+        logger.warning(f"No usable {backend} export for {model_dir}; serving fp32")
+    return "fp32"
+
+
+def load_fast_sequence_classifier(model_dir: str, backend: str = "auto") -> Tuple[Any, Any]:
+    """
+    (model, tokenizer) for model_dir in fast-inference mode.
+
+    The int8 model is built from the config and quantized before its weights
+    are loaded, so the fp32 weights are never materialized.
+    """
+    from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    backend = resolve_backend(model_dir, backend)
+    fast_dir = Path(model_dir) / FAST_DIRNAME
+    if backend == "fp32":
+        model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    elif backend == "int8":
+        config = AutoConfig.from_pretrained(model_dir)
+        model = quantize_int8(AutoModelForSequenceClassification.from_config(config))
+        model.load_state_dict(torch.load(fast_dir / BACKEND_FILES["int8"]))
+    else:
+        model = OnnxSequenceClassifier(str(fast_dir / BACKEND_FILES[backend]),
+                                       num_threads=int(os.getenv("INFERENCE_NUM_THREADS", "0")) or None)
+    logger.info(f"Loaded {model_dir} with the {backend} backend")
+    return model.eval(), tokenizer
+
+
+def parse_export_backends(value: str) -> List[str]:
+    """--export CLI value ("none", "all", or comma-separated backends) to a backend list."""
+    if value == "none":
+        return []
+    if value == "all":
+        return list(BACKEND_FILES)
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def print_export_summary(manifest: Dict[str, Any]) -> None:
+    """One line per exported backend: parity, latency and size against fp32."""
+    fp32 = manifest["fp32"]
+    print(f"⚡ Fast CPU exports (fp32: {fp32['ms_per_batch']:.1f} ms/batch, {fp32['size_mb']:.1f} MB):")
+    for backend, entry in manifest["backends"].items():
+        status = "✅" if entry["passed"] else "❌ failed parity, not served"
+        print(f"   {backend}: agreement {entry['agreement']:.3f}, {entry['ms_per_batch']:.1f} ms/batch, "
+              f"{entry['size_mb']:.1f} MB {status}")
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Model Registry
+
+Process-wide cache of loaded model artifacts keyed by
+(model kind, sport, artifact version). ParlayBuilder used to construct and
+load its own correlation GNN, confidence predictor, strategist, prop
+trainers and Q-Learning agent, and SportFactory and the scheduler create
+builders over and over; through the registry each checkpoint is loaded once
+per process and every builder shares the same instance.
+
+Key Features:
+- Artifact versions: digest of the path, size and mtime of each checkpoint
+  file, so a retrained artifact gets a new key instead of a stale instance
+- Single-flight loads: concurrent first requests for a key wait on one load
+- Stale versions of a (kind, sport) are dropped when a newer one loads
+- Hot swaps: pinned kinds keep their active instance until promote(), and
+  subscribers (e.g. ParlayBuilder) are told to swap the new one in; see
+  tools/model_watcher.py
+- Optional lazy mode (MODEL_REGISTRY_LAZY) for callers that defer loading
+  until a model is first used
+- Load/hit counters for monitoring
+
+Shared models must be treated as read-only: callers that need to change a
+model's settings (e.g. ParlayOptimizer limits) keep their own instance.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (kind, sport, artifact version)
+ModelKey = Tuple[str, str, str]
+
+# callback(kind, sport, new_model)
+SwapCallback = Callable[[str, str, Any], None]
+
+ALL_SPORTS = "all"
+UNTRAINED_VERSION = "untrained"
+
+
+def artifact_version(paths: Iterable[Path]) -> str:
+    """
+    Version of a model's on-disk artifacts.
+
+    Directories contribute every file below them. Only metadata is read
+    (path, size, mtime), so this is cheap enough to check on every lookup.
+
+    Args:
+        paths: Checkpoint files or directories
+
+    Returns:
+        Short hex digest, or UNTRAINED_VERSION when no artifact exists
+    """
+    stats = []
+    for path in paths:
+        path = Path(path)
+        files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        for file in files:
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            stats.append(f"{file}:{stat.st_size}:{stat.st_mtime_ns}")
+    if not stats:
+        return UNTRAINED_VERSION
+    return hashlib.blake2b("|".join(stats).encode("utf-8"), digest_size=8).hexdigest()
+
+
+@dataclass
+class ModelSpec:
+    """How to load one model kind and where its artifacts live."""
+    loader: Callable[[str], Any]
+    artifacts: Callable[[str], List[Path]]
+    # Raises if a freshly loaded model cannot serve (run before a hot swap)
+    smoke_test: Optional[Callable[[Any], Any]] = None
+    # Called when a newer version replaces a model; in-flight callers may still hold it
+    retire: Optional[Callable[[Any], None]] = None
+
+
+class ModelRegistry:
+    """Shared, load-once model instances keyed by (kind, sport, artifact version)."""
+
+    def __init__(self, lazy: bool = False, specs: Optional[Dict[str, ModelSpec]] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            lazy: Hint for callers: load models on first use instead of up front
+            specs: Model kinds to register (defaults to the built-in kinds)
+        """
+        self.lazy = lazy
+        self._specs: Dict[str, ModelSpec] = dict(default_model_specs() if specs is None else specs)
+        self._models: Dict[ModelKey, Any] = {}
+        self._active: Dict[Tuple[str, str], ModelKey] = {}
+        self._pinned: Set[Tuple[str, str]] = set()
+        self._subscribers: Dict[Tuple[str, str], List[Callable[[], Optional[SwapCallback]]]] = {}
+        self._loading: Dict[ModelKey, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+        self.swaps = 0
+        self.load_seconds = 0.0
+
+    def register(self, kind: str, loader: Callable[[str], Any],
+                 artifacts: Callable[[str], List[Path]], **options: Any) -> None:
+        """Register (or replace) a model kind; loaded instances of it are dropped."""
+        with self._lock:
+            self._specs[kind] = ModelSpec(loader, artifacts, **options)
+            for key in [key for key in self._models if key[0] == kind]:
+                del self._models[key]
+            for slot in [slot for slot in self._active if slot[0] == kind]:
+                del self._active[slot]
+
+    def spec(self, kind: str) -> ModelSpec:
+        """Registered spec of a model kind."""
+        spec = self._specs.get(kind)
+        if spec is None:
+            raise KeyError(f"Unknown model kind: {kind}")
+        return spec
+
+    def key(self, kind: str, sport: str = ALL_SPORTS) -> ModelKey:
+        """Current key of a model kind, from the artifacts on disk."""
+        return kind, sport, artifact_version(self.spec(kind).artifacts(sport))
+
+    def active_key(self, kind: str, sport: str = ALL_SPORTS) -> Optional[ModelKey]:
+        """Key of the instance currently served for (kind, sport), if any."""
+        with self._lock:
+            return self._active.get((kind, sport))
+
+    def get(self, kind: str, sport: str = ALL_SPORTS) -> Any:
+        """
+        Return the shared instance for the current artifact version.
+
+        The first caller loads it; concurrent callers for the same key wait
+        for that load. Loader errors propagate and nothing is cached. Pinned
+        (kind, sport) pairs keep serving the active instance until promote()
+        replaces it, whatever is on disk.
+
+        Args:
+            kind: Registered model kind (e.g. "prop_trainer")
+            sport: Sport the model serves, or ALL_SPORTS
+
+        Returns:
+            Loaded model instance, shared with every other caller
+        """
+        slot = (kind, sport)
+        with self._lock:
+            if slot in self._pinned and slot in self._active:
+                self.hits += 1
+                return self._models[self._active[slot]]
+        key = self.key(kind, sport)
+        while True:
+            with self._lock:
+                if key in self._models:
+                    self.hits += 1
+                    return self._models[key]
+                pending = self._loading.get(key)
+                if pending is None:
+                    pending = self._loading[key] = threading.Event()
+                    break
+            pending.wait()
+
+        try:
+            key, model = self.load(kind, sport, key)
+            self.promote(key, model)
+            return model
+        finally:
+            with self._lock:
+                del self._loading[key]
+            pending.set()
+
+    def load(self, kind: str, sport: str = ALL_SPORTS, key: Optional[ModelKey] = None) -> Tuple[ModelKey, Any]:
+        """
+        Load the on-disk version of (kind, sport) without serving it.
+
+        Returns:
+            (key, model) - install it with promote()
+        """
+        key = key or self.key(kind, sport)
+        start = time.perf_counter()
+        model = self.spec(kind).loader(sport)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.loads += 1
+            self.load_seconds += elapsed
+        logger.info(f"Loaded {kind} ({sport}, version {key[2]}) in {elapsed * 1000:.1f} ms")
+        return key, model
+
+    def promote(self, key: ModelKey, model: Any) -> None:
+        """
+        Serve model as the active instance of its (kind, sport).
+
+        The previous version is dropped and retired, and subscribers are told
+        so they can swap the new instance in. The swap is a reference
+        replacement: callers already holding the old instance finish with it.
+        """
+        slot = key[:2]
+        with self._lock:
+            stale = [self._models.pop(k) for k in list(self._models) if k[:2] == slot and k != key]
+            replaced = self._active.get(slot) not in (None, key)
+            self._models[key] = model
+            self._active[slot] = key
+            refs = self._subscribers.get(slot, [])
+            callbacks = [callback for callback in (ref() for ref in refs) if callback is not None]
+            self._subscribers[slot] = [ref for ref in refs if ref() is not None]
+            if replaced:
+                self.swaps += 1
+
+        retire = self.spec(key[0]).retire
+        for old in stale:
+            if retire is not None and old is not model:
+                retire(old)
+        if replaced:
+            for callback in callbacks:
+                try:
+                    callback(key[0], key[1], model)
+                except Exception as e:
+                    logger.warning(f"Model swap callback failed for {key[0]} ({key[1]}): {e}")
+
+    def pin(self, kind: str, sport: str = ALL_SPORTS) -> None:
+        """Serve the active instance of (kind, sport) until promote() replaces it."""
+        with self._lock:
+            self._pinned.add((kind, sport))
+
+    def subscribe(self, kind: str, sport: str, callback: SwapCallback) -> None:
+        """
+        Call callback(kind, sport, model) whenever a new version of (kind, sport) is promoted.
+
+        Bound methods are held weakly, so subscribing does not keep their
+        owner alive. Dead callbacks are dropped here as well as on promotion,
+        so builders created and discarded between retrains do not accumulate.
+        """
+        ref = weakref.WeakMethod(callback) if inspect.ismethod(callback) else (lambda: callback)
+        with self._lock:
+            refs = [live for live in self._subscribers.get((kind, sport), []) if live() is not None]
+            if callback not in (live() for live in refs):
+                refs.append(ref)
+            self._subscribers[(kind, sport)] = refs
+
+    def loaded(self) -> List[ModelKey]:
+        """Keys of the instances currently held."""
+        with self._lock:
+            return list(self._models)
+
+    def evict(self, kind: Optional[str] = None) -> int:
+        """Drop loaded instances (of one kind, or all); returns how many were dropped."""
+        with self._lock:
+            keys = [key for key in self._models if kind is None or key[0] == kind]
+            for key in keys:
+                del self._models[key]
+            for slot in [slot for slot in self._active if kind is None or slot[0] == kind]:
+                del self._active[slot]
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Load/hit counters for monitoring."""
+        with self._lock:
+            return {
+                "loaded": len(self._models),
+                "loads": self.loads,
+                "hits": self.hits,
+                "swaps": self.swaps,
+                "load_seconds": round(self.load_seconds, 4),
+            }
+
+
+# Built-in kinds. Paths mirror the defaults the model classes save to.
+
+CORRELATION_MODEL_DIR = Path("models/correlation_model")
+CONFIDENCE_MODEL_DIR = Path("models/parlay_confidence_classifier")
+QLEARNING_MODEL_PATH = Path("models/qlearning_parlay_agent.pt")
+
+
+def _prop_artifacts(sport: str) -> List[Path]:
+    model_dir = Path(f"models/prop_predictor_{sport}")
+    return [model_dir / f"{sport}_prop_model.pkl", model_dir / f"{sport}_preprocessor.pkl",
+            model_dir / f"{sport}_features.pkl"]
+
+
+def _load_correlation_model(sport: str) -> Any:
+    from tools.correlation_model import DynamicCorrelationModel
+
+    model = DynamicCorrelationModel("data/parlays.sqlite", model_save_path=str(CORRELATION_MODEL_DIR))
+    model.load_model()  # falls back to rule-based scoring without a checkpoint
+    return model
+
+
+def _load_confidence_predictor(sport: str) -> Any:
+    from tools.parlay_confidence_predictor import ParlayConfidencePredictor
+
+    return ParlayConfidencePredictor(str(CONFIDENCE_MODEL_DIR))
+
+
+def _load_prop_trainer(sport: str) -> Any:
+    from ml.ml_prop_trainer import HistoricalPropTrainer
+
+    trainer = HistoricalPropTrainer(sport)
+    try:
+        trainer.load_model()
+    except FileNotFoundError:
+        logger.info(f"{sport.upper()} prop model not found - train with ml_prop_trainer.py first")
+    return trainer
+
+
+def _load_parlay_strategist(sport: str) -> Any:
+    from tools.parlay_strategist_agent import EnhancedParlayStrategistAgent
+
+    return EnhancedParlayStrategistAgent(use_injury_classifier=False, sport=sport)
+
+
+def _load_qlearning_agent(sport: str) -> Any:
+    from ml.ml_qlearning_agent import QLearningConfig, QLearningParlayAgent
+    from tools.parlay_rules_engine import ParlayRulesEngine
+
+    # Inference never picks legs a HARD_BLOCK rule forbids combining
+    agent = QLearningParlayAgent(QLearningConfig(), rules_engine=ParlayRulesEngine())
+    agent.load_model(str(QLEARNING_MODEL_PATH.with_suffix("")))
+    return agent
+
+
+def _smoke_test_correlation_model(model: Any) -> None:
+    if model.model is None:
+        raise ValueError("correlation checkpoint did not load")
+
+
+def _smoke_test_confidence_predictor(predictor: Any) -> None:
+    predictor.load_model()
+    predictor.predict("Smoke test: two rested home favorites with no injury news.")
+
+
+def _retire_confidence_predictor(predictor: Any) -> None:
+    # Close the replaced batching service once nobody holds the old predictor
+    service = predictor._inference
+    if service is not None:
+        from tools.inference_service import discard_inference_service
+
+        discard_inference_service(service)
+        weakref.finalize(predictor, service.close)
+
+
+def _smoke_test_prop_trainer(trainer: Any) -> None:
+    if not trainer.is_trained:
+        raise ValueError(f"{trainer.sport.upper()} prop model did not load")
+    probabilities = trainer.predict_batch([{}])
+    if probabilities.shape != (1,) or not 0.0 <= float(probabilities[0]) <= 1.0:
+        raise ValueError(f"prop model returned {probabilities!r} for a default leg")
+
+
+def _smoke_test_qlearning_agent(agent: Any) -> None:
+    if not agent.is_loaded:
+        raise ValueError("Q-Learning checkpoint did not load")
+    agent.infer_parlay([{"leg_id": "smoke_a", "odds": 1.91, "expected_value": 0.04},
+                        {"leg_id": "smoke_b", "odds": 2.10, "expected_value": 0.02}], max_legs=2)
+
+
+def default_model_specs() -> Dict[str, ModelSpec]:
+    """Model kinds every registry knows about."""
+    return {
+        "correlation_model": ModelSpec(_load_correlation_model,
+                                       lambda sport: [CORRELATION_MODEL_DIR / "correlation_model.pth"],
+                                       smoke_test=_smoke_test_correlation_model),
+        "confidence_predictor": ModelSpec(_load_confidence_predictor, lambda sport: [CONFIDENCE_MODEL_DIR],
+                                          smoke_test=_smoke_test_confidence_predictor,
+                                          retire=_retire_confidence_predictor),
+        "prop_trainer": ModelSpec(_load_prop_trainer, _prop_artifacts, smoke_test=_smoke_test_prop_trainer),
+        # No artifacts of its own: the strategist follows prop_trainer swaps
+        "parlay_strategist": ModelSpec(_load_parlay_strategist, lambda sport: []),
+        "qlearning_agent": ModelSpec(_load_qlearning_agent, lambda sport: [QLEARNING_MODEL_PATH],
+                                     smoke_test=_smoke_test_qlearning_agent),
+    }
+
+
+_shared_registry: Optional[ModelRegistry] = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Return the process-wide ModelRegistry.
+
+    MODEL_REGISTRY_LAZY=1 asks callers to defer loading until first use.
+    """
+    global _shared_registry
+    if _shared_registry is None:
+        with _shared_registry_lock:
+            if _shared_registry is None:
+                _shared_registry = ModelRegistry(
+                    lazy=os.getenv("MODEL_REGISTRY_LAZY", "0").lower() in ("1", "true", "yes")
+                )
+    return _shared_registry
+
+
+def reset_model_registry() -> None:
+    """Discard the process-wide registry and its models (next call builds a new one)."""
+    global _shared_registry
+    with _shared_registry_lock:
+        _shared_registry = None
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Model Watcher
+
+Hot reload for the models served through tools/model_registry.py.
+Retraining jobs (prop trainers, Q-Learning, tools/automated_roberta_retraining.py)
+write new artifacts in place; the API and ProductionParlaySystem used to
+pick them up only after a full restart, which also reloads RAG, embeddings
+and every agent.
+
+A background thread polls the artifact version of each watched
+(kind, sport). When it changes, the new version is loaded on that thread,
+validated with the kind's smoke test and then promoted: the registry swaps
+the reference in every subscribed builder/strategist. Requests already
+holding the old instance finish with it; a version that fails to load or
+validate is rejected and the old one keeps serving.
+
+Key Features:
+- Watches the models the API and ProductionParlaySystem serve (watch_served),
+  the ones a process has loaded so far (watch_active) or explicit kinds
+- Settle checks: a new version must stay unchanged for settle_seconds, and
+  one that changes while loading is retried on the next poll
+- Load, validation and swap timings per reload for monitoring
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from tools.model_registry import ALL_SPORTS, ModelKey, ModelRegistry, get_model_registry
+
+logger = logging.getLogger(__name__)
+
+# Models the serving processes reach through ParlayBuilder and the strategist
+# agents. Those are created per request/job (SportFactory, the scheduler), so
+# nothing is loaded yet when the watcher starts.
+SERVED_MODELS: Tuple[Tuple[str, str], ...] = (
+    ("prop_trainer", "nba"),
+    ("prop_trainer", "nfl"),
+    ("qlearning_agent", ALL_SPORTS),
+    ("correlation_model", ALL_SPORTS),
+    ("confidence_predictor", ALL_SPORTS),
+)
+
+
+@dataclass
+class ReloadResult:
+    """Outcome of one hot reload attempt."""
+    kind: str
+    sport: str
+    old_version: Optional[str]
+    new_version: str
+    success: bool
+    load_seconds: float = 0.0
+    validate_seconds: float = 0.0
+    swap_ms: float = 0.0
+    error: Optional[str] = None
+
+
+class ModelWatcher:
+    """Polls model artifact versions and hot-swaps validated new versions."""
+
+    def __init__(self, registry: Optional[ModelRegistry] = None, poll_interval: float = 60.0,
+                 settle_seconds: float = 2.0, history_size: int = 50):
+        """
+        Initialize the watcher.
+
+        Args:
+            registry: Registry whose models are watched (default: process-wide)
+            poll_interval: Seconds between artifact version checks
+            settle_seconds: How long a new version must stay unchanged before it
+                is loaded, so multi-file saves are picked up complete
+            history_size: Reload results kept for stats()
+        """
+        self.registry = registry or get_model_registry()
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.history: deque = deque(maxlen=history_size)
+        self._watched: Set[Tuple[str, str]] = set()
+        self._rejected: Set[ModelKey] = set()
+        self._pending: Dict[Tuple[str, str], Tuple[ModelKey, float]] = {}
+        self._check_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, kind: str, sport: str = ALL_SPORTS) -> None:
+        """Serve (kind, sport) from its active instance and reload it when its artifacts change."""
+        self.registry.get(kind, sport)  # make sure there is an active version to fall back on
+        self.registry.pin(kind, sport)
+        self._watched.add((kind, sport))
+
+    def watch_served(self) -> int:
+        """
+        Watch SERVED_MODELS plus anything already loaded; returns how many are watched.
+
+        Each model is loaded now (it becomes the version builders created later
+        share); one that fails to load is logged and left unwatched.
+        """
+        for kind, sport in SERVED_MODELS:
+            try:
+                self.watch(kind, sport)
+            except Exception as e:
+                logger.warning(f"Not watching {kind} ({sport}): {e}")
+        return self.watch_active()
+
+    def watch_active(self) -> int:
+        """Watch every model the registry currently serves; returns how many are watched."""
+        for kind, sport, _ in self.registry.loaded():
+            self.watch(kind, sport)
+        return len(self._watched)
+
+    def check_now(self) -> List[ReloadResult]:
+        """Run one poll: reload every watched model whose artifacts changed."""
+        results = []
+        with self._check_lock:
+            for kind, sport in sorted(self._watched):
+                key = self.registry.key(kind, sport)
+                if key == self.registry.active_key(kind, sport) or key in self._rejected:
+                    self._pending.pop((kind, sport), None)
+                    continue
+                now = time.monotonic()
+                pending = self._pending.get((kind, sport))
+                if pending is None or pending[0] != key:
+                    self._pending[(kind, sport)] = pending = (key, now)
+                if now - pending[1] < self.settle_seconds:
+                    continue
+                del self._pending[(kind, sport)]
+                result = self._reload(key)
+                if result is not None:
+                    results.append(result)
+                    self.history.append(result)
+        return results
+
+    def _reload(self, key: ModelKey) -> Optional[ReloadResult]:
+        kind, sport, version = key
+        spec = self.registry.spec(kind)
+        active = self.registry.active_key(kind, sport)
+        result = ReloadResult(kind, sport, active[2] if active else None, version, success=False)
+
+        try:
+            start = time.perf_counter()
+            _, model = self.registry.load(kind, sport, key)
+            result.load_seconds = time.perf_counter() - start
+        except Exception as e:
+            result.error = f"load failed: {e}"
+            self._reject(key, result)
+            return result
+
+        if self.registry.key(kind, sport) != key:
+            # Artifacts changed while loading (still being written) - retry next poll
+            if spec.retire is not None:
+                spec.retire(model)
+            logger.info(f"{kind} ({sport}) artifacts still changing, retrying on next poll")
+            return None
+
+        try:
+            start = time.perf_counter()
+            if spec.smoke_test is not None:
+                spec.smoke_test(model)
+            result.validate_seconds = time.perf_counter() - start
+        except Exception as e:
+            result.error = f"smoke test failed: {e}"
+            if spec.retire is not None:
+                spec.retire(model)
+            self._reject(key, result)
+            return result
+
+        start = time.perf_counter()
+        self.registry.promote(key, model)
+        result.swap_ms = 1000 * (time.perf_counter() - start)
+        result.success = True
+        logger.info(f"Hot-swapped {kind} ({sport}) {result.old_version} -> {version}: "
+                    f"load {result.load_seconds * 1000:.0f} ms, validate {result.validate_seconds * 1000:.0f} ms, "
+                    f"swap {result.swap_ms:.2f} ms")
+        return result
+
+    def _reject(self, key: ModelKey, result: ReloadResult) -> None:
+        # Not retried until the artifacts change again
+        self._rejected.add(key)
+        logger.warning(f"Keeping {key[0]} ({key[1]}) version {result.old_version}: "
+                       f"version {key[2]} rejected ({result.error})")
+
+    def start(self) -> None:
+        """Start polling on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Model watcher started: {len(self._watched)} models, every {self.poll_interval:g}s")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop polling (a reload in progress finishes first)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        # Poll again soon while a new version is settling
+        while not self._stop.wait(min(self.poll_interval, self.settle_seconds) if self._pending
+                                  else self.poll_interval):
+            try:
+                self.check_now()
+            except Exception as e:
+                logger.error(f"Model watcher poll failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Watched models, active versions and recent reloads for monitoring."""
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "poll_interval": self.poll_interval,
+            "watched": {f"{kind}:{sport}": (self.registry.active_key(kind, sport) or (None, None, None))[2]
+                        for kind, sport in sorted(self._watched)},
+            "reloads": [asdict(result) for result in self.history],
+        }
+
+
+_shared_watcher: Optional[ModelWatcher] = None
+_shared_watcher_lock = threading.Lock()
+
+
+def get_model_watcher() -> ModelWatcher:
+    """
+    Return the process-wide ModelWatcher over the process-wide registry.
+
+    Configured from MODEL_WATCH_INTERVAL_SECONDS; 0 turns hot reload off in
+    the API and ProductionParlaySystem.
+    """
+    global _shared_watcher
+    if _shared_watcher is None:
+        with _shared_watcher_lock:
+            if _shared_watcher is None:
+                _shared_watcher = ModelWatcher(
+                    poll_interval=float(os.getenv("MODEL_WATCH_INTERVAL_SECONDS", "60"))
+                )
+    return _shared_watcher
+
+
+def reset_model_watcher() -> None:
+    """Stop and discard the process-wide watcher (next call builds a new one)."""
+    global _shared_watcher
+    with _shared_watcher_lock:
+        watcher, _shared_watcher = _shared_watcher, None
+    if watcher is not None:
+        watcher.stop()
@@ -2,17 +2,26 @@
 """
 Enhanced Multi-Sport Embedder - JIRA-NFL-004
 Extends RAG system to support sport-specific metadata filtering and NFL content ingestion
+
+The vector store is partitioned into one Qdrant collection per sport plus a
+shared "general" collection for betting theory that names no team or player.
+Retrieval for a sport searches only that sport's partition and the general
+one, merges the hits by score, and can prune by date (a range filter on the
+indexed date_ordinal payload field) for recency-sensitive queries.
 """
 
 import os
 import uuid
 from pathlib import Path
 from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import re
 
 from langchain_community.document_loaders import TextLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+try:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+except ImportError:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
 from sentence_transformers import SentenceTransformer
 from qdrant_client import QdrantClient, models
 from qdrant_client.models import PointStruct, VectorParams, Distance
@@ -30,6 +39,19 @@ COLLECTIONS = {
     "nfl": "sports_knowledge_base_nfl"
 }
 
+# Shared partition for chunks about no particular sport (betting theory)
+GENERAL_PARTITION = "general"
+PARTITIONS = {**COLLECTIONS, GENERAL_PARTITION: "sports_knowledge_base_general"}
+
+# Path keywords marking a file as about one sport
+SPORT_PATH_KEYWORDS = {
+    "nfl": ["nfl", "football", "patriots", "chiefs", "cowboys"],
+    "nba": ["nba", "basketball", "lakers", "celtics", "warriors"]
+}
+
+# Formats produced by extract_date_from_content
+DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%B %d, %Y", "%B %d %Y"]
+
 # Enhanced source relevance mapping for multi-sport
 SOURCE_RELEVANCE = {
     # NBA sources (existing)
@@ -85,6 +107,16 @@ NFL_TEAMS = {
     "Seahawks": "Seattle Seahawks"
 }
 
+def date_ordinal(date_text: Optional[str]) -> Optional[int]:
+    """Proleptic Gregorian ordinal of a date string (None if unparseable)."""
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_text, date_format).date().toordinal()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
 # Common NFL players for metadata extraction
 NFL_PLAYERS = [
     "Patrick Mahomes", "Josh Allen", "Joe Burrow", "Lamar Jackson",
@@ -108,10 +140,10 @@ class MultiSportEmbedder:
         self._create_collections()
     
     def _create_collections(self):
-        """Create sport-specific Qdrant collections if they don't exist"""
+        """Create the sport and general partition collections if they don't exist"""
         existing = [c.name for c in self.qdrant.get_collections().collections]
         
-        for sport, collection_name in COLLECTIONS.items():
+        for sport, collection_name in PARTITIONS.items():
             if collection_name not in existing:
                 self.qdrant.recreate_collection(
                     collection_name=collection_name,
@@ -120,19 +152,29 @@ class MultiSportEmbedder:
                         distance=Distance.COSINE,
                     ),
                 )
+                # Indexed so date-window filters prune instead of scanning payloads
+                self.qdrant.create_payload_index(
+                    collection_name=collection_name,
+                    field_name="date_ordinal",
+                    field_schema=models.PayloadSchemaType.INTEGER,
+                )
                 print(f"✅ Created {sport.upper()} collection: {collection_name}")
     
+    def _sport_from_path(self, file_path: Path) -> Optional[str]:
+        """Sport named by a file path's keywords, if any"""
+        path_str = str(file_path).lower()
+        for sport, keywords in SPORT_PATH_KEYWORDS.items():
+            if any(keyword in path_str for keyword in keywords):
+                return sport
+        return None
+    
     def determine_sport_and_source(self, file_path: Path) -> tuple[str, str]:
         """Determine sport and source from file path"""
         parts = file_path.parts
         path_str = str(file_path).lower()
         
         # Determine sport
-        sport = "nba"  # Default
-        if any(keyword in path_str for keyword in ["nfl", "football", "patriots", "chiefs", "cowboys"]):
-            sport = "nfl"
-        elif any(keyword in path_str for keyword in ["nba", "basketball", "lakers", "celtics", "warriors"]):
-            sport = "nba"
+        sport = self._sport_from_path(file_path) or "nba"  # Default
         
         # Determine source
         source_name = "unknown"
@@ -207,9 +249,35 @@ class MultiSportEmbedder:
         # Default to today
         return datetime.now().strftime("%Y-%m-%d")
     
-    def create_enhanced_metadata(self, text: str, file_path: Path, chunk_index: int) -> Dict:
-        """Create enhanced metadata with sport-specific fields"""
+    def determine_partition(self, text: str, file_path: Path) -> str:
+        """
+        Partition of a chunk: the sport its file path names, else the one sport
+        whose teams or players it mentions, else the general partition.
+        """
+        sport = self._sport_from_path(file_path)
+        if sport:
+            return sport
+        
+        mentioned = [name for name in COLLECTIONS
+                     if self.extract_teams_from_text(text, name) or self.extract_players_from_text(text, name)]
+        return mentioned[0] if len(mentioned) == 1 else GENERAL_PARTITION
+    
+    def create_enhanced_metadata(self, text: str, file_path: Path, chunk_index: int,
+                                 partition: Optional[str] = None) -> Dict:
+        """
+        Create enhanced metadata with sport-specific fields
+        
+        Args:
+            text: Chunk text
+            file_path: Source file
+            chunk_index: Position of the chunk in the file
+            partition: Partition the chunk is stored in (default: the sport
+                named by the file path)
+        """
         sport, source_name = self.determine_sport_and_source(file_path)
+        if partition:
+            sport = partition.lower()
+        chunk_date = self.extract_date_from_content(text, file_path)
         
         # Base metadata
         metadata = {
@@ -219,7 +287,8 @@ class MultiSportEmbedder:
             "filename": file_path.name,
             "chunk_index": chunk_index,
             "text": text,
-            "date": self.extract_date_from_content(text, file_path)
+            "date": chunk_date,
+            "date_ordinal": date_ordinal(chunk_date)
         }
         
         # Extract sport-specific entities
@@ -238,77 +307,106 @@ class MultiSportEmbedder:
         return metadata
     
     def process_file(self, file_path: Path, sport: Optional[str] = None) -> None:
-        """Process a file and add to appropriate sport-specific collection"""
+        """
+        Process a file into the partition collections
+        
+        Args:
+            file_path: Text file to chunk and embed
+            sport: Store every chunk in this sport's partition (default: each
+                chunk goes to the partition determine_partition picks)
+        """
         try:
             loader = TextLoader(str(file_path), encoding="utf-8")
             docs = loader.load()
             chunks = self.text_splitter.split_documents(docs)
             
-            # Determine sport if not provided
-            if sport is None:
-                sport, _ = self.determine_sport_and_source(file_path)
-            
-            collection_name = COLLECTIONS[sport.lower()]
-            points: List[PointStruct] = []
-            
+            texts, partitions = [], []
             for i, chunk in enumerate(chunks):
                 text = (chunk.page_content or "").strip()
                 if not text or len(text) < 50:  # Skip very short chunks
                     continue
-                
-                vector = self.embedder.encode(text).tolist()
-                metadata = self.create_enhanced_metadata(text, file_path, i)
-                
-                points.append(PointStruct(
+                texts.append((i, text))
+                partitions.append(sport.lower() if sport else self.determine_partition(text, file_path))
+            if not texts:
+                return
+            
+            # One batched encode for the whole file
+            vectors = self.embedder.encode([text for _, text in texts], show_progress_bar=False)
+            points_by_partition: Dict[str, List[PointStruct]] = {}
+            for (i, text), partition, vector in zip(texts, partitions, vectors):
+                metadata = self.create_enhanced_metadata(text, file_path, i, partition)
+                points_by_partition.setdefault(partition, []).append(PointStruct(
                     id=str(uuid.uuid4()),
-                    vector=vector,
+                    vector=vector.tolist(),
                     payload=metadata
                 ))
             
-            if points:
-                self.qdrant.upsert(collection_name=collection_name, points=points)
-                print(f"✅ {file_path.name} → {len(points)} chunks embedded in {sport.upper()} collection")
+            for partition, points in points_by_partition.items():
+                self.qdrant.upsert(collection_name=PARTITIONS[partition], points=points)
+                print(f"✅ {file_path.name} → {len(points)} chunks embedded in {partition.upper()} collection")
             
         except Exception as e:
             print(f"❌ Error processing {file_path}: {e}")
     
-    def retrieve_sport_context(self, query: str, sport: str, limit: int = 10) -> List[Dict]:
+    def retrieve_sport_context(self, query: str, sport: str, limit: int = 10,
+                               include_general: bool = True,
+                               max_age_days: Optional[int] = None,
+                               as_of: Optional[date] = None) -> List[Dict]:
         """
         Retrieve sport-specific context for a query
         
+        Only the sport's partition (and the general one) are searched, so other
+        sports' chunks are never scored.
+        
         Args:
             query: Search query
             sport: "NBA" or "NFL" 
             limit: Maximum number of results
+            include_general: Also search the general (betting theory) partition
+            max_age_days: Only sport chunks dated within this many days of
+                as_of (recency-sensitive queries such as injury news); the
+                general partition is not date-pruned
+            as_of: End of the date window (default: today)
             
         Returns:
-            List of relevant chunks with metadata
+            List of relevant chunks with metadata, merged across partitions by score
         """
         sport = sport.lower()
         if sport not in COLLECTIONS:
             raise ValueError(f"Unsupported sport: {sport}. Use 'nba' or 'nfl'")
         
-        collection_name = COLLECTIONS[sport]
         query_vector = self.embedder.encode(query).tolist()
         
-        # Search with sport filter
-        search_result = self.qdrant.search(
-            collection_name=collection_name,
-            query_vector=query_vector,
-            query_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="sport",
-                        match=models.MatchValue(value=sport.upper())
-                    )
-                ]
-            ),
-            limit=limit
-        )
+        date_filter = None
+        if max_age_days is not None:
+            end = as_of or date.today()
+            date_filter = models.Filter(must=[
+                models.FieldCondition(
+                    key="date_ordinal",
+                    range=models.Range(gte=(end - timedelta(days=max_age_days)).toordinal(),
+                                       lte=end.toordinal())
+                )
+            ])
+        
+        searches = [(PARTITIONS[sport], date_filter)]
+        if include_general:
+            searches.append((PARTITIONS[GENERAL_PARTITION], None))
+        
+        hits = []
+        for collection_name, query_filter in searches:
+            response = self.qdrant.query_points(
+                collection_name=collection_name,
+                query=query_vector,
+                query_filter=query_filter,
+                limit=limit,
+                with_payload=True
+            )
+            hits.extend(response.points)
         
-        # Convert results to readable format
+        # Convert results to readable format, best first across partitions
+        hits.sort(key=lambda hit: hit.score, reverse=True)
         results = []
-        for hit in search_result:
+        for hit in hits[:limit]:
             results.append({
                 "text": hit.payload.get("text", ""),
                 "score": hit.score,
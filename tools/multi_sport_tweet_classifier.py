@@ -8,7 +8,7 @@ import os
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence
 import torch
 from torch.utils.data import Dataset, DataLoader
 from transformers import (
@@ -22,6 +22,9 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import argparse
 
+from tools.inference_service import InferenceService, get_inference_service
+from tools.model_export import export_fast_inference, parse_export_backends, print_export_summary
+
 # Labels for classification
 LABELS = ["injury_news", "lineup_news", "general_commentary", "irrelevant"]
 LABEL_TO_ID = {label: i for i, label in enumerate(LABELS)}
@@ -70,11 +73,14 @@ class MultiSportTweetDataset(Dataset):
 class MultiSportTweetClassifier:
     """Enhanced tweet classifier supporting both NBA and NFL"""
     
-    def __init__(self, model_name: str = "roberta-base"):
+    def __init__(self, model_name: str = "roberta-base", fast_inference: bool = False):
         self.model_name = model_name
+        # Serve the int8/ONNX CPU export of a saved model when one passed parity
+        self.fast_inference = fast_inference
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
         self.model = None
         self.labels = LABELS
+        self._inference: Optional[InferenceService] = None
         
         # Add special tokens if needed
         if "[NBA]" not in self.tokenizer.vocab:
@@ -145,8 +151,9 @@ class MultiSportTweetClassifier:
             {"text": "Follow us on TikTok for exclusive NBA behind-the-scenes content", "label": "irrelevant", "sport": "nba"}
         ]
     
-    def fine_tune(self, output_dir: str = "models/multi_sport_tweet_classifier", num_epochs: int = 3):
-        """Fine-tune RoBERTa on combined NBA/NFL dataset"""
+    def fine_tune(self, output_dir: str = "models/multi_sport_tweet_classifier", num_epochs: int = 3,
+                  export_backends: Sequence[str] = ("int8", "onnx_int8")):
+        """Fine-tune RoBERTa on combined NBA/NFL dataset, then export fast CPU artifacts"""
         
         print("🤖 Loading training data...")
         texts, sports, labels = self.load_training_data()
@@ -220,49 +227,60 @@ class MultiSportTweetClassifier:
         eval_results = trainer.evaluate()
         print(f"Validation Accuracy: {eval_results['eval_accuracy']:.3f}")
         
+        if export_backends:
+            manifest = export_fast_inference(
+                output_dir, export_backends,
+                parity_texts=[f"[{sport.upper()}] {text}" for text, sport in zip(val_texts, val_sports)],
+                parity_labels=val_labels, max_length=128
+            )
+            print_export_summary(manifest)
+        
         return output_dir
     
-    def classify_tweet(self, text: str, sport: str, model_dir: str = "models/multi_sport_tweet_classifier") -> Dict:
-        """Classify a single tweet with sport context"""
-        
-        # Load model if not already loaded
+    def _inference_service(self, model_dir: str) -> InferenceService:
+        """Batched service for this classifier's model (shared when loaded from model_dir)"""
         if self.model is None:
-            self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
-            self.model = AutoModelForSequenceClassification.from_pretrained(model_dir)
-        
-        # Add sport context
-        sport_prefix = f"[{sport.upper()}] "
-        enhanced_text = sport_prefix + text
-        
-        # Tokenize
-        encoding = self.tokenizer(
-            enhanced_text,
-            truncation=True,
-            padding=True,
-            max_length=128,
-            return_tensors='pt'
-        )
-        
-        # Predict
-        with torch.no_grad():
-            outputs = self.model(**encoding)
-            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-            confidence, predicted_id = torch.max(predictions, dim=-1)
-        
-        predicted_label = ID_TO_LABEL[predicted_id.item()]
-        confidence_score = confidence.item()
-        
+            return get_inference_service(model_dir, max_length=128,
+                                         backend="auto" if self.fast_inference else "fp32")
+        # Model fine-tuned (or assigned) in this process: batch over it directly
+        if self._inference is None or self._inference.model is not self.model \
+                or self._inference.tokenizer is not self.tokenizer:
+            self._inference = InferenceService(self.model, self.tokenizer, max_length=128,
+                                               name="multi_sport_tweet_classifier")
+        return self._inference
+    
+    def _format_result(self, text: str, sport: str, probabilities: np.ndarray) -> Dict:
+        predicted_id = int(probabilities.argmax())
         return {
             "text": text,
             "sport": sport,
-            "predicted_label": predicted_label,
-            "confidence": confidence_score,
+            "predicted_label": ID_TO_LABEL[predicted_id],
+            "confidence": float(probabilities[predicted_id]),
             "all_probabilities": {
-                label: predictions[0][i].item() 
+                label: float(probabilities[i])
                 for i, label in enumerate(LABELS)
             }
         }
-
+    
+    def classify_tweet(self, text: str, sport: str, model_dir: str = "models/multi_sport_tweet_classifier") -> Dict:
+        """Classify a single tweet with sport context (batched with concurrent callers)"""
+        enhanced_text = f"[{sport.upper()}] {text}"
+        probabilities = self._inference_service(model_dir).predict(enhanced_text)
+        return self._format_result(text, sport, probabilities)
+    
+    async def classify_tweet_async(self, text: str, sport: str,
+                                   model_dir: str = "models/multi_sport_tweet_classifier") -> Dict:
+        """Async classify_tweet: awaits the batch without blocking the event loop"""
+        enhanced_text = f"[{sport.upper()}] {text}"
+        probabilities = await self._inference_service(model_dir).predict_async(enhanced_text)
+        return self._format_result(text, sport, probabilities)
+    
+    def classify_tweets(self, texts: List[str], sports: List[str],
+                        model_dir: str = "models/multi_sport_tweet_classifier") -> List[Dict]:
+        """Classify many tweets in padded-to-longest batches"""
+        enhanced_texts = [f"[{sport.upper()}] {text}" for text, sport in zip(texts, sports)]
+        probabilities = self._inference_service(model_dir).predict_many(enhanced_texts)
+        return [self._format_result(text, sport, row) for text, sport, row in zip(texts, sports, probabilities)]
 
 def main():
     """Main function for training and testing the multi-sport classifier"""
@@ -272,13 +290,17 @@ def main():
     parser.add_argument("--text", type=str, help="Text to classify")
     parser.add_argument("--sport", type=str, choices=["nba", "nfl"], default="nba", help="Sport context")
     parser.add_argument("--model-dir", default="models/multi_sport_tweet_classifier", help="Model directory")
+    parser.add_argument("--export", default="int8,onnx_int8",
+                        help="Fast CPU exports after training: none, all, or any of int8,onnx,onnx_int8")
+    parser.add_argument("--fast", action="store_true", help="Classify with the fast CPU export")
     args = parser.parse_args()
     
-    classifier = MultiSportTweetClassifier()
+    classifier = MultiSportTweetClassifier(fast_inference=args.fast)
     
     if args.train:
         print("🤖 Training Multi-Sport Tweet Classifier...")
-        model_dir = classifier.fine_tune(output_dir=args.model_dir)
+        model_dir = classifier.fine_tune(output_dir=args.model_dir,
+                                         export_backends=parse_export_backends(args.export))
         print(f"✅ Training complete! Model saved to {model_dir}")
     
     if args.test or args.text:
@@ -305,8 +327,9 @@ def main():
                 ("Cowboys defense impressive despite injuries", "nfl")
             ]
             
-            for text, sport in test_tweets:
-                result = classifier.classify_tweet(text, sport, args.model_dir)
+            texts, sports = zip(*test_tweets)
+            for result in classifier.classify_tweets(list(texts), list(sports), args.model_dir):
+                text, sport = result["text"], result["sport"]
                 print(f"\n{sport.upper()}: {text}")
                 print(f"→ {result['predicted_label']} ({result['confidence']:.3f})")
 
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Odds Delta Engine
+
+Keeps the last market snapshot per game and turns each new poll into the
+(bookmaker, market, selection, line, price) tuples that actually changed.
+Consumers subscribe to delta batches instead of re-diffing or re-scanning the
+whole slate, so arbitrage detection, discrepancy monitoring and verification
+caches only recompute the games that moved.
+
+Key Features:
+- Quiet games cost almost nothing: a game object seen before (snapshot cache
+  hit) is skipped outright, and a refetched game is compared as one flat
+  list of quotes before any per-quote diffing is done
+- Added / changed / removed deltas per quote; a line move shows up as the old
+  line removed and the new line added
+- Per-subscriber game filters; a failing subscriber is logged and skipped
+- ChangedGameTracker: ready-made subscriber for "which games need a rescan"
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from tools.odds_fetcher_tool import GameOdds
+
+logger = logging.getLogger(__name__)
+
+# (bookmaker, market, selection_name, line)
+QuoteKey = Tuple[str, str, str, Optional[float]]
+
+
+@dataclass(frozen=True)
+class OddsDelta:
+    """One quote that appeared, moved or disappeared since the last snapshot."""
+    game_id: str
+    bookmaker: str
+    market: str
+    selection_name: str
+    line: Optional[float]
+    price_decimal: Optional[float]   # None when removed
+    previous_price: Optional[float]  # None when added
+    kind: str                        # 'added', 'changed', 'removed'
+
+
+@dataclass
+class OddsDeltaBatch:
+    """All deltas produced by one ingest() call."""
+    deltas: List[OddsDelta]
+    timestamp: str
+    new_game_ids: Set[str] = field(default_factory=set)
+    removed_game_ids: Set[str] = field(default_factory=set)
+
+    @property
+    def changed_game_ids(self) -> Set[str]:
+        return {delta.game_id for delta in self.deltas} | self.new_game_ids | self.removed_game_ids
+
+    def for_games(self, game_ids: Set[str]) -> "OddsDeltaBatch":
+        """Subset of this batch touching the given games."""
+        return OddsDeltaBatch(
+            deltas=[delta for delta in self.deltas if delta.game_id in game_ids],
+            timestamp=self.timestamp,
+            new_game_ids=self.new_game_ids & game_ids,
+            removed_game_ids=self.removed_game_ids & game_ids
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.deltas or self.new_game_ids or self.removed_game_ids)
+
+    def __len__(self) -> int:
+        return len(self.deltas)
+
+
+# (bookmaker, market, selection_name, line, price_decimal) in snapshot order
+FlatQuote = Tuple[str, str, str, Optional[float], float]
+
+
+@dataclass
+class _GameState:
+    """Last seen version of one game."""
+    game: GameOdds
+    flat: List[FlatQuote]
+
+
+@dataclass
+class _Subscription:
+    callback: Callable[[OddsDeltaBatch], None]
+    game_ids: Optional[Set[str]]
+
+
+def _flatten(game: GameOdds) -> List[FlatQuote]:
+    return [
+        (book.bookmaker, book.market, selection.name, selection.line, selection.price_decimal)
+        for book in game.books
+        for selection in book.selections
+    ]
+
+
+class OddsDeltaEngine:
+    """Incremental snapshot differ with change-only notifications."""
+
+    def __init__(self):
+        self._games: Dict[str, _GameState] = {}
+        self._subscriptions: List[_Subscription] = []
+        self._lock = threading.Lock()
+
+        self.ingests = 0
+        self.games_skipped = 0
+        self.games_diffed = 0
+        self.deltas_emitted = 0
+
+    def subscribe(self, callback: Callable[[OddsDeltaBatch], None],
+                  game_ids: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """
+        Register a callback for non-empty delta batches.
+
+        Args:
+            callback: Called with the batch (filtered to game_ids, if given)
+            game_ids: Only notify for these games (all games if None)
+
+        Returns:
+            A function that removes the subscription
+        """
+        subscription = _Subscription(callback, set(game_ids) if game_ids is not None else None)
+        with self._lock:
+            self._subscriptions.append(subscription)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if subscription in self._subscriptions:
+                    self._subscriptions.remove(subscription)
+
+        return unsubscribe
+
+    def ingest(self, games: List[GameOdds], complete: bool = False) -> OddsDeltaBatch:
+        """
+        Diff a new snapshot against the last one and notify subscribers.
+
+        Args:
+            games: Latest GameOdds (any subset of the tracked games)
+            complete: The snapshot covers every live game, so tracked games
+                missing from it are reported as removed
+
+        Returns:
+            The batch of deltas (empty when nothing moved)
+        """
+        deltas: List[OddsDelta] = []
+        new_game_ids: Set[str] = set()
+        removed_game_ids: Set[str] = set()
+
+        with self._lock:
+            self.ingests += 1
+            seen: Set[str] = set()
+            for game in games:
+                seen.add(game.game_id)
+                previous = self._games.get(game.game_id)
+                if previous is not None and previous.game is game:
+                    self.games_skipped += 1
+                    continue
+
+                flat = _flatten(game)
+                if previous is not None and previous.flat == flat:
+                    previous.game = game
+                    self.games_skipped += 1
+                    continue
+
+                self.games_diffed += 1
+                if previous is None:
+                    new_game_ids.add(game.game_id)
+                    self._diff_flat(game.game_id, [], flat, deltas)
+                else:
+                    self._diff_flat(game.game_id, previous.flat, flat, deltas)
+                self._games[game.game_id] = _GameState(game=game, flat=flat)
+
+            if complete:
+                for game_id in [g for g in self._games if g not in seen]:
+                    removed_game_ids.add(game_id)
+                    self._diff_flat(game_id, self._games.pop(game_id).flat, [], deltas)
+
+            self.deltas_emitted += len(deltas)
+            subscriptions = list(self._subscriptions)
+
+        batch = OddsDeltaBatch(
+            deltas=deltas,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            new_game_ids=new_game_ids,
+            removed_game_ids=removed_game_ids
+        )
+        if batch:
+            self._notify(subscriptions, batch)
+        return batch
+
+    @classmethod
+    def _diff_flat(cls, game_id: str, old: List[FlatQuote], new: List[FlatQuote],
+                   deltas: List[OddsDelta]) -> None:
+        # Usual case: same quotes in the same order, only some prices moved
+        if len(old) == len(new):
+            moved = [(a, b) for a, b in zip(old, new) if a != b]
+            if all(a[:4] == b[:4] for a, b in moved):
+                for a, b in moved:
+                    deltas.append(OddsDelta(game_id, *b[:4], price_decimal=b[4],
+                                            previous_price=a[4], kind='changed'))
+                return
+        cls._diff_prices(game_id, {q[:4]: q[4] for q in old}, {q[:4]: q[4] for q in new}, deltas)
+
+    @staticmethod
+    def _diff_prices(game_id: str, old: Dict[QuoteKey, float], new: Dict[QuoteKey, float],
+                     deltas: List[OddsDelta]) -> None:
+        for key, price in new.items():
+            previous = old.get(key)
+            if previous is None:
+                deltas.append(OddsDelta(game_id, *key, price_decimal=price, previous_price=None, kind='added'))
+            elif previous != price:
+                deltas.append(OddsDelta(game_id, *key, price_decimal=price, previous_price=previous, kind='changed'))
+        for key, previous in old.items():
+            if key not in new:
+                deltas.append(OddsDelta(game_id, *key, price_decimal=None, previous_price=previous, kind='removed'))
+
+    def _notify(self, subscriptions: List[_Subscription], batch: OddsDeltaBatch) -> None:
+        changed = batch.changed_game_ids
+        for subscription in subscriptions:
+            if subscription.game_ids is None:
+                payload = batch
+            elif subscription.game_ids & changed:
+                payload = batch.for_games(subscription.game_ids)
+            else:
+                continue
+            try:
+                subscription.callback(payload)
+            except Exception as e:
+                logger.error(f"Odds delta subscriber {subscription.callback!r} failed: {e}")
+
+    def latest_game(self, game_id: str) -> Optional[GameOdds]:
+        """Most recently ingested version of a game."""
+        with self._lock:
+            state = self._games.get(game_id)
+            return state.game if state else None
+
+    def reset(self) -> None:
+        """Forget all tracked games (subscriptions are kept)."""
+        with self._lock:
+            self._games.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            checked = self.games_skipped + self.games_diffed
+            return {
+                'ingests': self.ingests,
+                'tracked_games': len(self._games),
+                'games_skipped': self.games_skipped,
+                'games_diffed': self.games_diffed,
+                'deltas_emitted': self.deltas_emitted,
+                'skip_rate': self.games_skipped / checked if checked else 0.0,
+                'subscribers': len(self._subscriptions)
+            }
+
+
+class ChangedGameTracker:
+    """
+    Subscriber that remembers which games moved since they were last processed.
+
+    take() hands out games that changed since the previous take() plus games
+    never handed out before, so every game is processed at least once.
+    """
+
+    def __init__(self):
+        self._pending: Set[str] = set()
+        self._taken: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, batch: OddsDeltaBatch) -> None:
+        with self._lock:
+            self._pending |= batch.changed_game_ids
+
+    def mark(self, game_ids: Iterable[str]) -> None:
+        """Force games to be handed out again on the next take()."""
+        with self._lock:
+            self._pending.update(game_ids)
+
+    def take(self, game_ids: Iterable[str]) -> List[str]:
+        """Games from game_ids that need processing (order preserved)."""
+        with self._lock:
+            due = [g for g in game_ids if g in self._pending or g not in self._taken]
+            self._pending.difference_update(due)
+            self._taken.update(due)
+            return due
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-from typing import Any, Dict, List, Optional, Union
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
-from tools.api_fetcher import ApiFetcher
+from tools.api_fetcher import ApiFetcher, AsyncApiFetcher
+from tools.market_snapshot_cache import get_market_snapshot_cache
 from config import THE_ODDS_API_KEY
 
 # Set up logging
@@ -53,6 +56,13 @@ class OddsFetcherTool:
         """Initialize the OddsFetcherTool with API configuration."""
         self.api_fetcher = ApiFetcher(api_key=THE_ODDS_API_KEY)
         
+        # Pooled, bounded-concurrency fetcher for the asyncio code paths
+        self.async_api_fetcher = AsyncApiFetcher(
+            api_key=THE_ODDS_API_KEY,
+            max_connections=int(os.getenv("ODDS_API_MAX_CONNECTIONS", "20")),
+            max_concurrency=int(os.getenv("ODDS_API_MAX_CONCURRENCY", "8"))
+        )
+        
         # Optional fallback API configuration
         self.fallback_api_key = os.getenv("FALLBACK_ODDS_API_KEY")
         self.fallback_base_url = os.getenv("FALLBACK_ODDS_BASE_URL", "https://api.fallback-odds.com")
@@ -186,6 +196,30 @@ class OddsFetcherTool:
         
         return normalized_games
 
+    def _build_odds_request(self, sport_key: str, regions: str, markets_str: str,
+                            api_key: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the primary Odds API URL and query parameters.
+        
+        Args:
+            sport_key: Sport key for the request
+            regions: Regions to fetch odds for
+            markets_str: Comma-separated markets to fetch odds for
+            api_key: The Odds API key
+            
+        Returns:
+            Tuple of (url, params)
+        """
+        url = f"https://api.the-odds-api.com/v4/sports/{sport_key}/odds"
+        params = {
+            "regions": regions,
+            "markets": markets_str,
+            "apiKey": api_key,
+            "oddsFormat": "decimal",
+            "dateFormat": "iso"
+        }
+        return url, params
+
     def _fetch_fallback_odds(self, sport_key: str, regions: str, markets: str) -> List[GameOdds]:
         """
         Fetch odds from fallback API if configured.
@@ -257,14 +291,7 @@ class OddsFetcherTool:
         
         try:
             # Primary API call
-            url = f"https://api.the-odds-api.com/v4/sports/{sport_key}/odds"
-            params = {
-                "regions": regions,
-                "markets": markets_str,
-                "apiKey": self.api_fetcher.api_key,
-                "oddsFormat": "decimal",
-                "dateFormat": "iso"
-            }
+            url, params = self._build_odds_request(sport_key, regions, markets_str, self.api_fetcher.api_key)
             
             response = self.api_fetcher.fetch(url, params=params)
             
@@ -296,4 +323,178 @@ class OddsFetcherTool:
         Returns:
             List of normalized GameOdds objects
         """
-        return self.get_game_odds(sport_key, regions, markets)
\ No newline at end of file
+        return self.get_game_odds(sport_key, regions, markets)
+
+    def get_cached_game_odds(self, sport_key: str, regions: str = "us", markets: Optional[List[str]] = None,
+                             ttl: Optional[float] = None, max_age: Optional[float] = None) -> List[GameOdds]:
+        """
+        get_game_odds through the process-wide market snapshot cache.
+        
+        Concurrent callers asking for the same (sport_key, regions, markets)
+        share one upstream request; the returned list is shared and read-only.
+        
+        Args:
+            sport_key: The sport key (e.g., 'basketball_nba')
+            regions: The regions to fetch odds for (e.g., 'us')
+            markets: The markets to fetch odds for (e.g., ['h2h', 'spreads', 'totals'])
+            ttl: Seconds to keep a freshly fetched snapshot (cache default if None)
+            max_age: Refetch if the cached snapshot is older than this many seconds
+            
+        Returns:
+            List of normalized GameOdds objects
+        """
+        return get_market_snapshot_cache().get(
+            sport_key, self.get_game_odds, regions, markets, ttl=ttl, max_age=max_age
+        )
+
+    async def get_cached_game_odds_async(self, sport_key: str, regions: str = "us",
+                                         markets: Optional[List[str]] = None,
+                                         ttl: Optional[float] = None,
+                                         max_age: Optional[float] = None) -> List[GameOdds]:
+        """Coroutine variant of get_cached_game_odds backed by get_game_odds_async."""
+        return await get_market_snapshot_cache().get_async(
+            sport_key, self.get_game_odds_async, regions, markets, ttl=ttl, max_age=max_age
+        )
+
+    async def get_game_odds_async(self, sport_key: str, regions: str = "us", markets: Optional[List[str]] = None) -> List[GameOdds]:
+        """
+        Non-blocking variant of get_game_odds for use inside the event loop.
+        
+        Requests go through the shared AsyncApiFetcher connection pool; the
+        fallback provider (if configured) is run in a worker thread.
+        
+        Args:
+            sport_key: The sport key (e.g., 'basketball_nba')
+            regions: The regions to fetch odds for (e.g., 'us')
+            markets: The markets to fetch odds for (e.g., ['h2h', 'spreads', 'totals'])
+            
+        Returns:
+            List of normalized GameOdds objects
+            
+        Raises:
+            OddsFetcherError: If both primary and fallback providers fail
+        """
+        if markets is None:
+            markets = ["h2h", "spreads", "totals"]
+        
+        markets_str = ",".join(markets)
+        
+        logger.info(f"Fetching odds (async) for sport: {sport_key}, regions: {regions}, markets: {markets_str}")
+        
+        try:
+            url, params = self._build_odds_request(sport_key, regions, markets_str, self.async_api_fetcher.api_key)
+            response = await self.async_api_fetcher.fetch(url, params=params)
+            return self._normalize_response(response, sport_key, odds_format="decimal")
+            
+        except Exception as e:
+            logger.warning(f"Primary API failed: {e}")
+            
+            try:
+                return await asyncio.to_thread(self._fetch_fallback_odds, sport_key, regions, markets_str)
+            except Exception as fallback_error:
+                logger.error(f"Both primary and fallback APIs failed. Primary: {e}, Fallback: {fallback_error}")
+                raise OddsFetcherError(f"All odds providers failed. Last error: {fallback_error}")
+
+    def _merge_game_odds(self, game_lists: List[List[GameOdds]]) -> List[GameOdds]:
+        """
+        Merge per-market-group responses into one GameOdds per game.
+        
+        Args:
+            game_lists: GameOdds lists for the same sport, one per market group
+            
+        Returns:
+            List of GameOdds with books from every market group, in first-seen order
+        """
+        merged: Dict[str, GameOdds] = {}
+        for games in game_lists:
+            for game in games:
+                existing = merged.get(game.game_id)
+                if existing is None:
+                    merged[game.game_id] = GameOdds(
+                        sport_key=game.sport_key,
+                        game_id=game.game_id,
+                        commence_time=game.commence_time,
+                        books=list(game.books)
+                    )
+                else:
+                    existing.books.extend(game.books)
+        return list(merged.values())
+
+    async def get_multi_sport_odds(self, sport_keys: List[str], regions: str = "us",
+                                   market_groups: Optional[List[List[str]]] = None) -> Dict[str, List[GameOdds]]:
+        """
+        Fetch several sports and market groups concurrently.
+        
+        Every (sport, market group) pair is issued as its own request over the
+        shared connection pool; results are merged back per sport so callers
+        get the same GameOdds/BookOdds/Selection shape as get_game_odds.
+        
+        Args:
+            sport_keys: Sport keys to fetch (e.g., ['basketball_nba', 'americanfootball_nfl'])
+            regions: The regions to fetch odds for
+            market_groups: Lists of markets to request separately
+                (default: [['h2h', 'spreads', 'totals']])
+            
+        Returns:
+            Dict mapping sport key to its merged list of GameOdds
+            
+        Raises:
+            OddsFetcherError: If every request failed
+        """
+        if market_groups is None:
+            market_groups = [["h2h", "spreads", "totals"]]
+        
+        jobs = [(sport_key, markets) for sport_key in sport_keys for markets in market_groups]
+        results = await asyncio.gather(
+            *(self.get_game_odds_async(sport_key, regions, markets) for sport_key, markets in jobs),
+            return_exceptions=True
+        )
+        
+        per_sport: Dict[str, List[List[GameOdds]]] = {sport_key: [] for sport_key in sport_keys}
+        errors = []
+        for (sport_key, markets), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Odds fetch failed for {sport_key} [{','.join(markets)}]: {result}")
+                errors.append(result)
+                continue
+            per_sport[sport_key].append(result)
+        
+        if jobs and len(errors) == len(jobs):
+            raise OddsFetcherError(f"All odds requests failed. Last error: {errors[-1]}")
+        
+        return {sport_key: self._merge_game_odds(game_lists) for sport_key, game_lists in per_sport.items()}
+
+    def _filter_by_date_range(self, games: List[GameOdds],
+                              date_range: Optional[Tuple[datetime, datetime]]) -> List[GameOdds]:
+        """Keep games whose commence time falls inside date_range (inclusive)."""
+        if not date_range:
+            return games
+        
+        start, end = date_range
+        filtered = []
+        for game in games:
+            try:
+                commence = datetime.fromisoformat(game.commence_time.replace('Z', '+00:00'))
+            except (ValueError, AttributeError):
+                continue
+            if start.tzinfo is None:
+                commence = commence.replace(tzinfo=None)
+            if start <= commence <= end:
+                filtered.append(game)
+        return filtered
+
+    async def fetch_nba_odds(self, date_range: Optional[Tuple[datetime, datetime]] = None,
+                             regions: str = "us") -> List[GameOdds]:
+        """Fetch NBA odds without blocking the event loop."""
+        games = await self.get_cached_game_odds_async("basketball_nba", regions)
+        return self._filter_by_date_range(games, date_range)
+
+    async def fetch_nfl_odds(self, date_range: Optional[Tuple[datetime, datetime]] = None,
+                             regions: str = "us") -> List[GameOdds]:
+        """Fetch NFL odds without blocking the event loop."""
+        games = await self.get_cached_game_odds_async("americanfootball_nfl", regions)
+        return self._filter_by_date_range(games, date_range)
+
+    async def aclose(self) -> None:
+        """Release pooled connections held by the async fetcher."""
+        await self.async_api_fetcher.close()
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Columnar Odds Snapshot Store
+
+Flattens the nested GameOdds -> BookOdds -> Selection tree into one row per
+quoted selection, held in NumPy columns with interned string tables:
+
+    game_idx | book_id | market_id | selection_id | price | line (NaN = none)
+
+A full slate (15 games x 10 books x several markets) becomes a handful of
+contiguous arrays instead of thousands of small Python objects, and lookups
+such as "best price per outcome" or "every book quoting this selection" turn
+into boolean masks and sorts over those arrays.
+
+Converters to and from the existing dataclasses keep every consumer of
+GameOdds working unchanged.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from tools.odds_fetcher_tool import GameOdds, BookOdds, Selection
+
+logger = logging.getLogger(__name__)
+
+
+class _StringTable:
+    """Interned string table: value <-> dense integer id."""
+
+    __slots__ = ("values", "_ids", "_lower_ids")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lower_ids: Dict[str, List[int]] = {}
+
+    def intern(self, value: str) -> int:
+        idx = self._ids.get(value)
+        if idx is None:
+            idx = len(self.values)
+            self.values.append(value)
+            self._ids[value] = idx
+            self._lower_ids.setdefault(value.lower(), []).append(idx)
+        return idx
+
+    def ids_for(self, value: str, case_insensitive: bool = False) -> List[int]:
+        """All ids matching value (several when case-insensitive and spellings differ)."""
+        if case_insensitive:
+            return self._lower_ids.get(value.lower(), [])
+        idx = self._ids.get(value)
+        return [] if idx is None else [idx]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def _isin(column: np.ndarray, ids: List[int]) -> np.ndarray:
+    """np.isin with a fast path for the common single-id case."""
+    if len(ids) == 1:
+        return column == ids[0]
+    return np.isin(column, ids)
+
+
+@dataclass
+class OutcomeQuote:
+    """A single price for an outcome, resolved back to strings."""
+    game_id: str
+    market: str
+    selection_name: str
+    line: Optional[float]
+    bookmaker: str
+    price_decimal: float
+
+
+class ColumnarOddsSnapshot:
+    """
+    Column-oriented, read-only view of a market snapshot.
+
+    Build with from_game_odds(); convert back with to_game_odds().
+    """
+
+    def __init__(self, game_ids: List[str], sport_keys: List[str], commence_times: List[str],
+                 bookmakers: _StringTable, markets: _StringTable, selections: _StringTable,
+                 game_idx: np.ndarray, book_id: np.ndarray, market_id: np.ndarray,
+                 selection_id: np.ndarray, price: np.ndarray, line: np.ndarray,
+                 block_offsets: np.ndarray, block_game: np.ndarray,
+                 block_book: np.ndarray, block_market: np.ndarray):
+        self.game_ids = game_ids
+        self.sport_keys = sport_keys
+        self.commence_times = commence_times
+        self.bookmakers = bookmakers
+        self.markets = markets
+        self.selections = selections
+
+        self.game_idx = game_idx
+        self.book_id = book_id
+        self.market_id = market_id
+        self.selection_id = selection_id
+        self.price = price
+        self.line = line
+
+        # One block per original BookOdds: rows block_offsets[i]:block_offsets[i + 1]
+        self.block_offsets = block_offsets
+        self.block_game = block_game
+        self.block_book = block_book
+        self.block_market = block_market
+
+        self._game_lookup = {game_id: i for i, game_id in enumerate(game_ids)}
+        # Rows are written game by game, so each game is one contiguous slice
+        self._game_bounds = np.searchsorted(game_idx, np.arange(len(game_ids) + 1)).tolist()
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_game_odds(cls, games: Iterable[GameOdds]) -> "ColumnarOddsSnapshot":
+        """Flatten GameOdds dataclasses into columns."""
+        bookmakers, markets, selections = _StringTable(), _StringTable(), _StringTable()
+        game_ids: List[str] = []
+        sport_keys: List[str] = []
+        commence_times: List[str] = []
+
+        game_col: List[int] = []
+        book_col: List[int] = []
+        market_col: List[int] = []
+        selection_col: List[int] = []
+        price_col: List[float] = []
+        line_col: List[float] = []
+        block_offsets: List[int] = [0]
+        block_game: List[int] = []
+        block_book: List[int] = []
+        block_market: List[int] = []
+
+        nan = float("nan")
+        for g_idx, game in enumerate(games):
+            game_ids.append(game.game_id)
+            sport_keys.append(game.sport_key)
+            commence_times.append(game.commence_time)
+            for book in game.books:
+                b_id = bookmakers.intern(book.bookmaker)
+                m_id = markets.intern(book.market)
+                block_game.append(g_idx)
+                block_book.append(b_id)
+                block_market.append(m_id)
+                for selection in book.selections:
+                    game_col.append(g_idx)
+                    book_col.append(b_id)
+                    market_col.append(m_id)
+                    selection_col.append(selections.intern(selection.name))
+                    price_col.append(selection.price_decimal)
+                    line_col.append(nan if selection.line is None else selection.line)
+                block_offsets.append(len(price_col))
+
+        return cls(
+            game_ids=game_ids,
+            sport_keys=sport_keys,
+            commence_times=commence_times,
+            bookmakers=bookmakers,
+            markets=markets,
+            selections=selections,
+            game_idx=np.asarray(game_col, dtype=np.int32),
+            book_id=np.asarray(book_col, dtype=np.int32),
+            market_id=np.asarray(market_col, dtype=np.int32),
+            selection_id=np.asarray(selection_col, dtype=np.int32),
+            price=np.asarray(price_col, dtype=np.float64),
+            line=np.asarray(line_col, dtype=np.float64),
+            block_offsets=np.asarray(block_offsets, dtype=np.int64),
+            block_game=np.asarray(block_game, dtype=np.int32),
+            block_book=np.asarray(block_book, dtype=np.int32),
+            block_market=np.asarray(block_market, dtype=np.int32)
+        )
+
+    def to_game_odds(self) -> List[GameOdds]:
+        """Rebuild the GameOdds tree, block for block in the original order."""
+        games = [
+            GameOdds(sport_key=sport_key, game_id=game_id, commence_time=commence_time, books=[])
+            for game_id, sport_key, commence_time in zip(self.game_ids, self.sport_keys, self.commence_times)
+        ]
+
+        book_names = self.bookmakers.values
+        market_names = self.markets.values
+        selection_names = self.selections.values
+        prices = self.price.tolist()
+        lines = [None if v != v else v for v in self.line.tolist()]  # NaN -> None
+        selection_ids = self.selection_id.tolist()
+        offsets = self.block_offsets.tolist()
+
+        blocks = zip(self.block_game.tolist(), self.block_book.tolist(), self.block_market.tolist())
+        for block, (g_idx, b_id, m_id) in enumerate(blocks):
+            start, end = offsets[block], offsets[block + 1]
+            games[g_idx].books.append(BookOdds(
+                bookmaker=book_names[b_id],
+                market=market_names[m_id],
+                selections=[
+                    Selection(name=selection_names[selection_ids[i]], price_decimal=prices[i], line=lines[i])
+                    for i in range(start, end)
+                ]
+            ))
+        return games
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return int(self.price.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the numeric columns (string tables excluded)."""
+        return sum(col.nbytes for col in (self.game_idx, self.book_id, self.market_id,
+                                          self.selection_id, self.price, self.line,
+                                          self.block_offsets, self.block_game,
+                                          self.block_book, self.block_market))
+
+    def quote(self, row: int) -> OutcomeQuote:
+        """Resolve one row back to strings."""
+        return self.quotes(np.asarray([row]))[0]
+
+    def quotes(self, rows: np.ndarray) -> List[OutcomeQuote]:
+        """Resolve many rows back to strings with one gather per column."""
+        game_ids, markets = self.game_ids, self.markets.values
+        selections, books = self.selections.values, self.bookmakers.values
+        return [
+            OutcomeQuote(
+                game_id=game_ids[g],
+                market=markets[m],
+                selection_name=selections[sel],
+                line=None if line != line else line,  # NaN -> None
+                bookmaker=books[b],
+                price_decimal=price
+            )
+            for g, m, sel, line, b, price in zip(
+                self.game_idx[rows].tolist(), self.market_id[rows].tolist(),
+                self.selection_id[rows].tolist(), self.line[rows].tolist(),
+                self.book_id[rows].tolist(), self.price[rows].tolist()
+            )
+        ]
+
+    # ------------------------------------------------------------------
+    # Vectorized queries
+    # ------------------------------------------------------------------
+
+    def mask(self, game_id: Optional[str] = None, market: Optional[str] = None,
+             bookmaker: Optional[str] = None, selection_name: Optional[str] = None,
+             markets: Optional[Iterable[str]] = None,
+             case_insensitive: bool = True) -> np.ndarray:
+        """
+        Boolean row mask for the given filters (None = no filter).
+
+        Bookmaker and selection names match case-insensitively by default, as
+        ParlayBuilder does.
+        """
+        keep = np.zeros(len(self), dtype=bool)
+        view = slice(None)
+        if game_id is not None:
+            g_idx = self._game_lookup.get(game_id)
+            if g_idx is None:
+                return keep
+            view = slice(self._game_bounds[g_idx], self._game_bounds[g_idx + 1])
+
+        sub = np.ones(len(self.price[view]), dtype=bool)
+
+        if market is not None:
+            sub &= _isin(self.market_id[view], self.markets.ids_for(market))
+
+        if markets is not None:
+            sub &= _isin(self.market_id[view], [i for m in markets for i in self.markets.ids_for(m)])
+
+        if bookmaker is not None:
+            sub &= _isin(self.book_id[view], self.bookmakers.ids_for(bookmaker, case_insensitive))
+
+        if selection_name is not None:
+            sub &= _isin(self.selection_id[view], self.selections.ids_for(selection_name, case_insensitive))
+
+        keep[view] = sub
+        return keep
+
+    def rows(self, **filters) -> np.ndarray:
+        """Row indices matching mask(**filters)."""
+        return np.flatnonzero(self.mask(**filters))
+
+    def best_price_per_outcome(self, game_id: Optional[str] = None, market: Optional[str] = None,
+                               by_line: bool = True) -> List[OutcomeQuote]:
+        """
+        Best available price for every distinct outcome.
+
+        An outcome is (game, market, selection) plus the line when by_line is
+        True, so "Lakers -2.5" and "Lakers -3" are ranked separately.
+
+        Returns:
+            One OutcomeQuote per outcome, carrying the bookmaker with the best price
+        """
+        return self.quotes(self.best_price_rows(game_id, market, by_line))
+
+    def best_price_rows(self, game_id: Optional[str] = None, market: Optional[str] = None,
+                        by_line: bool = True) -> np.ndarray:
+        """Row indices of best_price_per_outcome(), for callers that stay in array space."""
+        rows = self.rows(game_id=game_id, market=market)
+        if rows.size == 0:
+            return rows
+
+        line_key = np.nan_to_num(self.line[rows], nan=np.inf) if by_line else np.zeros(rows.size)
+        # lexsort: last key is primary; -price puts the best quote first in each group
+        order = np.lexsort((-self.price[rows], line_key, self.selection_id[rows],
+                            self.market_id[rows], self.game_idx[rows]))
+        ordered = rows[order]
+        keys = np.column_stack((self.game_idx[ordered], self.market_id[ordered],
+                                self.selection_id[ordered], line_key[order]))
+        first = np.ones(ordered.size, dtype=bool)
+        first[1:] = np.any(keys[1:] != keys[:-1], axis=1)
+        return ordered[first]
+
+    def books_for_selection(self, game_id: str, market: str, selection_name: str,
+                            line: Optional[float] = None,
+                            line_tolerance: float = 0.5) -> List[OutcomeQuote]:
+        """
+        Every bookmaker quoting a selection, best price first.
+
+        Rows without a line always match; when line is given, quoted lines must be
+        within line_tolerance of it (the ParlayBuilder matching rule).
+        """
+        rows = self.rows(game_id=game_id, market=market, selection_name=selection_name)
+        if line is not None:
+            quoted = self.line[rows]
+            rows = rows[np.isnan(quoted) | (np.abs(quoted - line) <= line_tolerance)]
+        rows = rows[np.argsort(-self.price[rows], kind="stable")]
+        return self.quotes(rows)
+
+    def unique_rows(self, markets: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        First occurrence of each (game, market, selection, line, book) key, in row order.
+
+        Args:
+            markets: Restrict to these markets (all markets if None)
+        """
+        rows = self.rows(markets=markets) if markets is not None else np.arange(len(self))
+        if rows.size == 0:
+            return rows
+        keys = np.column_stack((
+            self.game_idx[rows], self.market_id[rows], self.selection_id[rows],
+            np.nan_to_num(self.line[rows], nan=np.inf), self.book_id[rows]
+        ))
+        _, first = np.unique(keys, axis=0, return_index=True)
+        return rows[np.sort(first)]
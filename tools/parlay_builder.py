@@ -16,12 +16,17 @@ Key Features:
 from __future__ import annotations
 
 import logging
+import math
+import numpy as np
+from functools import cached_property
 from typing import Dict, List, Optional, Tuple, Any, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import json
 
 from tools.odds_fetcher_tool import OddsFetcherTool, GameOdds, BookOdds, Selection
+from tools.market_snapshot_cache import get_market_snapshot_cache
+from tools.model_registry import ALL_SPORTS, ModelRegistry, get_model_registry
 
 # Import parlay rules engine (JIRA-022) with error handling
 try:
@@ -173,6 +178,96 @@ class ParlayBuilderError(Exception):
     pass
 
 
+# Allowed difference between a leg's line and the quoted line
+LINE_TOLERANCE = 0.5
+
+# (scan position, book position, lowercase bookmaker, book, selection); positions
+# follow snapshot order, so the lowest one is what a linear scan would hit first
+_IndexEntry = Tuple[int, int, str, BookOdds, Selection]
+
+
+class MarketSnapshotIndex:
+    """
+    Hash index over a market snapshot for leg matching.
+
+    Built once per snapshot so validating a leg is a handful of dict lookups
+    instead of a scan over every game, book and selection:
+
+    - by bookmaker: (game_id, market, selection, bookmaker, line bucket)
+    - across bookmakers: (game_id, market, selection), for alternatives
+
+    Selection and bookmaker names are lowercased. Line buckets are
+    LINE_TOLERANCE wide, so any line within tolerance of a leg sits in the
+    leg's bucket or an adjacent one; quotes without a line use the None bucket
+    and match any leg, as in ParlayBuilder._selection_matches.
+    """
+
+    def __init__(self, games: List[GameOdds]):
+        self.games = games
+        self.games_by_id: Dict[str, GameOdds] = {}
+        self._by_book: Dict[Tuple, List[_IndexEntry]] = {}
+        self._by_book_all_lines: Dict[Tuple, List[_IndexEntry]] = {}
+        self._by_selection: Dict[Tuple, List[_IndexEntry]] = {}
+
+        for game in games:
+            # Later duplicates of a game_id win, as with a plain {game_id: game} dict
+            self.games_by_id[game.game_id] = game
+
+        position = block = 0
+        for game in self.games_by_id.values():
+            for book_odds in game.books:
+                bookmaker = book_odds.bookmaker.lower()
+                for selection in book_odds.selections:
+                    entry = (position, block, bookmaker, book_odds, selection)
+                    position += 1
+                    selection_key = (game.game_id, book_odds.market, selection.name.lower())
+                    book_key = selection_key + (bookmaker,)
+                    self._by_book.setdefault(book_key + (self._bucket(selection.line),), []).append(entry)
+                    self._by_book_all_lines.setdefault(book_key, []).append(entry)
+                    self._by_selection.setdefault(selection_key, []).append(entry)
+                block += 1
+
+    @staticmethod
+    def _bucket(line: Optional[float]) -> Optional[int]:
+        return None if line is None else math.floor(line / LINE_TOLERANCE)
+
+    @staticmethod
+    def _line_matches(selection: Selection, leg: ParlayLeg) -> bool:
+        return leg.line is None or selection.line is None or abs(selection.line - leg.line) <= LINE_TOLERANCE
+
+    def find_matching_selection(self, leg: ParlayLeg) -> Optional[Tuple[BookOdds, Selection]]:
+        """Same result as ParlayBuilder._find_matching_selection on the leg's game."""
+        book_key = (leg.game_id, leg.market_type, leg.selection_name.lower(), leg.bookmaker.lower())
+
+        if leg.line is None:
+            candidates = self._by_book_all_lines.get(book_key, [])
+            return (candidates[0][3], candidates[0][4]) if candidates else None
+
+        bucket = self._bucket(leg.line)
+        best: Optional[_IndexEntry] = None
+        for b in (None, bucket - 1, bucket, bucket + 1):
+            for entry in self._by_book.get(book_key + (b,), ()):
+                if self._line_matches(entry[4], leg):
+                    if best is None or entry[0] < best[0]:
+                        best = entry
+                    break  # entries are in snapshot order; the first match is this bucket's earliest
+        return (best[3], best[4]) if best else None
+
+    def find_alternative_bookmakers(self, leg: ParlayLeg) -> List[str]:
+        """Same result as ParlayBuilder._find_alternative_bookmakers on the leg's game."""
+        original = leg.bookmaker.lower()
+        alternatives = []
+        last_block = -1
+        for _, block, bookmaker, book_odds, selection in self._by_selection.get(
+                (leg.game_id, leg.market_type, leg.selection_name.lower()), ()):
+            if block == last_block or bookmaker == original:
+                continue
+            if self._line_matches(selection, leg):
+                alternatives.append(book_odds.bookmaker)
+                last_block = block
+        return alternatives
+
+
 class ParlayBuilder:
     """
     Tool for building and validating parlays against current market availability.
@@ -184,7 +279,9 @@ class ParlayBuilder:
     def __init__(self, sport_key: str = "basketball_nba", 
                  correlation_threshold: float = 0.7,
                  db_path: str = "data/parlays.sqlite",
-                 default_sportsbook: str = "DRAFTKINGS"):
+                 default_sportsbook: str = "DRAFTKINGS",
+                 model_registry: Optional[ModelRegistry] = None,
+                 lazy_models: Optional[bool] = None):
         """
         Initialize ParlayBuilder.
         
@@ -193,13 +290,18 @@ class ParlayBuilder:
             correlation_threshold: Threshold for flagging correlated legs (default: 0.7)
             db_path: Path to SQLite database for correlation model training
             default_sportsbook: Default sportsbook for rules validation (default: DRAFTKINGS)
+            model_registry: Registry to take shared models from (default: process-wide)
+            lazy_models: Load models on first use instead of here
+                (default: the registry's MODEL_REGISTRY_LAZY setting)
         """
         self.sport_key = sport_key
+        self.db_path = db_path
         self.correlation_threshold = correlation_threshold
         self.default_sportsbook = default_sportsbook
         self.odds_fetcher = OddsFetcherTool()
         self._current_market_snapshot: Optional[List[GameOdds]] = None
         self._snapshot_timestamp: Optional[str] = None
+        self._market_index: Optional[MarketSnapshotIndex] = None
         
         # Initialize parlay rules engine (JIRA-022)
         if ParlayRulesEngine:
@@ -212,70 +314,17 @@ class ParlayBuilder:
             self.rules_engine = None
         logger.info("Parlay rules engine initialized for compatibility validation")
         
-        # Initialize correlation model (JIRA-022A)
-        self.correlation_model = None
-        if HAS_CORRELATION_MODEL:
-            try:
-                self.correlation_model = DynamicCorrelationModel(db_path)
-                self.correlation_model.load_model()  # Try to load existing model
-                logger.info("Correlation model initialized for dynamic correlation detection")
-            except Exception as e:
-                logger.warning(f"Failed to initialize correlation model: {e}")
-        
-        # Initialize confidence classifier (JIRA-019)
-        self.confidence_predictor = None
-        self.parlay_strategist = None
-        if HAS_CONFIDENCE_CLASSIFIER:
-            try:
-                self.confidence_predictor = ParlayConfidencePredictor()
-                self.parlay_strategist = EnhancedParlayStrategistAgent(use_injury_classifier=False)
-                logger.info("Confidence classifier and strategist initialized")
-            except Exception as e:
-                logger.warning(f"Could not initialize confidence classifier: {e}")
-        
-        # Initialize prop trainers for EV-based ranking (ML-PROP-001)
-        self.prop_trainers = {}
-        if HAS_PROP_TRAINER:
-            try:
-                # Determine sport from sport_key
-                if "basketball" in sport_key.lower() or "nba" in sport_key.lower():
-                    self.prop_trainers['nba'] = HistoricalPropTrainer("nba")
-                    try:
-                        self.prop_trainers['nba'].load_model()
-                        logger.info("NBA prop trainer loaded for EV-based ranking")
-                    except FileNotFoundError:
-                        logger.info("NBA prop model not found - train with ml_prop_trainer.py first")
-                        
-                elif "football" in sport_key.lower() or "nfl" in sport_key.lower():
-                    self.prop_trainers['nfl'] = HistoricalPropTrainer("nfl")
-                    try:
-                        self.prop_trainers['nfl'].load_model()
-                        logger.info("NFL prop trainer loaded for EV-based ranking")
-                    except FileNotFoundError:
-                        logger.info("NFL prop model not found - train with ml_prop_trainer.py first")
-                        
-                else:
-                    # Load both for multi-sport support
-                    for sport in ['nba', 'nfl']:
-                        self.prop_trainers[sport] = HistoricalPropTrainer(sport)
-                        try:
-                            self.prop_trainers[sport].load_model()
-                            logger.info(f"{sport.upper()} prop trainer loaded")
-                        except FileNotFoundError:
-                            logger.info(f"{sport.upper()} prop model not found - train first")
-                            
-            except Exception as e:
-                logger.warning(f"Failed to initialize prop trainers: {e}")
-                self.prop_trainers = {}
-        
-        # Initialize parlay optimizer (ML-OPTIMIZER-001)
+        # Initialize parlay optimizer (ML-OPTIMIZER-001); kept per builder because
+        # optimize_parlays adjusts its limits
         self.parlay_optimizer = None
         if HAS_PARLAY_OPTIMIZER:
             try:
                 self.parlay_optimizer = ParlayOptimizer(
                     max_legs=5,
                     max_correlation_threshold=0.3,
-                    min_ev_threshold=0.02
+                    min_ev_threshold=0.02,
+                    rules_engine=self.rules_engine,
+                    sportsbook=self.default_sportsbook
                 )
                 logger.info("Parlay optimizer initialized for LP-based optimization")
             except Exception as e:
@@ -283,28 +332,127 @@ class ParlayBuilder:
         else:
             logger.info("Parlay optimizer not available - install PuLP for optimization features")
         
-        # Initialize Q-Learning agent (ML-QLEARNING-001) - experimental
-        self.qlearning_agent = None
-        self.qlearning_enabled = False
-        if HAS_QLEARNING_AGENT:
-            try:
-                config = QLearningConfig()
-                self.qlearning_agent = QLearningParlayAgent(config)
-                
-                # Try to load pre-trained model
-                if self.qlearning_agent.load_model():
-                    self.qlearning_enabled = True
-                    logger.info("Q-Learning parlay agent loaded successfully")
-                else:
-                    logger.info("Q-Learning agent initialized but not trained - train with ml_qlearning_agent.py")
-                    
-            except Exception as e:
-                logger.warning(f"Failed to initialize Q-Learning agent: {e}")
-        else:
-            logger.info("Q-Learning agent not available - install gymnasium and torch for RL features")
+        # Models come from the process-wide registry: each checkpoint is loaded once
+        # and shared by every builder (see tools/model_registry.py)
+        self.model_registry = model_registry or get_model_registry()
+        self.lazy_models = self.model_registry.lazy if lazy_models is None else lazy_models
+        if not self.lazy_models:
+            self.load_models()
         
         logger.info(f"ParlayBuilder initialized for sport: {sport_key}")
-    
+
+    def load_models(self) -> None:
+        """Resolve every shared model now rather than on first use."""
+        for name in ("correlation_model", "confidence_predictor", "parlay_strategist",
+                     "prop_trainers", "qlearning_agent", "qlearning_enabled"):
+            getattr(self, name)
+
+    def _shared_model(self, kind: str, sport: str) -> Any:
+        """Registry instance of a model, swapped in again whenever a new version is promoted."""
+        model = self.model_registry.get(kind, sport)
+        self.model_registry.subscribe(kind, sport, self._swap_model)
+        return model
+
+    def _swap_model(self, kind: str, sport: str, model: Any) -> None:
+        """
+        Registry callback: serve a hot-reloaded model.
+
+        Replacing the reference is atomic; requests that already hold the old
+        instance finish with it.
+        """
+        if kind == "prop_trainer":
+            self.prop_trainers[sport] = model
+        elif kind == "qlearning_agent":
+            self.qlearning_agent = model
+            self.qlearning_enabled = bool(model.is_loaded)
+        else:
+            setattr(self, kind, model)
+        logger.info(f"Swapped new {kind} ({sport}) into ParlayBuilder for {self.sport_key}")
+
+    @cached_property
+    def correlation_model(self) -> Optional[DynamicCorrelationModel]:
+        """Correlation model (JIRA-022A), or None when unavailable."""
+        if not HAS_CORRELATION_MODEL:
+            return None
+        try:
+            if self.db_path == "data/parlays.sqlite":
+                model = self._shared_model("correlation_model", ALL_SPORTS)
+            else:
+                # The shared instance is bound to the default training database
+                model = DynamicCorrelationModel(self.db_path)
+                model.load_model()
+            logger.info("Correlation model initialized for dynamic correlation detection")
+            return model
+        except Exception as e:
+            logger.warning(f"Failed to initialize correlation model: {e}")
+            return None
+
+    @cached_property
+    def confidence_predictor(self) -> Optional[ParlayConfidencePredictor]:
+        """Confidence classifier (JIRA-019), or None when unavailable."""
+        if not HAS_CONFIDENCE_CLASSIFIER:
+            return None
+        try:
+            return self._shared_model("confidence_predictor", ALL_SPORTS)
+        except Exception as e:
+            logger.warning(f"Could not initialize confidence classifier: {e}")
+            return None
+
+    @cached_property
+    def parlay_strategist(self) -> Optional[EnhancedParlayStrategistAgent]:
+        """Strategist used with the confidence classifier (JIRA-019), or None when unavailable."""
+        if not HAS_CONFIDENCE_CLASSIFIER:
+            return None
+        try:
+            strategist = self._shared_model("parlay_strategist", "nba")
+            logger.info("Confidence classifier and strategist initialized")
+            return strategist
+        except Exception as e:
+            logger.warning(f"Could not initialize parlay strategist: {e}")
+            return None
+
+    @cached_property
+    def prop_trainers(self) -> Dict[str, HistoricalPropTrainer]:
+        """Prop trainers for EV-based ranking (ML-PROP-001), keyed by sport."""
+        if not HAS_PROP_TRAINER:
+            return {}
+        sport_key = self.sport_key.lower()
+        if "basketball" in sport_key or "nba" in sport_key:
+            sports = ['nba']
+        elif "football" in sport_key or "nfl" in sport_key:
+            sports = ['nfl']
+        else:
+            sports = ['nba', 'nfl']  # multi-sport support
+        try:
+            # Per-builder dict of shared trainers, so callers may swap entries
+            return {sport: self._shared_model("prop_trainer", sport) for sport in sports}
+        except Exception as e:
+            logger.warning(f"Failed to initialize prop trainers: {e}")
+            return {}
+
+    @cached_property
+    def qlearning_agent(self) -> Optional[QLearningParlayAgent]:
+        """Q-Learning agent (ML-QLEARNING-001, experimental), or None when unavailable."""
+        if not HAS_QLEARNING_AGENT:
+            logger.info("Q-Learning agent not available - install gymnasium and torch for RL features")
+            return None
+        try:
+            agent = self._shared_model("qlearning_agent", ALL_SPORTS)
+            if agent.is_loaded:
+                logger.info("Q-Learning parlay agent loaded successfully")
+            else:
+                logger.info("Q-Learning agent initialized but not trained - train with ml_qlearning_agent.py")
+            return agent
+        except Exception as e:
+            logger.warning(f"Failed to initialize Q-Learning agent: {e}")
+            return None
+
+    @cached_property
+    def qlearning_enabled(self) -> bool:
+        """Whether a pre-trained Q-Learning agent is available."""
+        agent = self.qlearning_agent
+        return bool(agent is not None and agent.is_loaded)
+
     def _get_fresh_market_snapshot(self, regions: str = "us", 
                                  markets: Optional[List[str]] = None) -> List[GameOdds]:
         """
@@ -325,10 +473,9 @@ class ParlayBuilder:
         
         try:
             logger.info(f"Fetching fresh market snapshot for {self.sport_key}")
-            game_odds = self.odds_fetcher.get_game_odds(
-                sport_key=self.sport_key,
-                regions=regions,
-                markets=markets
+            # Shared with every other builder/verifier asking for the same slate
+            game_odds = get_market_snapshot_cache().get(
+                self.sport_key, self.odds_fetcher.get_game_odds, regions, markets
             )
             
             self._current_market_snapshot = game_odds
@@ -343,6 +490,15 @@ class ParlayBuilder:
             logger.error(f"Failed to fetch market snapshot: {e}")
             raise ParlayBuilderError(f"Unable to fetch current market data: {e}")
     
+    def _get_market_index(self, games: List[GameOdds]) -> MarketSnapshotIndex:
+        """
+        Return the leg-matching index for a snapshot, rebuilding it only when
+        the snapshot changes (cache hits hand back the same list object).
+        """
+        if self._market_index is None or self._market_index.games is not games:
+            self._market_index = MarketSnapshotIndex(games)
+        return self._market_index
+    
     def _find_matching_selection(self, leg: ParlayLeg, 
                                game_odds: GameOdds) -> Optional[Tuple[BookOdds, Selection]]:
         """
@@ -388,8 +544,7 @@ class ParlayBuilder:
         
         # For spread/total markets, check if line matches (within tolerance)
         if leg.line is not None and selection.line is not None:
-            line_tolerance = 0.5  # Allow 0.5 point difference
-            if abs(selection.line - leg.line) > line_tolerance:
+            if abs(selection.line - leg.line) > LINE_TOLERANCE:
                 return False
         
         return True
@@ -480,38 +635,30 @@ class ParlayBuilder:
             if bet_node:
                 bet_nodes.append((leg, bet_node))
         
-        # Check pairwise correlations
-        for i, (leg1, node1) in enumerate(bet_nodes):
-            for leg2, node2 in bet_nodes[i+1:]:
-                try:
-                    if self.correlation_model:
-                        # Get feature vectors
-                        features1 = node1.to_feature_vector()
-                        features2 = node2.to_feature_vector()
-                        
-                        # Predict correlation
-                        correlation_score = self.correlation_model.predict_correlation(
-                            features1, features2
-                        )
-                        
-                        # Boost correlation for same-game legs (rule-based enhancement)
-                        if leg1.game_id == leg2.game_id:
-                            correlation_score = max(correlation_score, 0.8)  # Same game = high correlation
-                    else:
-                        # Simple rule-based correlation when no model available
-                        correlation_score = self._simple_correlation_check(leg1, leg2)
-                    
-                    max_correlation = max(max_correlation, correlation_score)
-                    
-                    # Flag high correlations
-                    if correlation_score > self.correlation_threshold:
-                        warning = (f"High correlation detected ({correlation_score:.3f}) between "
-                                 f"{leg1.selection_name} and {leg2.selection_name}")
-                        warnings.append(warning)
-                        logger.warning(warning)
-                    
-                except Exception as e:
-                    logger.debug(f"Correlation check failed for {leg1.selection_name} vs {leg2.selection_name}: {e}")
+        if len(bet_nodes) < 2:
+            return warnings, max_correlation
+        
+        # Score every pair in one batched pass (same-game legs boosted to 0.8)
+        legs = [leg for leg, _ in bet_nodes]
+        try:
+            scores = self.correlation_model.predict_correlation_matrix(
+                [node.to_feature_vector() for _, node in bet_nodes],
+                game_ids=[leg.game_id for leg in legs]
+            )
+        except Exception as e:
+            logger.debug(f"Correlation check failed for {len(legs)} legs: {e}")
+            return warnings, max_correlation
+        
+        upper = np.triu(scores, k=1)
+        max_correlation = max(max_correlation, float(upper.max()))
+        
+        # Flag high correlations
+        for i, j in np.argwhere(upper > self.correlation_threshold):
+            correlation_score = scores[i, j]
+            warning = (f"High correlation detected ({correlation_score:.3f}) between "
+                     f"{legs[i].selection_name} and {legs[j].selection_name}")
+            warnings.append(warning)
+            logger.warning(warning)
         
         return warnings, max_correlation
     
@@ -593,15 +740,15 @@ class ParlayBuilder:
         except Exception as e:
             raise ParlayBuilderError(f"Failed to get market snapshot: {e}")
         
-        # Create game lookup for efficiency
-        games_by_id = {game.game_id: game for game in current_games}
+        # Index is reused across validations until the snapshot refreshes
+        market_index = self._get_market_index(current_games)
         
         valid_legs = []
         invalid_results = []
         
         for leg in potential_legs:
             try:
-                result = self._validate_single_leg(leg, games_by_id)
+                result = self._validate_single_leg(leg, market_index)
                 
                 if result.is_valid:
                     valid_legs.append(leg)
@@ -642,33 +789,31 @@ class ParlayBuilder:
         return validation
     
     def _validate_single_leg(self, leg: ParlayLeg, 
-                           games_by_id: Dict[str, GameOdds]) -> ValidationResult:
+                           market_index: MarketSnapshotIndex) -> ValidationResult:
         """
         Validate a single parlay leg.
         
         Args:
             leg: Parlay leg to validate
-            games_by_id: Dictionary of game odds by game ID
+            market_index: Index over the current market snapshot
             
         Returns:
             ValidationResult for the leg
         """
         # Check if game exists in current markets
-        if leg.game_id not in games_by_id:
+        if leg.game_id not in market_index.games_by_id:
             return ValidationResult(
                 leg=leg,
                 is_valid=False,
                 reason="Game not found in current markets"
             )
         
-        game_odds = games_by_id[leg.game_id]
-        
         # Find matching selection
-        match = self._find_matching_selection(leg, game_odds)
+        match = market_index.find_matching_selection(leg)
         
         if match is None:
             # Find alternative bookmakers
-            alternatives = self._find_alternative_bookmakers(leg, game_odds)
+            alternatives = market_index.find_alternative_bookmakers(leg)
             
             return ValidationResult(
                 leg=leg,
@@ -1064,39 +1209,50 @@ class ParlayBuilder:
             logger.warning("No prop trainers available for EV ranking")
             return [(leg, 0.5, 0.0) for leg in potential_legs[:top_k]]
         
-        ranked_legs = []
-        
-        for leg in potential_legs:
+        # Group legs by sport so each trainer scores its legs in one batch
+        ranked = [None] * len(potential_legs)
+        batches: Dict[str, Tuple[List[int], List[Dict[str, Any]], List[float]]] = {}
+
+        for i, leg in enumerate(potential_legs):
             try:
                 # Determine sport from leg data
                 sport = self._determine_leg_sport(leg)
-                
+
                 if sport not in self.prop_trainers:
                     logger.warning(f"No trainer available for sport: {sport}")
                     continue
-                
-                # Extract features for prediction
-                features = self._extract_prop_features(leg, sport)
-                
-                # Get prediction probability
-                hit_probability = self.prop_trainers[sport].predict(features)
-                
-                # Calculate Expected Value
+
                 odds = leg.get('odds', 2.0)
                 if isinstance(odds, str):
                     # Handle American odds format
                     odds = self._convert_american_to_decimal(odds)
-                
-                # EV = (Probability of Win * Payout) - (Probability of Loss * Stake)
-                payout = odds - 1  # Profit on $1 bet
-                expected_value = (hit_probability * payout) - ((1 - hit_probability) * 1)
-                
-                ranked_legs.append((leg, hit_probability, expected_value))
-                
+
+                indices, features, leg_odds = batches.setdefault(sport, ([], [], []))
+                features.append(self._extract_prop_features(leg, sport))
+                leg_odds.append(float(odds))
+                indices.append(i)
+
             except Exception as e:
                 logger.warning(f"Error calculating EV for leg {leg.get('selection', 'unknown')}: {e}")
-                ranked_legs.append((leg, 0.5, 0.0))
-        
+                ranked[i] = (leg, 0.5, 0.0)
+
+        for sport, (indices, features, leg_odds) in batches.items():
+            try:
+                hit_probabilities = self.prop_trainers[sport].predict_batch(features)
+            except Exception as e:
+                logger.warning(f"Error calculating EV for {len(indices)} {sport} legs: {e}")
+                for i in indices:
+                    ranked[i] = (potential_legs[i], 0.5, 0.0)
+                continue
+
+            # EV = (Probability of Win * Payout) - (Probability of Loss * Stake)
+            payouts = np.asarray(leg_odds) - 1  # Profit on $1 bet
+            expected_values = hit_probabilities * payouts - (1 - hit_probabilities)
+            for i, hit_probability, expected_value in zip(indices, hit_probabilities, expected_values):
+                ranked[i] = (potential_legs[i], float(hit_probability), float(expected_value))
+
+        ranked_legs = [entry for entry in ranked if entry is not None]
+
         # Sort by Expected Value (descending)
         ranked_legs.sort(key=lambda x: x[2], reverse=True)
         
@@ -1251,28 +1407,27 @@ class ParlayBuilder:
     def _enhance_legs_with_predictions(self, candidate_legs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Enhance candidate legs with ML predictions if prop trainers available."""
         enhanced_legs = []
-        
+        batches: Dict[str, Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+
         for leg in candidate_legs:
             enhanced_leg = leg.copy()
-            
+
             # Add ML prediction if not present and prop trainer available
             if 'predicted_prob' not in enhanced_leg:
                 sport = enhanced_leg.get('sport', 'nba').lower()
                 if sport in self.prop_trainers:
                     try:
-                        # Extract features and predict
+                        # Queue the leg for its sport's batch prediction
                         features = self._extract_prop_features_from_leg(enhanced_leg, sport)
-                        predicted_prob = self.prop_trainers[sport].predict(features)
-                        enhanced_leg['predicted_prob'] = predicted_prob
-                        
-                        logger.debug(f"Enhanced {leg.get('leg_id', 'unknown')} with ML prediction: {predicted_prob:.3f}")
-                        
+                        legs, rows = batches.setdefault(sport, ([], []))
+                        legs.append(enhanced_leg)
+                        rows.append(features)
                     except Exception as e:
                         logger.warning(f"Failed to enhance leg with ML prediction: {e}")
                         enhanced_leg['predicted_prob'] = 0.5  # Default 50%
                 else:
                     enhanced_leg['predicted_prob'] = 0.5  # Default 50%
-            
+
             # Ensure all required fields are present
             enhanced_leg.setdefault('sport', 'nba')
             enhanced_leg.setdefault('market_type', 'points')
@@ -1282,7 +1437,17 @@ class ParlayBuilder:
             enhanced_leg.setdefault('bookmaker', 'draftkings')
             
             enhanced_legs.append(enhanced_leg)
-        
+
+        for sport, (legs, rows) in batches.items():
+            try:
+                predicted_probs = self.prop_trainers[sport].predict_batch(rows)
+            except Exception as e:
+                logger.warning(f"Failed to enhance {len(legs)} {sport} legs with ML predictions: {e}")
+                predicted_probs = [0.5] * len(legs)  # Default 50%
+            for enhanced_leg, predicted_prob in zip(legs, predicted_probs):
+                enhanced_leg['predicted_prob'] = float(predicted_prob)
+            logger.debug(f"Enhanced {len(legs)} {sport} legs with ML predictions")
+
         return enhanced_legs
     
     def _extract_prop_features_from_leg(self, leg: Dict[str, Any], sport: str) -> Dict[str, Any]:
@@ -12,7 +12,10 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List
 
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from tools.inference_service import InferenceService, get_inference_service
+from tools.model_export import resolve_backend
+from tools.model_registry import artifact_version
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -26,17 +29,23 @@ class ParlayConfidencePredictor:
     confidence levels from parlay reasoning text.
     """
     
-    def __init__(self, model_path: str = "models/parlay_confidence_classifier"):
+    def __init__(self, model_path: str = "models/parlay_confidence_classifier",
+                 fast_inference: bool = False):
         """
         Initialize the confidence predictor.
         
         Args:
             model_path: Path to the trained model directory
+            fast_inference: Serve the int8/ONNX CPU export (tools/model_export.py)
+                when one passed parity, instead of the fp32 model
         """
         self.model_path = Path(model_path)
         self.model = None
         self.tokenizer = None
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self._inference: Optional[InferenceService] = None
+        self.fast_inference = fast_inference
+        self.backend = "fp32"
+        self.device = torch.device('cpu' if fast_inference or not torch.cuda.is_available() else 'cuda')
         self.is_loaded = False
         
         # Label mappings (will be loaded from model metadata)
@@ -52,11 +61,14 @@ class ParlayConfidencePredictor:
             raise FileNotFoundError(f"Model not found at {self.model_path}")
         
         try:
-            # Load tokenizer and model
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_path)
-            self.model = AutoModelForSequenceClassification.from_pretrained(self.model_path)
-            self.model.to(self.device)
-            self.model.eval()
+            # Load tokenizer and model once per process; predictors share the batching service
+            if self.fast_inference:
+                self.backend = resolve_backend(str(self.model_path))
+            self._inference = get_inference_service(str(self.model_path), max_length=512, device=self.device,
+                                                    backend=self.backend,
+                                                    version=artifact_version([self.model_path]))
+            self.model = self._inference.model
+            self.tokenizer = self._inference.tokenizer
             
             # Load training metadata if available
             metadata_path = self.model_path / "training_metadata.json"
@@ -74,10 +86,31 @@ class ParlayConfidencePredictor:
             logger.error(f"Failed to load model: {e}")
             raise
     
+    def _format_prediction(self, probabilities, return_probabilities: bool = True) -> Dict[str, Any]:
+        """Prediction dict from one softmax probability row."""
+        predicted_label = self.id2label[int(probabilities.argmax())]
+        confidence_scores = {
+            "low_confidence": float(probabilities[0]),
+            "high_confidence": float(probabilities[1])
+        }
+        
+        result = {
+            "predicted_confidence": predicted_label,
+            "max_confidence_score": max(confidence_scores.values()),
+            "prediction_certainty": abs(confidence_scores["high_confidence"] - 0.5) * 2  # 0-1 scale
+        }
+        
+        if return_probabilities:
+            result["confidence_probabilities"] = confidence_scores
+        
+        return result
+    
     def predict(self, reasoning_text: str, return_probabilities: bool = True) -> Dict[str, Any]:
         """
         Predict confidence level for parlay reasoning text.
         
+        Concurrent callers are micro-batched by the shared inference service.
+        
         Args:
             reasoning_text: The parlay reasoning text to analyze
             return_probabilities: Whether to return confidence probabilities
@@ -92,47 +125,24 @@ class ParlayConfidencePredictor:
             raise ValueError("Reasoning text cannot be empty")
         
         try:
-            # Tokenize the input
-            inputs = self.tokenizer(
-                reasoning_text,
-                truncation=True,
-                max_length=512,
-                padding=True,
-                return_tensors="pt"
-            )
-            
-            # Move to device
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # Make prediction
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
-                probabilities = torch.softmax(logits, dim=-1)
-                prediction = torch.argmax(logits, dim=-1)
-            
-            # Prepare results
-            predicted_label = self.id2label[prediction.item()]
-            confidence_scores = {
-                "low_confidence": probabilities[0][0].item(),
-                "high_confidence": probabilities[0][1].item()
-            }
-            
-            result = {
-                "predicted_confidence": predicted_label,
-                "max_confidence_score": max(confidence_scores.values()),
-                "prediction_certainty": abs(confidence_scores["high_confidence"] - 0.5) * 2  # 0-1 scale
-            }
-            
-            if return_probabilities:
-                result["confidence_probabilities"] = confidence_scores
-            
-            return result
+            probabilities = self._inference.predict(reasoning_text)
+            return self._format_prediction(probabilities, return_probabilities)
             
         except Exception as e:
             logger.error(f"Prediction failed: {e}")
             raise
     
+    async def predict_async(self, reasoning_text: str, return_probabilities: bool = True) -> Dict[str, Any]:
+        """Async predict: awaits the shared batch without blocking the event loop."""
+        if not self.is_loaded:
+            self.load_model()
+        
+        if not reasoning_text.strip():
+            raise ValueError("Reasoning text cannot be empty")
+        
+        probabilities = await self._inference.predict_async(reasoning_text)
+        return self._format_prediction(probabilities, return_probabilities)
+    
     def predict_batch(self, reasoning_texts: List[str], 
                      batch_size: int = 16) -> List[Dict[str, Any]]:
         """
@@ -140,7 +150,8 @@ class ParlayConfidencePredictor:
         
         Args:
             reasoning_texts: List of reasoning texts to analyze
-            batch_size: Batch size for processing
+            batch_size: Unused; batch size is the inference service's
+                max_batch_size (INFERENCE_MAX_BATCH_SIZE)
             
         Returns:
             List of prediction results
@@ -151,47 +162,8 @@ class ParlayConfidencePredictor:
         if not reasoning_texts:
             return []
         
-        results = []
-        
-        for i in range(0, len(reasoning_texts), batch_size):
-            batch_texts = reasoning_texts[i:i + batch_size]
-            
-            # Tokenize batch
-            inputs = self.tokenizer(
-                batch_texts,
-                truncation=True,
-                max_length=512,
-                padding=True,
-                return_tensors="pt"
-            )
-            
-            # Move to device
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # Make predictions
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
-                probabilities = torch.softmax(logits, dim=-1)
-                predictions = torch.argmax(logits, dim=-1)
-            
-            # Process batch results
-            for j, (pred, probs) in enumerate(zip(predictions, probabilities)):
-                predicted_label = self.id2label[pred.item()]
-                confidence_scores = {
-                    "low_confidence": probs[0].item(),
-                    "high_confidence": probs[1].item()
-                }
-                
-                result = {
-                    "predicted_confidence": predicted_label,
-                    "max_confidence_score": max(confidence_scores.values()),
-                    "prediction_certainty": abs(confidence_scores["high_confidence"] - 0.5) * 2,
-                    "confidence_probabilities": confidence_scores
-                }
-                results.append(result)
-        
-        return results
+        probabilities = self._inference.predict_many(reasoning_texts)
+        return [self._format_prediction(row) for row in probabilities]
     
     def analyze_parlay_reasoning(self, reasoning_text: str) -> Dict[str, Any]:
         """
@@ -267,10 +239,12 @@ class ParlayConfidencePredictor:
             "status": "Model loaded",
             "model_path": str(self.model_path),
             "device": str(self.device),
-            "label_mapping": self.id2label,
-            "num_parameters": sum(p.numel() for p in self.model.parameters()),
-            "trainable_parameters": sum(p.numel() for p in self.model.parameters() if p.requires_grad)
+            "backend": self.backend,
+            "label_mapping": self.id2label
         }
+        if hasattr(self.model, "parameters"):  # ONNX Runtime sessions have none
+            info["num_parameters"] = sum(p.numel() for p in self.model.parameters())
+            info["trainable_parameters"] = sum(p.numel() for p in self.model.parameters() if p.requires_grad)
         
         # Add training metadata if available
         metadata_path = self.model_path / "training_metadata.json"
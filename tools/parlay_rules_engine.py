@@ -18,12 +18,16 @@ from __future__ import annotations
 
 import json
 import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Set, Any, Union
+from typing import Callable, Dict, List, Tuple, Optional, Set, Any, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import re
 
+import numpy as np
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -89,16 +93,20 @@ class ParlayRulesEngine:
     comprehensive validation with detailed violation reporting.
     """
     
-    def __init__(self, config_dir: str = "config"):
+    def __init__(self, config_dir: str = "config", use_compiled_rules: bool = True):
         """
         Initialize the rules engine.
         
         Args:
             config_dir: Directory containing sport configuration JSON files
+            use_compiled_rules: Validate with the precompiled rule matcher
+                (False re-interprets the JSON rules for every parlay)
         """
         self.config_dir = Path(config_dir)
         self.sport_configs: Dict[str, Dict] = {}
         self.loaded_sports: Set[str] = set()
+        self.use_compiled_rules = use_compiled_rules
+        self._compiled_rules: Dict[str, CompiledRuleSet] = {}
         
         logger.info(f"ParlayRulesEngine initialized with config directory: {config_dir}")
     
@@ -193,12 +201,17 @@ class ParlayRulesEngine:
         warnings = []
         correlation_tax = 1.0
         
-        # Apply exclusion rules
-        exclusion_violations = self.apply_exclusion_rules(legs, config)
+        if self.use_compiled_rules:
+            # Exclusion and correlation rules in one pass over featurized legs
+            exclusion_violations, correlation_violations, tax_multiplier = \
+                self.get_compiled_rules(sport).evaluate(legs)
+        else:
+            # Apply exclusion rules
+            exclusion_violations = self.apply_exclusion_rules(legs, config)
+            
+            # Evaluate correlation rules
+            correlation_violations, tax_multiplier = self.evaluate_correlation_rules(legs, config)
         violations.extend(exclusion_violations)
-        
-        # Evaluate correlation rules
-        correlation_violations, tax_multiplier = self.evaluate_correlation_rules(legs, config)
         violations.extend(correlation_violations)
         correlation_tax *= tax_multiplier
         
@@ -662,7 +675,105 @@ class ParlayRulesEngine:
         """
         result = self.validate_parlay(legs, sport, sportsbook)
         return result.is_valid, result.get_rejection_reason() or "Valid parlay"
-    
+
+    def validate_many(self, candidate_parlays: List[List[Dict[str, Any]]],
+                      sport: str,
+                      sportsbook: str = "DRAFTKINGS",
+                      processes: Optional[int] = None,
+                      chunk_size: int = 10_000) -> List[ValidationResult]:
+        """
+        Validate a batch of candidate parlays drawn from a shared pool of legs.
+
+        Results match validate_parlay for every candidate, but the config is
+        looked up once, nothing is logged per parlay, and the rules matching
+        each distinct leg pair are computed once (see LegPairTable) and then
+        reused by every candidate containing that pair.
+
+        Args:
+            candidate_parlays: Candidate parlays, each a list of legs
+            sport: Sport identifier
+            sportsbook: Target sportsbook for sportsbook-specific rules
+            processes: Worker processes for very large batches; batches longer
+                than chunk_size are split into chunks of chunk_size, each
+                validated with its own pair table in a child process
+            chunk_size: Candidates per worker chunk
+
+        Returns:
+            One ValidationResult per candidate, in order
+        """
+        try:
+            config = self.load_rules(sport)
+        except (FileNotFoundError, ValueError) as e:
+            return [ValidationResult(is_valid=False, warnings=[f"Failed to load {sport} rules: {e}"], sport=sport)
+                    for _ in candidate_parlays]
+
+        if not self.use_compiled_rules:
+            return [self.validate_parlay(legs, sport, sportsbook) for legs in candidate_parlays]
+
+        if processes and processes > 1 and len(candidate_parlays) > chunk_size:
+            chunks = [candidate_parlays[start:start + chunk_size]
+                      for start in range(0, len(candidate_parlays), chunk_size)]
+            n = len(chunks)
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                chunk_results = executor.map(_validate_many_chunk, [str(self.config_dir)] * n, [sport] * n,
+                                             [config] * n, [sportsbook] * n, chunks)
+                results = [result for chunk in chunk_results for result in chunk]
+            logger.info(f"Validated {len(results)} {sport.upper()} parlays in {n} chunks "
+                        f"across {processes} processes")
+            return results
+
+        compiled = self.get_compiled_rules(sport)
+        table = compiled.pair_table()
+        results = []
+        for legs in candidate_parlays:
+            if not legs:
+                results.append(ValidationResult(is_valid=False, warnings=["No legs provided for validation"],
+                                                sport=sport))
+                continue
+            if len(legs) < 2:
+                results.append(ValidationResult(is_valid=False, warnings=["Parlay must have at least 2 legs"],
+                                                sport=sport))
+                continue
+
+            exclusion_violations, correlation_violations, tax_multiplier = \
+                compiled.evaluate_pair_table(table, legs)
+            sportsbook_violations, warnings = self._check_sportsbook_rules(legs, sportsbook, config)
+            violations = exclusion_violations + correlation_violations + sportsbook_violations
+
+            results.append(ValidationResult(
+                is_valid=not any(v.severity == ValidationLevel.HARD_BLOCK for v in violations),
+                violations=violations,
+                warnings=warnings,
+                correlation_tax_multiplier=1.0 * tax_multiplier,
+                sport=sport
+            ))
+
+        rejected = sum(not result.is_valid for result in results)
+        logger.info(f"Validated {len(results)} {sport.upper()} parlays from a {len(table)} leg pool "
+                    f"for {sportsbook}: {rejected} rejected")
+        return results
+
+    def compatibility_matrix(self, legs: List[Dict[str, Any]], sport: str) -> np.ndarray:
+        """
+        Pairwise leg compatibility for a candidate pool.
+
+        Args:
+            legs: Candidate legs
+            sport: Sport identifier
+
+        Returns:
+            Boolean len(legs) x len(legs) matrix, False where a HARD_BLOCK
+            exclusion or correlation rule forbids parlaying the two legs
+            (sportsbook limits are per parlay and not reflected)
+
+        Raises:
+            FileNotFoundError: If sport config file doesn't exist
+            ValueError: If config file is invalid
+        """
+        table = self.get_compiled_rules(sport).pair_table()
+        index = [table.index_of(leg) for leg in legs]
+        return table.compatibility_matrix()[np.ix_(index, index)]
+
     def get_supported_sports(self) -> List[str]:
         """Get list of supported sports based on available config files."""
         sports = []
@@ -671,6 +782,472 @@ class ParlayRulesEngine:
             sports.append(sport_name)
         return sorted(sports)
 
+    def get_compiled_rules(self, sport: str) -> CompiledRuleSet:
+        """
+        Compiled form of a sport's rules (built on first use, rebuilt if the config is reloaded).
+
+        Args:
+            sport: Sport identifier
+
+        Returns:
+            CompiledRuleSet for the sport
+
+        Raises:
+            FileNotFoundError: If sport config file doesn't exist
+            ValueError: If config file is invalid
+        """
+        config = self.load_rules(sport)
+        compiled = self._compiled_rules.get(sport.lower())
+        if compiled is None or compiled.config is not config:
+            compiled = CompiledRuleSet(self, config)
+            self._compiled_rules[sport.lower()] = compiled
+        return compiled
+
+
+# Per-leg features reused by every rule: (condition bitmask, team, player, is_over, is_under)
+_LegFeatures = Tuple[int, Optional[str], Optional[str], bool, bool]
+
+
+@dataclass
+class _CompiledRule:
+    """One parlay rule reduced to condition bitmasks and a constraint predicate."""
+    rule: Dict[str, Any]
+    mode: Optional[str]            # 'pair' (two 'all' conditions), 'all', 'any' or None (never matches)
+    mask: int                      # bits of all the rule's conditions
+    required: int                  # 'pair'/'all' prefilter: seen bits & mask must equal this (-1: never)
+    mask_a: int                    # 'pair' mode: first / second condition bit
+    mask_b: int
+    constraint: Callable[[_LegFeatures, _LegFeatures, Any, Any], bool]
+    severity: ValidationLevel
+    tag: ViolationTag
+    multiplier: float = 1.0
+    suggested_action: str = ""
+
+
+class CompiledRuleSet:
+    """
+    A sport's rules compiled for repeated validation.
+
+    The interpreted path re-reads the JSON rule dicts for every leg pair and
+    re-runs the team/player regexes for every constraint. Here each distinct
+    rule condition gets one bit; a leg is featurized once into a condition
+    bitmask plus its interned team, player and over/under flags (memoized by
+    market and selection across parlays), so pair checks are integer mask
+    tests and string identity comparisons. Results, including violation
+    order, are identical to ParlayRulesEngine.apply_exclusion_rules followed
+    by evaluate_correlation_rules.
+    """
+
+    max_cached_legs = 100_000
+
+    def __init__(self, engine: ParlayRulesEngine, config: Dict[str, Any]):
+        """
+        Compile a sport configuration.
+
+        Args:
+            engine: Engine supplying condition matching, name extraction and identifiers
+            config: Sport configuration as returned by load_rules
+        """
+        self.engine = engine
+        self.config = config
+
+        self._conditions: List[Dict[str, Any]] = []
+        self._condition_bits: Dict[str, int] = {}
+        self._leg_cache: Dict[Tuple[Any, Any], _LegFeatures] = {}
+
+        self.exclusion_rules = [self._compile_rule(rule) for rule in config['parlay_rules']
+                                if rule['type'] == 'EXCLUSION']
+        self.correlation_rules = [self._compile_rule(rule) for rule in config['parlay_rules']
+                                  if rule['type'] == 'CORRELATION']
+        # Exclusion rules then correlation rules: the order evaluate() reports violations in
+        self.rules = self.exclusion_rules + self.correlation_rules
+
+    def _condition_bit(self, condition: Dict[str, Any]) -> int:
+        key = json.dumps(condition, sort_keys=True)
+        if key not in self._condition_bits:
+            self._condition_bits[key] = 1 << len(self._conditions)
+            self._conditions.append(condition)
+        return self._condition_bits[key]
+
+    def _compile_rule(self, rule: Dict[str, Any]) -> _CompiledRule:
+        conditions = rule['conditions']
+        is_exclusion = rule['type'] == 'EXCLUSION'
+
+        mode, bits = None, []
+        if 'all' in conditions:
+            bits = [self._condition_bit(c) for c in conditions['all']]
+            mode = 'pair' if len(bits) == 2 else 'all'
+        elif 'any' in conditions and is_exclusion:
+            bits = [self._condition_bit(c) for c in conditions['any']]
+            mode = 'any'
+
+        if is_exclusion:
+            severity = ValidationLevel.HARD_BLOCK if rule.get('severity') == 'HARD_BLOCK' else ValidationLevel.SOFT_BLOCK
+            multiplier = 1.0
+        else:
+            severity = {
+                'HARD_BLOCK': ValidationLevel.HARD_BLOCK,
+                'SOFT_BLOCK': ValidationLevel.SOFT_BLOCK,
+                'WARNING': ValidationLevel.WARNING
+            }.get(rule.get('severity', 'WARNING'), ValidationLevel.WARNING)
+            multiplier = rule.get('correlation_adjustment', {}).get('multiplier', 1.0)
+
+        mask = 0
+        for bit in bits:
+            mask |= bit
+        return _CompiledRule(
+            rule=rule,
+            mode=mode,
+            mask=mask,
+            required=-1 if mode is None else mask,
+            mask_a=bits[0] if mode == 'pair' else 0,
+            mask_b=bits[1] if mode == 'pair' else 0,
+            constraint=self._compile_constraints(rule['constraints']),
+            severity=severity,
+            tag=self.engine._get_violation_tag(rule),
+            multiplier=multiplier,
+            suggested_action=("Remove one of the conflicting legs" if is_exclusion
+                              else f"Correlation adjustment applied (multiplier: {multiplier:.3f})")
+        )
+
+    @staticmethod
+    def _compile_constraints(constraints: Dict[str, Any]) -> Callable[[_LegFeatures, _LegFeatures, Any, Any], bool]:
+        """Predicate (features1, features2, game_id1, game_id2) equivalent to ParlayRulesEngine._check_constraints."""
+        same_game = bool(constraints.get('same_game'))
+        same_team = bool(constraints.get('same_team'))
+        opposite_teams = bool(constraints.get('opposite_teams'))
+        same_player = bool(constraints.get('same_player'))
+        different_players = bool(constraints.get('different_players'))
+        opposite_selections = bool(constraints.get('opposite_selections'))
+
+        def check(f1: _LegFeatures, f2: _LegFeatures, game1: Any, game2: Any) -> bool:
+            if same_game and game1 != game2:
+                return False
+            if same_team:
+                if f1[1] and f2[1]:
+                    if f1[1] != f2[1]:
+                        return False
+                elif not (game1 and game2 and game1 == game2):
+                    # No explicit teams: only a shared (non-empty) game implies the same teams
+                    return False
+            if opposite_teams and (not f1[1] or not f2[1] or f1[1] == f2[1]):
+                return False
+            if same_player and (not f1[2] or not f2[2] or f1[2] != f2[2]):
+                return False
+            if different_players and f1[2] and f2[2] and f1[2] == f2[2]:
+                return False
+            if opposite_selections:
+                return (f1[3] and f2[4]) or (f1[4] and f2[3])
+            return True
+
+        return check
+
+    def featurize(self, leg: Dict[str, Any]) -> _LegFeatures:
+        """Condition bitmask and interned team/player/over/under flags for one leg."""
+        key = (leg.get('market_type'), leg.get('selection_name', ''))
+        features = self._leg_cache.get(key)
+        if features is None:
+            mask = 0
+            for condition, bit in zip(self._conditions, self._condition_bits.values()):
+                if self.engine._leg_matches_condition(leg, condition, self.config):
+                    mask |= bit
+            team = self.engine._extract_team_name(leg)
+            player = self.engine._extract_player_name(leg)
+            selection = (key[1] or '').upper()
+            features = (
+                mask,
+                sys.intern(team) if team else None,
+                sys.intern(player) if player else None,
+                'OVER' in selection,
+                'UNDER' in selection
+            )
+            if len(self._leg_cache) >= self.max_cached_legs:
+                self._leg_cache.clear()
+            self._leg_cache[key] = features
+        return features
+
+    def evaluate(self, legs: List[Dict[str, Any]]) -> Tuple[List[RuleViolation], List[RuleViolation], float]:
+        """
+        Apply every exclusion and correlation rule to a parlay.
+
+        Args:
+            legs: Parlay legs
+
+        Returns:
+            Tuple of (exclusion violations, correlation violations, correlation tax multiplier)
+        """
+        cached = self._leg_cache.get
+        features = [cached((leg.get('market_type'), leg.get('selection_name', ''))) or self.featurize(leg)
+                    for leg in legs]
+        games = [leg.get('game_id') for leg in legs]
+
+        # Which condition bits appear at all, and which appear on two or more legs
+        seen, seen_twice = 0, 0
+        for f in features:
+            seen_twice |= seen & f[0]
+            seen |= f[0]
+
+        exclusion_violations = []
+        for rule in self.exclusion_rules:
+            # Skip rules needing a condition no leg matches ('any': no condition on two legs)
+            if rule.mode == 'any':
+                if not seen_twice & rule.mask:
+                    continue
+            elif seen & rule.mask != rule.required:
+                continue
+            for i, j in self._matching_pairs(rule, features, games):
+                exclusion_violations.append(self._violation(
+                    rule, self.engine._get_leg_identifier(legs[i]), self.engine._get_leg_identifier(legs[j])))
+
+        correlation_violations = []
+        correlation_tax = 1.0
+        for rule in self.correlation_rules:
+            if rule.mode == 'any':
+                if not seen_twice & rule.mask:
+                    continue
+            elif seen & rule.mask != rule.required:
+                continue
+            rule_tax = 1.0
+            for i, j in self._matching_pairs(rule, features, games):
+                rule_tax *= rule.multiplier
+                correlation_violations.append(self._violation(
+                    rule, self.engine._get_leg_identifier(legs[i]), self.engine._get_leg_identifier(legs[j])))
+            correlation_tax *= rule_tax
+
+        return exclusion_violations, correlation_violations, correlation_tax
+
+    @staticmethod
+    def _violation(rule: _CompiledRule, leg1_identifier: str, leg2_identifier: str) -> RuleViolation:
+        """RuleViolation for a leg pair matching a compiled exclusion or correlation rule."""
+        if rule.rule['type'] == 'EXCLUSION':
+            return RuleViolation(
+                rule_id=rule.rule['ruleId'],
+                rule_type="EXCLUSION",
+                severity=rule.severity,
+                description=rule.rule['description'],
+                leg1_identifier=leg1_identifier,
+                leg2_identifier=leg2_identifier,
+                suggested_action=rule.suggested_action,
+                tags=[rule.tag]
+            )
+        return RuleViolation(
+            rule_id=rule.rule['ruleId'],
+            rule_type="CORRELATION",
+            severity=rule.severity,
+            description=rule.rule['description'],
+            leg1_identifier=leg1_identifier,
+            leg2_identifier=leg2_identifier,
+            correlation_score=1.0 - rule.multiplier,
+            correlation_multiplier=rule.multiplier,
+            suggested_action=rule.suggested_action,
+            tags=[rule.tag]
+        )
+
+    def pair_table(self) -> LegPairTable:
+        """Empty LegPairTable for a new candidate pool."""
+        return LegPairTable(self)
+
+    def evaluate_pair_table(self, table: LegPairTable,
+                            legs: List[Dict[str, Any]]) -> Tuple[List[RuleViolation], List[RuleViolation], float]:
+        """
+        Same result as evaluate(legs), read from a pool's pairwise rule matches.
+
+        Args:
+            table: Pair table shared by every parlay drawn from the pool
+            legs: Parlay legs
+
+        Returns:
+            Tuple of (exclusion violations, correlation violations, correlation tax multiplier)
+        """
+        index = table.indices(legs)
+        if len(set(index)) < len(index):
+            # A leg repeated within one parlay pairs with itself: not in the table
+            return self.evaluate(legs)
+
+        # Only legs matching some rule condition can be part of a violation
+        active = [i for i, a in enumerate(index) if table.in_any_rule[a]]
+        if len(active) < 2:
+            return [], [], 1.0
+
+        # (rule position, i, j) in pair order; a stable sort by rule gives evaluate()'s order
+        hits = []
+        pairs = table.pairs
+        for x, i in enumerate(active):
+            a = index[i]
+            for j in active[x + 1:]:
+                b = index[j]
+                key = (a, b) if a < b else (b, a)
+                matched = pairs.get(key)
+                if matched is None:
+                    matched = table.rules_between(a, b)
+                for position in matched:
+                    hits.append((position, i, j))
+        if not hits:
+            return [], [], 1.0
+        hits.sort(key=lambda hit: hit[0])
+
+        exclusion_violations = []
+        correlation_violations = []
+        correlation_tax = 1.0
+        rule_tax, current = 1.0, None
+        n_exclusion = len(self.exclusion_rules)
+        identifier = table.identifier
+        for position, i, j in hits:
+            rule = self.rules[position]
+            violation = self._violation(rule, identifier(index[i]), identifier(index[j]))
+            if position < n_exclusion:
+                exclusion_violations.append(violation)
+                continue
+            if position != current:
+                correlation_tax *= rule_tax
+                rule_tax, current = 1.0, position
+            rule_tax *= rule.multiplier
+            correlation_violations.append(violation)
+        correlation_tax *= rule_tax
+
+        return exclusion_violations, correlation_violations, correlation_tax
+
+    def pair_rules(self, f1: _LegFeatures, f2: _LegFeatures, game1: Any, game2: Any) -> Tuple[int, ...]:
+        """
+        Positions in self.rules of every rule matching one leg pair.
+
+        Rule conditions and constraints are symmetric, so the pair's order does not matter.
+        """
+        m1, m2 = f1[0], f2[0]
+        matched = []
+        for position, rule in enumerate(self.rules):
+            mask = rule.mask
+            if not (m1 & mask and m2 & mask):
+                continue
+            mode = rule.mode
+            if mode == 'pair':
+                hit = (m1 & rule.mask_a and m2 & rule.mask_b) or (m1 & rule.mask_b and m2 & rule.mask_a)
+            elif mode == 'all':
+                hit = (m1 | m2) & mask == mask
+            else:
+                hit = m1 & m2 & mask
+            if hit and rule.constraint(f1, f2, game1, game2):
+                matched.append(position)
+        return tuple(matched)
+
+    @staticmethod
+    def _matching_pairs(rule: _CompiledRule, features: List[_LegFeatures], games: List[Any]) -> List[Tuple[int, int]]:
+        """Index pairs (i < j, in order) matching the rule's conditions and constraints."""
+        mode, mask, mask_a, mask_b, constraint = rule.mode, rule.mask, rule.mask_a, rule.mask_b, rule.constraint
+        pairs = []
+        n = len(features)
+        for i in range(n):
+            f1 = features[i]
+            m1 = f1[0]
+            if not m1 & mask:
+                continue
+            for j in range(i + 1, n):
+                f2 = features[j]
+                m2 = f2[0]
+                if mode == 'pair':
+                    matched = (m1 & mask_a and m2 & mask_b) or (m1 & mask_b and m2 & mask_a)
+                elif mode == 'all':
+                    matched = (m1 | m2) & mask == mask and m2 & mask
+                else:
+                    matched = m1 & m2 & mask
+                if matched and constraint(f1, f2, games[i], games[j]):
+                    pairs.append((i, j))
+        return pairs
+
+
+class LegPairTable:
+    """
+    Pairwise rule matches for one pool of candidate legs.
+
+    Optimizers draw thousands of parlays from the same few dozen legs, so
+    each distinct leg pair recurs across many candidates. Legs are keyed by
+    (game_id, market_type, selection_name) - everything rule matching reads -
+    and each pair's matching rules are computed once, on first use, then
+    reused by every parlay containing both legs.
+    """
+
+    def __init__(self, rules: CompiledRuleSet):
+        """
+        Args:
+            rules: Compiled rules of the pool's sport
+        """
+        self.rules = rules
+        self._index: Dict[Tuple[Any, Any, Any], int] = {}
+        self._by_id: Dict[int, Tuple[Dict[str, Any], int]] = {}
+        self._features: List[_LegFeatures] = []
+        self._games: List[Any] = []
+        self._identifiers: List[str] = []
+        self.in_any_rule: List[bool] = []
+        self.pairs: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def index_of(self, leg: Dict[str, Any]) -> int:
+        """Pool index of a leg, adding it to the pool on first sight."""
+        # Candidates usually share the pool's leg objects; the stored leg guards against id reuse
+        seen = self._by_id.get(id(leg))
+        if seen is not None and seen[0] is leg:
+            return seen[1]
+        key = (leg.get('game_id'), leg.get('market_type'), leg.get('selection_name', ''))
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self._features)
+            self._features.append(self.rules.featurize(leg))
+            self._games.append(key[0])
+            self._identifiers.append(self.rules.engine._get_leg_identifier(leg))
+            self.in_any_rule.append(bool(self._features[index][0]))
+        self._by_id[id(leg)] = (leg, index)
+        return index
+
+    def indices(self, legs: List[Dict[str, Any]]) -> List[int]:
+        """Pool indices of a parlay's legs."""
+        by_id = self._by_id
+        indices = []
+        for leg in legs:
+            seen = by_id.get(id(leg))
+            indices.append(seen[1] if seen is not None and seen[0] is leg else self.index_of(leg))
+        return indices
+
+    def identifier(self, index: int) -> str:
+        """Violation identifier of a pool leg."""
+        return self._identifiers[index]
+
+    def rules_between(self, a: int, b: int) -> Tuple[int, ...]:
+        """Positions in CompiledRuleSet.rules of the rules matching pool legs a and b (a != b)."""
+        key = (a, b) if a < b else (b, a)
+        matched = self.pairs.get(key)
+        if matched is None:
+            i, j = key
+            matched = self.pairs[key] = self.rules.pair_rules(
+                self._features[i], self._features[j], self._games[i], self._games[j])
+        return matched
+
+    def compatibility_matrix(self) -> np.ndarray:
+        """
+        Boolean pool x pool matrix, False where a HARD_BLOCK rule matches the pair.
+
+        The diagonal is True; cost is one rules_between call per unseen pair.
+        """
+        n = len(self._features)
+        compatible = np.ones((n, n), dtype=bool)
+        rules = self.rules.rules
+        for a in range(n):
+            for b in range(a + 1, n):
+                if any(rules[position].severity == ValidationLevel.HARD_BLOCK
+                       for position in self.rules_between(a, b)):
+                    compatible[a, b] = compatible[b, a] = False
+        return compatible
+
+
+def _validate_many_chunk(config_dir: str, sport: str, config: Dict[str, Any], sportsbook: str,
+                         candidate_parlays: List[List[Dict[str, Any]]]) -> List[ValidationResult]:
+    """validate_many worker: one chunk of candidates in a child process."""
+    engine = ParlayRulesEngine(config_dir)
+    engine.sport_configs[sport.lower()] = config
+    engine.loaded_sports.add(sport.lower())
+    return engine.validate_many(candidate_parlays, sport, sportsbook)
+
 
 def create_sample_nfl_legs() -> List[Dict[str, Any]]:
     """Create sample NFL legs for testing."""
@@ -16,12 +16,14 @@ from __future__ import annotations
 
 import logging
 import random
+import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import json
 
 from tools.odds_fetcher_tool import GameOdds, BookOdds, Selection
+from tools.model_registry import get_model_registry
 
 # Import injury classifier (optional dependency)
 try:
@@ -106,8 +108,13 @@ class EnhancedParlayStrategistAgent:
         self.prop_trainer = None
         if HAS_PROP_TRAINER and self.sport in ['nba', 'nfl']:
             try:
-                self.prop_trainer = HistoricalPropTrainer(self.sport)
-                self.prop_trainer.load_model()
+                # Shared with ParlayBuilder and other strategists via the model registry
+                registry = get_model_registry()
+                prop_trainer = registry.get("prop_trainer", self.sport)
+                registry.subscribe("prop_trainer", self.sport, self._swap_prop_trainer)
+                if not prop_trainer.is_trained:
+                    raise FileNotFoundError(f"no trained {self.sport.upper()} prop model")
+                self.prop_trainer = prop_trainer
                 logger.info(f"{self.sport.upper()} prop trainer initialized for EV-based leg selection")
             except Exception as e:
                 logger.warning(f"Could not initialize {self.sport.upper()} prop trainer: {e}")
@@ -126,7 +133,12 @@ class EnhancedParlayStrategistAgent:
         ]
         
         logger.info(f"Enhanced ParlayStrategistAgent initialized: {self.agent_id}")
-    
+
+    def _swap_prop_trainer(self, kind: str, sport: str, prop_trainer) -> None:
+        """Registry callback: serve a hot-reloaded prop trainer."""
+        self.prop_trainer = prop_trainer
+        logger.info(f"{sport.upper()} prop trainer swapped into {self.agent_id}")
+
     def generate_parlay_with_reasoning(self, current_games: List[GameOdds],
                                      target_legs: int = 3,
                                      min_total_odds: float = 3.0) -> Optional[ParlayRecommendation]:
@@ -327,28 +339,31 @@ class EnhancedParlayStrategistAgent:
                 
                 # Calculate traditional opportunity score
                 enhanced_opportunity['opportunity_score'] = self._calculate_opportunity_score(enhanced_opportunity)
-                
-                # Add ML-based EV score if prop trainer available
-                if self.prop_trainer:
-                    try:
-                        ml_ev_score = self._calculate_prop_ev_score(enhanced_opportunity)
-                        enhanced_opportunity['prop_ev_score'] = ml_ev_score
-                        # Weighted combination: 70% traditional + 30% ML EV
-                        enhanced_opportunity['combined_score'] = (
-                            0.7 * enhanced_opportunity['opportunity_score'] + 
-                            0.3 * ml_ev_score
-                        )
-                        logger.debug(f"Enhanced {opportunity['selection_name']} with ML EV: {ml_ev_score:.3f}")
-                    except Exception as e:
-                        logger.warning(f"Failed to calculate prop EV for {opportunity['selection_name']}: {e}")
-                        enhanced_opportunity['prop_ev_score'] = 0.5
-                        enhanced_opportunity['combined_score'] = enhanced_opportunity['opportunity_score']
-                else:
-                    enhanced_opportunity['prop_ev_score'] = enhanced_opportunity['opportunity_score'] 
-                    enhanced_opportunity['combined_score'] = enhanced_opportunity['opportunity_score']
-                
                 all_opportunities.append(enhanced_opportunity)
         
+        # Add ML-based EV scores if prop trainer available (one batch prediction)
+        if self.prop_trainer:
+            ml_ev_scores = self._calculate_prop_ev_scores(all_opportunities)
+        else:
+            ml_ev_scores = [None] * len(all_opportunities)
+        
+        for enhanced_opportunity, ml_ev_score in zip(all_opportunities, ml_ev_scores):
+            if not self.prop_trainer:
+                enhanced_opportunity['prop_ev_score'] = enhanced_opportunity['opportunity_score'] 
+                enhanced_opportunity['combined_score'] = enhanced_opportunity['opportunity_score']
+            elif ml_ev_score is None:
+                # Prediction failed for this leg only: fall back to the traditional score
+                enhanced_opportunity['prop_ev_score'] = 0.5
+                enhanced_opportunity['combined_score'] = enhanced_opportunity['opportunity_score']
+            else:
+                enhanced_opportunity['prop_ev_score'] = ml_ev_score
+                # Weighted combination: 70% traditional + 30% ML EV
+                enhanced_opportunity['combined_score'] = (
+                    0.7 * enhanced_opportunity['opportunity_score'] + 
+                    0.3 * ml_ev_score
+                )
+                logger.debug(f"Enhanced {enhanced_opportunity['selection_name']} with ML EV: {ml_ev_score:.3f}")
+        
         # Sort by combined score (ML-enhanced when available)
         sort_key = 'combined_score' if self.prop_trainer else 'opportunity_score'
         all_opportunities.sort(key=lambda x: x[sort_key], reverse=True)
@@ -378,36 +393,60 @@ class EnhancedParlayStrategistAgent:
         
         Returns normalized score between 0.0 and 1.0 for combination with traditional scoring.
         """
+        score = self._calculate_prop_ev_scores([opportunity])[0]
+        return 0.5 if score is None else score
+    
+    def _calculate_prop_ev_scores(self, opportunities: List[Dict[str, Any]]) -> List[Optional[float]]:
+        """
+        Batch version of _calculate_prop_ev_score: one prop trainer call for every opportunity.
+        
+        Returns normalized scores in input order, None for each opportunity whose
+        prediction failed (if the batch call fails, opportunities are retried one by one).
+        """
         if not self.prop_trainer:
-            return 0.5
+            return [0.5] * len(opportunities)
         
+        # Extract features for prop prediction based on sport
+        features = []
+        for opportunity in opportunities:
+            try:
+                features.append(self._extract_prop_features_from_opportunity(opportunity))
+            except Exception as e:
+                logger.warning(f"Failed to calculate prop EV for {opportunity.get('selection_name')}: {e}")
+                features.append(None)
+        rows = [i for i, row_features in enumerate(features) if row_features is not None]
+        
+        # Get hit probabilities from ML model (NaN where prediction failed)
+        hit_probabilities = np.full(len(opportunities), np.nan)
         try:
-            # Extract features for prop prediction based on sport
-            features = self._extract_prop_features_from_opportunity(opportunity)
-            
-            # Get hit probability from ML model
-            hit_probability = self.prop_trainer.predict(features)
-            
-            # Calculate Expected Value
-            odds_decimal = opportunity.get('odds_decimal', 2.0)
-            payout = odds_decimal - 1
-            expected_value = (hit_probability * payout) - ((1 - hit_probability) * 1)
-            
-            # Normalize EV to 0-1 range for scoring combination
-            # EV > 0 is positive value, scale to 0.5-1.0
-            # EV < 0 is negative value, scale to 0.0-0.5
-            if expected_value >= 0:
-                normalized_score = 0.5 + (min(expected_value, 1.0) * 0.5)
-            else:
-                normalized_score = max(0.0, 0.5 + (expected_value * 0.5))
-            
-            logger.debug(f"ML EV calculation: P={hit_probability:.3f}, EV={expected_value:.3f}, Score={normalized_score:.3f}")
-            
-            return normalized_score
-            
+            if rows:
+                hit_probabilities[rows] = self.prop_trainer.predict_batch([features[i] for i in rows])
         except Exception as e:
-            logger.warning(f"Error in prop EV calculation: {e}")
-            return 0.5
+            logger.warning(f"Error in batch prop EV calculation ({e}); retrying each opportunity")
+            for i in rows:
+                try:
+                    hit_probabilities[i] = self.prop_trainer.predict_batch([features[i]])[0]
+                except Exception as e:
+                    logger.warning(f"Failed to calculate prop EV for {opportunities[i].get('selection_name')}: {e}")
+        
+        # Calculate Expected Value
+        odds_decimal = np.array([opportunity.get('odds_decimal', 2.0) for opportunity in opportunities], dtype=float)
+        payout = odds_decimal - 1
+        expected_values = (hit_probabilities * payout) - ((1 - hit_probabilities) * 1)
+        
+        # Normalize EV to 0-1 range for scoring combination
+        # EV > 0 is positive value, scale to 0.5-1.0
+        # EV < 0 is negative value, scale to 0.0-0.5
+        normalized_scores = np.where(
+            expected_values >= 0,
+            0.5 + np.minimum(expected_values, 1.0) * 0.5,
+            np.maximum(0.0, 0.5 + expected_values * 0.5)
+        )
+        
+        logger.debug(f"ML EV calculation for {len(opportunities)} opportunities: "
+                     f"{int(np.isfinite(normalized_scores).sum())} scored")
+        
+        return [None if np.isnan(score) else float(score) for score in normalized_scores]
     
     def _extract_prop_features_from_opportunity(self, opportunity: Dict[str, Any]) -> Dict[str, Any]:
         """Extract features from opportunity data for prop prediction."""
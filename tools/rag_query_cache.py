@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+RAG Query Cache
+
+Process-wide memo of knowledge-base queries. The strategist agents, the
+insight helpers (get_parlay_insights, get_value_betting_insights, ...) and
+the scheduler jobs issue the same templated queries on every run, and each
+one used to re-encode the query and regenerate its insights.
+
+Key Features:
+- Query embeddings cached per embedding model (an index rebuild does not
+  change a query's embedding)
+- RAGResults cached per knowledge base under (query, top_k, min_relevance,
+  sport_filter)
+- Results are tied to the knowledge base's index version; a lookup with a
+  new version drops every result cached for the old one
+- One cache per process, so the NBA and NFL agents share hits
+- LRU eviction and hit/miss counters for monitoring
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (model_name, query)
+EmbeddingKey = Tuple[str, str]
+# (namespace, query key)
+ResultKey = Tuple[str, Hashable]
+
+
+class RAGQueryCache:
+    """Bounded LRU caches of query embeddings and RAG results."""
+
+    def __init__(self, max_embeddings: int = 2048, max_results: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_embeddings: Query embeddings kept before LRU eviction
+            max_results: RAG results kept before LRU eviction
+        """
+        self.max_embeddings = max_embeddings
+        self.max_results = max_results
+
+        self._embeddings: "OrderedDict[EmbeddingKey, np.ndarray]" = OrderedDict()
+        self._results: "OrderedDict[ResultKey, Any]" = OrderedDict()
+        self._versions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        self.embedding_hits = 0
+        self.embedding_misses = 0
+        self.result_hits = 0
+        self.result_misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_embedding(self, model_name: str, query: str) -> Optional[np.ndarray]:
+        """Cached (read-only) query embedding, or None on a miss."""
+        key = (model_name, query)
+        with self._lock:
+            vector = self._embeddings.get(key)
+            if vector is None:
+                self.embedding_misses += 1
+                return None
+            self._embeddings.move_to_end(key)
+            self.embedding_hits += 1
+            return vector
+
+    def put_embedding(self, model_name: str, query: str, vector: np.ndarray) -> np.ndarray:
+        """
+        Store a query embedding.
+
+        Returns:
+            The stored read-only array (callers must not modify it)
+        """
+        vector = np.array(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        with self._lock:
+            self._embeddings[(model_name, query)] = vector
+            self._embeddings.move_to_end((model_name, query))
+            while len(self._embeddings) > self.max_embeddings:
+                self._embeddings.popitem(last=False)
+                self.evictions += 1
+        return vector
+
+    def _check_version(self, namespace: str, version: str) -> None:
+        # Caller holds the lock
+        if self._versions.get(namespace) != version:
+            if namespace in self._versions:
+                self._drop_namespace(namespace)
+            self._versions[namespace] = version
+
+    def _drop_namespace(self, namespace: str) -> int:
+        stale = [key for key in self._results if key[0] == namespace]
+        for key in stale:
+            del self._results[key]
+        self.invalidations += 1
+        logger.debug(f"Dropped {len(stale)} cached RAG results for {namespace}")
+        return len(stale)
+
+    def get_result(self, namespace: str, version: str, key: Hashable) -> Optional[Any]:
+        """
+        Cached result for a query, or None on a miss.
+
+        Args:
+            namespace: Knowledge base the result came from (e.g. its chunks path)
+            version: Current index version of that knowledge base
+            key: Query key (query text plus search parameters)
+        """
+        with self._lock:
+            self._check_version(namespace, version)
+            result = self._results.get((namespace, key))
+            if result is None:
+                self.result_misses += 1
+                return None
+            self._results.move_to_end((namespace, key))
+            self.result_hits += 1
+            return result
+
+    def put_result(self, namespace: str, version: str, key: Hashable, result: Any) -> None:
+        """Store the result for a query computed against the given index version."""
+        with self._lock:
+            self._check_version(namespace, version)
+            self._results[(namespace, key)] = result
+            self._results.move_to_end((namespace, key))
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, namespace: Optional[str] = None) -> int:
+        """
+        Drop cached results.
+
+        Args:
+            namespace: Only drop this knowledge base's results (all results and
+                embeddings if None)
+
+        Returns:
+            Number of results removed
+        """
+        with self._lock:
+            if namespace is not None:
+                self._versions.pop(namespace, None)
+                return self._drop_namespace(namespace)
+            removed = len(self._results)
+            self._results.clear()
+            self._embeddings.clear()
+            self._versions.clear()
+            self.invalidations += 1
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring how much re-encoding and re-searching the cache saves."""
+        with self._lock:
+            lookups = self.result_hits + self.result_misses
+            return {
+                'embedding_hits': self.embedding_hits,
+                'embedding_misses': self.embedding_misses,
+                'result_hits': self.result_hits,
+                'result_misses': self.result_misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'embeddings': len(self._embeddings),
+                'results': len(self._results),
+                'result_hit_rate': self.result_hits / lookups if lookups else 0.0
+            }
+
+
+_shared_cache: Optional[RAGQueryCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_rag_query_cache() -> RAGQueryCache:
+    """
+    Return the process-wide RAGQueryCache.
+
+    Configured from RAG_QUERY_CACHE_MAX_EMBEDDINGS and RAG_QUERY_CACHE_MAX_RESULTS.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = RAGQueryCache(
+                    max_embeddings=int(os.getenv("RAG_QUERY_CACHE_MAX_EMBEDDINGS", "2048")),
+                    max_results=int(os.getenv("RAG_QUERY_CACHE_MAX_RESULTS", "1024"))
+                )
+    return _shared_cache
+
+
+def reset_rag_query_cache() -> None:
+    """Discard the process-wide cache and its counters (next call builds a new one)."""
+    global _shared_cache
+    with _shared_cache_lock:
+        _shared_cache = None
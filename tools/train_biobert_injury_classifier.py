@@ -18,9 +18,16 @@ from transformers import (
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import json
+import sys
 from datetime import datetime
 import logging
 
+# Add project root to path for imports (also run as a script from tools/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.inference_service import InferenceService, get_inference_service
+from tools.model_export import export_fast_inference, print_export_summary
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -59,13 +66,17 @@ class InjuryDataset(Dataset):
 class BioBERTInjuryClassifier:
     """BioBERT-based injury severity classifier with confidence thresholding"""
     
-    def __init__(self, model_name="dmis-lab/biobert-base-cased-v1.1", confidence_threshold=0.8):
+    def __init__(self, model_name="dmis-lab/biobert-base-cased-v1.1", confidence_threshold=0.8,
+                 fast_inference=False):
         self.model_name = model_name
         self.confidence_threshold = confidence_threshold
+        # Serve the int8/ONNX CPU export of a saved model when one passed parity
+        self.fast_inference = fast_inference
         self.tokenizer = None
         self.model = None
         self.label_encoder = {}
         self.label_decoder = {}
+        self._inference = None
         
     def prepare_data(self, csv_path):
         """Load and prepare the injury severity dataset"""
@@ -140,7 +151,8 @@ class BioBERTInjuryClassifier:
         predictions = np.argmax(predictions, axis=1)
         return {'accuracy': accuracy_score(labels, predictions)}
     
-    def train(self, train_dataset, val_dataset, output_dir="models/biobert_injury_classifier"):
+    def train(self, train_dataset, val_dataset, output_dir="models/biobert_injury_classifier",
+              export_backends=("int8", "onnx_int8")):
         """Train the BioBERT model"""
         logger.info("Starting model training...")
         
@@ -194,41 +206,35 @@ class BioBERTInjuryClassifier:
             }, f, indent=2)
         
         logger.info(f"Model saved to {output_dir}")
+        
+        # Fast CPU artifacts, parity-checked against the fp32 model on the validation split
+        if export_backends:
+            manifest = export_fast_inference(
+                output_dir, export_backends,
+                parity_texts=val_dataset.texts,
+                parity_labels=list(val_dataset.labels)
+            )
+            print_export_summary(manifest)
         return trainer
     
+    def _inference_service(self):
+        """Batched inference service for the current model (CPU, to avoid MPS issues)"""
+        if self._inference is None or self._inference.model is not self.model:
+            # Model trained in this process rather than loaded
+            self.model = self.model.to(torch.device('cpu'))
+            self._inference = InferenceService(self.model, self.tokenizer, max_length=512,
+                                               name="biobert_injury_classifier")
+        return self._inference
+    
     def predict_with_confidence(self, texts, model_path="models/biobert_injury_classifier"):
         """Make predictions with confidence scores"""
         # Load model if not already loaded
         if self.model is None:
             self.load_model(model_path)
         
-        # Move model to CPU to avoid MPS issues
-        device = torch.device('cpu')
-        self.model = self.model.to(device)
-        
-        # Tokenize inputs
-        inputs = self.tokenizer(
-            texts,
-            truncation=True,
-            padding=True,
-            max_length=512,
-            return_tensors="pt"
-        )
-        
-        # Move inputs to CPU
-        inputs = {k: v.to(device) for k, v in inputs.items()}
-        
-        # Get predictions
-        self.model.eval()
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
-            
-            # Apply softmax to get probabilities
-            probabilities = torch.softmax(logits, dim=-1)
-            
-            # Get predicted classes and confidence scores
-            confidence_scores, predicted_classes = torch.max(probabilities, dim=-1)
+        # Batched, padded-to-longest inference (shared with concurrent callers)
+        probabilities = torch.from_numpy(self._inference_service().predict_many(texts))
+        confidence_scores, predicted_classes = torch.max(probabilities, dim=-1)
             
         results = []
         for i, text in enumerate(texts):
@@ -264,9 +270,11 @@ class BioBERTInjuryClassifier:
             self.label_decoder = {int(k): v for k, v in mappings["label_decoder"].items()}
             self.confidence_threshold = mappings.get("confidence_threshold", 0.8)
         
-        # Load model and tokenizer
-        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-        self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+        # Load model and tokenizer once per process (shared inference service)
+        self._inference = get_inference_service(model_path, max_length=512,
+                                                backend="auto" if self.fast_inference else "fp32")
+        self.tokenizer = self._inference.tokenizer
+        self.model = self._inference.model
         
         logger.info("Model loaded successfully")
     
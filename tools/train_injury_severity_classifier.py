@@ -16,9 +16,16 @@ import torch
 from torch.utils.data import Dataset
 import json
 import os
+import sys
 from datetime import datetime
 import argparse
 
+# Add project root to path for imports (also run as a script from tools/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.inference_service import InferenceService, get_inference_service
+from tools.model_export import export_fast_inference, parse_export_backends, print_export_summary
+
 
 class InjuryDataset(Dataset):
     def __init__(self, texts, labels, tokenizer, max_length=512):
@@ -48,8 +55,10 @@ class InjuryDataset(Dataset):
 
 
 class InjurySeverityClassifier:
-    def __init__(self, model_path='models/nfl_injury_severity_classifier'):
+    def __init__(self, model_path='models/nfl_injury_severity_classifier', fast_inference=False):
         self.model_path = model_path
+        # Serve the int8/ONNX CPU export of the saved model when one passed parity
+        self.fast_inference = fast_inference
         # Injury severity labels from your data
         self.labels = ['unconfirmed', 'out_for_season', 'day_to_day', 'minor']
         self.label_to_id = {label: idx for idx, label in enumerate(self.labels)}
@@ -57,6 +66,7 @@ class InjurySeverityClassifier:
         
         self.tokenizer = RobertaTokenizer.from_pretrained('roberta-base')
         self.model = None
+        self._inference = None
         
     def load_training_data(self):
         """Load the combined NFL injury severity dataset"""
@@ -199,44 +209,46 @@ class InjurySeverityClassifier:
         
         return accuracy, pred_labels, true_labels
     
-    def classify_injury(self, text):
-        """Classify injury severity for a single tweet"""
+    def _inference_service(self):
+        """Batched inference service: shared when loaded from model_path, private after training"""
+        if self.model is None and self.fast_inference:
+            return get_inference_service(self.model_path, max_length=512, backend="auto")
         if self.model is None:
-            self.model = RobertaForSequenceClassification.from_pretrained(self.model_path)
-        
-        # Tokenize
-        inputs = self.tokenizer(
-            text,
-            truncation=True,
-            padding=True,
-            max_length=512,
-            return_tensors='pt'
-        )
-        
-        # Predict
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-            predicted_class_id = predictions.argmax().item()
-            confidence = predictions.max().item()
-        
-        predicted_severity = self.id_to_label[predicted_class_id]
-        
+            return get_inference_service(
+                self.model_path, max_length=512,
+                loader=lambda path: (RobertaForSequenceClassification.from_pretrained(path), self.tokenizer)
+            )
+        if self._inference is None or self._inference.model is not self.model:
+            self._inference = InferenceService(self.model, self.tokenizer, max_length=512,
+                                               name="nfl_injury_severity_classifier")
+        return self._inference
+    
+    def _format_severity(self, probabilities):
+        predicted_class_id = int(probabilities.argmax())
         return {
-            'severity': predicted_severity,
-            'confidence': confidence,
+            'severity': self.id_to_label[predicted_class_id],
+            'confidence': float(probabilities[predicted_class_id]),
             'all_probabilities': {
-                self.id_to_label[i]: float(predictions[0][i]) 
+                self.id_to_label[i]: float(probabilities[i]) 
                 for i in range(len(self.labels))
             }
         }
-
+    
+    def classify_injury(self, text):
+        """Classify injury severity for a single tweet (batched with concurrent callers)"""
+        return self._format_severity(self._inference_service().predict(text))
+    
+    def classify_injuries(self, texts):
+        """Classify injury severity for many tweets in padded-to-longest batches"""
+        return [self._format_severity(row) for row in self._inference_service().predict_many(texts)]
 
 def main():
     parser = argparse.ArgumentParser(description="Train NFL Injury Severity Classifier")
     parser.add_argument('--epochs', type=int, default=3, help='Number of training epochs')
     parser.add_argument('--batch-size', type=int, default=8, help='Batch size')
     parser.add_argument('--test-only', action='store_true', help='Only test existing model')
+    parser.add_argument('--export', default='int8,onnx_int8',
+                        help='Fast CPU exports after training: none, all, or any of int8,onnx,onnx_int8')
     args = parser.parse_args()
     
     # Initialize classifier
@@ -269,6 +281,16 @@ def main():
             json.dump(summary, f, indent=2)
         
         print(f"\n🎉 Training complete! Summary saved to {classifier.model_path}/training_summary.json")
+        
+        # Fast CPU artifacts, parity-checked against the fp32 model on the test split
+        export_backends = parse_export_backends(args.export)
+        if export_backends:
+            manifest = export_fast_inference(
+                classifier.model_path, export_backends,
+                parity_texts=test_df['training_text'].tolist(),
+                parity_labels=test_df['label_id'].tolist()
+            )
+            print_export_summary(manifest)
     
     # Test with sample injury tweets
     print("\n🧪 Testing with sample injury tweets:")
@@ -16,9 +16,15 @@ import torch
 from torch.utils.data import Dataset
 import json
 import os
+import sys
 from datetime import datetime
 import argparse
 
+# Add project root to path for imports (also run as a script from tools/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.model_export import export_fast_inference, parse_export_backends, print_export_summary
+
 
 class TweetDataset(Dataset):
     def __init__(self, texts, labels, tokenizer, max_length=512):
@@ -282,6 +288,8 @@ def main():
     parser.add_argument('--epochs', type=int, default=3, help='Number of training epochs')
     parser.add_argument('--batch-size', type=int, default=16, help='Batch size')
     parser.add_argument('--test-only', action='store_true', help='Only test existing model')
+    parser.add_argument('--export', default='int8,onnx_int8',
+                        help='Fast CPU exports after training: none, all, or any of int8,onnx,onnx_int8')
     args = parser.parse_args()
     
     # Initialize classifier
@@ -314,6 +322,16 @@ def main():
             json.dump(summary, f, indent=2)
         
         print(f"\n🎉 Training complete! Summary saved to {classifier.model_path}/training_summary.json")
+        
+        # Fast CPU artifacts, parity-checked against the fp32 model on the test split
+        export_backends = parse_export_backends(args.export)
+        if export_backends:
+            manifest = export_fast_inference(
+                classifier.model_path, export_backends,
+                parity_texts=test_df['text'].tolist(),
+                parity_labels=test_df['label_id'].tolist()
+            )
+            print_export_summary(manifest)
     
     # Test with sample tweets
     print("\n🧪 Testing with sample tweets:")
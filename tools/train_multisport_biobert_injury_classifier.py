@@ -19,10 +19,17 @@ from transformers import (
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import json
+import sys
 from datetime import datetime, timedelta
 import logging
 import argparse
 
+# Add project root to path for imports (also run as a script from tools/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.inference_service import InferenceService, get_inference_service
+from tools.model_export import export_fast_inference, parse_export_backends, print_export_summary
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -73,15 +80,19 @@ class MultiSportInjuryDataset(Dataset):
 class MultiSportBioBERTInjuryClassifier:
     """Multi-sport BioBERT-based injury severity classifier with enhanced features"""
     
-    def __init__(self, model_name="dmis-lab/biobert-base-cased-v1.1", confidence_threshold=0.8):
+    def __init__(self, model_name="dmis-lab/biobert-base-cased-v1.1", confidence_threshold=0.8,
+                 fast_inference=False):
         self.model_name = model_name
         self.confidence_threshold = confidence_threshold
+        # Serve the int8/ONNX CPU export of a saved model when one passed parity
+        self.fast_inference = fast_inference
         self.tokenizer = None
         self.model = None
         self.label_encoder = {}
         self.label_decoder = {}
         self.sport_encoder = {"nba": 0, "nfl": 1}
         self.sport_decoder = {0: "nba", 1: "nfl"}
+        self._inference = None
         
     def calculate_timestamp_weight(self, timestamp_str, current_time=None):
         """Calculate timestamp weight based on recency"""
@@ -262,7 +273,8 @@ class MultiSportBioBERTInjuryClassifier:
         predictions = np.argmax(predictions, axis=1)
         return {'accuracy': accuracy_score(labels, predictions)}
     
-    def train(self, train_dataset, val_dataset, output_dir="models/multisport_biobert_injury_classifier"):
+    def train(self, train_dataset, val_dataset, output_dir="models/multisport_biobert_injury_classifier",
+              export_backends=("int8", "onnx_int8")):
         """Train the Multi-Sport BioBERT model"""
         logger.info("Starting multi-sport model training...")
         
@@ -322,8 +334,26 @@ class MultiSportBioBERTInjuryClassifier:
             }, f, indent=2)
         
         logger.info(f"Multi-sport model saved to {output_dir}")
+        
+        # Fast CPU artifacts, parity-checked against the fp32 model on the validation split
+        if export_backends:
+            manifest = export_fast_inference(
+                output_dir, export_backends,
+                parity_texts=[f"[{sport.upper()}] {text}" for text, sport in zip(val_dataset.texts, val_dataset.sports)],
+                parity_labels=list(val_dataset.labels)
+            )
+            print_export_summary(manifest)
         return trainer
     
+    def _inference_service(self):
+        """Batched inference service for the current model (CPU, to avoid MPS issues)"""
+        if self._inference is None or self._inference.model is not self.model:
+            # Model trained in this process rather than loaded
+            self.model = self.model.to(torch.device('cpu'))
+            self._inference = InferenceService(self.model, self.tokenizer, max_length=512,
+                                               name="multisport_biobert_injury_classifier")
+        return self._inference
+    
     def predict_with_confidence(self, texts, sports=None, authors=None, timestamps=None, 
                               model_path="models/multisport_biobert_injury_classifier"):
         """Make predictions with confidence scores and enhanced features"""
@@ -347,33 +377,9 @@ class MultiSportBioBERTInjuryClassifier:
         # Enhance texts with sport context
         enhanced_texts = [f"[{sport.upper()}] {text}" for text, sport in zip(texts, sports)]
         
-        # Move model to CPU to avoid MPS issues
-        device = torch.device('cpu')
-        self.model = self.model.to(device)
-        
-        # Tokenize inputs
-        inputs = self.tokenizer(
-            enhanced_texts,
-            truncation=True,
-            padding=True,
-            max_length=512,
-            return_tensors="pt"
-        )
-        
-        # Move inputs to CPU
-        inputs = {k: v.to(device) for k, v in inputs.items()}
-        
-        # Get predictions
-        self.model.eval()
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
-            
-            # Apply softmax to get probabilities
-            probabilities = torch.softmax(logits, dim=-1)
-            
-            # Get predicted classes and confidence scores
-            confidence_scores_tensor, predicted_classes = torch.max(probabilities, dim=-1)
+        # Batched, padded-to-longest inference (shared with concurrent callers)
+        probabilities = torch.from_numpy(self._inference_service().predict_many(enhanced_texts))
+        confidence_scores_tensor, predicted_classes = torch.max(probabilities, dim=-1)
             
         results = []
         for i, text in enumerate(texts):
@@ -419,9 +425,11 @@ class MultiSportBioBERTInjuryClassifier:
             self.sport_decoder = mappings.get("sport_decoder", {"0": "nba", "1": "nfl"})
             self.confidence_threshold = mappings.get("confidence_threshold", 0.8)
         
-        # Load model and tokenizer
-        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-        self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+        # Load model and tokenizer once per process (shared inference service)
+        self._inference = get_inference_service(model_path, max_length=512,
+                                                backend="auto" if self.fast_inference else "fp32")
+        self.tokenizer = self._inference.tokenizer
+        self.model = self._inference.model
         
         logger.info("Multi-sport model loaded successfully")
     
@@ -530,6 +538,8 @@ def main():
                         help='Training batch size')
     parser.add_argument('--confidence-threshold', type=float, default=0.8,
                         help='Confidence threshold for predictions')
+    parser.add_argument('--export', default='int8,onnx_int8',
+                        help='Fast CPU exports after training: none, all, or any of int8,onnx,onnx_int8')
     
     args = parser.parse_args()
     
@@ -547,7 +557,7 @@ def main():
     train_dataset, val_dataset, test_dataset = classifier.create_datasets(data_splits, label_splits)
     
     # Train model
-    trainer = classifier.train(train_dataset, val_dataset)
+    trainer = classifier.train(train_dataset, val_dataset, export_backends=parse_export_backends(args.export))
     
     # Evaluate model
     logger.info("Evaluating multi-sport model on test set...")
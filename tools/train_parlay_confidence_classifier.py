@@ -27,6 +27,8 @@ from transformers import (
     EarlyStoppingCallback
 )
 
+from tools.model_export import export_fast_inference, print_export_summary
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -253,6 +255,24 @@ class ParlayConfidenceClassifier:
         
         return training_metadata
     
+    def export_fast_model(self, test_dataset: "ParlayReasoningDataset",
+                          backends: Tuple[str, ...] = ("int8", "onnx_int8")) -> Dict[str, Any]:
+        """
+        Export int8/ONNX CPU artifacts for the saved model.
+        
+        Args:
+            test_dataset: Held-out samples for the fp32 parity check
+            backends: Export backends (see tools.model_export)
+            
+        Returns:
+            Export manifest with parity, latency and size per backend
+        """
+        return export_fast_inference(
+            str(self.model_save_path), backends,
+            parity_texts=[sample["reasoning"] for sample in test_dataset.samples],
+            parity_labels=[self.label2id[sample["confidence_label"]] for sample in test_dataset.samples]
+        )
+    
     def evaluate(self, test_dataset: Dataset) -> Dict[str, Any]:
         """
         Evaluate the trained model on test data.
@@ -469,6 +489,9 @@ def main():
         print(f"Recall: {evaluation_results['recall']:.4f}")
         print(f"F1 Score: {evaluation_results['f1_score']:.4f}")
         
+        # Export fast CPU inference artifacts
+        print_export_summary(classifier.export_fast_model(test_dataset))
+        
         # Test prediction on sample
         print(f"\n🧪 Testing prediction on sample reasoning...")
         sample_reasoning = samples[0]['reasoning']
@@ -1,5 +1,6 @@
 import json
 import os
+import sys
 from pathlib import Path
 from typing import List, Dict
 
@@ -7,6 +8,10 @@ import torch
 from torch.utils.data import Dataset, DataLoader
 from transformers import AutoTokenizer, AutoModelForSequenceClassification, Trainer, TrainingArguments
 
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.model_export import export_fast_inference, print_export_summary
+
 
 LABELS = ["injury_news", "lineup_news", "general_commentary", "irrelevant"]
 LABEL2ID = {l: i for i, l in enumerate(LABELS)}
@@ -91,6 +96,16 @@ def main():
     tokenizer.save_pretrained(out_dir)
     print(f"✅ Model saved to {out_dir}")
 
+    # Fast CPU artifacts, parity-checked on the eval split
+    eval_samples = samples[split:]
+    manifest = export_fast_inference(
+        str(out_dir), os.getenv("EXPORT_BACKENDS", "int8,onnx_int8").split(","),
+        parity_texts=[ex["text"] for ex in eval_samples] or None,
+        parity_labels=[LABEL2ID[ex["label"]] for ex in eval_samples] or None,
+        max_length=160,
+    )
+    print_export_summary(manifest)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Vectorized Arbitrage Scanner
+
+Batch counterpart of ArbitrageDetectorTool.detect_arbitrage_two_way /
+detect_arbitrage_three_way. Instead of pricing one pair or triple of odds per
+call, every market on the slate is laid out as an (outcomes x books) matrix of
+American odds and the whole slate is scanned with NumPy in one pass:
+
+1. Execution-cost adjustment per book (BookConfiguration bid-ask spread,
+   slippage, market impact, liquidity tier) and per sport (slippage
+   multiplier, NFL volatility) - the same factors adjust_for_spread_and_slippage
+   applies one quote at a time
+2. Best-price combinations: the top-k books per outcome, with every leg at a
+   different book
+3. Implied-probability sums, slippage-adjusted margins and stake ratios
+
+Only markets that clear the detector's thresholds are turned back into
+ArbitrageOpportunity objects, using the detector's own risk, Sharpe,
+false-positive and confidence scoring.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tools.arbitrage_detector_tool import (
+    ArbitrageDetectorTool, ArbitrageLeg, ArbitrageOpportunity, BookConfiguration
+)
+
+logger = logging.getLogger(__name__)
+
+LIQUIDITY_PENALTY = {"high": 1.0, "medium": 0.995, "low": 0.990}
+NFL_VOLATILITY_PENALTY = 0.998
+
+
+@dataclass
+class MarketMatrix:
+    """American odds for one market of one game: odds[outcome, book], NaN = not offered."""
+    game_id: str
+    market_type: str
+    outcomes: List[str]
+    books: List[str]
+    odds: np.ndarray
+    sport: str = "nba"
+
+
+def decimal_to_american(price_decimal: float) -> float:
+    """Decimal odds to American odds."""
+    if price_decimal >= 2.0:
+        return (price_decimal - 1) * 100
+    return -100 / (price_decimal - 1)
+
+
+def sport_from_key(sport_key: str) -> str:
+    """Odds API sport key to the detector's sport name ('nfl' or 'nba')."""
+    return "nfl" if "nfl" in sport_key.lower() else "nba"
+
+
+def build_market_matrices(games: List, markets: Optional[List[str]] = None) -> List[MarketMatrix]:
+    """
+    Lay out GameOdds as one MarketMatrix per (game, market, line).
+
+    Outcomes only compete when they settle against each other: totals are
+    grouped by line (Over/Under 220.5), spreads by the line of the
+    alphabetically first team (A -2.5 pairs with B +2.5), moneylines as is.
+
+    Args:
+        games: List of GameOdds
+        markets: Markets to include (all if None)
+
+    Returns:
+        Matrices with at least two outcomes and two books
+    """
+    matrices = []
+    for game in games:
+        groups: Dict[Tuple[str, Optional[float]], Dict[Tuple[str, str], float]] = {}
+        for book in game.books:
+            if markets is not None and book.market not in markets:
+                continue
+            first_name = min((s.name for s in book.selections), default=None)
+            for selection in book.selections:
+                if selection.price_decimal <= 1.0:
+                    continue
+                line = selection.line
+                if book.market == "spreads" and line is not None and selection.name != first_name:
+                    line = -line
+                quotes = groups.setdefault((book.market, line), {})
+                quotes.setdefault((selection.name, book.bookmaker), decimal_to_american(selection.price_decimal))
+
+        for (market, line), quotes in groups.items():
+            outcomes = sorted({name for name, _ in quotes})
+            books = sorted({book for _, book in quotes})
+            if len(outcomes) < 2 or len(books) < 2:
+                continue
+            odds = np.full((len(outcomes), len(books)), np.nan)
+            outcome_idx = {name: i for i, name in enumerate(outcomes)}
+            book_idx = {name: j for j, name in enumerate(books)}
+            for (name, book), price in quotes.items():
+                odds[outcome_idx[name], book_idx[book]] = price
+            market_type = market if line is None else f"{market} {line:+g}"
+            matrices.append(MarketMatrix(game.game_id, market_type, outcomes, books, odds,
+                                         sport_from_key(game.sport_key)))
+    return matrices
+
+
+class VectorizedArbitrageScanner:
+    """Slate-wide arbitrage scan driven by an ArbitrageDetectorTool's settings."""
+
+    def __init__(self, detector: ArbitrageDetectorTool, total_stake: float = 1000.0):
+        """
+        Initialize the scanner.
+
+        Args:
+            detector: Detector supplying book/sport configurations, thresholds and scoring
+            total_stake: Stake spread across the legs of each opportunity
+        """
+        self.detector = detector
+        self.total_stake = total_stake
+
+    def _book_config(self, book: str) -> BookConfiguration:
+        return self.detector.book_configs.get(book.lower(), BookConfiguration(book))
+
+    def _adjustment_factors(self, books: List[str], sport: str, stake_size: float) -> np.ndarray:
+        """Multiplicative decimal-odds adjustment per book (adjust_for_spread_and_slippage, vectorized)."""
+        sport_config = self.detector.sport_configs.get(sport.lower(), self.detector.sport_configs["nba"])
+        configs = [self._book_config(book) for book in books]
+
+        spread = np.array([c.bid_ask_spread for c in configs])
+        slippage = np.array([c.slippage_factor for c in configs])
+        threshold = np.array([c.market_impact_threshold for c in configs])
+        liquidity = np.array([LIQUIDITY_PENALTY.get(c.liquidity_tier, 1.0) for c in configs])
+
+        factor = (1 - spread / 2) * (1 - slippage * sport_config["slippage_multiplier"]) * liquidity
+
+        impact_multiplier = np.minimum(stake_size / threshold, 3.0)
+        if sport.lower() == "nfl":
+            impact_multiplier = impact_multiplier * 1.1
+            factor = factor * NFL_VOLATILITY_PENALTY
+        factor = np.where(stake_size > threshold, factor * (1 - slippage * impact_multiplier * 0.5), factor)
+        return factor
+
+    def scan(self, matrices: List[MarketMatrix], log_opportunities: bool = False) -> List[ArbitrageOpportunity]:
+        """
+        Scan every market matrix and return the arbitrage opportunities found.
+
+        At most one opportunity is returned per matrix: the cheapest
+        combination of distinct books across its outcomes.
+
+        Args:
+            matrices: Markets to scan (any mix of games, sports and outcome counts)
+            log_opportunities: Also write each opportunity to the detector's SQLite log
+
+        Returns:
+            ArbitrageOpportunity list, in matrix order
+        """
+        # Matrices sharing sport and outcome count are stacked into one
+        # (games x outcomes x books) array over the union of their books
+        groups: Dict[Tuple[str, int], List[int]] = {}
+        for i, matrix in enumerate(matrices):
+            groups.setdefault((matrix.sport.lower(), len(matrix.outcomes)), []).append(i)
+
+        found: Dict[int, ArbitrageOpportunity] = {}
+        for (sport, n_outcomes), members in groups.items():
+            for i, book_per_outcome in self._scan_group([matrices[m] for m in members], sport, n_outcomes):
+                opportunity = self._build_opportunity(matrices[members[i]], book_per_outcome)
+                if opportunity is None:
+                    continue
+                found[members[i]] = opportunity
+                self.detector.opportunities_detected.append(opportunity)
+                if log_opportunities:
+                    self.detector.log_arbitrage_opportunity(opportunity, sport=sport)
+
+        return [found[i] for i in sorted(found)]
+
+    def _scan_group(self, matrices: List[MarketMatrix], sport: str, n_outcomes: int):
+        """Yield (matrix index, the matrix's book index per outcome) for each arbitrage."""
+        books = sorted({book for matrix in matrices for book in matrix.books})
+        book_idx = {book: j for j, book in enumerate(books)}
+
+        odds = np.full((len(matrices), n_outcomes, len(books)), np.nan)
+        for g, matrix in enumerate(matrices):
+            odds[g][:, [book_idx[b] for b in matrix.books]] = matrix.odds
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            decimal = np.where(odds > 0, odds / 100 + 1, 100 / np.abs(odds) + 1)
+            adjusted = decimal * self._adjustment_factors(books, sport, self.total_stake / n_outcomes)
+            # Implied probability of the adjusted price; missing or degenerate quotes never win
+            probs = np.where(adjusted > 1.0, 1.0 / adjusted, np.inf)
+        probs[np.isnan(probs)] = np.inf
+
+        # Top-k books per outcome (k = number of legs) always contain the best
+        # assignment with every leg at a different book
+        k = min(n_outcomes, len(books))
+        top_books = np.argsort(probs, axis=2, kind="stable")[:, :, :k]
+        top_probs = np.take_along_axis(probs, top_books, axis=2)
+
+        combos = np.array(list(product(range(k), repeat=n_outcomes)))   # C x O
+        outcome_axis = np.arange(n_outcomes)[None, :]
+        combo_books = top_books[:, outcome_axis, combos]                  # G x C x O
+        combo_probs = top_probs[:, outcome_axis, combos]
+        totals = combo_probs.sum(axis=2)                                  # G x C
+
+        ordered = np.sort(combo_books, axis=2)
+        distinct = np.all(ordered[:, :, 1:] != ordered[:, :, :-1], axis=2)
+        totals = np.where(distinct, totals, np.inf)
+
+        best = np.argmin(totals, axis=1)
+        best_total = totals[np.arange(len(matrices)), best]
+        with np.errstate(divide="ignore"):
+            margin = 1.0 / best_total - 1.0
+        hits = (best_total < 1.0 - self.detector.false_positive_epsilon) & \
+               (margin >= self.detector.min_profit_threshold)
+
+        for g in np.flatnonzero(hits):
+            chosen = combo_books[g, best[g]]
+            matrix = matrices[g]
+            yield g, [matrix.books.index(books[j]) for j in chosen]
+
+    def _build_opportunity(self, matrix: MarketMatrix,
+                           book_per_outcome: List[int]) -> Optional[ArbitrageOpportunity]:
+        """Materialize one hit with the detector's leg pricing and risk scoring."""
+        detector = self.detector
+        sport = matrix.sport
+        current_time = datetime.now(timezone.utc)
+        n_legs = len(matrix.outcomes)
+
+        quotes = [(float(matrix.odds[o, b]), matrix.books[b]) for o, b in enumerate(book_per_outcome)]
+        profit_margin, stake_ratios, individual_stakes = detector.calculate_profit_margin_and_stake_ratios(
+            quotes, total_stake=self.total_stake, sport=sport
+        )
+        if profit_margin < detector.min_profit_threshold:
+            return None  # rounding at the threshold boundary
+
+        legs = []
+        for (odds, book), outcome, stake in zip(quotes, matrix.outcomes, individual_stakes):
+            adjusted_odds = detector.adjust_for_spread_and_slippage(odds, book, stake, sport)
+            legs.append(ArbitrageLeg(
+                book=book,
+                market=matrix.market_type,
+                team=outcome,
+                odds=odds,
+                adjusted_odds=adjusted_odds,
+                implied_probability=detector.odds_to_implied_probability(odds),
+                adjusted_implied_probability=detector.odds_to_implied_probability(adjusted_odds),
+                stake_ratio=stake_ratios[book],
+                stake_amount=stake,
+                expected_return=stake * (adjusted_odds / 100 + 1 if adjusted_odds > 0 else 100 / abs(adjusted_odds) + 1),
+                last_update=current_time.isoformat(),
+                latency_seconds=0.0
+            ))
+
+        execution_risk_score = detector._calculate_execution_risk(legs)
+        false_positive_prob = detector._estimate_false_positive_probability(legs, profit_margin)
+        if n_legs == 3:
+            # Same complexity penalties as detect_arbitrage_three_way
+            execution_risk_score *= 1.15
+            false_positive_prob *= 1.1
+
+        return ArbitrageOpportunity(
+            arbitrage=True,
+            type=f"{n_legs}-way" if n_legs <= 3 else "n-way",
+            profit_margin=profit_margin,
+            risk_adjusted_profit=profit_margin * (1 - execution_risk_score),
+            expected_edge=profit_margin * (0.8 if n_legs == 2 else 0.70),
+            sharpe_ratio=detector._calculate_sharpe_ratio(profit_margin, execution_risk_score),
+            total_stake=self.total_stake,
+            stake_ratios=stake_ratios,
+            adjusted_for_slippage=True,
+            max_latency_seconds=0.0,
+            execution_time_window=detector.execution_window,
+            legs=legs,
+            execution_risk_score=execution_risk_score,
+            false_positive_probability=false_positive_prob,
+            confidence_level=detector._determine_confidence_level(
+                profit_margin, execution_risk_score, false_positive_prob
+            ),
+            detection_timestamp=current_time.isoformat(),
+            expires_at=(current_time + timedelta(seconds=detector.execution_window)).isoformat(),
+            game_id=matrix.game_id,
+            market_type=matrix.market_type
+        )